@@ -0,0 +1,64 @@
+"""add_user_counters
+
+Revision ID: a4c9e2d7b815
+Revises: f3b8d1e6a5c2
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+revision = "a4c9e2d7b815"
+down_revision = "f3b8d1e6a5c2"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = ("posts_count", "public_posts_count", "followers_count", "following_count")
+
+
+def upgrade():
+    for column in COUNTER_COLUMNS:
+        op.add_column("users", sa.Column(column, sa.Integer(), nullable=False, server_default="0"))
+
+    # Backfill from the source rows; kept in sync by ORM listeners afterwards.
+    op.execute(text("""
+        UPDATE users SET
+            posts_count = live.posts_count,
+            public_posts_count = live.public_posts_count,
+            followers_count = live.followers_count,
+            following_count = live.following_count
+        FROM (
+            SELECT u.id AS user_id,
+                   COALESCE(pc.posts_count, 0) AS posts_count,
+                   COALESCE(pc.public_posts_count, 0) AS public_posts_count,
+                   COALESCE(fr.followers_count, 0) AS followers_count,
+                   COALESCE(fg.following_count, 0) AS following_count
+            FROM users u
+            LEFT JOIN (
+                SELECT author_id,
+                       COUNT(*) AS posts_count,
+                       SUM(CASE WHEN privacy_level = 'public' THEN 1 ELSE 0 END) AS public_posts_count
+                FROM posts
+                WHERE deleted_at IS NULL
+                GROUP BY author_id
+            ) pc ON pc.author_id = u.id
+            LEFT JOIN (
+                SELECT followed_id, COUNT(*) AS followers_count
+                FROM follows WHERE status = 'active'
+                GROUP BY followed_id
+            ) fr ON fr.followed_id = u.id
+            LEFT JOIN (
+                SELECT follower_id, COUNT(*) AS following_count
+                FROM follows WHERE status = 'active'
+                GROUP BY follower_id
+            ) fg ON fg.follower_id = u.id
+        ) live
+        WHERE users.id = live.user_id
+    """))
+
+
+def downgrade():
+    for column in reversed(COUNTER_COLUMNS):
+        op.drop_column("users", column)
@@ -0,0 +1,45 @@
+"""add_notification_keyset_index_and_unread_count
+
+Revision ID: b8e3f1c6d2a9
+Revises: a4c9e2d7b815
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+revision = "b8e3f1c6d2a9"
+down_revision = "a4c9e2d7b815"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination of /notifications on (last_updated_at, id) over parents.
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_parents "
+        "ON notifications (user_id, last_updated_at, id) WHERE parent_id IS NULL"
+    ))
+
+    op.add_column(
+        "users",
+        sa.Column("unread_notifications_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Backfill from the source rows; kept in sync by ORM listeners afterwards.
+    op.execute(text("""
+        UPDATE users SET unread_notifications_count = live.unread_count
+        FROM (
+            SELECT user_id, COUNT(*) AS unread_count
+            FROM notifications
+            WHERE parent_id IS NULL AND read = false
+            GROUP BY user_id
+        ) live
+        WHERE users.id = live.user_id
+    """))
+
+
+def downgrade():
+    op.drop_column("users", "unread_notifications_count")
+    op.execute(text("DROP INDEX IF EXISTS idx_notifications_user_parents"))
@@ -0,0 +1,32 @@
+"""add_notification_post_id
+
+Revision ID: c3d7a9e1f4b2
+Revises: b8e3f1c6d2a9
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+revision = "c3d7a9e1f4b2"
+down_revision = "b8e3f1c6d2a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Indexed copy of data->>'post_id' so deleting a post's notifications
+    # no longer scans every notification.
+    op.add_column("notifications", sa.Column("post_id", sa.String(), nullable=True))
+    op.execute(text("""
+        UPDATE notifications SET post_id = data->>'post_id'
+        WHERE data IS NOT NULL AND data->>'post_id' IS NOT NULL
+    """))
+    op.create_index("ix_notifications_post_id", "notifications", ["post_id"])
+
+
+def downgrade():
+    op.drop_index("ix_notifications_post_id", table_name="notifications")
+    op.drop_column("notifications", "post_id")
@@ -0,0 +1,24 @@
+"""add_user_deletion_claimed_at
+
+Revision ID: d8a2f4c6e1b3
+Revises: c3d7a9e1f4b2
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d8a2f4c6e1b3"
+down_revision = "c3d7a9e1f4b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lease on a deletion_pending account, so only one worker runs its deletion
+    op.add_column("users", sa.Column("deletion_claimed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "deletion_claimed_at")
@@ -0,0 +1,49 @@
+"""add_post_engagement_stats
+
+Revision ID: e1a7c3f92b04
+Revises: b7f2a6c9d1e3
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+revision = "e1a7c3f92b04"
+down_revision = "b7f2a6c9d1e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "post_engagement_stats",
+        sa.Column("post_id", sa.String(), nullable=False),
+        sa.Column("reactions_distinct_users", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("reactions_distinct_codes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("post_id"),
+    )
+
+    # Backfill from existing post-level reactions.
+    op.execute(text(
+        """
+        INSERT INTO post_engagement_stats
+            (post_id, reactions_distinct_users, reactions_distinct_codes, updated_at)
+        SELECT post_id,
+               COUNT(DISTINCT user_id),
+               COUNT(DISTINCT emoji_code),
+               CURRENT_TIMESTAMP
+        FROM emoji_reactions
+        WHERE object_type = 'post'
+          AND post_id IN (SELECT id FROM posts)
+        GROUP BY post_id
+        """
+    ))
+
+
+def downgrade():
+    op.drop_table("post_engagement_stats")
@@ -0,0 +1,37 @@
+"""add_feed_candidate_window_indexes
+
+Revision ID: f3b8d1e6a5c2
+Revises: e1a7c3f92b04
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+
+revision = "f3b8d1e6a5c2"
+down_revision = "e1a7c3f92b04"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Top-N engagement slices of the bounded feed candidate window.
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_posts_comments_count_active "
+        "ON posts (comments_count DESC) WHERE deleted_at IS NULL"
+    ))
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_posts_shares_count_active "
+        "ON posts (shares_count DESC) WHERE deleted_at IS NULL"
+    ))
+    op.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_post_engagement_stats_users "
+        "ON post_engagement_stats (reactions_distinct_users DESC)"
+    ))
+
+
+def downgrade():
+    op.execute(text("DROP INDEX IF EXISTS idx_post_engagement_stats_users"))
+    op.execute(text("DROP INDEX IF EXISTS idx_posts_shares_count_active"))
+    op.execute(text("DROP INDEX IF EXISTS idx_posts_comments_count_active"))
@@ -8,6 +8,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 from app.core.database import get_db
+from app.core.dependencies import get_current_user_id
 from app.services.auth_service import AuthService
 from app.core.responses import success_response, AuthResponse, build_auth_response
 from app.core.security_audit import log_login_success, log_login_failure, SecurityAuditor, SecurityEventType
@@ -469,6 +470,27 @@ async def logout(
     return success_response(result, getattr(request.state, 'request_id', None))
 
 
+@router.post("/logout-all")
+async def logout_all(
+    request: Request,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke every session of the current user."""
+    auth_service = AuthService(db)
+    result = await auth_service.logout_all(current_user_id)
+
+    SecurityAuditor.log_security_event(
+        event_type=SecurityEventType.LOGOUT,
+        request=request,
+        user_id=current_user_id,
+        details={"all_sessions": True},
+        severity="INFO"
+    )
+
+    return success_response(result, getattr(request.state, 'request_id', None))
+
+
 @router.post("/refresh", response_model=AuthResponse)
 async def refresh_token(
     refresh_request: RefreshTokenRequest,
@@ -3,7 +3,7 @@ API endpoints for comments and replies.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Request, Query
+from fastapi import APIRouter, Depends, Request, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from app.core.database import get_db
@@ -189,7 +189,11 @@ async def create_reply(
 async def get_post_comments(
     post_id: str,
     request: Request,
+    response: Response,
     include_replies: bool = Query(False, description="Whether to include replies (default: False for performance)"),
+    include_reactions: bool = Query(False, description="Whether to include each comment's reaction summary"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Maximum number of top-level comments (default: all)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
     current_user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -198,32 +202,28 @@ async def get_post_comments(
     
     - **post_id**: ID of the post to get comments for
     - **include_replies**: Whether to include replies (default: False for performance optimization)
+    - **include_reactions**: Whether to include reaction summaries (as /posts/{post_id}/comment-reactions returns them)
+    - **limit** / **cursor**: Page through top-level comments of long threads
     
     Returns a list of comments with user information.
     By default, replies are NOT included and should be fetched separately via /comments/{comment_id}/replies.
+    When a limited page is full, the X-Next-Cursor response header carries the cursor for the next page.
     """
     comment_service = CommentService(db)
     
     # Get comments (without replies by default for performance)
-    comments = await comment_service.get_post_comments(
+    comments, next_cursor = await comment_service.get_post_comments_page(
         post_id=post_id,
-        include_replies=include_replies
+        include_replies=include_replies,
+        current_user_id=current_user_id if include_reactions else None,
+        limit=limit,
+        cursor=cursor
     )
     
-    # Add reply_count and is_reply flags to each comment
-    from sqlalchemy import select, func
-    from app.models.comment import Comment
-    
     for comment in comments:
-        # Count replies for this comment
-        reply_count_query = select(func.count(Comment.id)).where(
-            Comment.parent_comment_id == comment['id']
-        )
-        result = await db.execute(reply_count_query)
-        reply_count = result.scalar() or 0
-        
-        comment['reply_count'] = reply_count
         comment['is_reply'] = False
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     logger.info(
         f"Retrieved {len(comments)} comments for post {post_id}",
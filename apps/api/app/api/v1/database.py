@@ -11,6 +11,7 @@ from app.core.database_backup import backup_manager
 from app.core.migration_manager import migration_manager
 from app.core.index_monitor import index_monitor, analyze_database_indexes
 from app.core.query_monitor import get_query_performance_report
+from app.core.sql_profiler import sql_profiler
 from app.core.responses import success_response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -67,9 +68,11 @@ async def get_performance_report():
     Get query performance report.
     
     Returns detailed query performance metrics including slow queries,
-    execution times, and performance trends.
+    execution times, and performance trends, plus per-route SQL statement
+    profiles and budget violations from the request profiler.
     """
     performance_data = get_query_performance_report()
+    performance_data["sql_profile"] = sql_profiler.get_stats()
     return success_response(performance_data)
 
 
@@ -14,6 +14,15 @@ from app.core.dependencies import get_current_user_id
 from app.core.monitoring_dashboard import monitoring_dashboard
 from app.core.uptime_monitoring import uptime_monitor
 from app.core.error_alerting import alert_manager
+from app.core.image_pipeline import image_pipeline
+from app.core.notification_pipeline import notification_pipeline
+from app.core.notification_rate_limiter import notification_rate_limiter
+from app.core.password_hashing import password_hasher
+from app.core.pool_metrics import pool_metrics
+from app.core.principal_cache import principal_cache
+from app.core.rate_limiting import get_rate_limiter
+from app.core.structured_logging import get_logging_stats
+from app.services.user_deletion_service import account_deletion_jobs
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -225,6 +234,86 @@ async def get_performance_metrics(
         ) from e
 
 
+@router.get("/monitoring/image-pipeline")
+async def get_image_pipeline_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get image processing pool status.
+    
+    Returns:
+        Dict containing queue depth, running renders and per-stage timings
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **image_pipeline.get_stats()
+    }
+
+
+@router.get("/monitoring/principal-cache")
+async def get_principal_cache_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get authenticated-principal cache counters.
+    
+    Returns:
+        Dict containing entry count, hits, misses and invalidations
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **principal_cache.get_stats()
+    }
+
+
+@router.get("/monitoring/password-hashing")
+async def get_password_hashing_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get password hashing pool status.
+    
+    Returns:
+        Dict containing queue depth, rejections and hash timings
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **password_hasher.get_stats()
+    }
+
+
+@router.get("/monitoring/notification-pipeline")
+async def get_notification_pipeline_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get write-behind notification pipeline status.
+    
+    Returns:
+        Dict containing queue depth, flush counts and group sizes
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **notification_pipeline.get_stats()
+    }
+
+
+@router.get("/monitoring/notification-rate-limit")
+async def get_notification_rate_limit_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get notification rate limiter counters.
+    
+    Returns:
+        Dict containing allowed/rejected counts and window store size
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **notification_rate_limiter.get_stats()
+    }
+
+
 @router.post("/monitoring/alerts/{alert_id}/resolve")
 async def resolve_alert(
     alert_id: str,
@@ -342,4 +431,56 @@ def _determine_overall_status(current_metrics: Dict[str, Any], active_incidents:
     if metrics_status in ["error", "degraded"]:
         return "degraded"
     
-    return "healthy"
\ No newline at end of file
+    return "healthy"
+
+
+@router.get("/monitoring/account-deletions")
+async def get_account_deletion_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get background account deletion progress.
+    
+    Returns:
+        Dict containing queue depth, completed/failed counts and each tracked
+        job's phase and tombstoned post count
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **account_deletion_jobs.get_stats()
+    }
+
+
+@router.get("/monitoring/db-pool")
+async def get_db_pool_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get connection pool metrics and logging queue state.
+    
+    Returns:
+        Dict containing checkout counts, sampled wait time/in-use/overflow
+        and the background logging queue depth
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **pool_metrics.get_stats(),
+        "logging": get_logging_stats()
+    }
+
+
+@router.get("/monitoring/rate-limiter")
+async def get_rate_limiter_stats(
+    current_user_id: int = Depends(get_current_user_id)
+) -> Dict[str, Any]:
+    """
+    Get API rate limiter backend statistics.
+    
+    Returns:
+        Dict containing the backend in use, tracked (identity, endpoint)
+        windows and expiry/eviction or store error counts
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **get_rate_limiter().get_stats()
+    }
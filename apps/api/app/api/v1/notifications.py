@@ -3,9 +3,9 @@ API endpoints for notifications.
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field, ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -156,9 +156,11 @@ async def resolve_notification_user(db: AsyncSession, notification_data: dict) -
 
 @router.get("/notifications", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     current_user_id: int = Depends(get_authenticated_user_id),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     unread_only: bool = Query(False),
     db: AsyncSession = Depends(get_db)
 ):
@@ -166,19 +168,33 @@ async def get_notifications(
     Get notifications for the current user.
     
     - **limit**: Maximum number of notifications to return (1-100)
-    - **offset**: Number of notifications to skip
+    - **offset**: Number of notifications to skip; ignored when cursor is given
+    - **cursor**: X-Next-Cursor header of the previous page; prefer it to offset
     - **unread_only**: If true, only return unread notifications
     
-    Returns a list of notifications with metadata.
+    Returns a list of notifications with metadata. When the page is full the
+    X-Next-Cursor response header carries the cursor for the next page.
     """
+    if cursor:
+        try:
+            NotificationService.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
     try:
         notifications = await NotificationService.get_user_notifications(
             db=db,
             user_id=current_user_id,
             limit=limit,
             offset=offset,
-            unread_only=unread_only
+            unread_only=unread_only,
+            cursor=cursor
         )
+        if len(notifications) == limit:
+            response.headers["X-Next-Cursor"] = NotificationService.encode_cursor(notifications[-1])
         
         response_notifications = []
         
@@ -286,18 +302,11 @@ async def get_notification_summary(
     """
     Get notification summary for the current user.
     
-    Returns unread count and total count.
+    Returns unread count and total count (total is capped at 1000).
     """
     try:
         unread_count = await NotificationService.get_unread_count(db=db, user_id=current_user_id)
-        
-        # Get total count by fetching all notifications (we can optimize this later)
-        all_notifications = await NotificationService.get_user_notifications(
-            db=db, 
-            user_id=current_user_id, 
-            limit=1000  # Large limit to get all
-        )
-        total_count = len(all_notifications)
+        total_count = await NotificationService.count_user_notifications(db=db, user_id=current_user_id)
         
         return NotificationSummary(
             unread_count=unread_count,
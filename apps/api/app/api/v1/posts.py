@@ -377,48 +377,40 @@ async def _save_post_images(
         )
 
     file_service = FileUploadService(db)
-    post_images = []
 
-    for position, file in enumerate(files):
-        try:
+    try:
+        for file in files:
             # Reset file pointer
             await file.seek(0)
 
-            # Generate variants (thumbnail, medium, original)
-            variant_result = await file_service.save_post_image_variants(
-                file=file,
-                position=position,
-                force_upload=force_upload,
-                uploader_id=uploader_id,
-            )
-
-            # Create PostImage record
-            post_image = PostImage(
-                post_id=post_id,
-                position=variant_result['position'],
-                thumbnail_url=variant_result['thumbnail_url'],
-                medium_url=variant_result['medium_url'],
-                original_url=variant_result['original_url'],
-                width=variant_result.get('width'),
-                height=variant_result.get('height'),
-                file_size=variant_result.get('file_size')
-            )
-
-            post_images.append(post_image)
-
-        except Exception as e:
-            logger.error(f"Error processing image at position {position}: {e}")
-            # Clean up any already-created variants
-            for img in post_images:
-                file_service.cleanup_post_image_variants(
-                    img.thumbnail_url, img.medium_url, img.original_url
-                )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to process image: {str(e)}"
-            ) from e
+        # Generate variants (thumbnail, medium, original) for every image;
+        # uploads run concurrently and are removed again if any image fails
+        variant_results = await file_service.save_post_images_variants(
+            files,
+            force_upload=force_upload,
+            uploader_id=uploader_id,
+        )
+    except Exception as e:
+        logger.error(f"Error processing post images: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process image: {str(e)}"
+        ) from e
 
-    return post_images
+    # Create PostImage records
+    return [
+        PostImage(
+            post_id=post_id,
+            position=variant_result['position'],
+            thumbnail_url=variant_result['thumbnail_url'],
+            medium_url=variant_result['medium_url'],
+            original_url=variant_result['original_url'],
+            width=variant_result.get('width'),
+            height=variant_result.get('height'),
+            file_size=variant_result.get('file_size')
+        )
+        for variant_result in variant_results
+    ]
 
 
 def _serialize_post_images(images) -> List[Dict[str, Any]]:
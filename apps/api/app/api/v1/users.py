@@ -4,7 +4,7 @@ User profile endpoints.
 
 import logging
 from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, Depends, Request, UploadFile, File, Form, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 import re
@@ -14,7 +14,7 @@ from app.services.user_service import UserService
 from app.services.mention_service import MentionService
 from app.services.profile_photo_service import ProfilePhotoService
 from app.core.responses import success_response
-from app.core.security import verify_password
+from app.core.password_hashing import password_hasher
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -220,13 +220,29 @@ async def update_my_profile(
 async def delete_my_account(
     deletion_request: AccountDeletionRequest,
     request: Request,
+    response: Response,
     current_user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete the authenticated user's account using tombstone cleanup."""
-    from app.services.user_deletion_service import UserDeletionService
+    """
+    Delete the authenticated user's account using tombstone cleanup.
 
-    result = await UserDeletionService(db).delete_user(
+    When background deletion is running the account is marked
+    deletion_pending and queued, and the response is 202 with the job's
+    progress; otherwise the deletion completes before the response.
+    """
+    from app.services.user_deletion_service import UserDeletionService, account_deletion_jobs
+
+    service = UserDeletionService(db)
+    if account_deletion_jobs.running:
+        result = await service.request_deletion(current_user_id, deletion_request.confirmation)
+        progress = account_deletion_jobs.submit(current_user_id)
+        if progress is not None:
+            response.status_code = 202
+            result["deletion_job"] = progress.to_dict()
+            return success_response(result, getattr(request.state, 'request_id', None))
+
+    result = await service.delete_user(
         current_user_id,
         deletion_request.confirmation,
     )
@@ -678,7 +694,7 @@ async def change_password(
         )
 
     # Verify the current password
-    if not verify_password(password_request.current_password, user.hashed_password):
+    if not await password_hasher.verify(password_request.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect current password"
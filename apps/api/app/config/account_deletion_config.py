@@ -0,0 +1,19 @@
+"""Account deletion configuration constants."""
+
+import os
+
+# --- Background deletion ---
+# Off when TESTING=true so tests see the account deleted as soon as the request returns
+ACCOUNT_DELETION_BACKGROUND = os.getenv(
+    "ACCOUNT_DELETION_BACKGROUND",
+    "false" if os.getenv("TESTING", "false").lower() == "true" else "true",
+).lower() == "true"
+ACCOUNT_DELETION_POST_BATCH_SIZE = int(os.getenv("ACCOUNT_DELETION_POST_BATCH_SIZE", "500"))  # posts tombstoned per transaction
+ACCOUNT_DELETION_MAX_TRACKED_JOBS = int(os.getenv("ACCOUNT_DELETION_MAX_TRACKED_JOBS", "1000"))  # jobs kept for progress reporting
+
+# --- Claims and retries (several workers share the pending accounts) ---
+ACCOUNT_DELETION_CLAIM_LEASE_SECONDS = float(os.getenv("ACCOUNT_DELETION_CLAIM_LEASE_SECONDS", "900"))  # renewed every post batch
+ACCOUNT_DELETION_RETRY_BASE_SECONDS = float(os.getenv("ACCOUNT_DELETION_RETRY_BASE_SECONDS", "30"))  # doubled per failed attempt
+ACCOUNT_DELETION_MAX_RETRY_SECONDS = float(os.getenv("ACCOUNT_DELETION_MAX_RETRY_SECONDS", "900"))
+ACCOUNT_DELETION_MAX_ATTEMPTS = int(os.getenv("ACCOUNT_DELETION_MAX_ATTEMPTS", "5"))  # per process before the job is reported failed
+ACCOUNT_DELETION_RESCAN_SECONDS = float(os.getenv("ACCOUNT_DELETION_RESCAN_SECONDS", "300"))  # look for unclaimed or expired pending accounts
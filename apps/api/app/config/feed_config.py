@@ -4,8 +4,14 @@
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 50
 CANDIDATE_MULTIPLIER = 3  # fetch page_size * N candidates for spacing diversity
+CANDIDATE_SLICE_LIMIT = 500  # rows per engagement slice in the bounded candidate window
 CURSOR_VERSION = 2
 
+# --- Cursor page cache ---
+FEED_CACHE_TTL_SECONDS = 600  # lifetime of a cached ranked ordering
+FEED_CACHE_MAX_ENTRIES = 2048  # LRU capacity of the in-process backend
+FEED_CACHE_DEPTH_PAGES = 5  # pages of candidates ranked per cached snapshot
+
 # --- Recency ---
 RECENCY_WINDOW_SECONDS = 604_800  # 7 days
 RECENCY_MAX = 10.0
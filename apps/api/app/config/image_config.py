@@ -44,6 +44,28 @@ class ImageVariantConfig:
     jpeg_quality: int = 85
 
 
+@dataclass
+class ImagePipelineConfig:
+    """
+    Configuration for the off-event-loop image processing pool.
+
+    Environment variables:
+    - IMAGE_PIPELINE_WORKERS: Worker processes (default: CPU count, max 4; 0 = one thread)
+    - IMAGE_PIPELINE_MAX_PENDING: Renders queued or running before uploads wait (default: 4 per worker)
+    - IMAGE_PIPELINE_QUEUE_TIMEOUT_SECONDS: How long an upload waits for a slot before 503 (default: 30)
+    """
+    workers: int = 2
+    max_pending: int = 8
+    queue_timeout_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "ImagePipelineConfig":
+        workers = int(os.getenv("IMAGE_PIPELINE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        max_pending = int(os.getenv("IMAGE_PIPELINE_MAX_PENDING", str(max(1, workers) * 4)))
+        queue_timeout = float(os.getenv("IMAGE_PIPELINE_QUEUE_TIMEOUT_SECONDS", "30"))
+        return cls(workers=max(0, workers), max_pending=max(1, max_pending), queue_timeout_seconds=queue_timeout)
+
+
 @dataclass
 class MultiImageConfig:
     """
@@ -134,6 +156,16 @@ def get_variant_config() -> ImageVariantConfig:
     return get_image_config().variants
 
 
+def get_pipeline_config() -> ImagePipelineConfig:
+    """
+    Get image processing pool configuration.
+
+    Returns:
+        ImagePipelineConfig: Worker count and queue bounds
+    """
+    return ImagePipelineConfig.from_env()
+
+
 def reload_image_config() -> None:
     """Reload the image configuration (useful for testing)."""
     global _config
@@ -0,0 +1,15 @@
+"""Notification pipeline configuration constants."""
+
+import os
+
+# --- Write-behind pipeline ---
+# Off when TESTING=true so tests see notifications as soon as the request returns
+NOTIFICATION_WRITE_BEHIND = os.getenv(
+    "NOTIFICATION_WRITE_BEHIND",
+    "false" if os.getenv("TESTING", "false").lower() == "true" else "true",
+).lower() == "true"
+NOTIFICATION_FLUSH_INTERVAL_SECONDS = float(os.getenv("NOTIFICATION_FLUSH_INTERVAL_SECONDS", "0.25"))  # coalescing window
+NOTIFICATION_MAX_PENDING = int(os.getenv("NOTIFICATION_MAX_PENDING", "10000"))  # queued events before callers write inline
+
+# --- Rate limiting ---
+NOTIFICATION_RATE_LIMIT_MAX_KEYS = int(os.getenv("NOTIFICATION_RATE_LIMIT_MAX_KEYS", "50000"))  # (recipient, type) windows kept per process
@@ -0,0 +1,11 @@
+"""Logging pipeline and connection pool metrics configuration constants."""
+
+import os
+
+# --- Logging ---
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"  # format/write logs on a background thread
+LOG_QUEUE_MAX_SIZE = int(os.getenv("LOG_QUEUE_MAX_SIZE", "10000"))  # buffered records before new ones are dropped
+
+# --- Connection pool metrics ---
+DB_POOL_METRICS_SAMPLE_EVERY = int(os.getenv("DB_POOL_METRICS_SAMPLE_EVERY", "10"))  # checkouts per recorded sample
+DB_POOL_METRICS_MAX_SAMPLES = int(os.getenv("DB_POOL_METRICS_MAX_SAMPLES", "1024"))  # samples kept for percentiles
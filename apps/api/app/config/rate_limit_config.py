@@ -0,0 +1,14 @@
+"""API rate limiting configuration constants."""
+
+import os
+
+# --- Backend ---
+# "memory": per-process windows; "sqlite": windows in a file shared by every
+# worker on the host (RATE_LIMIT_SQLITE_PATH must be on a local filesystem)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.sqlite3")
+RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS", "100"))  # wait for another worker's write
+
+# --- Sliding windows ---
+RATE_LIMIT_SUBWINDOWS = int(os.getenv("RATE_LIMIT_SUBWINDOWS", "60"))  # counters per window; resolution is window / subwindows
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))  # (identity, endpoint) windows kept per process
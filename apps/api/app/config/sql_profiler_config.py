@@ -0,0 +1,23 @@
+"""SQL profiler configuration constants."""
+
+import os
+
+_TESTING = os.getenv("TESTING", "false").lower() == "true"
+
+# --- Request profiling ---
+# On by default under TESTING so statement budgets are checked in CI
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "true" if _TESTING else "false").lower() == "true"
+SQL_PROFILER_MAX_ROUTES = int(os.getenv("SQL_PROFILER_MAX_ROUTES", "500"))  # routes aggregated per process
+SQL_PROFILER_MAX_STATEMENTS_PER_ROUTE = int(os.getenv("SQL_PROFILER_MAX_STATEMENTS_PER_ROUTE", "100"))  # distinct normalized statements per route
+SQL_PROFILER_MAX_CALL_SITES = 5  # call sites kept per normalized statement
+SQL_PROFILER_MAX_VIOLATIONS = 100  # recent budget violations kept for reporting
+
+# --- Statement budgets ---
+# Maximum SQL statements one request may issue, keyed by "METHOD route path".
+# Budgets hold for any page size, so an N+1 query exceeds them.
+SQL_STATEMENT_BUDGETS = {
+    "GET /api/v1/posts/feed": 25,
+    "GET /api/v1/posts/{post_id}/comments": 12,
+    "GET /api/v1/comments/{comment_id}/replies": 10,
+    "GET /api/v1/notifications": 15,
+}
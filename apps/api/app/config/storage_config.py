@@ -0,0 +1,10 @@
+"""Object storage configuration constants."""
+
+import os
+
+# --- S3-compatible client ---
+S3_MAX_CONNECTIONS = int(os.getenv("S3_MAX_CONNECTIONS", "32"))  # pooled HTTP connections to the object store
+S3_TIMEOUT_SECONDS = float(os.getenv("S3_TIMEOUT_SECONDS", "30"))  # per request (connect, read and write)
+
+# --- URL generation ---
+STORAGE_URL_CACHE_SIZE = int(os.getenv("STORAGE_URL_CACHE_SIZE", "10000"))  # stored paths memoized by get_url; 0 disables
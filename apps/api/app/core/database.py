@@ -13,6 +13,8 @@ from sqlalchemy.pool import QueuePool
 from sqlalchemy import event, text
 from fastapi import HTTPException
 
+from app.core.pool_metrics import pool_metrics
+
 logger = logging.getLogger(__name__)
 
 # Database URL from environment
@@ -121,15 +123,8 @@ def receive_before_cursor_execute(conn, cursor, statement, parameters, context,
     count = statement_count_var.get()
     statement_count_var.set(count + 1)
 
-@event.listens_for(engine.sync_engine, "checkout")
-def receive_checkout(dbapi_connection, connection_record, connection_proxy):
-    """Log connection checkout for monitoring."""
-    logger.info(f"Connection checked out from pool. Pool size: {engine.pool.size()}")
-
-@event.listens_for(engine.sync_engine, "checkin")
-def receive_checkin(dbapi_connection, connection_record):
-    """Log connection checkin for monitoring."""
-    logger.info(f"Connection checked in to pool. Pool size: {engine.pool.size()}")
+# Checkouts and checkins are counted and sampled as metrics rather than logged
+pool_metrics.instrument_engine(engine.sync_engine)
 
 async def get_db() -> AsyncSession:
     """
@@ -137,18 +132,15 @@ async def get_db() -> AsyncSession:
     """
     token = statement_count_var.set(0)
     async with async_session() as session:
-        session_id = id(session)
-        logger.info(f"DB session {session_id} created")
         try:
             yield session
         except Exception as e:
             if not isinstance(e, HTTPException):
-                logger.exception(f"Database session {session_id} error: {e}")
+                logger.exception(f"Database session {id(session)} error: {e}")
             await session.rollback()
             raise
         finally:
-            count = statement_count_var.get()
-            logger.info(f"DB session {session_id} closing. Total SQL statements: {count}")
+            logger.debug("DB session closing. Total SQL statements: %s", statement_count_var.get())
             await session.close()
             statement_count_var.reset(token)
 
@@ -191,6 +183,7 @@ async def get_db_health() -> Dict[str, Any]:
             # Add invalid count if available (not all pool types have this)
             if hasattr(pool, 'invalid'):
                 pool_status["invalid"] = pool.invalid()
+            pool_status["metrics"] = pool_metrics.get_stats()
             
             return {
                 "status": "healthy",
@@ -3,6 +3,7 @@ Common dependencies for API endpoints.
 """
 
 import logging
+from typing import Optional
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,32 +11,33 @@ from sqlalchemy import select
 from app.core.exceptions import AuthenticationError
 from app.core.security import decode_token
 from app.core.database import get_db
+from app.core.principal_cache import principal_cache
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-def _token_version_matches(payload, user: User) -> bool:
+def _payload_token_version(payload) -> Optional[int]:
+    """The token_version a token was issued with (0 if absent, None if malformed)."""
     token_version = payload.get("token_version")
     if token_version is None:
         token_version = payload.get("tv")
     if token_version is None:
-        return getattr(user, "token_version", 0) == 0
+        return 0
     try:
-        return int(token_version) == int(getattr(user, "token_version", 0) or 0)
+        return int(token_version)
     except (TypeError, ValueError):
-        return False
+        return None
 
 
-async def get_active_user_from_credentials(
-    auth: HTTPAuthorizationCredentials,
-    db: AsyncSession,
-    token_type: str = "access",
-) -> User:
-    """Decode a token, fetch the user, and enforce active-account state."""
-    payload = decode_token(auth.credentials, token_type=token_type)
-    user_id = int(payload.get("sub"))
+def _token_version_matches(payload, user: User) -> bool:
+    token_version = _payload_token_version(payload)
+    return token_version is not None and token_version == int(getattr(user, "token_version", 0) or 0)
+
+
+async def _load_active_user(payload, user_id: int, db: AsyncSession) -> User:
+    load_started_at = principal_cache.now()
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
@@ -45,9 +47,40 @@ async def get_active_user_from_credentials(
         raise AuthenticationError("User account is inactive")
     if not _token_version_matches(payload, user):
         raise AuthenticationError("Authentication token has been invalidated")
+    principal_cache.store(user_id, int(getattr(user, "token_version", 0) or 0), load_started_at)
     return user
 
 
+async def get_active_user_from_credentials(
+    auth: HTTPAuthorizationCredentials,
+    db: AsyncSession,
+    token_type: str = "access",
+) -> User:
+    """Decode a token, fetch the user, and enforce active-account state."""
+    payload = decode_token(auth.credentials, token_type=token_type)
+    return await _load_active_user(payload, int(payload.get("sub")), db)
+
+
+async def get_active_user_id_from_credentials(
+    auth: HTTPAuthorizationCredentials,
+    db: AsyncSession,
+    token_type: str = "access",
+) -> int:
+    """
+    Like get_active_user_from_credentials, but only returns the user id.
+
+    Answered from the principal cache when the token's user and
+    token_version were recently verified, without touching the database.
+    """
+    payload = decode_token(auth.credentials, token_type=token_type)
+    user_id = int(payload.get("sub"))
+    token_version = _payload_token_version(payload)
+    if token_version is not None and principal_cache.lookup(user_id, token_version):
+        return user_id
+    user = await _load_active_user(payload, user_id, db)
+    return user.id
+
+
 async def get_current_user_id(
     auth: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -73,8 +106,7 @@ async def get_current_user_id(
             return test_user_id
     
     try:
-        user = await get_active_user_from_credentials(auth, db)
-        return user.id
+        return await get_active_user_id_from_credentials(auth, db)
     except Exception as e:
         logger.error(f"Authentication error: {e}")
         raise AuthenticationError("Invalid authentication token")
@@ -0,0 +1,186 @@
+"""
+Server-side cache of ranked feed orderings for cursor pagination.
+
+A feed cursor freezes query_time, so every page of one scroll session is a
+slice of the same ranked ordering. The first page stores that ordering (post
+id, author, score, created_at) under (user, query_time, filter spec); later
+cursor pages slice it instead of re-running the scored query and only
+hydrate the posts they return.
+
+The store is pluggable: InMemoryFeedCacheBackend is a per-process LRU with
+TTL, and anything implementing FeedCacheBackend (e.g. Redis) can replace it
+to share snapshots between workers.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config.feed_config import FEED_CACHE_MAX_ENTRIES, FEED_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Filter spec fields that change the ranked ordering ("params" and "debug"
+# are derived from these).
+_FILTER_KEY_FIELDS = ("type_required", "type_required_any", "type_boost", "date", "author", "keyword")
+
+
+@dataclass
+class FeedRankingSnapshot:
+    """A frozen slice of one ranked feed ordering."""
+    # (post_id, author_id, feed_score, created_at) in feed order
+    entries: List[Tuple[str, int, float, datetime]]
+    # True when the ordering ends here (no posts rank below the last entry)
+    complete: bool
+    created_at: float = field(default_factory=time.time)
+
+    def entries_after(self, post_id: str, score: float) -> Optional[List[Tuple[str, int, float, datetime]]]:
+        """Entries ranked after the cursor post, or None if it is not in this snapshot."""
+        for index, entry in enumerate(self.entries):
+            if entry[0] == post_id:
+                return self.entries[index + 1:] if entry[2] == score else None
+        return None
+
+
+class FeedCacheBackend(ABC):
+    """Key/value store for feed snapshots and post invalidation markers."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the live value for key, or None."""
+
+    @abstractmethod
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the live values for the keys that exist."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        """Store value under key for ttl_seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove key if present."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every key."""
+
+
+class InMemoryFeedCacheBackend(FeedCacheBackend):
+    """Per-process LRU with per-key TTL."""
+
+    def __init__(self, max_entries: int = FEED_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def _live(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._live(key)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self._live(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FeedResultCache:
+    """Ranked-ordering cache for feed cursor pages.
+
+    Snapshots are never trusted blindly: posts deleted or re-scoped after a
+    snapshot was taken leave an invalidation marker, and the feed re-checks
+    deletion and visibility when hydrating a cached page.
+    """
+
+    def __init__(self, backend: Optional[FeedCacheBackend] = None, ttl_seconds: int = FEED_CACHE_TTL_SECONDS):
+        self.backend = backend or InMemoryFeedCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(user_id: int, query_time: datetime, filter_spec: Dict[str, Any]) -> str:
+        """Cache key for one scroll session of one viewer."""
+        filters = json.dumps(
+            {name: filter_spec.get(name) for name in _FILTER_KEY_FIELDS},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha1(filters.encode()).hexdigest()
+        return f"feed:{user_id}:{query_time.isoformat()}:{digest}"
+
+    @staticmethod
+    def _post_marker_key(post_id: str) -> str:
+        return f"feed:invalidated:{post_id}"
+
+    async def get_snapshot(self, key: str) -> Optional[FeedRankingSnapshot]:
+        snapshot = await self.backend.get(key)
+        if snapshot is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return snapshot
+
+    async def store_snapshot(self, key: str, snapshot: FeedRankingSnapshot) -> None:
+        await self.backend.set(key, snapshot, self.ttl_seconds)
+
+    async def discard(self, key: str) -> None:
+        await self.backend.delete(key)
+
+    async def invalidate_post(self, post_id: str) -> None:
+        """Mark a post as changed so snapshots taken before now skip it."""
+        await self.backend.set(self._post_marker_key(post_id), time.time(), self.ttl_seconds)
+
+    async def has_invalidated_posts(self, snapshot: FeedRankingSnapshot, post_ids: Iterable[str]) -> bool:
+        markers = await self.backend.get_many(self._post_marker_key(pid) for pid in post_ids)
+        return any(invalidated_at >= snapshot.created_at for invalidated_at in markers.values())
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Global feed cache instance
+feed_result_cache = FeedResultCache()
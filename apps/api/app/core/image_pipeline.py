@@ -0,0 +1,392 @@
+"""
+Off-event-loop image processing for uploads.
+
+Pillow decoding, LANCZOS resampling and optimized JPEG encoding are CPU-bound
+and hold the GIL, so running them inside an async handler stalls every other
+request on the worker for the duration of an upload. ImagePipeline runs the
+render functions below in a process pool instead.
+
+Submissions are bounded: at most max_pending renders may be queued or running
+per process. Further uploads wait up to queue_timeout for a slot and then fail
+with 503 rather than piling up memory. Queue depth and per-stage timings
+(queue wait, decode, hash, resize, encode) are exposed through get_stats().
+
+The render functions are module-level and take/return plain bytes so they can
+be pickled to worker processes; they must not touch the database or storage.
+
+Post images are rendered by render_post_image in one pass: the upload is
+decoded once at full size, the perceptual hash is taken from that decode (the
+same pixels ImageHashService hashes, so stored hashes stay comparable), and
+the variants are cascaded original -> medium -> thumbnail after a cheap
+integer box reduction of images much larger than the biggest variant.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from app.config.image_config import get_pipeline_config
+from app.core.exceptions import UpstreamServiceError
+
+try:
+    from PIL import Image, ImageDraw, ImageOps
+    import imagehash
+except ImportError:
+    raise ImportError("PIL and imagehash are required. Install with: pip install Pillow imagehash")
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("queue_wait", "decode", "hash", "resize", "encode", "total")
+
+
+class ImageDecodeError(ValueError):
+    """The upload could not be decoded as an image."""
+
+
+@dataclass
+class RenderedVariant:
+    """An encoded JPEG variant and how long each stage took to produce it."""
+    data: bytes
+    width: int
+    height: int
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class RenderedPostImage:
+    """All variants of one post image plus the hash computed while rendering."""
+    # variant name ("thumbnail", "medium", "original") -> encoded JPEG
+    variants: Dict[str, RenderedVariant]
+    perceptual_hash: str
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def normalize_image(image: Image.Image) -> Image.Image:
+    """Flatten transparency onto white, convert to RGB and apply EXIF orientation."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    return ImageOps.exif_transpose(image)
+
+
+def decode_image(content: bytes) -> Image.Image:
+    """Decode and normalize an upload; raises ImageDecodeError if it is not an image."""
+    try:
+        image = Image.open(io.BytesIO(content))
+        image.load()
+        return normalize_image(image)
+    except Exception as e:
+        raise ImageDecodeError(f"Invalid image file: {str(e)}") from e
+
+
+def _reduce_for_width(image: Image.Image, max_width: int) -> Image.Image:
+    """
+    Box-reduce by the largest integer factor that keeps width >= max_width.
+
+    reduce() averages whole pixel blocks, far cheaper than LANCZOS over the
+    full image, and the final LANCZOS pass still starts from at least as
+    many pixels as it keeps.
+    """
+    factor = image.width // max_width
+    if factor < 2:
+        return image
+    return image.reduce(factor)
+
+
+def _fit_width(image: Image.Image, max_width: int, source_size: Tuple[int, int]) -> Image.Image:
+    """Resize to max_width, taking the height from the full-size source's aspect ratio."""
+    if image.width <= max_width:
+        return image
+    new_height = int(source_size[1] * (max_width / source_size[0]))
+    return image.resize((max_width, new_height), Image.Resampling.LANCZOS)
+
+
+def render_post_image(content: bytes, widths: Sequence[Tuple[str, int]], quality: int) -> RenderedPostImage:
+    """
+    Decode a post image once and render every variant from it.
+
+    Args:
+        content: Uploaded file bytes
+        widths: (variant name, max width) pairs, largest first; each variant
+            is resized from the previous one
+        quality: JPEG quality
+
+    Raises:
+        ImageDecodeError: If content is not an image
+    """
+    timings = {"decode": 0.0, "hash": 0.0, "resize": 0.0, "encode": 0.0}
+    started = time.perf_counter()
+    try:
+        image = Image.open(io.BytesIO(content))
+        image.load()
+    except Exception as e:
+        raise ImageDecodeError(f"Invalid image file: {str(e)}") from e
+    decoded = time.perf_counter()
+    timings["decode"] = (decoded - started) * 1000
+
+    # Same input imagehash.phash sees in ImageHashService: the full decode of
+    # the stored pixels, before orientation/flattening. A reduced decode
+    # (e.g. JPEG draft()) shifts the hash by several bits.
+    try:
+        perceptual_hash = str(imagehash.phash(image))
+    except Exception as e:
+        logger.warning(f"Failed to calculate perceptual hash: {e}")
+        perceptual_hash = ""
+    image = normalize_image(image)
+    hashed = time.perf_counter()
+    timings["hash"] = (hashed - decoded) * 1000
+
+    variants: Dict[str, RenderedVariant] = {}
+    # Heights follow the full-size aspect ratio, not the rounded reduction's
+    source_size = image.size
+    current = _reduce_for_width(image, widths[0][1])
+    timings["resize"] += (time.perf_counter() - hashed) * 1000
+    for name, max_width in widths:
+        stage_start = time.perf_counter()
+        current = _fit_width(current, max_width, source_size)
+        resized = time.perf_counter()
+        data = _encode_jpeg(current, quality)
+        encoded = time.perf_counter()
+        timings["resize"] += (resized - stage_start) * 1000
+        timings["encode"] += (encoded - resized) * 1000
+        variants[name] = RenderedVariant(data=data, width=current.width, height=current.height)
+
+    return RenderedPostImage(variants=variants, perceptual_hash=perceptual_hash, timings=timings)
+
+
+def apply_circular_crop(image: Image.Image, crop_data: Dict[str, Any]) -> Image.Image:
+    """
+    Apply circular cropping to an image.
+
+    Args:
+        image: PIL Image to crop
+        crop_data: Dict with 'x', 'y', 'radius' keys
+
+    Returns:
+        Circularly cropped PIL Image (the input image if cropping fails)
+    """
+    try:
+        x = float(crop_data.get('x', 0))
+        y = float(crop_data.get('y', 0))
+        radius = float(crop_data.get('radius', 100))
+
+        # Calculate crop bounds
+        left = max(0, int(x - radius))
+        top = max(0, int(y - radius))
+        right = min(image.width, int(x + radius))
+        bottom = min(image.height, int(y + radius))
+
+        # Crop to square containing the circle
+        crop_size = int(radius * 2)
+        cropped = image.crop((left, top, right, bottom))
+
+        # Resize to exact crop size if needed
+        if cropped.size != (crop_size, crop_size):
+            cropped = cropped.resize((crop_size, crop_size), Image.Resampling.LANCZOS)
+
+        # Create circular mask
+        mask = Image.new('L', (crop_size, crop_size), 0)
+        draw = ImageDraw.Draw(mask)
+        draw.ellipse((0, 0, crop_size, crop_size), fill=255)
+
+        # Apply circular mask
+        result = Image.new('RGBA', (crop_size, crop_size), (0, 0, 0, 0))
+        result.paste(cropped, (0, 0))
+        result.putalpha(mask)
+
+        return result
+
+    except Exception as e:
+        logger.warning(f"Failed to apply circular crop: {e}")
+        return image
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def render_boxed_variant(
+    content: bytes,
+    size: Tuple[int, int],
+    quality: int,
+    crop_data: Optional[Dict[str, Any]] = None,
+) -> RenderedVariant:
+    """
+    Decode content and encode it as a JPEG of exactly size.
+
+    The image is fitted inside the box (aspect preserved) and centered on
+    white. With crop_data it is first cut to a circle.
+    """
+    started = time.perf_counter()
+    image = decode_image(content)
+    decoded = time.perf_counter()
+
+    width, height = size
+    if crop_data:
+        image = apply_circular_crop(image, crop_data)
+    resized_image = image.copy()
+    resized_image.thumbnail((width, height), Image.Resampling.LANCZOS)
+    x = (width - resized_image.width) // 2
+    y = (height - resized_image.height) // 2
+
+    if crop_data:
+        # Center on a transparent canvas, then flatten onto white for JPEG
+        final_image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        final_image.paste(resized_image, (x, y))
+        background = Image.new('RGB', final_image.size, (255, 255, 255))
+        background.paste(final_image, mask=final_image.split()[-1])
+        final_image = background
+    else:
+        final_image = Image.new('RGB', (width, height), (255, 255, 255))
+        final_image.paste(resized_image, (x, y))
+    resized = time.perf_counter()
+
+    data = _encode_jpeg(final_image, quality)
+    encoded = time.perf_counter()
+    return RenderedVariant(
+        data=data,
+        width=final_image.width,
+        height=final_image.height,
+        timings={
+            "decode": (decoded - started) * 1000,
+            "resize": (resized - decoded) * 1000,
+            "encode": (encoded - resized) * 1000,
+        },
+    )
+
+
+class ImagePipeline:
+    """Bounded process pool for image render functions."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        config = get_pipeline_config()
+        self.max_workers = config.workers if max_workers is None else max_workers
+        self.max_pending = config.max_pending if max_pending is None else max_pending
+        self.queue_timeout = config.queue_timeout_seconds if queue_timeout is None else queue_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._rejected = 0
+        self._stage_totals: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self._stage_max: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self._completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.max_workers > 0:
+                # spawn: forking a process that runs an event loop and DB
+                # driver threads is not safe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                # Still off the event loop, but shares the GIL with it.
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-pipeline")
+            logger.info(
+                f"Image pipeline started: workers={self.max_workers}, max_pending={self.max_pending}"
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, fn: Callable[..., RenderedVariant], *args) -> RenderedVariant:
+        """
+        Run a render function off the event loop.
+
+        Raises:
+            UpstreamServiceError: If no slot frees up within queue_timeout (503)
+        """
+        slots = self._get_slots()
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            logger.warning(f"Image pipeline saturated: {self._waiting} waiting, {self._running} running")
+            raise UpstreamServiceError(
+                "Image processing is busy, please retry shortly",
+                "image_pipeline",
+                status_code=503,
+            )
+        finally:
+            self._waiting -= 1
+
+        started = time.perf_counter()
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM on a huge image); start a fresh pool.
+                logger.error("Image pipeline worker pool broke; restarting it")
+                self._executor = None
+                raise
+        finally:
+            self._running -= 1
+            slots.release()
+
+        finished = time.perf_counter()
+        self._record({
+            **result.timings,
+            "queue_wait": (started - queued) * 1000,
+            "total": (finished - queued) * 1000,
+        })
+        return result
+
+    def _record(self, timings: Dict[str, float]) -> None:
+        self._completed += 1
+        for stage, elapsed in timings.items():
+            if stage in self._stage_totals:
+                self._stage_totals[stage] += elapsed
+                self._stage_max[stage] = max(self._stage_max[stage], elapsed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "stages_ms": {
+                stage: {
+                    "mean": round(self._stage_totals[stage] / self._completed, 3) if self._completed else 0.0,
+                    "max": round(self._stage_max[stage], 3),
+                }
+                for stage in STAGES
+            },
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+image_pipeline = ImagePipeline()
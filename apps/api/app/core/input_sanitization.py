@@ -8,9 +8,9 @@ import html
 import json
 import logging
 from typing import Any, Dict, List, Optional, Union
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
 from starlette.datastructures import FormData
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.constants import POST_MAX_LENGTH
 import bleach
 
@@ -452,7 +452,7 @@ class InputSanitizer:
         return filename
 
 
-class InputSanitizationMiddleware(BaseHTTPMiddleware):
+class InputSanitizationMiddleware:
     """
     Middleware to automatically sanitize user input.
     """
@@ -497,26 +497,32 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
         '/openapi.json'
     }
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.sanitizer = InputSanitizer()
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Sanitize request data before processing."""
+        if scope["type"] == "http":
+            self._prepare(Request(scope))
+        await self.app(scope, receive, send)
+    
+    def _prepare(self, request: Request) -> None:
+        """Attach the sanitization mappings for this endpoint to request.state."""
         # Skip sanitization during regular testing but NOT during security tests
         # Security tests need sanitization to be active to test it properly
         if (os.getenv('TESTING') == 'true' and 
             os.getenv('SECURITY_TESTING') != 'true' and
             os.getenv('PYTEST_CURRENT_TEST') is not None):
-            return await call_next(request)
+            return
         
         # Skip sanitization for certain endpoints
         if any(request.url.path.startswith(skip) for skip in self.SKIP_ENDPOINTS):
-            return await call_next(request)
+            return
         
         # Only sanitize POST, PUT, PATCH requests with data
         if request.method not in ['POST', 'PUT', 'PATCH']:
-            return await call_next(request)
+            return
         
         # Store field mappings in request state for endpoints to use
         # This approach avoids consuming the request body in middleware
@@ -534,8 +540,6 @@ class InputSanitizationMiddleware(BaseHTTPMiddleware):
                     "mappings": list(field_mappings.keys())
                 }
             )
-        
-        return await call_next(request)
     
     def _get_field_mappings(self, path: str) -> Dict[str, str]:
         """Get field mappings for endpoint path."""
@@ -1,38 +1,82 @@
 """
 Middleware for request/response validation and error handling.
+
+The application middlewares are plain ASGI callables rather than Starlette
+BaseHTTPMiddleware subclasses. BaseHTTPMiddleware runs every downstream app
+in its own task, bridges the response through memory streams and re-wraps it
+as a StreamingResponse, once per layer; with the stack in main.py that cost
+is paid several times before a handler runs. A raw ASGI middleware only
+wraps ``send`` when it needs to touch the response headers.
 """
 
 import logging
 import uuid
 from typing import Callable
-from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.exceptions import BaseAPIException
 from app.core.responses import error_response
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+def on_response_start(send: Send, hook: Callable[[Message], None]) -> Send:
+    """
+    Wrap send so hook sees the http.response.start message before it is sent.
+
+    The hook may edit the response headers in place through
+    ``MutableHeaders(scope=message)``.
+    """
+    async def wrapped_send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            hook(message)
+        await send(message)
+
+    return wrapped_send
+
+
+def set_request_state(scope: Scope, name: str, value) -> None:
+    """Equivalent of ``request.state.<name> = value`` without building a Request."""
+    scope.setdefault("state", {})[name] = value
+
+
+class ErrorHandlingMiddleware:
     """Middleware for standardized error handling."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and handle errors."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate request ID
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        set_request_state(scope, "request_id", request_id)
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
+            return
         except BaseAPIException as exc:
+            if response_started:
+                raise
             # Handle custom API exceptions
             logger.warning(
                 f"API Exception: {exc.error_code} - {exc.detail}",
                 extra={"request_id": request_id, "details": exc.details}
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=exc.status_code,
                 content=error_response(
                     error_code=exc.error_code,
@@ -42,13 +86,15 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 )
             )
         except Exception as exc:
+            if response_started:
+                raise
             # Handle unexpected exceptions
             logger.error(
                 f"Unexpected error: {str(exc)}",
                 extra={"request_id": request_id},
                 exc_info=True
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content=error_response(
                     error_code="internal_error",
@@ -56,15 +102,24 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                     request_id=request_id
                 )
             )
+        await response(scope, receive, send)
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """Middleware for request validation and logging."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with validation and logging."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-        
+
         # Log incoming request
         logger.info(
             f"Incoming request: {request.method} {request.url.path}",
@@ -76,15 +131,14 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             }
         )
 
-        response = await call_next(request)
-
-        # Log response
-        logger.info(
-            f"Response: {response.status_code}",
-            extra={
-                "request_id": request_id,
-                "status_code": response.status_code
-            }
-        )
+        def log_response(message: Message) -> None:
+            # Log response
+            logger.info(
+                f"Response: {message['status']}",
+                extra={
+                    "request_id": request_id,
+                    "status_code": message["status"]
+                }
+            )
 
-        return response
\ No newline at end of file
+        await self.app(scope, receive, on_response_start(send, log_response))
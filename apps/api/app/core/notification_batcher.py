@@ -84,6 +84,165 @@ class NotificationBatcher:
     ) -> str:
         """Generate standardized batch key."""
         return f"{notification_type}:{batch_scope}:{target_id}"
+
+    def resolve_batch_key(
+        self,
+        notification: Notification,
+        batch_config: Optional[BatchConfig]
+    ) -> Optional[str]:
+        """Batch key for a notification under batch_config, or None if it is not batched."""
+        if not batch_config:
+            return None
+        
+        if batch_config.batch_scope == "post":
+            target_id = notification.data.get("post_id")
+            if not target_id:
+                return None
+        elif batch_config.batch_scope == "user":
+            target_id = str(notification.user_id)
+        else:
+            return None
+        
+        return self.generate_batch_key(
+            notification.type, 
+            target_id, 
+            batch_config.batch_scope
+        )
+    
+    async def apply_batch_group(
+        self,
+        notifications: List[Notification],
+        batch_config: BatchConfig
+    ) -> None:
+        """
+        Write several notifications for one recipient and batch key at once.
+        
+        Leaves the same rows as calling create_or_update_batch for each
+        notification in order, but with one lookup and without committing;
+        the caller commits. Every notification must have batch_key set.
+        
+        Args:
+            notifications: Notifications sharing user_id and batch_key, oldest first
+            batch_config: Batch configuration for their type
+        """
+        first = notifications[0]
+        existing_batch = await self.notification_repo.find_existing_batch(
+            first.user_id,
+            first.batch_key,
+            batch_config.max_age_hours
+        )
+        existing_single = None
+        if existing_batch is None:
+            existing_single = await self.notification_repo.find_existing_single_notification(
+                first.user_id,
+                first.batch_key,
+                max_age_hours=1  # Only convert recent single notifications
+            )
+        await self._apply_group(notifications, batch_config, existing_batch, existing_single)
+    
+    async def apply_recipient_groups(
+        self,
+        notifications: List[Notification],
+        batch_config: BatchConfig
+    ) -> None:
+        """
+        Write one notification for each of several recipients of one batch key.
+        
+        Leaves the same rows as apply_batch_group per recipient, but finds the
+        existing batches and singles of every recipient with one query; the
+        caller commits. Every notification must have batch_key set.
+        
+        Args:
+            notifications: Notifications sharing batch_key, at most one per user_id
+            batch_config: Batch configuration for their type
+        """
+        if not notifications:
+            return
+        batches, singles = await self.notification_repo.find_batch_parents_for_users(
+            [notification.user_id for notification in notifications],
+            notifications[0].batch_key,
+            batch_config.max_age_hours,
+            single_max_age_hours=1  # Only convert recent single notifications
+        )
+        for notification in notifications:
+            await self._apply_group(
+                [notification],
+                batch_config,
+                batches.get(notification.user_id),
+                None if notification.user_id in batches else singles.get(notification.user_id)
+            )
+    
+    async def _apply_group(
+        self,
+        notifications: List[Notification],
+        batch_config: BatchConfig,
+        existing_batch: Optional[Notification],
+        existing_single: Optional[Notification]
+    ) -> None:
+        """apply_batch_group once the recipient's existing batch and single are known."""
+        if existing_batch:
+            existing_batch.batch_count += len(notifications)
+            existing_batch.title, existing_batch.message = self._group_summary(
+                existing_batch, existing_batch.batch_count, batch_config
+            )
+            existing_batch.last_updated_at = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            existing_batch.read = False
+            existing_batch.read_at = None
+            self.db.add(existing_batch)
+            self._add_children(existing_batch, notifications)
+            return
+        
+        first = notifications[0]
+        if existing_single is None:
+            # The first notification is created single, the next ones convert it
+            self.db.add(first)
+            if len(notifications) == 1:
+                return
+            existing_single, notifications = first, notifications[1:]
+        
+        count = len(notifications) + 1
+        title, message = self._group_summary(existing_single, count, batch_config)
+        batch_notification = Notification(
+            user_id=existing_single.user_id,
+            type=self._batch_type(existing_single),
+            title=title,
+            message=message,
+            data=existing_single.data,  # Use same data as the original for context
+            batch_key=existing_single.batch_key,
+            is_batch=True,
+            batch_count=count,
+            last_updated_at=datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+        )
+        self.db.add(batch_notification)
+        # Insert the batch before rows that reference it
+        await self.db.flush()
+        
+        existing_single.parent_id = batch_notification.id
+        self.db.add(existing_single)
+        self._add_children(batch_notification, notifications)
+    
+    def _add_children(self, batch_notification: Notification, notifications: List[Notification]) -> None:
+        for notification in notifications:
+            # Children are stored without a batch key, like create_or_update_batch does
+            notification.batch_key = None
+            notification.parent_id = batch_notification.id
+            self.db.add(notification)
+        logger.info(
+            f"Added {len(notifications)} notifications to batch {batch_notification.id}, "
+            f"now has {batch_notification.batch_count} items"
+        )
+    
+    def _batch_type(self, existing_notification: Notification) -> str:
+        """Type of the batch notification created from existing_notification."""
+        return existing_notification.type
+    
+    def _group_summary(
+        self,
+        notification: Notification,
+        count: int,
+        batch_config: BatchConfig
+    ) -> tuple[str, str]:
+        return self._generate_batch_summary(notification, count, batch_config)
     
     async def create_or_update_batch(
         self,
@@ -102,28 +261,11 @@ class NotificationBatcher:
         """
         if batch_config is None:
             batch_config = BATCH_CONFIGS.get(notification.type)
-            
-        if not batch_config:
-            # No batching config, create as single notification
-            return await self._create_single_notification(notification)
         
-        # Generate batch key based on configuration
-        if batch_config.batch_scope == "post":
-            target_id = notification.data.get("post_id")
-            if not target_id:
-                # No post_id, create as single notification
-                return await self._create_single_notification(notification)
-        elif batch_config.batch_scope == "user":
-            target_id = str(notification.user_id)
-        else:
-            # Unknown scope, create as single notification
+        batch_key = self.resolve_batch_key(notification, batch_config)
+        if batch_key is None:
+            # No batching config, post_id or known scope: create as single notification
             return await self._create_single_notification(notification)
-        
-        batch_key = self.generate_batch_key(
-            notification.type, 
-            target_id, 
-            batch_config.batch_scope
-        )
         notification.batch_key = batch_key
         
         # Check for existing batch
@@ -282,6 +424,42 @@ class PostInteractionBatcher(NotificationBatcher):
         target_data: Optional[dict] = None
     ) -> Optional[Notification]:
         """Create a reaction notification with unified batching."""
+        notification = self.build_interaction_notification(
+            notification_type, post_id, user_id, actor_data, target_data
+        )
+        batch_key = notification.batch_key
+        
+        # Check for existing combined batch
+        existing_batch = await self.notification_repo.find_existing_batch(
+            notification.user_id, 
+            batch_key, 
+            24  # 24 hour window for batching
+        )
+        
+        if existing_batch:
+            return await self._add_to_combined_batch(existing_batch, notification)
+        
+        # Check for existing single notification of any interaction type to convert to batch
+        existing_single = await self._find_existing_interaction_notification(
+            notification.user_id, 
+            post_id
+        )
+        
+        if existing_single:
+            return await self._convert_to_combined_batch(existing_single, notification)
+        
+        # Create new single notification
+        return await self._create_single_notification(notification)
+    
+    def build_interaction_notification(
+        self,
+        notification_type: str,  # Supported: "emoji_reaction"
+        post_id: str,
+        user_id: int,
+        actor_data: dict,
+        target_data: Optional[dict] = None
+    ) -> Notification:
+        """Build a reaction notification carrying the unified post_interaction batch key."""
         
         # Validate interaction type
         if notification_type not in ("emoji_reaction", "like", "react"):
@@ -322,30 +500,19 @@ class PostInteractionBatcher(NotificationBatcher):
         
         # Use unified batch key for all post interactions from the start
         # Future object-level batching may split this as post_interaction:post:{post_id}:object:{object_id}.
-        batch_key = self.generate_batch_key("post_interaction", post_id, "post")
-        notification.batch_key = batch_key
-        
-        # Check for existing combined batch
-        existing_batch = await self.notification_repo.find_existing_batch(
-            notification.user_id, 
-            batch_key, 
-            24  # 24 hour window for batching
-        )
-        
-        if existing_batch:
-            return await self._add_to_combined_batch(existing_batch, notification)
-        
-        # Check for existing single notification of any interaction type to convert to batch
-        existing_single = await self._find_existing_interaction_notification(
-            notification.user_id, 
-            post_id
-        )
-        
-        if existing_single:
-            return await self._convert_to_combined_batch(existing_single, notification)
-        
-        # Create new single notification
-        return await self._create_single_notification(notification)
+        notification.batch_key = self.generate_batch_key("post_interaction", post_id, "post")
+        return notification
+    
+    def _batch_type(self, existing_notification: Notification) -> str:
+        return "post_interaction"  # Use combined type
+    
+    def _group_summary(
+        self,
+        notification: Notification,
+        count: int,
+        batch_config: BatchConfig
+    ) -> tuple[str, str]:
+        return self._generate_combined_batch_summary(count, notification.data or {})
     
     async def _create_combined_interaction_batch(
         self,
@@ -519,6 +686,19 @@ class UserInteractionBatcher(NotificationBatcher):
         actor_data: dict
     ) -> Optional[Notification]:
         """Create user-directed notification with batching."""
+        notification = self.build_user_notification(notification_type, target_user_id, actor_data)
+        
+        # Use user-based batching configuration
+        batch_config = BATCH_CONFIGS.get("follow")
+        return await self.create_or_update_batch(notification, batch_config)
+    
+    def build_user_notification(
+        self,
+        notification_type: str,  # "follow"
+        target_user_id: int,
+        actor_data: dict
+    ) -> Notification:
+        """Build a user-directed notification (no batch key yet)."""
         
         if notification_type == "follow":
             notification = Notification(
@@ -536,6 +716,5 @@ class UserInteractionBatcher(NotificationBatcher):
         else:
             raise ValueError(f"Unsupported user interaction type: {notification_type}")
         
-        # Use user-based batching configuration
-        batch_config = BATCH_CONFIGS.get("follow")
-        return await self.create_or_update_batch(notification, batch_config)
+        return notification
+
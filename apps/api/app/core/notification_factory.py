@@ -4,13 +4,26 @@ Notification Factory - Centralized notification creation with generic batching s
 This factory eliminates the need for developers to remember notification creation patterns
 and prevents static/instance method conflicts that cause notifications to fail silently.
 Now includes generic batching system for all notification types.
+
+While the write-behind NotificationPipeline is running, batched notifications
+are queued to it instead of being written inside the caller's request; the
+convenience methods then return None. Like the inline path, queueing commits
+the caller's session, and the notification is only queued once that commit
+succeeds.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.notification_repository import NotificationRepository
-from app.core.notification_batcher import NotificationBatcher, PostInteractionBatcher, UserInteractionBatcher
+from app.core.notification_batcher import BATCH_CONFIGS, NotificationBatcher, PostInteractionBatcher, UserInteractionBatcher
+from app.core.notification_pipeline import (
+    KIND_BATCHED,
+    KIND_POST_INTERACTION,
+    KIND_SINGLE,
+    NotificationPipeline,
+    notification_pipeline,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +40,49 @@ class NotificationFactory:
     5. Implements generic batching for all notification types
     """
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, pipeline: Optional[NotificationPipeline] = None):
         self.db = db
         self.notification_repo = NotificationRepository(db)
         self.batcher = NotificationBatcher(db)
         self.post_interaction_batcher = PostInteractionBatcher(db)
         self.user_interaction_batcher = UserInteractionBatcher(db)
+        self.pipeline = pipeline or notification_pipeline
+    
+    def _defer_batched(self, notification: Any, config_name: Optional[str] = None) -> bool:
+        """Hold a notification for write-behind batching until the session commits."""
+        if not self.pipeline.running:
+            return False
+        batch_config = BATCH_CONFIGS.get(config_name or notification.type)
+        batch_key = self.batcher.resolve_batch_key(notification, batch_config)
+        if batch_key is None:
+            return self.pipeline.submit_after_commit(self.db, notification, KIND_SINGLE)
+        notification.batch_key = batch_key
+        return self.pipeline.submit_after_commit(self.db, notification, KIND_BATCHED, config_name)
+    
+    async def _enqueue_batched(self, notification: Any, config_name: Optional[str] = None) -> bool:
+        """Queue a notification for write-behind batching; False means write it inline."""
+        if not self._defer_batched(notification, config_name):
+            return False
+        await self._commit_deferred()
+        logger.debug(f"Queued {notification.type} notification for user {notification.user_id}")
+        return True
+    
+    async def _enqueue(self, notification: Any, kind: str) -> bool:
+        """Queue a notification that already has its batch key; False means write it inline."""
+        if not self.pipeline.submit_after_commit(self.db, notification, kind):
+            return False
+        await self._commit_deferred()
+        logger.debug(f"Queued {notification.type} notification for user {notification.user_id}")
+        return True
+    
+    async def _commit_deferred(self) -> None:
+        """Commit the caller's session; deferred notifications are queued once it succeeds."""
+        try:
+            await self.db.commit()
+        except Exception:
+            # Drops the deferred notifications along with the caller's work
+            await self.db.rollback()
+            raise
     
     async def create_notification(
         self,
@@ -117,6 +167,9 @@ class NotificationFactory:
                 }
             )
             
+            if await self._enqueue_batched(notification):
+                return None
+            
             # Use generic batcher for share notifications
             result = await self.batcher.create_or_update_batch(notification)
             
@@ -156,6 +209,9 @@ class NotificationFactory:
                 }
             )
             
+            if await self._enqueue_batched(notification):
+                return None
+            
             # Use generic batcher for mention notifications
             result = await self.batcher.create_or_update_batch(notification)
             
@@ -166,6 +222,73 @@ class NotificationFactory:
             logger.error(f"Failed to create mention notification for user {mentioned_user_id}: {e}")
             return None
     
+    async def create_mention_notifications(
+        self,
+        mentioned_user_ids: List[int],
+        author_username: str,
+        author_id: int,
+        post_id: str
+    ) -> int:
+        """
+        Create mention notifications for everyone mentioned in one post.
+        
+        Same rows as create_mention_notification per user, but written with
+        one batch lookup and one commit however many users are mentioned.
+        
+        Returns:
+            int: Number of notifications created or queued
+        """
+        recipient_ids = [
+            user_id for user_id in dict.fromkeys(mentioned_user_ids) if user_id != author_id
+        ]
+        if not recipient_ids:
+            return 0
+        
+        from app.models.notification import Notification
+        notifications = [
+            Notification(
+                user_id=user_id,
+                type='mention',
+                title='You were mentioned',
+                message='mentioned you in a post',
+                data={
+                    'post_id': post_id,
+                    'author_username': author_username,
+                    'actor_user_id': str(author_id),
+                    'actor_username': author_username
+                }
+            )
+            for user_id in recipient_ids
+        ]
+        
+        if self.pipeline.running:
+            inline = [n for n in notifications if not self._defer_batched(n)]
+            if len(inline) < len(notifications):
+                try:
+                    await self._commit_deferred()
+                except Exception as e:
+                    logger.error(f"Failed to queue mention notifications for post {post_id}: {e}")
+                    return 0
+        else:
+            inline = notifications
+        if not inline:
+            return len(notifications)
+        
+        try:
+            batch_config = BATCH_CONFIGS['mention']
+            batch_key = self.batcher.resolve_batch_key(inline[0], batch_config)
+            for notification in inline:
+                notification.batch_key = batch_key
+            await self.batcher.apply_recipient_groups(inline, batch_config)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to create mention notifications for post {post_id}: {e}")
+            return len(notifications) - len(inline)
+        
+        logger.info(f"Created {len(inline)} mention notifications for post {post_id}")
+        return len(notifications)
+    
     async def create_reaction_notification(
         self,
         post_author_id: int,
@@ -184,8 +307,7 @@ class NotificationFactory:
             return None
         
         try:
-            # Use the post interaction batcher for emoji reactions
-            result = await self.post_interaction_batcher.create_interaction_notification(
+            interaction = dict(
                 notification_type="emoji_reaction",
                 post_id=post_id,
                 user_id=post_author_id,
@@ -202,6 +324,13 @@ class NotificationFactory:
                     **({"thumbnail_url": thumbnail_url} if thumbnail_url else {})
                 }
             )
+            if self.pipeline.running:
+                notification = self.post_interaction_batcher.build_interaction_notification(**interaction)
+                if await self._enqueue(notification, KIND_POST_INTERACTION):
+                    return None
+            
+            # Use the post interaction batcher for emoji reactions
+            result = await self.post_interaction_batcher.create_interaction_notification(**interaction)
             
             logger.info(f"Created emoji_reaction notification for user {post_author_id}")
             return result
@@ -245,13 +374,19 @@ class NotificationFactory:
                 }
             )
 
+            batch_key = f"emoji_reaction:comment:{comment_id}"
+            if self.pipeline.running:
+                notification.batch_key = batch_key
+                if await self._enqueue(notification, KIND_SINGLE):
+                    return None
+
             result = await self.notification_repo.create(
                 user_id=notification.user_id,
                 type=notification.type,
                 title=notification.title,
                 message=notification.message,
                 data=notification.data,
-                batch_key=f"emoji_reaction:comment:{comment_id}"
+                batch_key=batch_key
             )
 
             logger.info(f"Created comment emoji_reaction notification for user {comment_author_id}")
@@ -291,8 +426,7 @@ class NotificationFactory:
             return None
         
         try:
-            # Use the user interaction batcher for follows
-            result = await self.user_interaction_batcher.create_user_notification(
+            follow = dict(
                 notification_type="follow",
                 target_user_id=followed_user_id,
                 actor_data={
@@ -300,6 +434,13 @@ class NotificationFactory:
                     "username": follower_username
                 }
             )
+            if self.pipeline.running:
+                notification = self.user_interaction_batcher.build_user_notification(**follow)
+                if await self._enqueue_batched(notification, "follow"):
+                    return None
+            
+            # Use the user interaction batcher for follows
+            result = await self.user_interaction_batcher.create_user_notification(**follow)
             
             logger.info(f"Created follow notification for user {followed_user_id}")
             return result
@@ -338,6 +479,9 @@ class NotificationFactory:
                 }
             )
             
+            if await self._enqueue_batched(notification):
+                return None
+            
             # Use generic batcher for comment notifications
             result = await self.batcher.create_or_update_batch(notification)
             
@@ -380,6 +524,9 @@ class NotificationFactory:
                 }
             )
             
+            if await self._enqueue_batched(notification):
+                return None
+            
             # Use generic batcher for comment reply notifications
             result = await self.batcher.create_or_update_batch(notification)
             
@@ -0,0 +1,269 @@
+"""
+Write-behind notification delivery.
+
+Creating a batched notification inline costs the request a batch lookup, a
+single-notification lookup, possibly a batch conversion and several
+commits. When the pipeline is running, NotificationFactory hands the built
+Notification to it instead and returns straight away. Notifications are
+queued from the caller's session once its transaction commits, so work that
+is rolled back never produces a notification.
+
+Events are coalesced per (recipient, batch key) for a short window. A
+background task then writes each window in one transaction:
+NotificationBatcher.apply_batch_group turns a burst of N reactions on one
+post into a single batch lookup and one batch update, with the same rows
+that N calls to create_or_update_batch would leave.
+
+Pending events live in process memory. Events still queued when the process
+dies are lost; stop() flushes them on a clean shutdown. If the queue is full
+or the pipeline is not running, submit() returns False and the caller
+writes inline as before.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.notification_config import (
+    NOTIFICATION_FLUSH_INTERVAL_SECONDS,
+    NOTIFICATION_MAX_PENDING,
+)
+from app.core.notification_batcher import BATCH_CONFIGS, NotificationBatcher, PostInteractionBatcher
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+# How a queued notification is written
+KIND_BATCHED = "batched"  # NotificationBatcher rules for its BatchConfig
+KIND_POST_INTERACTION = "post_interaction"  # PostInteractionBatcher combined batches
+KIND_SINGLE = "single"  # plain insert, never batched
+
+# (kind, user_id, batch_key or notification id)
+GroupKey = Tuple[str, int, str]
+
+# Session.info key prefix for notifications waiting on the session's commit
+_AFTER_COMMIT_KEY = "notification_pipeline.after_commit"
+
+# Content copied from a queued notification into the row that is written
+_ROW_COLUMNS = ("user_id", "type", "title", "message", "data", "batch_key")
+
+
+class NotificationPipeline:
+    """Coalescing write-behind queue for batched notifications."""
+
+    def __init__(
+        self,
+        flush_interval: float = NOTIFICATION_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = NOTIFICATION_MAX_PENDING,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._session_factory = session_factory
+        self._after_commit_key = (_AFTER_COMMIT_KEY, id(self))
+        self._pending: "OrderedDict[GroupKey, List[Tuple[Notification, Optional[str]]]]" = OrderedDict()
+        self._pending_count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._groups = 0
+        self._last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, notification: Notification, kind: str, config_name: Optional[str] = None) -> bool:
+        """
+        Queue a notification for the next flush.
+
+        Args:
+            notification: Built notification; KIND_BATCHED and
+                KIND_POST_INTERACTION ones must have batch_key set
+            kind: KIND_BATCHED, KIND_POST_INTERACTION or KIND_SINGLE
+            config_name: BATCH_CONFIGS entry for KIND_BATCHED notifications
+
+        Returns:
+            False if the pipeline is not running or full; write inline then
+        """
+        if not self.running or self._pending_count >= self.max_pending:
+            return False
+        self._queue(notification, kind, config_name)
+        return True
+
+    def submit_after_commit(
+        self, db: AsyncSession, notification: Notification, kind: str, config_name: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a notification when the caller's session next commits.
+
+        The notification is held on the session and dropped if the session
+        rolls back instead. Arguments are those of submit().
+
+        Returns:
+            False if the pipeline is not running or full; write inline then
+        """
+        if not self.running or self._pending_count >= self.max_pending:
+            return False
+        session = db.sync_session
+        deferred = session.info.get(self._after_commit_key)
+        if deferred is None:
+            deferred = session.info[self._after_commit_key] = []
+            event.listen(session, "after_commit", self._on_commit)
+            event.listen(session, "after_rollback", self._on_rollback)
+        deferred.append((notification, kind, config_name))
+        return True
+
+    def _on_commit(self, session) -> None:
+        deferred = session.info.get(self._after_commit_key)
+        while deferred:
+            # Capacity was checked when the notification was deferred
+            self._queue(*deferred.pop(0))
+
+    def _on_rollback(self, session) -> None:
+        deferred = session.info.get(self._after_commit_key)
+        if deferred:
+            logger.debug(f"Discarded {len(deferred)} notifications from a rolled back transaction")
+            deferred.clear()
+
+    def _queue(self, notification: Notification, kind: str, config_name: Optional[str]) -> None:
+        if kind == KIND_SINGLE:
+            group_key = (kind, notification.user_id, str(id(notification)))
+        else:
+            group_key = (kind, notification.user_id, notification.batch_key)
+        self._pending.setdefault(group_key, []).append((notification, config_name))
+        self._pending_count += 1
+        self._submitted += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name="notification-pipeline")
+        logger.info(f"Notification pipeline started: flush_interval={self.flush_interval}s")
+
+    async def stop(self) -> None:
+        """Stop the background task and write whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Coalescing window: let the rest of a burst arrive
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Notification pipeline flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Write every queued notification; returns how many were written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            groups, self._pending = self._pending, OrderedDict()
+            pending_count, self._pending_count = self._pending_count, 0
+
+            started = time.perf_counter()
+            session_factory = self._session_factory or _default_session_factory()
+            async with session_factory() as db:
+                try:
+                    for group_key, entries in groups.items():
+                        await self._write_group(db, group_key, entries)
+                    await db.commit()
+                    written = pending_count
+                except Exception as e:
+                    await db.rollback()
+                    logger.warning(f"Bulk notification flush failed, retrying per group: {e}")
+                    written = await self._write_groups_separately(db, groups)
+
+            self._written += written
+            self._dropped += pending_count - written
+            self._flushes += 1
+            self._groups += len(groups)
+            self._last_flush_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"Flushed {written} notifications in {len(groups)} groups "
+                f"({self._last_flush_ms:.1f}ms)"
+            )
+            return written
+
+    async def _write_groups_separately(self, db, groups) -> int:
+        written = 0
+        for group_key, entries in groups.items():
+            try:
+                await self._write_group(db, group_key, entries)
+                await db.commit()
+                written += len(entries)
+            except Exception as e:
+                await db.rollback()
+                logger.error(
+                    f"Dropped {len(entries)} notifications for user {group_key[1]} "
+                    f"(key {group_key[2]}): {e}"
+                )
+        return written
+
+    async def _write_group(self, db, group_key: GroupKey, entries: List[Tuple[Notification, Optional[str]]]) -> None:
+        kind = group_key[0]
+        # Queued notifications are never added to a session; each attempt
+        # writes new rows, so a retry does not re-add rolled back instances
+        notifications = [_new_row(notification) for notification, _ in entries]
+        if kind == KIND_SINGLE:
+            db.add_all(notifications)
+        elif kind == KIND_POST_INTERACTION:
+            await PostInteractionBatcher(db).apply_batch_group(notifications, BATCH_CONFIGS["post_interaction"])
+        else:
+            config_name = entries[0][1] or notifications[0].type
+            await NotificationBatcher(db).apply_batch_group(notifications, BATCH_CONFIGS[config_name])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "flush_interval_seconds": self.flush_interval,
+            "max_pending": self.max_pending,
+            "queue_depth": self._pending_count,
+            "pending_groups": len(self._pending),
+            "submitted": self._submitted,
+            "written": self._written,
+            "dropped": self._dropped,
+            "flushes": self._flushes,
+            "mean_group_size": round(self._written / self._groups, 3) if self._groups else 0.0,
+            "last_flush_ms": round(self._last_flush_ms, 3),
+        }
+
+
+def _new_row(notification: Notification) -> Notification:
+    """A pending row with the content of a queued notification."""
+    return Notification(**{column: getattr(notification, column) for column in _ROW_COLUMNS})
+
+
+def _default_session_factory():
+    from app.core.database import async_session
+    return async_session
+
+
+# Global instance; started from the app lifespan when NOTIFICATION_WRITE_BEHIND is on
+notification_pipeline = NotificationPipeline()
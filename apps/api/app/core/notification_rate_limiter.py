@@ -0,0 +1,167 @@
+"""
+Per-(recipient, type) notification rate limiting without a COUNT per create.
+
+NotificationService used to COUNT the recipient's notifications of a type
+created in the last hour before every insert. The limiter keeps the same
+answer in memory instead: for each (user_id, type) it holds the creation
+times of at most `limit` recent notifications, oldest first. A create is
+allowed while fewer than `limit` of them fall inside the window, which is
+exactly "fewer than MAX_NOTIFICATIONS_PER_HOUR in the last hour", in O(limit)
+memory per key.
+
+A key the process has not seen yet is seeded from the database with one
+bounded query, so a restart does not reset anyone's budget. Afterwards the
+window only sees creates made through the limiter; notifications written by
+other paths (NotificationFactory) count only through the seed, as they
+never went through the rate limit check before either.
+
+Windows are per process by default. A deployment with several workers can
+install a shared NotificationRateLimitBackend with set_backend().
+"""
+
+import datetime
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from datetime import timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.notification_config import NOTIFICATION_RATE_LIMIT_MAX_KEYS
+from app.repositories.notification_repository import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WINDOW_SECONDS = 3600
+
+# Loads the (epoch second) creation times of a key's recent notifications
+SeedLoader = Callable[[], Awaitable[List[float]]]
+
+
+class NotificationRateLimitBackend(ABC):
+    """Storage for sliding windows; implement acquire() to share them between workers."""
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: int, window_seconds: float, now: float, seed: SeedLoader) -> bool:
+        """
+        Record a create at `now` unless `limit` creates already fall inside the window.
+
+        `seed` is awaited at most once per key the backend does not hold yet.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every window."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class InMemoryRateLimitBackend(NotificationRateLimitBackend):
+    """Per-process LRU of sliding windows."""
+
+    def __init__(self, max_keys: int = NOTIFICATION_RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self.seeds = 0
+        self.evictions = 0
+
+    async def acquire(self, key: str, limit: int, window_seconds: float, now: float, seed: SeedLoader) -> bool:
+        window = self._windows.get(key)
+        if window is None:
+            timestamps = await seed()
+            self.seeds += 1
+            # Another create for this key may have seeded it during the await
+            window = self._windows.get(key)
+            if window is None:
+                window = deque(timestamps[-limit:], maxlen=limit) if limit > 0 else deque(maxlen=0)
+                self._windows[key] = window
+                while len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+                    self.evictions += 1
+        self._windows.move_to_end(key)
+
+        cutoff = now - window_seconds
+        while window and window[0] < cutoff:
+            window.popleft()
+        if len(window) >= limit:
+            return False
+        window.append(now)
+        return True
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._windows),
+            "max_keys": self.max_keys,
+            "seeds": self.seeds,
+            "evictions": self.evictions,
+        }
+
+
+class NotificationRateLimiter:
+    """Sliding-window limit on notifications per (recipient, type)."""
+
+    def __init__(
+        self,
+        backend: Optional[NotificationRateLimitBackend] = None,
+        window_seconds: float = RATE_LIMIT_WINDOW_SECONDS,
+    ):
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.window_seconds = window_seconds
+        self.allowed = 0
+        self.rejected = 0
+
+    def set_backend(self, backend: NotificationRateLimitBackend) -> None:
+        """Swap the window store, e.g. for one shared between workers."""
+        self.backend = backend
+
+    async def acquire(self, db: AsyncSession, user_id: int, notification_type: str, limit: int) -> bool:
+        """
+        Count a notification create against the recipient's limit for its type.
+
+        Args:
+            db: Session used to seed a key the backend does not hold yet
+            user_id: ID of the recipient
+            notification_type: Type of notification
+            limit: Maximum notifications of this type per window
+
+        Returns:
+            bool: True if under the limit (the create is counted), False if exceeded
+        """
+        now = time.time()
+
+        async def seed() -> List[float]:
+            since = datetime.datetime.fromtimestamp(now - self.window_seconds, tz=timezone.utc).replace(tzinfo=None)
+            created = await NotificationRepository(db).get_recent_created_at(
+                user_id, notification_type, since, limit
+            )
+            return [created_at.replace(tzinfo=timezone.utc).timestamp() for created_at in created]
+
+        key = f"{user_id}:{notification_type}"
+        if await self.backend.acquire(key, limit, self.window_seconds, now, seed):
+            self.allowed += 1
+            return True
+        self.rejected += 1
+        logger.info(f"Rate limit exceeded for user {user_id}, type {notification_type}")
+        return False
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "window_seconds": self.window_seconds,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            **self.backend.get_stats(),
+        }
+
+
+# Global instance
+notification_rate_limiter = NotificationRateLimiter()
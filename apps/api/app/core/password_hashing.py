@@ -0,0 +1,155 @@
+"""
+Off-event-loop password hashing.
+
+A bcrypt hash or verify at the configured work factor is a few hundred
+milliseconds of CPU. Run inline in an async handler it stalls every other
+request on the worker, so a burst of logins freezes the whole API.
+PasswordHasher runs pwd_context on a small dedicated thread pool instead;
+the bcrypt backend releases the GIL while it works, so the event loop keeps
+serving other requests.
+
+The pool is bounded: at most max_pending operations may be queued or running
+per process. Beyond that, callers fail fast with 503 instead of queueing
+logins for seconds. Queue depth, rejections and wait/duration timings are
+exposed through get_stats().
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.exceptions import UpstreamServiceError
+from app.core.security import pwd_context
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(1, PASSWORD_HASH_WORKERS) * 8)))
+
+
+class PasswordHasher:
+    """Bounded thread pool for bcrypt hashing and verification."""
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max(1, PASSWORD_HASH_WORKERS if max_workers is None else max_workers)
+        self.max_pending = max(1, PASSWORD_HASH_MAX_PENDING if max_pending is None else max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._duration_total = 0.0
+        self._duration_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+            logger.info(
+                f"Password hashing pool started: workers={self.max_workers}, max_pending={self.max_pending}"
+            )
+        return self._executor
+
+    def _timed(self, submitted: float, fn: Callable, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                wait_ms = (started - submitted) * 1000
+                duration_ms = (finished - started) * 1000
+                self._wait_total += wait_ms
+                self._wait_max = max(self._wait_max, wait_ms)
+                self._duration_total += duration_ms
+                self._duration_max = max(self._duration_max, duration_ms)
+
+    async def _run(self, fn: Callable, *args):
+        """
+        Run fn on the pool.
+
+        Raises:
+            UpstreamServiceError: If max_pending operations are already in flight (503)
+        """
+        if self._in_flight >= self.max_pending:
+            self._rejected += 1
+            logger.warning(f"Password hashing pool saturated: {self._in_flight} in flight")
+            raise UpstreamServiceError(
+                "Authentication is busy, please retry shortly",
+                "password_hashing",
+                status_code=503,
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._timed, time.perf_counter(), fn, *args
+            )
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured work factor."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it if its hash is out of policy.
+
+        Returns:
+            (valid, new_hash): new_hash is set when the password is valid but
+            was hashed with a different work factor; the caller stores it.
+        """
+        valid, new_hash = await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+        if valid and new_hash:
+            self._rehashed += 1
+        return valid, new_hash
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = self._running
+            completed = self._completed
+            wait_total, wait_max = self._wait_total, self._wait_max
+            duration_total, duration_max = self._duration_total, self._duration_max
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "queue_depth": max(0, self._in_flight - running),
+            "running": running,
+            "completed": completed,
+            "rejected": self._rejected,
+            "rehashed": self._rehashed,
+            "queue_wait_ms": {
+                "mean": round(wait_total / completed, 3) if completed else 0.0,
+                "max": round(wait_max, 3),
+            },
+            "duration_ms": {
+                "mean": round(duration_total / completed, 3) if completed else 0.0,
+                "max": round(duration_max, 3),
+            },
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+password_hasher = PasswordHasher()
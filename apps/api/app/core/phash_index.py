@@ -0,0 +1,174 @@
+"""
+In-memory similarity index over 64-bit perceptual hashes.
+
+Near-duplicate detection asks for every stored pHash within a small Hamming
+distance of an upload. Instead of loading every ImageHash row and comparing
+them one by one in Python, the index keeps the hashes packed in a NumPy
+uint64 array and answers a query with one vectorized XOR + popcount pass.
+
+The index is per process. It loads lazily from the database, is updated in
+place by ImageHashService as hashes are stored and deleted, and is reloaded
+after max_age_seconds so writes made by other workers are picked up.
+Callers re-check candidates against the database, so a stale entry can
+only cost a lookup, never a wrong match.
+"""
+
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PHASH_HEX_LENGTH = 16  # 64-bit pHash as produced by imagehash.phash
+
+_INITIAL_CAPACITY = 1024
+
+# Set-bit count of every byte value, for NumPy builds without bitwise_count.
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def parse_phash(value: Optional[str]) -> Optional[int]:
+    """64-bit integer form of a hex pHash, or None if it is not one."""
+    if not value or len(value) != PHASH_HEX_LENGTH:
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+class PerceptualHashIndex:
+    """Packed uint64 pHash array with id bookkeeping and swap-remove deletes."""
+
+    def __init__(self, max_age_seconds: float = 300.0):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._hashes = np.zeros(_INITIAL_CAPACITY, dtype=np.uint64)
+        self._ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._slots: dict = {}
+        self._size = 0
+        self._loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def needs_load(self) -> bool:
+        """True before the first load and once the loaded copy is too old."""
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def load(self, rows: Iterable[Tuple[int, str]]) -> int:
+        """
+        Replace the contents with (id, hex pHash) rows.
+
+        Rows whose hash is not a 64-bit hex string are skipped.
+
+        Returns:
+            Number of hashes indexed
+        """
+        ids: List[int] = []
+        hashes: List[int] = []
+        for image_id, phash in rows:
+            value = parse_phash(phash)
+            if value is not None:
+                ids.append(image_id)
+                hashes.append(value)
+
+        capacity = max(_INITIAL_CAPACITY, len(ids))
+        new_hashes = np.zeros(capacity, dtype=np.uint64)
+        new_ids = np.zeros(capacity, dtype=np.int64)
+        new_hashes[:len(hashes)] = np.array(hashes, dtype=np.uint64)
+        new_ids[:len(ids)] = np.array(ids, dtype=np.int64)
+
+        with self._lock:
+            self._hashes = new_hashes
+            self._ids = new_ids
+            self._slots = {image_id: slot for slot, image_id in enumerate(ids)}
+            self._size = len(ids)
+            self._loaded_at = time.monotonic()
+        logger.debug(f"Loaded {len(ids)} perceptual hashes into the similarity index")
+        return len(ids)
+
+    def add(self, image_id: int, phash: Optional[str]) -> None:
+        """Insert or replace the hash for image_id (ignored until loaded)."""
+        value = parse_phash(phash)
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if value is None:
+                self._remove_locked(image_id)
+                return
+            slot = self._slots.get(image_id)
+            if slot is None:
+                if self._size == len(self._hashes):
+                    self._hashes = np.concatenate([self._hashes, np.zeros_like(self._hashes)])
+                    self._ids = np.concatenate([self._ids, np.zeros_like(self._ids)])
+                slot = self._size
+                self._size += 1
+                self._slots[image_id] = slot
+                self._ids[slot] = image_id
+            self._hashes[slot] = value
+
+    def remove(self, image_id: int) -> None:
+        with self._lock:
+            self._remove_locked(image_id)
+
+    def _remove_locked(self, image_id: int) -> None:
+        slot = self._slots.pop(image_id, None)
+        if slot is None:
+            return
+        last = self._size - 1
+        if slot != last:
+            moved_id = int(self._ids[last])
+            self._ids[slot] = moved_id
+            self._hashes[slot] = self._hashes[last]
+            self._slots[moved_id] = slot
+        self._size = last
+
+    def query(self, phash: str, threshold: int) -> List[Tuple[int, int]]:
+        """
+        Ids within threshold Hamming distance of phash.
+
+        Returns:
+            List of (image_id, distance), closest first
+        """
+        value = parse_phash(phash)
+        if value is None:
+            return []
+        with self._lock:
+            size = self._size
+            hashes = self._hashes[:size]
+            ids = self._ids[:size]
+            distances = _popcount(np.bitwise_xor(hashes, np.uint64(value)))
+            matches = np.flatnonzero(distances <= threshold)
+            match_ids = ids[matches]
+            match_distances = distances[matches]
+        order = np.argsort(match_distances, kind="stable")
+        return [(int(match_ids[i]), int(match_distances[i])) for i in order]
+
+    def clear(self) -> None:
+        """Drop all entries and force a reload on next use."""
+        with self._lock:
+            self._hashes = np.zeros(_INITIAL_CAPACITY, dtype=np.uint64)
+            self._ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+            self._slots = {}
+            self._size = 0
+            self._loaded_at = None
+
+
+# Global instance
+perceptual_hash_index = PerceptualHashIndex()
@@ -0,0 +1,139 @@
+"""
+Connection pool metrics in place of per-checkout log lines.
+
+Every checkout and checkin is counted and the time spent waiting for a
+connection is accumulated; every DB_POOL_METRICS_SAMPLE_EVERY-th checkout
+also records a sample of the wait time, the connections in use and the
+overflow, from which get_stats() reports percentiles. Recording is a few
+arithmetic operations, with no formatting or I/O on the request path.
+
+Wait time is measured by wrapping the pool's connect(), which lives on the
+pool object. Engine.dispose() swaps in a recreated pool, so
+instrument_engine() wraps each replacement as it appears; the event
+listeners carry over on their own. A pool recreated outside
+Engine.dispose() keeps its counters but stops reporting wait times.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from sqlalchemy import event
+
+from app.config.observability_config import DB_POOL_METRICS_MAX_SAMPLES, DB_POOL_METRICS_SAMPLE_EVERY
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+class PoolMetrics:
+    """Counters and sampled gauges for one connection pool."""
+
+    def __init__(
+        self,
+        sample_every: int = DB_POOL_METRICS_SAMPLE_EVERY,
+        max_samples: int = DB_POOL_METRICS_MAX_SAMPLES,
+    ):
+        self.sample_every = max(1, sample_every)
+        self.pool = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        # (wait_ms, in_use, overflow)
+        self._samples: Deque[Tuple[float, int, int]] = deque(maxlen=max_samples)
+
+    def instrument(self, pool) -> None:
+        """Attach to a pool: time its connect() calls and listen to its events."""
+        self._time_connect(pool)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def instrument_engine(self, engine) -> None:
+        """Attach to a sync engine's pool, following it across engine.dispose()."""
+        self.instrument(engine.pool)
+        # Fired once engine.pool is the recreated pool, whose dispatch
+        # already holds the listeners above
+        event.listen(engine, "engine_disposed", lambda disposed: self._time_connect(disposed.pool))
+
+    def _time_connect(self, pool) -> None:
+        self.pool = pool
+        connect = pool.connect
+
+        def timed_connect():
+            start = time.perf_counter()
+            connection = connect()
+            self.record_checkout((time.perf_counter() - start) * 1000)
+            return connection
+
+        # Engine.raw_connection() calls pool.connect(); timing it measures
+        # how long a request waited for a free (or new) connection
+        pool.connect = timed_connect
+
+    def record_checkout(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.wait_ms_total += wait_ms
+        if wait_ms > self.wait_ms_max:
+            self.wait_ms_max = wait_ms
+        if self.checkouts % self.sample_every == 0:
+            self._samples.append((wait_ms, *self._gauges()))
+
+    def _gauges(self) -> Tuple[int, int]:
+        # Only queue pools track overflow
+        if self.pool is None or not hasattr(self.pool, "overflow"):
+            return 0, 0
+        return self.pool.checkedout(), max(0, self.pool.overflow())
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations += 1
+
+    def reset(self) -> None:
+        self.checkouts = self.checkins = self.connects = self.invalidations = 0
+        self.wait_ms_total = self.wait_ms_max = 0.0
+        self._samples.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        waits = sorted(sample[0] for sample in self._samples)
+        in_use = [sample[1] for sample in self._samples]
+        overflow = [sample[2] for sample in self._samples]
+        in_use_now, overflow_now = self._gauges()
+        return {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "in_use": in_use_now,
+            "overflow": overflow_now,
+            "checkout_wait_ms": {
+                "avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "max": round(self.wait_ms_max, 3),
+                "p50": round(_percentile(waits, 50), 3),
+                "p95": round(_percentile(waits, 95), 3),
+                "p99": round(_percentile(waits, 99), 3),
+            },
+            "sampled": {
+                "samples": len(self._samples),
+                "sample_every": self.sample_every,
+                "in_use_max": max(in_use, default=0),
+                "in_use_avg": round(sum(in_use) / len(in_use), 2) if in_use else 0.0,
+                "overflow_max": max(overflow, default=0),
+            },
+        }
+
+
+# Global instance for the application engine's pool (see app.core.database)
+pool_metrics = PoolMetrics()
@@ -0,0 +1,124 @@
+"""
+Short-lived cache of authenticated principals.
+
+Every authenticated request decodes its JWT and then needs to know whether
+the user still exists, is still active and still has the token_version the
+token was issued with. That answer is cached per user for a few seconds as
+(token_version, expiry); a request carrying the cached token_version skips
+the users lookup entirely, any other token_version falls through to the
+database.
+
+Only active principals are cached, and anything that changes a user's
+token_version, account_status or credentials calls invalidate_user(). The
+cache is per process, so another worker can keep accepting a revoked token
+for at most PRINCIPAL_CACHE_TTL_SECONDS.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+class PrincipalCache:
+    """Per-process LRU of (user_id -> token_version) for active users."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # user_id -> (token_version, expires_at)
+        self._entries: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+        # user_id -> monotonic time of the last invalidation, so a lookup
+        # that read the row before a revocation committed cannot re-cache it
+        self._invalidated_at: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def now() -> float:
+        """Clock used for load_started_at in store()."""
+        return time.monotonic()
+
+    def lookup(self, user_id: int, token_version: int) -> bool:
+        """True if user_id is a cached active principal at token_version."""
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            cached_version, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+            elif cached_version == token_version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return True
+        self.misses += 1
+        return False
+
+    def store(self, user_id: int, token_version: int, load_started_at: float) -> None:
+        """Cache an active principal read from the database at load_started_at."""
+        if not self.enabled:
+            return
+        invalidated_at = self._invalidated_at.get(user_id)
+        if invalidated_at is not None and invalidated_at >= load_started_at:
+            return
+        self._entries[user_id] = (token_version, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget user_id; call after revoking tokens or changing account state."""
+        self._entries.pop(user_id, None)
+        self._invalidated_at[user_id] = time.monotonic()
+        self._invalidated_at.move_to_end(user_id)
+        # Older markers can only block stores of lookups that are long finished.
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._invalidated_at:
+            oldest_user, oldest_at = next(iter(self._invalidated_at.items()))
+            if oldest_at >= cutoff and len(self._invalidated_at) <= self.max_entries:
+                break
+            del self._invalidated_at[oldest_user]
+        self.invalidations += 1
+        logger.debug(f"Principal cache invalidated for user {user_id}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._invalidated_at.clear()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(user_id: Optional[int]) -> None:
+    """Drop user_id from the principal cache (no-op for None)."""
+    if user_id is not None:
+        principal_cache.invalidate_user(int(user_id))
@@ -3,10 +3,11 @@ Request ID middleware for tracking requests across the application.
 """
 
 import time
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.middleware import set_request_state
 from app.core.structured_logging import (
     generate_request_id, 
     set_request_id, 
@@ -15,17 +16,22 @@ from app.core.structured_logging import (
 )
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Middleware that adds a unique request ID to each request and logs request/response.
     """
     
-    def __init__(self, app, header_name: str = "X-Request-ID"):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID"):
+        self.app = app
         self.header_name = header_name
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with request ID tracking and logging."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         
         # Generate or extract request ID
         request_id = request.headers.get(self.header_name)
@@ -34,7 +40,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         
         # Set request ID in context and request state
         set_request_id(request_id)
-        request.state.request_id = request_id
+        set_request_state(scope, "request_id", request_id)
         
         # Extract client information
         client_ip = self._get_client_ip(request)
@@ -45,37 +51,29 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         
         # Log request start
         start_time = time.time()
+        path = str(request.url.path)
         request_logger.log_request_start(
             method=request.method,
-            path=str(request.url.path),
+            path=path,
             request_id=request_id,
             client_ip=client_ip,
             user_agent=user_agent,
             user_id=user_id
         )
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            response_time_ms = (time.time() - start_time) * 1000
-            
-            # Add request ID to response headers
-            response.headers[self.header_name] = request_id
-            
-            # Log request completion
-            request_logger.log_request_end(
-                method=request.method,
-                path=str(request.url.path),
-                request_id=request_id,
-                status_code=response.status_code,
-                response_time_ms=response_time_ms,
-                user_id=user_id
-            )
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Calculate response time for failed requests
             response_time_ms = (time.time() - start_time) * 1000
@@ -83,7 +81,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             # Log request failure
             request_logger.log_request_end(
                 method=request.method,
-                path=str(request.url.path),
+                path=path,
                 request_id=request_id,
                 status_code=500,
                 response_time_ms=response_time_ms,
@@ -93,6 +91,19 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             
             # Re-raise the exception
             raise
+
+        # Calculate response time
+        response_time_ms = (time.time() - start_time) * 1000
+        
+        # Log request completion
+        request_logger.log_request_end(
+            method=request.method,
+            path=path,
+            request_id=request_id,
+            status_code=status_code,
+            response_time_ms=response_time_ms,
+            user_id=user_id
+        )
     
     def _get_client_ip(self, request: Request) -> str:
         """
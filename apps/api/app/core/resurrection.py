@@ -20,7 +20,8 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ConflictError
-from app.core.security import get_password_hash
+from app.core.principal_cache import invalidate_principal
+from app.core.password_hashing import password_hasher
 from app.models.deleted_user_auth_identity import DeletedUserAuthIdentity
 from app.models.user import User
 
@@ -163,11 +164,12 @@ async def resurrect_password_user(
     # Atomic resurrection mutation
     user.email = email
     user.username = username
-    user.hashed_password = get_password_hash(password)
+    user.hashed_password = await password_hasher.hash(password)
     user.account_status = "active"
     user.deleted_at = None
     user.deletion_source = None
     user.token_version = (user.token_version or 0) + 1
+    invalidate_principal(user.id)
 
     db.add(user)
     await db.flush()
@@ -230,6 +232,7 @@ async def resurrect_oauth_user(
     user.deleted_at = None
     user.deletion_source = None
     user.token_version = (user.token_version or 0) + 1
+    invalidate_principal(user.id)
 
     if oauth_user_info:
         oauth_data = user.oauth_data or {}
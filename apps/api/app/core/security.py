@@ -56,11 +56,15 @@ def _validate_production_security():
 # Validate security configuration on module load
 _validate_production_security()
 
-# Password hashing with stronger configuration
+# Password hashing with stronger configuration. Hashes made with any other
+# work factor are flagged by needs_update() and rehashed on the next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 pwd_context = CryptContext(
     schemes=["bcrypt"], 
     deprecated="auto",
-    bcrypt__rounds=12  # Increased rounds for better security
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
 )
 
 
@@ -299,6 +303,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
     
+    Blocks for the full bcrypt cost; request handlers should await
+    password_hasher.verify() from app.core.password_hashing instead.
+    
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password from database
@@ -313,6 +320,9 @@ def get_password_hash(password: str) -> str:
     """
     Hash a password.
     
+    Blocks for the full bcrypt cost; request handlers should await
+    password_hasher.hash() from app.core.password_hashing instead.
+    
     Args:
         password: Plain text password
         
@@ -172,7 +172,7 @@ class SecurityConfig:
                     "X-Requested-With",
                     "X-Request-ID"
                 ],
-                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-Next-Cursor"],
                 "max_age": 86400,  # 24 hours
             }
         elif self.is_development:
@@ -182,7 +182,7 @@ class SecurityConfig:
                 "allow_credentials": True,  # Allow credentials for development
                 "allow_methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
                 "allow_headers": ["*"],  # Allow all headers in development
-                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-Next-Cursor"],
                 "max_age": 86400,  # 24 hours
             }
         else:
@@ -200,7 +200,7 @@ class SecurityConfig:
                     "X-Requested-With",
                     "X-Request-ID"
                 ],
-                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+                "expose_headers": ["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "X-Next-Cursor"],
                 "max_age": 86400,  # 24 hours
             }
     
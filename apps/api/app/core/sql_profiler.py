@@ -0,0 +1,322 @@
+"""
+Request-scoped SQL profiling with per-route aggregation and statement budgets.
+
+While a request is profiled, every statement sent to the database is
+recorded with its normalized text (literals and parameter lists collapsed,
+so the same query with different values is one entry), its duration and the
+application frame that issued it. When the request finishes the profile is
+folded into per-route statistics keyed by "METHOD route path", and compared
+with the route's budget in SQL_STATEMENT_BUDGETS. Violations are logged and
+kept for the tests, which fail on them (see tests/conftest.py), so an N+1
+regression breaks CI instead of reaching production.
+
+The report is served by /api/v1/database/performance.
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.sql_profiler_config import (
+    SQL_PROFILER_ENABLED,
+    SQL_PROFILER_MAX_CALL_SITES,
+    SQL_PROFILER_MAX_ROUTES,
+    SQL_PROFILER_MAX_STATEMENTS_PER_ROUTE,
+    SQL_PROFILER_MAX_VIOLATIONS,
+    SQL_STATEMENT_BUDGETS,
+)
+
+try:
+    from greenlet import getcurrent
+except ImportError:  # pragma: no cover - installed with SQLAlchemy's asyncio extra
+    getcurrent = None
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_DIR = os.path.dirname(_APP_DIR)
+# Frames that only forward statements; the call site is their caller
+_FORWARDING_FILES = frozenset(
+    os.path.join(_APP_DIR, "core", name)
+    for name in ("sql_profiler.py", "database.py", "query_monitor.py", "repository_base.py")
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|\?")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """Collapse a statement's literals, parameters and IN/VALUES lists to '?'."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAMETER_LIST.sub("(?)", normalized)
+    normalized = _REPEATED_GROUPS.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _first_app_frame(frame) -> Optional[str]:
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _FORWARDING_FILES:
+            path = os.path.relpath(filename, _PROJECT_DIR)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _call_site() -> Optional[str]:
+    """The application frame that issued the statement being executed."""
+    site = _first_app_frame(sys._getframe(2))
+    if site is None and getcurrent is not None:
+        # AsyncSession runs the driver call in a greenlet; the awaiting
+        # coroutine is on the stack of the greenlet that spawned it
+        parent = getcurrent().parent
+        if parent is not None:
+            site = _first_app_frame(parent.gr_frame)
+    return site
+
+
+class StatementRecord:
+    """One statement executed during a profiled request."""
+
+    __slots__ = ("statement", "duration_ms", "call_site")
+
+    def __init__(self, statement: str, duration_ms: float, call_site: Optional[str]):
+        self.statement = statement
+        self.duration_ms = duration_ms
+        self.call_site = call_site
+
+
+class RequestProfile:
+    """Statements executed while one request (or profile() block) was active."""
+
+    def __init__(self):
+        self.statements: List[StatementRecord] = []
+
+    @property
+    def statement_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(record.duration_ms for record in self.statements)
+
+    def top_statements(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most repeated normalized statements, the usual sign of an N+1."""
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for record in self.statements:
+            entry = grouped.setdefault(record.statement, {"statement": record.statement, "count": 0, "call_site": record.call_site})
+            entry["count"] += 1
+        return sorted(grouped.values(), key=lambda entry: entry["count"], reverse=True)[:limit]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_request_profile", default=None)
+
+
+class _RouteStats:
+    def __init__(self, budget: Optional[int]):
+        self.budget = budget
+        self.requests = 0
+        self.statements = 0
+        self.max_statements = 0
+        self.sql_ms = 0.0
+        self.violations = 0
+        self.dropped_statements = 0
+        self.by_statement: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, profile: RequestProfile, max_statements: int) -> None:
+        self.requests += 1
+        self.statements += profile.statement_count
+        self.max_statements = max(self.max_statements, profile.statement_count)
+        for record in profile.statements:
+            self.sql_ms += record.duration_ms
+            entry = self.by_statement.get(record.statement)
+            if entry is None:
+                if len(self.by_statement) >= max_statements:
+                    self.dropped_statements += 1
+                    continue
+                entry = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "call_sites": []}
+                self.by_statement[record.statement] = entry
+            entry["count"] += 1
+            entry["total_ms"] += record.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], record.duration_ms)
+            sites = entry["call_sites"]
+            if record.call_site and record.call_site not in sites and len(sites) < SQL_PROFILER_MAX_CALL_SITES:
+                sites.append(record.call_site)
+
+    def to_dict(self, top: int) -> Dict[str, Any]:
+        statements = sorted(self.by_statement.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "requests": self.requests,
+            "budget": self.budget,
+            "budget_violations": self.violations,
+            "avg_statements": round(self.statements / self.requests, 2) if self.requests else 0,
+            "max_statements": self.max_statements,
+            "total_sql_ms": round(self.sql_ms, 3),
+            "avg_sql_ms": round(self.sql_ms / self.requests, 3) if self.requests else 0,
+            "dropped_statements": self.dropped_statements,
+            "top_statements": [
+                {
+                    "statement": statement,
+                    "count": entry["count"],
+                    "per_request": round(entry["count"] / self.requests, 2) if self.requests else 0,
+                    "total_ms": round(entry["total_ms"], 3),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "call_sites": list(entry["call_sites"]),
+                }
+                for statement, entry in statements[:top]
+            ],
+        }
+
+
+class SQLProfiler:
+    """Per-route SQL statistics and statement budgets for profiled requests."""
+
+    def __init__(
+        self,
+        enabled: bool = SQL_PROFILER_ENABLED,
+        budgets: Optional[Dict[str, int]] = None,
+        max_routes: int = SQL_PROFILER_MAX_ROUTES,
+        max_statements_per_route: int = SQL_PROFILER_MAX_STATEMENTS_PER_ROUTE,
+    ):
+        self.enabled = enabled
+        self.budgets = dict(SQL_STATEMENT_BUDGETS if budgets is None else budgets)
+        self.max_routes = max_routes
+        self.max_statements_per_route = max_statements_per_route
+        self._routes: "OrderedDict[str, _RouteStats]" = OrderedDict()
+        self._violations: deque = deque(maxlen=SQL_PROFILER_MAX_VIOLATIONS)
+        self.requests_profiled = 0
+        self.evictions = 0
+
+    @contextmanager
+    def profile(self) -> Iterator[RequestProfile]:
+        """Record the statements executed inside the block, whether or not the profiler is enabled."""
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+
+    def finish_request(self, route_key: str, profile: RequestProfile, request_id: Optional[str] = None) -> None:
+        """Fold a finished request into its route's statistics and check its budget."""
+        self.requests_profiled += 1
+        stats = self._routes.get(route_key)
+        if stats is None:
+            stats = _RouteStats(self.budgets.get(route_key))
+            self._routes[route_key] = stats
+            while len(self._routes) > self.max_routes:
+                self._routes.popitem(last=False)
+                self.evictions += 1
+        self._routes.move_to_end(route_key)
+        stats.add(profile, self.max_statements_per_route)
+
+        budget = stats.budget
+        if budget is not None and profile.statement_count > budget:
+            stats.violations += 1
+            violation = {
+                "route": route_key,
+                "statements": profile.statement_count,
+                "budget": budget,
+                "request_id": request_id,
+                "top_statements": profile.top_statements(),
+            }
+            self._violations.append(violation)
+            logger.warning(
+                f"SQL statement budget exceeded for {route_key}: "
+                f"{profile.statement_count} statements, budget {budget}"
+            )
+
+    def take_violations(self) -> List[Dict[str, Any]]:
+        """Return and forget the budget violations recorded so far."""
+        violations = list(self._violations)
+        self._violations.clear()
+        return violations
+
+    def clear(self) -> None:
+        self._routes.clear()
+        self._violations.clear()
+        self.requests_profiled = 0
+        self.evictions = 0
+
+    def get_stats(self, top: int = 10) -> Dict[str, Any]:
+        routes = sorted(self._routes.items(), key=lambda item: item[1].sql_ms, reverse=True)
+        return {
+            "enabled": self.enabled,
+            "requests_profiled": self.requests_profiled,
+            "routes_tracked": len(self._routes),
+            "max_routes": self.max_routes,
+            "evictions": self.evictions,
+            "budgets": dict(self.budgets),
+            "recent_budget_violations": list(self._violations),
+            "routes": {key: stats.to_dict(top) for key, stats in routes},
+        }
+
+
+def _route_key(scope: Scope) -> str:
+    # APIRoute.matches stores the matched route in the scope; unmatched paths
+    # share one key so scans cannot grow the route table
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope['method']} {path}"
+
+
+class SQLProfilerMiddleware:
+    """Profile each HTTP request's SQL when the profiler is enabled."""
+
+    def __init__(self, app: ASGIApp, profiler: Optional[SQLProfiler] = None):
+        self.app = app
+        self.profiler = profiler or sql_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile() as profile:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                request_id = scope.get("state", {}).get("request_id")
+                self.profiler.finish_request(_route_key(scope), profile, request_id)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _profile_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        context._sql_profiler_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _profile_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    start = getattr(context, "_sql_profiler_start", None)
+    if profile is None or start is None:
+        return
+    profile.statements.append(StatementRecord(
+        normalize_statement(statement),
+        (time.perf_counter() - start) * 1000,
+        _call_site(),
+    ))
+
+
+# Global instance
+sql_profiler = SQLProfiler()
@@ -12,30 +12,32 @@ import os
 import ssl
 import socket
 import logging
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from fastapi import Request, Response
 from fastapi.responses import RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.middleware import on_response_start
 from app.core.security_config import security_config
 
 logger = logging.getLogger(__name__)
 
 
-class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
+class HTTPSRedirectMiddleware:
     """
     Middleware to enforce HTTPS redirects and SSL/TLS security.
     """
     
     def __init__(
         self, 
-        app,
+        app: ASGIApp,
         force_https: bool = None,
         hsts_max_age: int = None,
         hsts_include_subdomains: bool = True,
         hsts_preload: bool = True
     ):
-        super().__init__(app)
+        self.app = app
         self.force_https = force_https if force_https is not None else security_config.ssl_redirect
         self.hsts_max_age = hsts_max_age if hsts_max_age is not None else security_config.hsts_max_age
         self.hsts_include_subdomains = hsts_include_subdomains
@@ -52,20 +54,26 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
            force_https is None:  # Only override if not explicitly set
             self.force_https = False
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with HTTPS enforcement and security headers."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         
         # Check if HTTPS redirect is needed
         if self.force_https and self._should_redirect_to_https(request):
-            return self._create_https_redirect(request)
-        
-        # Process the request
-        response = await call_next(request)
+            response = self._create_https_redirect(request)
+            await response(scope, receive, send)
+            return
         
-        # Add SSL/TLS security headers
-        self._add_ssl_security_headers(request, response)
+        def add_headers(message: Message) -> None:
+            # Add SSL/TLS security headers
+            self._apply_ssl_security_headers(request, MutableHeaders(scope=message))
         
-        return response
+        # Process the request
+        await self.app(scope, receive, on_response_start(send, add_headers))
     
     def _should_redirect_to_https(self, request: Request) -> bool:
         """Determine if request should be redirected to HTTPS."""
@@ -116,6 +124,10 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
     
     def _add_ssl_security_headers(self, request: Request, response: Response):
         """Add SSL/TLS security headers to response."""
+        self._apply_ssl_security_headers(request, response.headers)
+    
+    def _apply_ssl_security_headers(self, request: Request, headers: MutableHeaders):
+        """Add SSL/TLS security headers to a set of response headers."""
         # Add HSTS header for HTTPS requests
         if self._is_https_request(request):
             hsts_value = f"max-age={self.hsts_max_age}"
@@ -126,10 +138,10 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
             if self.hsts_preload:
                 hsts_value += "; preload"
             
-            response.headers["Strict-Transport-Security"] = hsts_value
+            headers["Strict-Transport-Security"] = hsts_value
         
         # Add secure cookie directives
-        self._secure_cookies(response)
+        self._secure_cookie_headers(headers)
     
     def _is_https_request(self, request: Request) -> bool:
         """Check if request is over HTTPS."""
@@ -150,19 +162,23 @@ class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
     
     def _secure_cookies(self, response: Response):
         """Configure secure cookie settings."""
+        self._secure_cookie_headers(response.headers)
+    
+    def _secure_cookie_headers(self, headers: MutableHeaders):
+        """Rewrite Set-Cookie headers with security attributes."""
         # Get existing Set-Cookie headers
-        set_cookie_headers = response.headers.getlist('set-cookie')
+        set_cookie_headers = headers.getlist('set-cookie')
         
         if not set_cookie_headers:
             return
         
         # Remove existing Set-Cookie headers
-        del response.headers['set-cookie']
+        del headers['set-cookie']
         
         # Re-add with security attributes
         for cookie_header in set_cookie_headers:
             secured_cookie = self._add_cookie_security_attributes(cookie_header)
-            response.headers.append('set-cookie', secured_cookie)
+            headers.append('set-cookie', secured_cookie)
     
     def _add_cookie_security_attributes(self, cookie_header: str) -> str:
         """Add security attributes to cookie header."""
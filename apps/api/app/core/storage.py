@@ -2,19 +2,39 @@
 Unified storage adapter - S3-compatible (works with Supabase, R2, AWS S3, etc.)
 Stores relative paths in DB, generates URLs dynamically
 """
+import asyncio
 import os
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import Iterable, List, NamedTuple, Optional, Sequence
 import uuid
 
+from app.config.storage_config import STORAGE_URL_CACHE_SIZE
+from app.core.object_storage import LocalObjectStorage, S3ObjectStorage
+
 logger = logging.getLogger(__name__)
 
 
+class StorageObject(NamedTuple):
+    """One file for StorageAdapter.upload_files."""
+    file_data: bytes
+    folder: str
+    filename: str
+    content_type: Optional[str] = None
+
+
 class StorageAdapter:
     """Unified storage adapter that works with any S3-compatible storage"""
     
-    def __init__(self):
+    def __init__(self, url_cache_size: int = STORAGE_URL_CACHE_SIZE):
+        # Stored path (any format) -> URL; bounded LRU, since feeds repeat the
+        # same avatars and images on every page
+        self.url_cache_size = url_cache_size
+        self._url_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.url_cache_hits = 0
+        self.url_cache_misses = 0
+        
         self.environment = os.getenv("ENVIRONMENT", "development")
         self.is_production = self.environment == "production"
         
@@ -31,9 +51,6 @@ class StorageAdapter:
     def _init_s3_storage(self):
         """Initialize S3-compatible storage (Supabase, R2, AWS S3, etc.)"""
         try:
-            import boto3
-            from botocore.config import Config
-            
             # Generic S3-compatible configuration
             s3_endpoint = os.getenv("S3_ENDPOINT_URL")
             s3_region = os.getenv("S3_REGION", "auto")
@@ -55,22 +72,26 @@ class StorageAdapter:
                     "required for production storage"
                 )
             
-            # Create S3 client (works with any S3-compatible service)
-            self.s3_client = boto3.client(
-                's3',
+            # URLs are this prefix plus the clean relative path
+            if self.public_url_base:
+                # Custom public URL (e.g., Supabase public URL)
+                self._url_prefix = f"{self.public_url_base.rstrip('/')}/"
+            else:
+                # Fallback to endpoint URL
+                self._url_prefix = f"{s3_endpoint.rstrip('/')}/{self.bucket_name}/"
+            
+            # Pooled client for any S3-compatible service
+            self.backend = S3ObjectStorage(
                 endpoint_url=s3_endpoint,
-                region_name=s3_region,
-                aws_access_key_id=s3_access_key,
-                aws_secret_access_key=s3_secret_key,
-                config=Config(signature_version='s3v4')
+                bucket=self.bucket_name,
+                access_key=s3_access_key,
+                secret_key=s3_secret_key,
+                region=s3_region,
             )
             
             self.storage_backend = "s3"
             logger.info(f"✓ Using S3-compatible storage (bucket: {self.bucket_name}, endpoint: {s3_endpoint})")
             
-        except ImportError:
-            logger.error("boto3 package not installed! Run: pip install boto3")
-            raise
         except Exception as e:
             logger.error(f"Failed to initialize S3 storage: {e}")
             raise
@@ -78,11 +99,19 @@ class StorageAdapter:
     def _init_local_storage(self):
         """Initialize local filesystem storage for development"""
         self.upload_path = Path(os.getenv("UPLOAD_PATH", "uploads"))
-        self.upload_path.mkdir(parents=True, exist_ok=True)
+        self.backend = LocalObjectStorage(self.upload_path)
         self.storage_backend = "local"
+        self._url_prefix = "/uploads/"
         
         logger.info(f"✓ Using local storage (path: {self.upload_path})")
     
+    def _relative_path(self, folder: str, filename: str) -> str:
+        # Ensure folder doesn't have /uploads/ prefix
+        folder = folder.lstrip('/').replace('uploads/', '', 1)
+        
+        # Construct clean relative path (no /uploads/ prefix)
+        return f"{folder}/{filename}"
+    
     def upload_file(
         self, 
         file_data: bytes, 
@@ -93,6 +122,9 @@ class StorageAdapter:
         """
         Upload file to storage.
         
+        Blocks until the object is stored; async code should use
+        upload_file_async or upload_files instead.
+        
         Args:
             file_data: File contents as bytes
             folder: Folder name ('posts', 'profile_photos', etc.)
@@ -103,106 +135,145 @@ class StorageAdapter:
             CLEAN relative path WITHOUT /uploads/ prefix (e.g., 'profile_photos/file.jpg')
             This MUST be stored AS-IS in the database - DO NOT add /uploads/ prefix!
         """
-        # Ensure folder doesn't have /uploads/ prefix
-        folder = folder.lstrip('/').replace('uploads/', '', 1)
-        
-        # Construct clean relative path (no /uploads/ prefix)
-        relative_path = f"{folder}/{filename}"
+        relative_path = self._relative_path(folder, filename)
         
-        if self.is_production:
-            self._upload_to_s3(file_data, relative_path, content_type)
-        else:
-            self._upload_to_local(file_data, folder, filename)
+        try:
+            self.backend.put(relative_path, file_data, content_type)
+        except Exception as e:
+            logger.error(f"Failed to upload {relative_path} to {self.storage_backend} storage: {e}")
+            raise
         
         # CRITICAL: Always return clean relative path for DB storage
         # Services MUST save this exact value to the database
         logger.info(f"📦 Uploaded file, DB path: {relative_path}")
         return relative_path
     
-    def _upload_to_s3(self, file_data: bytes, relative_path: str, content_type: Optional[str]) -> None:
-        """Upload to S3-compatible storage"""
+    async def upload_file_async(
+        self, 
+        file_data: bytes, 
+        folder: str, 
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> str:
+        """
+        Upload file to storage without blocking the event loop.
+        
+        Same arguments and return value as upload_file.
+        """
+        relative_path = self._relative_path(folder, filename)
+        
         try:
-            extra_args = {}
-            if content_type:
-                extra_args['ContentType'] = content_type
-            
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=relative_path,
-                Body=file_data,
-                **extra_args
-            )
-            
-            logger.info(f"✓ Uploaded to S3: {relative_path}")
-            
+            await self.backend.put_async(relative_path, file_data, content_type)
         except Exception as e:
-            logger.error(f"Failed to upload to S3: {e}")
+            logger.error(f"Failed to upload {relative_path} to {self.storage_backend} storage: {e}")
             raise
+        
+        logger.info(f"📦 Uploaded file, DB path: {relative_path}")
+        return relative_path
     
-    def _upload_to_local(self, file_data: bytes, folder: str, filename: str) -> None:
-        """Upload to local filesystem"""
-        # Create folder if it doesn't exist
-        folder_path = self.upload_path / folder
-        folder_path.mkdir(parents=True, exist_ok=True)
-        
-        # Write file
-        file_path = folder_path / filename
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-        
-        logger.info(f"✓ Uploaded locally: {folder}/{filename}")
+    async def upload_files(self, files: Sequence[StorageObject]) -> List[str]:
+        """
+        Upload several files concurrently.
+        
+        Takes as long as the slowest upload rather than the sum of all of
+        them. All or nothing: if any upload fails, the ones that succeeded
+        are deleted and the first error is raised.
+        
+        Args:
+            files: Objects to upload
+        
+        Returns:
+            Clean relative paths, in the order of files
+        """
+        results = await asyncio.gather(
+            *(
+                self.upload_file_async(item.file_data, item.folder, item.filename, item.content_type)
+                for item in files
+            ),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self.delete_files([result for result in results if isinstance(result, str)])
+            raise errors[0]
+        return list(results)
     
     def delete_file(self, relative_path: str) -> bool:
         """
         Delete file from storage using relative path.
         
+        Blocks until the object is deleted; async code should use
+        delete_file_async or delete_files instead.
+        
         Args:
             relative_path: Path like 'profile_photos/file.jpg' or '/uploads/profile_photos/file.jpg'
         
         Returns:
             True if deleted successfully
         """
-        # Normalize path (remove /uploads/ prefix if present)
-        clean_path = self.normalize_path(relative_path)
-        
+        clean_path = self._deletable_path(relative_path)
         if not clean_path:
-            logger.warning("Empty path provided to delete_file")
             return False
         
-        if self.is_production:
-            return self._delete_from_s3(clean_path)
-        else:
-            # Split into folder and filename for local storage
-            parts = clean_path.split('/', 1)
-            if len(parts) == 2:
-                folder, filename = parts
-                return self._delete_from_local(folder, filename)
-            logger.warning(f"Invalid path format for deletion: {clean_path}")
-            return False
-    
-    def _delete_from_s3(self, relative_path: str) -> bool:
-        """Delete from S3-compatible storage"""
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=relative_path)
-            logger.info(f"✓ Deleted from S3: {relative_path}")
-            return True
+            deleted = self.backend.delete(clean_path)
         except Exception as e:
-            logger.error(f"Failed to delete from S3: {e}")
+            logger.error(f"Failed to delete {clean_path} from {self.storage_backend} storage: {e}")
             return False
+        self._log_deletion(clean_path, deleted)
+        return deleted
     
-    def _delete_from_local(self, folder: str, filename: str) -> bool:
-        """Delete from local filesystem"""
-        try:
-            file_path = self.upload_path / folder / filename
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"✓ Deleted locally: {folder}/{filename}")
-                return True
-            logger.warning(f"File not found for deletion: {folder}/{filename}")
+    async def delete_file_async(self, relative_path: str) -> bool:
+        """
+        Delete file from storage without blocking the event loop.
+        
+        Same argument and return value as delete_file.
+        """
+        clean_path = self._deletable_path(relative_path)
+        if not clean_path:
             return False
+        
+        try:
+            deleted = await self.backend.delete_async(clean_path)
         except Exception as e:
-            logger.error(f"Failed to delete locally: {e}")
+            logger.error(f"Failed to delete {clean_path} from {self.storage_backend} storage: {e}")
             return False
+        self._log_deletion(clean_path, deleted)
+        return deleted
+    
+    async def delete_files(self, relative_paths: Sequence[str]) -> List[bool]:
+        """
+        Delete several files concurrently.
+        
+        Args:
+            relative_paths: Paths in any format delete_file accepts
+        
+        Returns:
+            Whether each file was deleted, in the order of relative_paths
+        """
+        return list(await asyncio.gather(*(self.delete_file_async(path) for path in relative_paths)))
+    
+    def _deletable_path(self, relative_path: str) -> Optional[str]:
+        # Normalize path (remove /uploads/ prefix if present)
+        clean_path = self.normalize_path(relative_path)
+        
+        if not clean_path:
+            logger.warning("Empty path provided to delete_file")
+            return None
+        if '/' not in clean_path:
+            logger.warning(f"Invalid path format for deletion: {clean_path}")
+            return None
+        return clean_path
+    
+    def _log_deletion(self, clean_path: str, deleted: bool) -> None:
+        if deleted:
+            logger.info(f"✓ Deleted from {self.storage_backend} storage: {clean_path}")
+        else:
+            logger.warning(f"File not found for deletion: {clean_path}")
+    
+    async def close(self) -> None:
+        """Release the storage backend's pooled connections."""
+        await self.backend.close()
     
     def normalize_path(self, path: str) -> str:
         """
@@ -284,33 +355,52 @@ class StorageAdapter:
         if not relative_path:
             return relative_path
         
+        url = self._url_cache.get(relative_path)
+        if url is not None:
+            self._url_cache.move_to_end(relative_path)
+            self.url_cache_hits += 1
+            return url
+        self.url_cache_misses += 1
+        
         # Normalize the path first (handles legacy /uploads/ prefix and full URLs)
         clean_path = self.normalize_path(relative_path)
         
         if not clean_path:
-            logger.warning(f"Empty path after normalization: {relative_path}")
+            logger.warning("Empty path after normalization: %s", relative_path)
             return relative_path
         
-        if self.is_production:
-            # Return full S3 URL
-            if self.public_url_base:
-                # Use custom public URL (e.g., Supabase public URL)
-                # Ensure no double slashes and proper joining
-                base_url = self.public_url_base.rstrip('/')
-                url = f"{base_url}/{clean_path}"
-                logger.debug(f"🔗 Generated S3 URL: {clean_path} -> {url}")
-                return url
-            else:
-                # Fallback to endpoint URL
-                s3_endpoint = os.getenv("S3_ENDPOINT_URL", "").rstrip('/')
-                url = f"{s3_endpoint}/{self.bucket_name}/{clean_path}"
-                logger.debug(f"🔗 Generated S3 URL (endpoint): {clean_path} -> {url}")
-                return url
-        else:
-            # Return local URL with /uploads/ prefix
-            url = f"/uploads/{clean_path}"
-            logger.debug(f"🔗 Generated local URL: {clean_path} -> {url}")
-            return url
+        url = self._url_prefix + clean_path
+        logger.debug("🔗 Generated %s URL: %s -> %s", self.storage_backend, clean_path, url)
+        
+        if self.url_cache_size > 0:
+            self._url_cache[relative_path] = url
+            while len(self._url_cache) > self.url_cache_size:
+                self._url_cache.popitem(last=False)
+        return url
+    
+    def get_urls(self, relative_paths: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """
+        Convert several paths from the DB to URLs, e.g. all images of a page.
+        
+        Empty paths (None or '') are passed through unchanged, so columns can
+        be mapped without filtering them first.
+        
+        Returns:
+            URLs in the order of relative_paths
+        """
+        get_url = self.get_url
+        return [get_url(path) if path else path for path in relative_paths]
+    
+    def get_url_cache_stats(self) -> dict:
+        """Size and hit rate of the get_url memo."""
+        lookups = self.url_cache_hits + self.url_cache_misses
+        return {
+            "size": len(self._url_cache),
+            "max_size": self.url_cache_size,
+            "hits": self.url_cache_hits,
+            "misses": self.url_cache_misses,
+            "hit_rate": round(self.url_cache_hits / lookups, 4) if lookups else 0.0,
+        }
     
     def generate_unique_filename(self, original_filename: str) -> str:
         """
@@ -2,10 +2,13 @@
 Structured logging system with request IDs and performance monitoring.
 """
 
+import atexit
 import json
 import logging
+import queue
 import time
 import uuid
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from contextvars import ContextVar
@@ -36,8 +39,11 @@ class StructuredFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
         
-        # Add request ID if available
-        request_id = request_id_context.get()
+        # Add request ID if available (captured at enqueue time for queued records)
+        if hasattr(record, "context_request_id"):
+            request_id = record.context_request_id
+        else:
+            request_id = request_id_context.get()
         if request_id:
             log_entry["request_id"] = request_id
         
@@ -49,7 +55,7 @@ class StructuredFormatter(logging.Formatter):
                 'filename', 'module', 'lineno', 'funcName', 'created', 
                 'msecs', 'relativeCreated', 'thread', 'threadName', 
                 'processName', 'process', 'getMessage', 'exc_info', 
-                'exc_text', 'stack_info'
+                'exc_text', 'stack_info', 'context_request_id'
             }:
                 extra_fields[key] = value
         
@@ -436,10 +442,79 @@ def performance_monitor(operation_name: str, threshold_ms: float = 300):
     return decorator
 
 
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread.
+    
+    Records are handed to a QueueListener thread that formats and writes
+    them, so JSON formatting and stdout writes happen off the event loop.
+    When the queue is full (the output cannot keep up) records are dropped
+    and counted instead of stalling the caller.
+    """
+    
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message while its arguments are still current and keep
+        # the request ID, which the listener thread cannot see
+        record.msg = record.getMessage()
+        record.args = None
+        record.context_request_id = request_id_context.get()
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Active listener and its output handler when logging is queued
+_queue_listener: Optional[QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_output_handler: Optional[logging.Handler] = None
+
+
+def stop_structured_logging() -> None:
+    """
+    Flush queued records and write directly from now on.
+    
+    Called on shutdown so records logged while the app stops still appear.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is None:
+        return
+    _queue_listener.stop()
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    root_logger.addHandler(_output_handler)
+    _queue_listener = None
+    _queue_handler = None
+
+
+atexit.register(stop_structured_logging)
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth and dropped record count of the queued logging pipeline."""
+    if _queue_handler is None:
+        return {"queued": False}
+    return {
+        "queued": True,
+        "queue_depth": _queue_handler.queue.qsize(),
+        "queue_max_size": _queue_handler.queue.maxsize,
+        "dropped_records": _queue_handler.dropped,
+    }
+
+
 def setup_structured_logging(
     service_name: str = "grateful-api",
     log_level: str = "INFO",
-    enable_json_format: bool = True
+    enable_json_format: bool = True,
+    use_queue: bool = True,
+    queue_max_size: int = 10000
 ) -> None:
     """
     Set up structured logging for the application.
@@ -448,7 +523,12 @@ def setup_structured_logging(
         service_name: Name of the service for log entries
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         enable_json_format: Whether to use JSON formatting
+        use_queue: Format and write records on a background thread
+        queue_max_size: Records buffered before new ones are dropped
     """
+    global _queue_listener, _queue_handler, _output_handler
+    stop_structured_logging()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
@@ -470,7 +550,14 @@ def setup_structured_logging(
         )
     
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    _output_handler = console_handler
+    if use_queue:
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_max_size))
+        _queue_listener = QueueListener(_queue_handler.queue, console_handler, respect_handler_level=True)
+        _queue_listener.start()
+        root_logger.addHandler(_queue_handler)
+    else:
+        root_logger.addHandler(console_handler)
     
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -8,6 +8,7 @@ from .post import Post
 from .post_privacy import PostPrivacyRule, PostPrivacyUser
 from .post_image import PostImage
 from .emoji_reaction import EmojiReaction
+from .post_engagement_stats import PostEngagementStats
 from .notification import Notification
 from .share import Share
 from .mention import Mention
@@ -16,6 +17,8 @@ from .user_interaction import UserInteraction
 from .image_hash import ImageHash
 from .comment import Comment
 from .deleted_user_auth_identity import DeletedUserAuthIdentity
+from . import user_counters  # noqa: F401  (registers counter listeners)
+from . import notification_counters  # noqa: F401  (registers counter listeners)
 
 __all__ = [
     "User",
@@ -24,6 +27,7 @@ __all__ = [
     "PostPrivacyUser",
     "PostImage",
     "EmojiReaction",
+    "PostEngagementStats",
     "Notification",
     "Share",
     "Mention",
@@ -140,4 +140,4 @@ class EmojiReaction(Base):
 
     # Relationships
     user = relationship("User", backref="emoji_reactions")
-    post = relationship("Post", backref="emoji_reactions")
\ No newline at end of file
+    post = relationship("Post", backref="emoji_reactions")
@@ -5,13 +5,22 @@ Notification model for handling user notifications.
 import datetime
 import uuid
 from datetime import timezone
+from typing import Optional
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Integer, Boolean
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Integer, Boolean, Index, text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
 
+def _post_id_from_data(context) -> Optional[str]:
+    """Insert default for post_id: the post the notification's data refers to."""
+    data = context.get_current_parameters().get("data")
+    if isinstance(data, dict) and data.get("post_id") is not None:
+        return str(data["post_id"])
+    return None
+
+
 class Notification(Base):
     """Model for user notifications."""
     
@@ -23,6 +32,8 @@ class Notification(Base):
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     data = Column(JSON, nullable=True)  # Additional data like post_id, emoji_code, etc.
+    # Copy of data["post_id"] filled on insert, so a post's notifications are found by index
+    post_id = Column(String, nullable=True, index=True, default=_post_id_from_data)
     read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
     read_at = Column(DateTime, nullable=True)
@@ -34,6 +45,16 @@ class Notification(Base):
     batch_key = Column(String, nullable=True, index=True)  # For grouping similar notifications
     last_updated_at = Column(DateTime, default=lambda: datetime.datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)  # Track when notification was last updated
 
+    __table_args__ = (
+        # Keyset pagination of a user's notification list and the unread recount
+        Index(
+            'idx_notifications_user_parents',
+            'user_id', 'last_updated_at', 'id',
+            postgresql_where=text('parent_id IS NULL'),
+            sqlite_where=text('parent_id IS NULL'),
+        ),
+    )
+
     # Relationships (using string references to avoid circular imports)
     user = relationship("User", back_populates="notifications")
     parent = relationship("Notification", remote_side=[id], back_populates="children")
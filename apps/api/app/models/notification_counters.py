@@ -0,0 +1,95 @@
+"""
+Write-time maintenance of ``users.unread_notifications_count``.
+
+The counter is the number of unread parent notifications (batches and
+standalone notifications, not batch children) a user has, which is what
+the notification badge shows. Every flush that inserts, deletes or changes
+the read/parent_id of Notification rows adjusts the affected users by delta
+in the same transaction, with one executemany UPDATE per flush; bulk SQL that
+bypasses the ORM must call NotificationRepository.refresh_unread_counts for
+the users it touched.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from app.models.notification import Notification
+from app.models.user_counters import _changed, _current, _previous
+
+
+# Recomputes one user's counter from source rows (index-backed by
+# idx_notifications_user_parents).
+REFRESH_UNREAD_NOTIFICATIONS_SQL = text("""
+    UPDATE users SET
+        unread_notifications_count = (
+            SELECT COUNT(*) FROM notifications
+            WHERE user_id = :user_id AND parent_id IS NULL AND read = false
+        )
+    WHERE id = :user_id
+""")
+
+_ADJUST_UNREAD_SQL = text("""
+    UPDATE users SET unread_notifications_count = unread_notifications_count + :delta
+    WHERE id = :user_id
+""")
+
+
+def _unread_parent(user_id, read, parent_id) -> int:
+    """1 if a notification row counts towards its user's unread badge."""
+    if user_id is None or read or parent_id is not None:
+        return 0
+    return 1
+
+
+@event.listens_for(Session, "after_flush")
+def _count_unread_notifications(session, flush_context):
+    deltas = defaultdict(int)
+    refresh = set()
+
+    for target in session.new:
+        if isinstance(target, Notification):
+            deltas[target.user_id] += _unread_parent(
+                target.user_id, _current(target, "read", False), _current(target, "parent_id")
+            )
+
+    for target in session.dirty:
+        if not isinstance(target, Notification) or not _changed(target, "read", "parent_id", "user_id"):
+            continue
+        old_values = (_previous(target, "user_id"), _previous(target, "read"), _previous(target, "parent_id"))
+        new_values = (
+            _current(target, "user_id", NO_VALUE),
+            _current(target, "read", NO_VALUE),
+            _current(target, "parent_id", NO_VALUE),
+        )
+        if NO_VALUE in old_values or NO_VALUE in new_values:
+            refresh.update(uid for uid in (old_values[0], new_values[0]) if uid not in (None, NO_VALUE))
+            continue
+        deltas[old_values[0]] -= _unread_parent(*old_values)
+        deltas[new_values[0]] += _unread_parent(*new_values)
+
+    for target in session.deleted:
+        if not isinstance(target, Notification):
+            continue
+        old_values = (_previous(target, "user_id"), _previous(target, "read"), _previous(target, "parent_id"))
+        if NO_VALUE in old_values:
+            if old_values[0] not in (None, NO_VALUE):
+                refresh.add(old_values[0])
+            continue
+        deltas[old_values[0]] -= _unread_parent(*old_values)
+
+    if not refresh and not any(deltas.values()):
+        return
+    connection = session.connection()
+    adjustments = [
+        {"user_id": user_id, "delta": delta}
+        for user_id, delta in deltas.items()
+        if delta and user_id is not None and user_id not in refresh
+    ]
+    # executemany: one round trip however many recipients the flush touched
+    if adjustments:
+        connection.execute(_ADJUST_UNREAD_SQL, adjustments)
+    if refresh:
+        connection.execute(REFRESH_UNREAD_NOTIFICATIONS_SQL, [{"user_id": user_id} for user_id in refresh])
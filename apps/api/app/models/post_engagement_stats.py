@@ -0,0 +1,91 @@
+"""
+Materialized per-post reaction aggregates used by feed scoring.
+"""
+
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, bindparam, event, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.emoji_reaction import EmojiReaction
+
+
+# Refreshing a post's aggregate takes three statements so concurrent reaction
+# writes cannot lose updates under READ COMMITTED: make sure the stats row
+# exists, lock it (PostgreSQL), then recount in a new statement, whose
+# snapshot includes every reaction committed by whoever held the lock before.
+# A single INSERT ... SELECT COUNT ... ON CONFLICT would count from the
+# snapshot it took before waiting on the row lock and write a stale value.
+ENSURE_POST_ENGAGEMENT_SQL = text("""
+    INSERT INTO post_engagement_stats
+        (post_id, reactions_distinct_users, reactions_distinct_codes, updated_at)
+    VALUES (:post_id, 0, 0, CURRENT_TIMESTAMP)
+    ON CONFLICT (post_id) DO NOTHING
+""")
+
+# Sorted so that transactions refreshing several posts lock them in one order
+LOCK_POST_ENGAGEMENT_SQL = text("""
+    SELECT post_id FROM post_engagement_stats
+    WHERE post_id IN :post_ids
+    ORDER BY post_id
+    FOR UPDATE
+""").bindparams(bindparam("post_ids", expanding=True))
+
+# Recomputes one post's aggregate from its own reactions (index-backed by
+# idx_emoji_reactions_post_object), so a write never touches other posts.
+REFRESH_POST_ENGAGEMENT_SQL = text("""
+    UPDATE post_engagement_stats SET
+        reactions_distinct_users = (
+            SELECT COUNT(DISTINCT user_id) FROM emoji_reactions
+            WHERE post_id = :post_id AND object_type = 'post'
+        ),
+        reactions_distinct_codes = (
+            SELECT COUNT(DISTINCT emoji_code) FROM emoji_reactions
+            WHERE post_id = :post_id AND object_type = 'post'
+        ),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE post_id = :post_id
+""")
+
+
+def locks_post_engagement_rows(dialect_name: str) -> bool:
+    """Whether LOCK_POST_ENGAGEMENT_SQL is needed; SQLite serializes writers anyway."""
+    return dialect_name == "postgresql"
+
+
+class PostEngagementStats(Base):
+    """
+    Denormalized reaction counters per post.
+
+    Mirrors what the feed used to aggregate from emoji_reactions on every
+    request: distinct reacting users and distinct emoji codes across
+    post-level reactions (image and comment reactions are excluded).
+    """
+    __tablename__ = "post_engagement_stats"
+
+    post_id = Column(String, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    reactions_distinct_users = Column(Integer, nullable=False, default=0, server_default="0")
+    reactions_distinct_codes = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<PostEngagementStats(post_id={self.post_id}, "
+            f"users={self.reactions_distinct_users}, codes={self.reactions_distinct_codes})>"
+        )
+
+
+def _is_post_level(target: EmojiReaction) -> bool:
+    object_type = getattr(target.object_type, "value", target.object_type)
+    return (object_type or "post") == "post"
+
+
+@event.listens_for(EmojiReaction, "after_insert")
+@event.listens_for(EmojiReaction, "after_update")
+@event.listens_for(EmojiReaction, "after_delete")
+def _refresh_stats_on_reaction_write(mapper, connection, target):
+    """Keep the post aggregate in step with ORM reaction writes (same transaction)."""
+    if target.post_id and _is_post_level(target):
+        params = {"post_id": target.post_id}
+        connection.execute(ENSURE_POST_ENGAGEMENT_SQL, params)
+        if locks_post_engagement_rows(connection.dialect.name):
+            connection.execute(LOCK_POST_ENGAGEMENT_SQL, {"post_ids": [target.post_id]})
+        connection.execute(REFRESH_POST_ENGAGEMENT_SQL, params)
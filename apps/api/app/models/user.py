@@ -43,8 +43,17 @@ class User(Base):
     deletion_requested_at = Column(DateTime(timezone=True), nullable=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     deletion_source = Column(String(20), nullable=True)
+    deletion_claimed_at = Column(DateTime(timezone=True), nullable=True)  # lease held by the worker running the deletion
     token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
+    # Denormalized counters, maintained on write (see app/models/user_counters.py)
+    posts_count = Column(Integer, nullable=False, default=0, server_default="0")
+    public_posts_count = Column(Integer, nullable=False, default=0, server_default="0")
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0")
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Unread parent notifications (see app/models/notification_counters.py)
+    unread_notifications_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     @property
     def is_active(self) -> bool:
         """Compatibility property for active-account checks."""
@@ -0,0 +1,190 @@
+"""
+Write-time maintenance of the denormalized counters on ``users``.
+
+followers_count / following_count count active follows; posts_count and
+public_posts_count count non-deleted posts (public ones for the latter).
+ORM writes of Follow and Post adjust them by delta in the same transaction;
+bulk SQL that bypasses the ORM must call
+UserRepository.refresh_user_counters for the users it touched.
+"""
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm.base import NO_VALUE
+
+from app.models.follow import Follow
+from app.models.post import Post
+
+
+# Recomputes one user's counters from source rows (index-backed by
+# idx_posts_author_deleted and the two follows status indexes).
+REFRESH_USER_COUNTERS_SQL = text("""
+    UPDATE users SET
+        posts_count = (
+            SELECT COUNT(*) FROM posts
+            WHERE author_id = :user_id AND deleted_at IS NULL
+        ),
+        public_posts_count = (
+            SELECT COUNT(*) FROM posts
+            WHERE author_id = :user_id AND deleted_at IS NULL AND privacy_level = 'public'
+        ),
+        followers_count = (
+            SELECT COUNT(*) FROM follows
+            WHERE followed_id = :user_id AND status = 'active'
+        ),
+        following_count = (
+            SELECT COUNT(*) FROM follows
+            WHERE follower_id = :user_id AND status = 'active'
+        )
+    WHERE id = :user_id
+""")
+
+_ADJUST_FOLLOW_SQL = text("""
+    UPDATE users SET
+        following_count = following_count + CASE WHEN id = :follower_id THEN :delta ELSE 0 END,
+        followers_count = followers_count + CASE WHEN id = :followed_id THEN :delta ELSE 0 END
+    WHERE id IN (:follower_id, :followed_id)
+""")
+
+_ADJUST_POSTS_SQL = text("""
+    UPDATE users SET
+        posts_count = posts_count + :posts_delta,
+        public_posts_count = public_posts_count + :public_delta
+    WHERE id = :user_id
+""")
+
+
+def _previous(target, attr: str):
+    """Value of attr before the pending flush, or NO_VALUE if it was never loaded.
+
+    Never triggers a lazy load (not possible inside a flush on AsyncSession).
+    """
+    state = inspect(target).attrs[attr]
+    history = state.history
+    if history.deleted:
+        return history.deleted[0]
+    if history.added:
+        # Overwritten before the old value was ever loaded.
+        return NO_VALUE
+    if history.unchanged:
+        return history.unchanged[0]
+    return state.loaded_value
+
+
+def _current(target, attr: str, unloaded=None):
+    """Flushed value of attr without triggering a lazy load.
+
+    Columns left out of an INSERT are unloaded afterwards; callers pass the
+    value the database would have given them.
+    """
+    value = inspect(target).attrs[attr].loaded_value
+    return unloaded if value is NO_VALUE else value
+
+
+def _changed(target, *attrs: str) -> bool:
+    state = inspect(target).attrs
+    return any(state[attr].history.has_changes() for attr in attrs)
+
+
+def _refresh_users(connection, *user_ids) -> None:
+    """Fallback when a deleted row's previous state is unknown: recount."""
+    for user_id in {uid for uid in user_ids if uid not in (None, NO_VALUE)}:
+        connection.execute(REFRESH_USER_COUNTERS_SQL, {"user_id": user_id})
+
+
+def _post_contribution(author_id, deleted_at, privacy_level) -> tuple:
+    """(posts, public_posts) a post row adds to its author's counters."""
+    if author_id is None or deleted_at is not None:
+        return 0, 0
+    return 1, 1 if (privacy_level or "public") == "public" else 0
+
+
+def _adjust_follow(connection, follower_id, followed_id, delta: int) -> None:
+    connection.execute(
+        _ADJUST_FOLLOW_SQL,
+        {"follower_id": follower_id, "followed_id": followed_id, "delta": delta},
+    )
+
+
+def _adjust_posts(connection, user_id, posts_delta: int, public_delta: int) -> None:
+    if user_id is not None and (posts_delta or public_delta):
+        connection.execute(
+            _ADJUST_POSTS_SQL,
+            {"user_id": user_id, "posts_delta": posts_delta, "public_delta": public_delta},
+        )
+
+
+@event.listens_for(Follow, "after_insert")
+def _count_inserted_follow(mapper, connection, target):
+    if _current(target, "status", "active") == "active":
+        _adjust_follow(connection, target.follower_id, target.followed_id, 1)
+
+
+@event.listens_for(Follow, "after_delete")
+def _count_deleted_follow(mapper, connection, target):
+    follower_id = _previous(target, "follower_id")
+    followed_id = _previous(target, "followed_id")
+    status = _previous(target, "status")
+    if NO_VALUE in (follower_id, followed_id, status):
+        _refresh_users(connection, follower_id, followed_id)
+    elif status == "active":
+        _adjust_follow(connection, follower_id, followed_id, -1)
+
+
+@event.listens_for(Follow, "after_update")
+def _count_updated_follow(mapper, connection, target):
+    if not _changed(target, "status", "follower_id", "followed_id"):
+        return
+    old_ids = (_previous(target, "follower_id"), _previous(target, "followed_id"))
+    new_ids = (_current(target, "follower_id"), _current(target, "followed_id"))
+    if old_ids != new_ids or NO_VALUE in old_ids:
+        _refresh_users(connection, *old_ids, *new_ids)
+        return
+    was_active = _previous(target, "status") == "active"
+    is_active = _current(target, "status") == "active"
+    if was_active != is_active:
+        _adjust_follow(connection, *new_ids, 1 if is_active else -1)
+
+
+@event.listens_for(Post, "after_insert")
+def _count_inserted_post(mapper, connection, target):
+    posts, public = _post_contribution(
+        target.author_id,
+        _current(target, "deleted_at"),
+        _current(target, "privacy_level", "public"),
+    )
+    _adjust_posts(connection, target.author_id, posts, public)
+
+
+@event.listens_for(Post, "after_delete")
+def _count_deleted_post(mapper, connection, target):
+    author_id = _previous(target, "author_id")
+    deleted_at = _previous(target, "deleted_at")
+    privacy_level = _previous(target, "privacy_level")
+    if NO_VALUE in (author_id, deleted_at, privacy_level):
+        _refresh_users(connection, author_id)
+        return
+    posts, public = _post_contribution(author_id, deleted_at, privacy_level)
+    _adjust_posts(connection, author_id, -posts, -public)
+
+
+@event.listens_for(Post, "after_update")
+def _count_updated_post(mapper, connection, target):
+    if not _changed(target, "author_id", "deleted_at", "privacy_level"):
+        return
+    old_author = _previous(target, "author_id")
+    old_values = (old_author, _previous(target, "deleted_at"), _previous(target, "privacy_level"))
+    new_values = (
+        _current(target, "author_id", NO_VALUE),
+        _current(target, "deleted_at", NO_VALUE),
+        _current(target, "privacy_level", NO_VALUE),
+    )
+    if NO_VALUE in old_values or NO_VALUE in new_values:
+        _refresh_users(connection, old_author, new_values[0])
+        return
+    old_posts, old_public = _post_contribution(*old_values)
+    new_posts, new_public = _post_contribution(*new_values)
+    if old_author == target.author_id:
+        _adjust_posts(connection, target.author_id, new_posts - old_posts, new_public - old_public)
+    else:
+        _adjust_posts(connection, old_author, -old_posts, -old_public)
+        _adjust_posts(connection, target.author_id, new_posts, new_public)
@@ -10,6 +10,12 @@ from app.core.repository_base import BaseRepository
 from app.models.emoji_reaction import EmojiReaction
 from app.models.user import User
 from app.models.comment import Comment
+from app.models.post_engagement_stats import (
+    ENSURE_POST_ENGAGEMENT_SQL,
+    LOCK_POST_ENGAGEMENT_SQL,
+    REFRESH_POST_ENGAGEMENT_SQL,
+    locks_post_engagement_rows,
+)
 
 
 class EmojiReactionRepository(BaseRepository):
@@ -408,7 +414,65 @@ class EmojiReactionRepository(BaseRepository):
         # We assume count is not perfectly tracking with text queries since we removed SELECT COUNT(*), 
         # but execute returns ResultProxy and rowcount works nicely
         result = await self.db.execute(text(query), params)
+        # Bulk DELETE bypasses ORM events, so refresh the aggregate explicitly.
+        await self.refresh_post_engagement_stats([post_id])
         return result.rowcount
+
+    async def refresh_post_engagement_stats(self, post_ids: List[str]) -> None:
+        """
+        Recompute the materialized reaction aggregate for the given posts.
+
+        ORM inserts/updates/deletes of reactions refresh it automatically;
+        call this after bulk SQL that bypasses the ORM.
+        """
+        params = [{"post_id": post_id} for post_id in dict.fromkeys(post_ids)]
+        if not params:
+            return
+        # executemany: a fixed number of round trips however many posts were touched
+        await self.db.execute(ENSURE_POST_ENGAGEMENT_SQL, params)
+        if locks_post_engagement_rows(self.db.bind.dialect.name if self.db.bind is not None else ""):
+            await self.db.execute(LOCK_POST_ENGAGEMENT_SQL, {"post_ids": [p["post_id"] for p in params]})
+        await self.db.execute(REFRESH_POST_ENGAGEMENT_SQL, params)
+
+    async def reconcile_post_engagement_stats(self) -> int:
+        """
+        Repair drift between post_engagement_stats and emoji_reactions.
+
+        Single set-based statement; only rows whose stored counters differ
+        from the live aggregate are written. Also serves as the backfill.
+
+        Returns:
+            int: Number of posts whose aggregate was (re)written
+        """
+        query = text("""
+            INSERT INTO post_engagement_stats
+                (post_id, reactions_distinct_users, reactions_distinct_codes, updated_at)
+            SELECT p.id,
+                   COALESCE(agg.distinct_users, 0),
+                   COALESCE(agg.distinct_codes, 0),
+                   CURRENT_TIMESTAMP
+            FROM posts p
+            LEFT JOIN (
+                SELECT post_id,
+                       COUNT(DISTINCT user_id) AS distinct_users,
+                       COUNT(DISTINCT emoji_code) AS distinct_codes
+                FROM emoji_reactions
+                WHERE object_type = 'post'
+                GROUP BY post_id
+            ) agg ON agg.post_id = p.id
+            LEFT JOIN post_engagement_stats s ON s.post_id = p.id
+            WHERE COALESCE(s.reactions_distinct_users, 0) != COALESCE(agg.distinct_users, 0)
+               OR COALESCE(s.reactions_distinct_codes, 0) != COALESCE(agg.distinct_codes, 0)
+            ON CONFLICT (post_id) DO UPDATE SET
+                reactions_distinct_users = excluded.reactions_distinct_users,
+                reactions_distinct_codes = excluded.reactions_distinct_codes,
+                updated_at = excluded.updated_at
+        """)
+        result = await self.execute_raw_query(query)
+        repaired = result.rowcount or 0
+        if repaired:
+            self.logger.warning(f"Reconciled engagement stats for {repaired} posts")
+        return repaired
     
     async def update_user_reaction(
         self, 
@@ -2,10 +2,13 @@
 Mention repository with specialized query methods.
 """
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Set
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.future import select
 from sqlalchemy import func, desc, text, and_, or_
+from app.core.exceptions import ConflictError, DatabaseError
 from app.core.repository_base import BaseRepository
 from app.models.mention import Mention
 from app.models.user import User
@@ -271,6 +274,33 @@ class MentionRepository(BaseRepository):
             await self.db.commit()
         return count
     
+    async def get_existing_mentioned_user_ids(
+        self,
+        post_id: str,
+        mentioned_user_ids: List[int]
+    ) -> Set[int]:
+        """
+        Get which of the given users are already mentioned in a post.
+        
+        Args:
+            post_id: ID of the post
+            mentioned_user_ids: User IDs to check
+            
+        Returns:
+            Set[int]: IDs of the users that already have a mention in the post
+        """
+        if not mentioned_user_ids:
+            return set()
+        
+        query = select(Mention.mentioned_user_id).where(
+            and_(
+                Mention.post_id == post_id,
+                Mention.mentioned_user_id.in_(mentioned_user_ids)
+            )
+        )
+        result = await self._execute_query(query, "get existing mentioned user ids")
+        return set(result.scalars().all())
+    
     async def bulk_create_mentions(
         self, 
         post_id: str, 
@@ -280,24 +310,48 @@ class MentionRepository(BaseRepository):
         """
         Create multiple mentions for a post.
         
+        Existing mentions are found with one query and the new ones are
+        inserted in one flush, so the cost does not grow with a round trip
+        per mentioned user.
+        
         Args:
             post_id: ID of the post
             author_id: ID of the author
             mentioned_user_ids: List of user IDs to mention
             
         Returns:
-            List[Mention]: List of created mentions
+            List[Mention]: List of created mentions, in mentioned_user_ids order
         """
-        mentions = []
+        # Skip users already mentioned to avoid duplicates
+        existing = await self.get_existing_mentioned_user_ids(post_id, mentioned_user_ids)
+        new_user_ids = [
+            user_id for user_id in dict.fromkeys(mentioned_user_ids) if user_id not in existing
+        ]
+        if not new_user_ids:
+            return []
         
-        for mentioned_user_id in mentioned_user_ids:
-            # Check if mention already exists to avoid duplicates
-            if not await self.check_mention_exists(post_id, mentioned_user_id):
-                mention = await self.create(
-                    post_id=post_id,
-                    author_id=author_id,
-                    mentioned_user_id=mentioned_user_id
-                )
-                mentions.append(mention)
+        # created_at is set here so the rows need no refresh after commit
+        created_at = datetime.now(timezone.utc)
+        mentions = [
+            Mention(
+                post_id=post_id,
+                author_id=author_id,
+                mentioned_user_id=user_id,
+                created_at=created_at
+            )
+            for user_id in new_user_ids
+        ]
+        try:
+            self.db.add_all(mentions)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            self.logger.error(f"Integrity error creating mentions for post {post_id}: {e}")
+            raise ConflictError("Data integrity violation creating Mention")
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            self.logger.error(f"Database error creating mentions for post {post_id}: {e}")
+            raise DatabaseError("Failed to create Mention")
         
+        self.logger.info(f"Created {len(mentions)} mentions for post {post_id}")
         return mentions
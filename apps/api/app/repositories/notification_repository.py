@@ -4,12 +4,14 @@ Notification repository with specialized query methods.
 
 import datetime
 from datetime import timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, desc, text, and_, or_
+from sqlalchemy import delete, func, desc, text, and_, or_
 from app.core.repository_base import BaseRepository
 from app.models.notification import Notification
+from app.models.notification_counters import REFRESH_UNREAD_NOTIFICATIONS_SQL
+from app.models.user import User
 
 
 class NotificationRepository(BaseRepository):
@@ -24,7 +26,8 @@ class NotificationRepository(BaseRepository):
         limit: int = 20,
         offset: int = 0,
         unread_only: bool = False,
-        include_children: bool = False
+        include_children: bool = False,
+        before: Optional[Tuple[datetime.datetime, str]] = None
     ) -> List[Notification]:
         """
         Get notifications for a user, excluding child notifications by default.
@@ -32,9 +35,11 @@ class NotificationRepository(BaseRepository):
         Args:
             user_id: ID of the user
             limit: Maximum number of notifications to return
-            offset: Number of notifications to skip
+            offset: Number of notifications to skip; ignored when before is given
             unread_only: If True, only return unread notifications
             include_children: If True, include child notifications
+            before: Keyset cursor (last_updated_at, id) of the previous page's
+                last notification; only notifications after it are returned
             
         Returns:
             List[Notification]: List of notifications
@@ -48,10 +53,27 @@ class NotificationRepository(BaseRepository):
         if unread_only:
             builder = builder.filter(Notification.read == False)
         
-        # Order by last_updated_at for proper batch ordering, fallback to created_at
+        if before is not None:
+            last_updated_at, notification_id = before
+            builder = builder.filter(
+                or_(
+                    Notification.last_updated_at < last_updated_at,
+                    and_(
+                        Notification.last_updated_at == last_updated_at,
+                        Notification.id < notification_id
+                    )
+                )
+            )
+        
+        # Newest activity first so updated batches move to the top; id breaks
+        # ties so keyset pages neither skip nor repeat rows
         builder = builder.order_by(
-            desc(func.coalesce(Notification.last_updated_at, Notification.created_at))
-        ).limit(limit).offset(offset)
+            desc(Notification.last_updated_at), desc(Notification.id)
+        ).limit(limit)
+        if before is None:
+            # The cursor already marks the position; skipping past it as well
+            # would drop rows for clients that still send their old offset
+            builder = builder.offset(offset)
         
         query = builder.build()
         result = await self._execute_query(query, "get user notifications")
@@ -84,17 +106,124 @@ class NotificationRepository(BaseRepository):
         """
         Get count of unread notifications for a user (only parent notifications).
         
+        Reads the counter on users kept up to date on write.
+        
         Args:
             user_id: ID of the user
             
         Returns:
             int: Number of unread notifications
         """
-        return await self.count({
-            "user_id": user_id,
-            "read": False,
-            "parent_id": None  # Only count parent notifications
-        })
+        query = select(User.unread_notifications_count).where(User.id == user_id)
+        result = await self._execute_query(query, "get unread count")
+        return result.scalar() or 0
+    
+    async def count_user_notifications(self, user_id: int, cap: int) -> int:
+        """
+        Count a user's parent notifications, stopping at cap.
+        
+        Args:
+            user_id: ID of the user
+            cap: Maximum count to report
+            
+        Returns:
+            int: min(number of parent notifications, cap)
+        """
+        capped = (
+            select(Notification.id)
+            .where(and_(Notification.user_id == user_id, Notification.parent_id.is_(None)))
+            .limit(cap)
+            .subquery()
+        )
+        result = await self._execute_query(select(func.count()).select_from(capped), "count user notifications")
+        return result.scalar() or 0
+    
+    async def delete_post_notifications(self, post_id: str) -> int:
+        """
+        Delete every notification about a post, with the batch children they own.
+        
+        Set-based on the indexed post_id column; the recipients' unread
+        counters are recomputed afterwards. Does not commit.
+        
+        Args:
+            post_id: ID of the post
+            
+        Returns:
+            int: Number of notifications deleted
+        """
+        return await self.delete_posts_notifications([post_id])
+    
+    async def delete_posts_notifications(self, post_ids: List[str]) -> int:
+        """
+        Delete every notification about any of the given posts, like
+        delete_post_notifications, in a fixed number of statements.
+        
+        Args:
+            post_ids: IDs of the posts
+            
+        Returns:
+            int: Number of notifications deleted
+        """
+        if not post_ids:
+            return 0
+        
+        recipients = await self.db.execute(
+            select(Notification.user_id).where(Notification.post_id.in_(post_ids)).distinct()
+        )
+        user_ids = list(recipients.scalars().all())
+        if not user_ids:
+            return 0
+        
+        owned = select(Notification.id).where(Notification.post_id.in_(post_ids)).scalar_subquery()
+        result = await self.db.execute(
+            delete(Notification)
+            .where(or_(Notification.post_id.in_(post_ids), Notification.parent_id.in_(owned)))
+            .execution_options(synchronize_session=False)
+        )
+        await self.refresh_unread_counts(user_ids)
+        return result.rowcount
+    
+    async def refresh_unread_counts(self, user_ids: List[int]) -> None:
+        """
+        Recompute the unread notification counter for the given users.
+        
+        ORM writes of notifications adjust it automatically; call this after
+        bulk SQL that bypasses the ORM.
+        """
+        params = [{"user_id": user_id} for user_id in dict.fromkeys(user_ids)]
+        if params:
+            await self.db.execute(REFRESH_UNREAD_NOTIFICATIONS_SQL, params)
+    
+    async def reconcile_unread_counts(self) -> int:
+        """
+        Repair drift between users.unread_notifications_count and the notifications rows.
+        
+        Single set-based statement; only users whose stored counter differs
+        from the live count are written. Also serves as the backfill.
+        
+        Returns:
+            int: Number of users whose counter was rewritten
+        """
+        query = text("""
+            UPDATE users SET unread_notifications_count = live.unread_count
+            FROM (
+                SELECT u.id AS user_id, COALESCE(n.unread_count, 0) AS unread_count
+                FROM users u
+                LEFT JOIN (
+                    SELECT user_id, COUNT(*) AS unread_count
+                    FROM notifications
+                    WHERE parent_id IS NULL AND read = false
+                    GROUP BY user_id
+                ) n ON n.user_id = u.id
+            ) live
+            WHERE users.id = live.user_id
+              AND users.unread_notifications_count != live.unread_count
+        """)
+        result = await self.execute_raw_query(query)
+        repaired = result.rowcount or 0
+        if repaired:
+            self.logger.warning(f"Reconciled unread notification counts for {repaired} users")
+        return repaired
     
     async def find_existing_batch(
         self,
@@ -163,6 +292,57 @@ class NotificationRepository(BaseRepository):
         result = await self._execute_query(query, "find existing single notification")
         return result.scalar_one_or_none()
     
+    async def find_batch_parents_for_users(
+        self,
+        user_ids: List[int],
+        batch_key: str,
+        max_age_hours: int = 24,
+        single_max_age_hours: int = 1
+    ) -> Tuple[Dict[int, Notification], Dict[int, Notification]]:
+        """
+        Find existing batches and convertible singles for several recipients of one batch key.
+        
+        Answers find_existing_batch and find_existing_single_notification for
+        every user in one query.
+        
+        Args:
+            user_ids: IDs of the recipients
+            batch_key: Key for grouping similar notifications
+            max_age_hours: Maximum age of a batch to consider
+            single_max_age_hours: Maximum age of a single notification to consider
+            
+        Returns:
+            Tuple of dicts mapping user_id to its newest batch and to its newest single notification
+        """
+        if not user_ids:
+            return {}, {}
+        
+        now = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+        batch_cutoff = now - datetime.timedelta(hours=max_age_hours)
+        single_cutoff = now - datetime.timedelta(hours=single_max_age_hours)
+        
+        builder = self.query().filter(
+            and_(
+                Notification.user_id.in_(user_ids),
+                Notification.batch_key == batch_key,
+                Notification.parent_id.is_(None),
+                Notification.created_at >= min(batch_cutoff, single_cutoff)
+            )
+        ).order_by(desc(Notification.created_at))
+        
+        query = builder.build()
+        result = await self._execute_query(query, "find batch parents for users")
+        
+        batches: Dict[int, Notification] = {}
+        singles: Dict[int, Notification] = {}
+        for notification in result.scalars().all():
+            if notification.is_batch:
+                if notification.created_at >= batch_cutoff:
+                    batches.setdefault(notification.user_id, notification)
+            elif notification.created_at >= single_cutoff:
+                singles.setdefault(notification.user_id, notification)
+        return batches, singles
+    
     async def mark_as_read(self, notification_id: str, user_id: int) -> bool:
         """
         Mark a notification as read. If it's a batch, mark all children as read too.
@@ -296,49 +476,42 @@ class NotificationRepository(BaseRepository):
             'rate_limit_remaining': max(0, 20 - hour_count)  # Assuming 20/hour limit
         }
     
-    async def check_rate_limit(
+    async def get_recent_created_at(
         self,
         user_id: int,
         notification_type: str,
-        max_per_hour: int = 20
-    ) -> bool:
+        since: datetime.datetime,
+        limit: int
+    ) -> List[datetime.datetime]:
         """
-        Check if user has exceeded the notification rate limit for a specific type.
+        Get creation times of a user's most recent notifications of one type.
+        
+        Seeds the notification rate limiter; only the newest `limit` rows
+        matter to a limit of that size.
         
         Args:
-            user_id: ID of the user to check
-            notification_type: Type of notification to check
-            max_per_hour: Maximum notifications per hour
+            user_id: ID of the user
+            notification_type: Type of notification
+            since: Naive UTC lower bound on created_at
+            limit: Maximum number of timestamps to return
             
         Returns:
-            bool: True if under rate limit, False if exceeded
+            List[datetime.datetime]: Naive UTC creation times, oldest first
         """
-        one_hour_ago = datetime.datetime.now(timezone.utc) - datetime.timedelta(hours=1)
-        one_hour_ago = one_hour_ago.replace(tzinfo=None)
-        
-        # For rate limiting, we need to check within the last hour
-        # This is a simplified check - in production you'd want more sophisticated rate limiting
-        builder = self.query().filter(
-            and_(
-                Notification.user_id == user_id,
-                Notification.type == notification_type,
-                Notification.created_at >= one_hour_ago
+        query = (
+            select(Notification.created_at)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.type == notification_type,
+                    Notification.created_at >= since
+                )
             )
+            .order_by(desc(Notification.created_at))
+            .limit(limit)
         )
-        
-        query = select(func.count()).select_from(builder.build().subquery())
-        result = await self._execute_query(query, "check rate limit")
-        recent_count = result.scalar() or 0
-        
-        is_under_limit = recent_count < max_per_hour
-        
-        if not is_under_limit:
-            self.logger.info(
-                f"Rate limit exceeded for user {user_id}, type {notification_type}: "
-                f"{recent_count} notifications in last hour"
-            )
-        
-        return is_under_limit
+        result = await self._execute_query(query, "get recent notification times")
+        return list(reversed(result.scalars().all()))
     
     async def get_notifications_by_type(
         self,
@@ -404,5 +577,9 @@ class NotificationRepository(BaseRepository):
             if deleted_count < batch_size:
                 break
         
+        if total_deleted:
+            # Raw DELETE bypasses the listeners that maintain unread counters
+            await self.reconcile_unread_counts()
+        
         self.logger.info(f"Deleted {total_deleted} old notifications (older than {days_old} days)")
         return total_deleted
\ No newline at end of file
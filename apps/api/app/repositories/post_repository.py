@@ -15,6 +15,10 @@ from app.models.user import User
 class PostRepository(BaseRepository):
     """Repository for Post model with specialized queries."""
     
+    # Fold post hydration into one statement on PostgreSQL; False uses the
+    # batched follow-up queries there too (the parity tests compare both)
+    single_statement_hydration = True
+    
     def __init__(self, db: AsyncSession):
         super().__init__(db, Post)
     
@@ -195,6 +199,11 @@ class PostRepository(BaseRepository):
         """
         Internal shared logic to fetch and map engagement data for a batch of post IDs.
         Contract: Bit-for-bit compatible structure across list and single-item views.
+
+        On PostgreSQL author stats, follow status, images and privacy details
+        are folded into the main statement (LATERAL joins + JSON aggregation),
+        so a page hydrates in one round trip. Other dialects load them with
+        the batched follow-up queries below.
         """
         import json
         import logging
@@ -223,8 +232,56 @@ class PostRepository(BaseRepository):
             else "GROUP_CONCAT(DISTINCT emoji_code)"
         )
         reaction_default_expression = "ARRAY[]::text[]" if is_postgresql else "''"
-
-        query = text(f"""
+        include_owner_privacy = include_privacy_details and viewer_id is not None
+        hydrate_in_statement = is_postgresql and self.single_statement_hydration
+
+        hydration_ctes = ""
+        hydration_columns = ""
+        hydration_joins = ""
+        if hydrate_in_statement:
+            hydration_ctes = f"""
+            WITH author_stats AS (
+                SELECT au.id AS author_id,
+                       au.posts_count,
+                       au.followers_count,
+                       au.following_count,
+                       EXISTS (SELECT 1 FROM follows vf
+                               WHERE vf.follower_id = :viewer_id AND vf.followed_id = au.id
+                                 AND vf.status = 'active') AS is_following
+                FROM users au
+                WHERE au.id IN (SELECT author_id FROM posts WHERE id IN ({post_id_placeholders}))
+            )"""
+            hydration_columns = """,
+                   author_stats.posts_count as author_posts_count,
+                   author_stats.followers_count as author_followers_count,
+                   author_stats.following_count as author_following_count,
+                   author_stats.is_following as author_is_following,
+                   images.images as images_json,
+                   privacy.privacy_rules as privacy_rules_json,
+                   privacy.specific_users as specific_users_json"""
+            hydration_joins = f"""
+            LEFT JOIN author_stats ON author_stats.author_id = p.author_id
+            LEFT JOIN LATERAL (
+                SELECT JSON_AGG(JSON_BUILD_OBJECT(
+                           'id', pi.id,
+                           'position', pi.position,
+                           'thumbnail_url', pi.thumbnail_url,
+                           'medium_url', pi.medium_url,
+                           'original_url', pi.original_url,
+                           'width', pi.width,
+                           'height', pi.height
+                       ) ORDER BY pi.position ASC) AS images
+                FROM post_images pi
+                WHERE pi.post_id = p.id
+            ) images ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT (SELECT JSON_AGG(r.rule_type) FROM post_privacy_rules r
+                        WHERE r.post_id = p.id) AS privacy_rules,
+                       (SELECT JSON_AGG(pu.user_id) FROM post_privacy_users pu
+                        WHERE pu.post_id = p.id) AS specific_users
+            ) privacy ON {"p.author_id = :viewer_id" if include_owner_privacy else "FALSE"}"""
+
+        query = text(f"""{hydration_ctes}
             SELECT p.id,
                    p.author_id,
                    p.content,
@@ -247,7 +304,7 @@ class PostRepository(BaseRepository):
                    COALESCE(engagement.reactions_count, 0) as reactions_count,
                    COALESCE(engagement.reaction_emoji_codes, {reaction_default_expression}) as reaction_emoji_codes,
                    COALESCE(comments.comments_count, 0) as comments_count,
-                   user_reactions.emoji_code as current_user_reaction
+                   user_reactions.emoji_code as current_user_reaction{hydration_columns}
             FROM posts p
             LEFT JOIN users u ON u.id = p.author_id
             LEFT JOIN (
@@ -271,7 +328,7 @@ class PostRepository(BaseRepository):
                     AND user_id = :viewer_id
                     AND object_type = 'post'
                 GROUP BY post_id, user_id
-            ) user_reactions ON user_reactions.post_id = p.id
+            ) user_reactions ON user_reactions.post_id = p.id{hydration_joins}
             WHERE p.id IN ({post_id_placeholders})
         """)
 
@@ -338,9 +395,16 @@ class PostRepository(BaseRepository):
                 ),
                 "emoji_counts": {},
             }
+            if hydrate_in_statement:
+                self._apply_hydrated_columns(post_dict, row, viewer_id, include_owner_privacy)
             posts.append(post_dict)
             collected_ids.append(row.id)
 
+        if hydrate_in_statement:
+            # Everything below was already fetched by the main statement.
+            posts_by_id = {p["id"]: p for p in posts}
+            return [posts_by_id[pid] for pid in selected_post_ids if pid in posts_by_id]
+
         # Batch load Author stats and Follow statuses for bit-for-bit parity
         unique_author_ids = list({post['author_id'] for post in posts if post['author_id']})
         if unique_author_ids:
@@ -381,12 +445,15 @@ class PostRepository(BaseRepository):
                 if img_row.post_id not in images_by_post:
                     images_by_post[img_row.post_id] = []
                 
+                thumbnail_url, medium_url, original_url = storage.get_urls(
+                    (img_row.thumbnail_url, img_row.medium_url, img_row.original_url)
+                )
                 images_by_post[img_row.post_id].append({
                     "id": img_row.id,
                     "position": img_row.position,
-                    "thumbnail_url": storage.get_url(img_row.thumbnail_url) if img_row.thumbnail_url else None,
-                    "medium_url": storage.get_url(img_row.medium_url) if img_row.medium_url else None,
-                    "original_url": storage.get_url(img_row.original_url) if img_row.original_url else None,
+                    "thumbnail_url": thumbnail_url or None,
+                    "medium_url": medium_url or None,
+                    "original_url": original_url or None,
                     "width": img_row.width,
                     "height": img_row.height
                 })
@@ -418,6 +485,63 @@ class PostRepository(BaseRepository):
 
         return ordered_posts
 
+    @staticmethod
+    def _apply_hydrated_columns(
+        post: Dict[str, Any],
+        row: Any,
+        viewer_id: Optional[int],
+        include_owner_privacy: bool,
+    ) -> None:
+        """
+        Map the single-statement hydration columns onto a post dict, mirroring
+        what the batched follow-up queries produce on other dialects.
+        """
+        import json
+
+        def _json_list(value) -> List[Any]:
+            if isinstance(value, str):
+                value = json.loads(value)
+            return list(value or [])
+
+        aid = post["author_id"]
+        if aid and row.author_user_id is not None:
+            post["author"].update({
+                "follower_count": row.author_followers_count or 0,
+                "following_count": row.author_following_count or 0,
+                "posts_count": row.author_posts_count or 0,
+            })
+        if aid and viewer_id and viewer_id != aid:
+            post["author"]["is_following"] = bool(row.author_is_following)
+
+        images = _json_list(row.images_json)
+        urls = storage.get_urls(
+            img[variant] for img in images for variant in ("thumbnail_url", "medium_url", "original_url")
+        )
+        post["images"] = [
+            {
+                "id": img["id"],
+                "position": img["position"],
+                "thumbnail_url": urls[3 * index] or None,
+                "medium_url": urls[3 * index + 1] or None,
+                "original_url": urls[3 * index + 2] or None,
+                "width": img["width"],
+                "height": img["height"],
+            }
+            for index, img in enumerate(images)
+        ]
+
+        if include_owner_privacy and aid == viewer_id:
+            rules: List[str] = []
+            for rule_type in _json_list(row.privacy_rules_json):
+                if rule_type not in rules:
+                    rules.append(rule_type)
+            specific_users: List[int] = []
+            for user_id in _json_list(row.specific_users_json):
+                if user_id not in specific_users:
+                    specific_users.append(user_id)
+            post["privacy_rules"] = rules
+            post["specific_users"] = specific_users
+
     async def _fetch_deleted_post_tombstone(self, post_id: str) -> Optional[Dict[str, Any]]:
         result = await self.db.execute(
             select(Post, User).join(User, User.id == Post.author_id).where(
@@ -361,4 +361,48 @@ class ShareRepository(BaseRepository):
             await self.delete(share)
             count += 1
         
-        return count
\ No newline at end of file
+        return count
+    
+    async def remove_recipient_from_shares(self, user_id: int) -> int:
+        """
+        Remove a user from the recipient list of every share that names them.
+        
+        One UPDATE that filters the JSON array in SQL, so shares are never
+        loaded into Python; recipient order is preserved. Does not commit.
+        
+        Args:
+            user_id: ID of the recipient to remove
+            
+        Returns:
+            int: Number of shares updated
+        """
+        dialect = self.db.bind.dialect.name if self.db.bind is not None else ""
+        if dialect == "postgresql":
+            query = text("""
+                UPDATE shares SET recipient_user_ids = COALESCE((
+                    SELECT jsonb_agg(recipient ORDER BY position)
+                    FROM jsonb_array_elements(shares.recipient_user_ids)
+                         WITH ORDINALITY AS r(recipient, position)
+                    WHERE recipient <> to_jsonb(CAST(:user_id AS integer))
+                ), CAST('[]' AS jsonb))
+                WHERE jsonb_typeof(recipient_user_ids) = 'array'
+                  AND recipient_user_ids @> jsonb_build_array(CAST(:user_id AS integer))
+            """)
+        else:
+            query = text("""
+                UPDATE shares SET recipient_user_ids = (
+                    SELECT json_group_array(value) FROM (
+                        SELECT value FROM json_each(shares.recipient_user_ids)
+                        WHERE value != :user_id
+                        ORDER BY key
+                    )
+                )
+                WHERE json_type(recipient_user_ids) = 'array'
+                  AND EXISTS (
+                      SELECT 1 FROM json_each(shares.recipient_user_ids)
+                      WHERE value = :user_id
+                  )
+            """)
+        
+        result = await self.execute_raw_query(query, {"user_id": user_id})
+        return result.rowcount or 0
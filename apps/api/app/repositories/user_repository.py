@@ -5,10 +5,10 @@ User repository with specialized query methods.
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, text, or_, and_
+from sqlalchemy import ARRAY, String, bindparam, func, text, or_
 from app.core.repository_base import BaseRepository
 from app.models.user import User
-from app.models.post import Post
+from app.models.user_counters import REFRESH_USER_COUNTERS_SQL
 
 
 class UserRepository(BaseRepository):
@@ -24,7 +24,34 @@ class UserRepository(BaseRepository):
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         return await self.find_one({"username": username})
-    
+
+    async def get_by_usernames(self, usernames: List[str]) -> List[User]:
+        """
+        Get the users with any of the given usernames in one query.
+
+        Matching is exact, like get_by_username; unknown usernames are skipped.
+
+        Args:
+            usernames: Usernames to resolve
+
+        Returns:
+            List[User]: Matching users, in no particular order
+        """
+        if not usernames:
+            return []
+
+        names = sorted(set(usernames))
+        dialect = self.db.bind.dialect.name if self.db.bind is not None else ""
+        if dialect == "postgresql":
+            # One array parameter, so the statement text (and its cached plan)
+            # is the same however many usernames there are
+            condition = User.username == func.any(bindparam("names", names, type_=ARRAY(String)))
+        else:
+            condition = User.username.in_(names)
+        query = self.query().filter(condition).build()
+        result = await self._execute_query(query, "get users by usernames")
+        return list(result.scalars().all())
+
     async def search_by_username(
         self, 
         query: str, 
@@ -87,34 +114,19 @@ class UserRepository(BaseRepository):
         if not user_ids:
             return {}
 
-        from app.models.follow import Follow
-        
-        # Optimized: Single query for all stats using correlated subqueries
-        # This is efficient for batches up to 50 users and ensures exactly 1 SQL connection/query
-        posts_sub = select(func.count(Post.id)).where(
-            and_(Post.author_id == User.id, Post.deleted_at.is_(None))
-        ).scalar_subquery()
-        public_sub = select(func.count(Post.id)).where(
-            and_(
-                Post.author_id == User.id,
-                Post.privacy_level == "public",
-                Post.deleted_at.is_(None),
-            )
-        ).scalar_subquery()
-        followers_sub = select(func.count(Follow.id)).where(and_(Follow.followed_id == User.id, Follow.status == "active")).scalar_subquery()
-        following_sub = select(func.count(Follow.id)).where(and_(Follow.follower_id == User.id, Follow.status == "active")).scalar_subquery()
-        
+        # Counters are maintained on write (app/models/user_counters.py),
+        # so this is a primary-key lookup.
         query = select(
             User.id,
-            posts_sub.label("posts_count"),
-            public_sub.label("public_posts_count"),
-            followers_sub.label("followers_count"),
-            following_sub.label("following_count")
+            User.posts_count,
+            User.public_posts_count,
+            User.followers_count,
+            User.following_count,
         ).where(User.id.in_(user_ids))
-        
+
         result = await self._execute_query(query, "batch get user stats")
         rows = result.fetchall()
-        
+
         return {
             row.id: {
                 "posts_count": row.posts_count,
@@ -123,6 +135,72 @@ class UserRepository(BaseRepository):
                 "following_count": row.following_count
             } for row in rows
         }
+
+    async def refresh_user_counters(self, user_ids: List[int]) -> None:
+        """
+        Recompute the denormalized counters for the given users.
+
+        ORM writes of follows and posts adjust them automatically; call this
+        after bulk SQL that bypasses the ORM.
+        """
+        params = [{"user_id": user_id} for user_id in dict.fromkeys(user_ids)]
+        # executemany: one round trip however many users were touched
+        if params:
+            await self.db.execute(REFRESH_USER_COUNTERS_SQL, params)
+
+    async def reconcile_user_counters(self) -> int:
+        """
+        Repair drift between the users counters and the follows/posts rows.
+
+        Single set-based statement; only users whose stored counters differ
+        from the live aggregates are written. Also serves as the backfill.
+
+        Returns:
+            int: Number of users whose counters were rewritten
+        """
+        query = text("""
+            UPDATE users SET
+                posts_count = live.posts_count,
+                public_posts_count = live.public_posts_count,
+                followers_count = live.followers_count,
+                following_count = live.following_count
+            FROM (
+                SELECT u.id AS user_id,
+                       COALESCE(pc.posts_count, 0) AS posts_count,
+                       COALESCE(pc.public_posts_count, 0) AS public_posts_count,
+                       COALESCE(fr.followers_count, 0) AS followers_count,
+                       COALESCE(fg.following_count, 0) AS following_count
+                FROM users u
+                LEFT JOIN (
+                    SELECT author_id,
+                           COUNT(*) AS posts_count,
+                           SUM(CASE WHEN privacy_level = 'public' THEN 1 ELSE 0 END) AS public_posts_count
+                    FROM posts
+                    WHERE deleted_at IS NULL
+                    GROUP BY author_id
+                ) pc ON pc.author_id = u.id
+                LEFT JOIN (
+                    SELECT followed_id, COUNT(*) AS followers_count
+                    FROM follows WHERE status = 'active'
+                    GROUP BY followed_id
+                ) fr ON fr.followed_id = u.id
+                LEFT JOIN (
+                    SELECT follower_id, COUNT(*) AS following_count
+                    FROM follows WHERE status = 'active'
+                    GROUP BY follower_id
+                ) fg ON fg.follower_id = u.id
+            ) live
+            WHERE users.id = live.user_id
+              AND (users.posts_count != live.posts_count
+                   OR users.public_posts_count != live.public_posts_count
+                   OR users.followers_count != live.followers_count
+                   OR users.following_count != live.following_count)
+        """)
+        result = await self.execute_raw_query(query)
+        repaired = result.rowcount or 0
+        if repaired:
+            self.logger.warning(f"Reconciled counters for {repaired} users")
+        return repaired
     
     async def check_username_availability(
         self, 
@@ -271,7 +349,6 @@ class UserRepository(BaseRepository):
             return []
         
         # Use case-insensitive comparison for username matching
-        from sqlalchemy import func
         lowercase_usernames = [username.lower() for username in usernames]
         query = self.query().filter(func.lower(User.username).in_(lowercase_usernames)).build()
         result = await self._execute_query(query, "get existing usernames")
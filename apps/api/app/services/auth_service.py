@@ -14,10 +14,12 @@ from app.core.exceptions import (
     ResurrectionRequired,
     ValidationException,
 )
+from app.core.principal_cache import invalidate_principal
 from app.models.user import User
 from app.models.token import PasswordResetToken
 import secrets
-from app.core.security import create_access_token, create_refresh_token, decode_token, get_password_hash, verify_password
+from app.core.password_hashing import password_hasher
+from app.core.security import create_access_token, create_refresh_token, decode_token
 
 logger = logging.getLogger(__name__)
 
@@ -132,7 +134,7 @@ class AuthService(BaseService):
         if not await check_username_available(self.db, username):
             raise ConflictError("Username already taken", "user")
 
-        hashed_password = get_password_hash(password)
+        hashed_password = await password_hasher.hash(password)
         user = await self.create_entity(
             User,
             email=email,
@@ -190,9 +192,16 @@ class AuthService(BaseService):
                 f"This account uses {provider_name} authentication. Please continue with {provider_name}."
             )
 
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             raise AuthenticationError("Incorrect email or password")
         self._ensure_active_user(user)
+
+        # Work factor changed since this hash was made; store the rehash
+        if new_hash:
+            user.hashed_password = new_hash
+            await self.db.commit()
+            logger.info(f"Password rehashed at the current work factor for user: {user.id}")
         
         # Create access and refresh tokens
         token_data = self._token_data_for_user(user)
@@ -309,6 +318,24 @@ class AuthService(BaseService):
         # For now, we just return a success message
         return {"message": "Successfully logged out"}
 
+    async def logout_all(self, user_id: int) -> Dict[str, str]:
+        """
+        Revoke every access and refresh token issued to a user.
+
+        Args:
+            user_id: ID of the user to sign out everywhere
+
+        Returns:
+            Dict with success message
+        """
+        user = await self.get_by_id_or_404(User, user_id, "User")
+        user.token_version = (user.token_version or 0) + 1
+        await self.db.commit()
+        invalidate_principal(user.id)
+
+        logger.info(f"Revoked all sessions for user: {user.id}")
+        return {"message": "Successfully logged out of all sessions"}
+
     async def generate_password_reset_token(self, email: str) -> Optional[str]:
         """
         Generate a password reset token for a user.
@@ -2,12 +2,16 @@
 CommentService for handling comment business logic.
 """
 
+import base64
+import binascii
+import json
 import logging
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from sqlalchemy import delete, or_
+from sqlalchemy import and_, delete, func, or_
 from app.core.service_base import BaseService
 from app.core.constants import COMMENT_MAX_LENGTH
 from app.core.exceptions import NotFoundError, ValidationException, PermissionDeniedError, BusinessLogicError
@@ -17,6 +21,7 @@ from app.models.comment import Comment
 from app.models.emoji_reaction import EmojiReaction
 from app.models.post import Post
 from app.models.user import User
+from app.repositories.emoji_reaction_repository import EmojiReactionRepository
 from app.core.notification_factory import NotificationFactory
 
 logger = logging.getLogger(__name__)
@@ -155,57 +160,190 @@ class CommentService(BaseService):
             "user": serialize_public_user_reference(user)
         }
 
+    @staticmethod
+    def _serialize_comment(comment: Comment) -> Dict[str, Any]:
+        return {
+            "id": comment.id,
+            "post_id": comment.post_id,
+            "user_id": comment.user_id,
+            "parent_comment_id": comment.parent_comment_id,
+            "content": comment.content,
+            "created_at": comment.created_at.isoformat(),
+            "updated_at": comment.updated_at.isoformat() if comment.updated_at else None,
+            "edited_at": comment.edited_at.isoformat() if comment.edited_at else None,
+            "user": serialize_public_user_reference(comment.user)
+        }
+
+    @classmethod
+    def _serialize_replies(cls, replies: List[Comment]) -> List[Dict[str, Any]]:
+        """Serialize one comment's replies, oldest first; only the last one can be deleted."""
+        reply_list = []
+        for index, reply in enumerate(replies):
+            reply_dict = cls._serialize_comment(reply)
+            reply_dict["can_delete"] = index == len(replies) - 1
+            reply_list.append(reply_dict)
+        return reply_list
+
+    @staticmethod
+    def encode_cursor(comment: Dict[str, Any]) -> str:
+        """Encode the keyset position after a serialized top-level comment as base64url JSON."""
+        payload = {"t": comment["created_at"], "id": comment["id"]}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Decode and validate a comment pagination cursor."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor))
+            return datetime.fromisoformat(payload["t"]), str(payload["id"])
+        except (json.JSONDecodeError, binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError) as exc:
+            raise ValidationException("Invalid cursor", {"cursor": "Malformed pagination cursor"}) from exc
+
     async def get_post_comments(
         self,
         post_id: str,
-        include_replies: bool = True
+        include_replies: bool = True,
+        current_user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get all comments for a post with user data loaded.
+        Get comments for a post with user data loaded.
         
         Args:
             post_id: ID of the post
             include_replies: Whether to include replies (default: True)
+            current_user_id: If given, fold each comment's reaction summary in
+            limit: Maximum number of top-level comments (default: all)
+            cursor: Cursor from encode_cursor() for the previous page
             
         Returns:
             List[Dict]: List of comment dictionaries with user data and full URLs
         """
-        # Build query for top-level comments
-        query = select(Comment).where(
-            Comment.post_id == post_id,
-            Comment.parent_comment_id.is_(None)
-        ).options(
-            selectinload(Comment.user)
-        ).order_by(Comment.created_at.asc())
+        comments, _ = await self.get_post_comments_page(
+            post_id, include_replies, current_user_id, limit, cursor
+        )
+        return comments
+
+    async def get_post_comments_page(
+        self,
+        post_id: str,
+        include_replies: bool = True,
+        current_user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Load a page of a post's comment tree without per-comment queries.
         
-        result = await self.db.execute(query)
-        comments = result.scalars().all()
+        The whole thread comes from one query when it is not paginated;
+        otherwise one query for the page of top-level comments and one for
+        their replies. Authors are batch-loaded with each query, and reaction
+        summaries come from one grouped query.
         
-        # Convert to dictionaries
+        Returns:
+            Tuple of the serialized top-level comments (oldest first, each with
+            reply_count and, if requested, replies) and the cursor for the next
+            page, or None if this is the last one
+        """
+        top_level: List[Comment]
+        replies: Dict[str, List[Comment]] = {}
+        reply_counts: Dict[str, int] = {}
+        paginated = limit is not None or cursor is not None
+
+        if include_replies and not paginated:
+            query = select(Comment).where(
+                Comment.post_id == post_id
+            ).options(
+                selectinload(Comment.user)
+            ).order_by(Comment.created_at.asc())
+            result = await self.db.execute(query)
+            top_level = []
+            for comment in result.scalars().all():
+                if comment.parent_comment_id is None:
+                    top_level.append(comment)
+                else:
+                    replies.setdefault(comment.parent_comment_id, []).append(comment)
+        else:
+            query = select(Comment).where(
+                Comment.post_id == post_id,
+                Comment.parent_comment_id.is_(None)
+            ).options(
+                selectinload(Comment.user)
+            )
+            if paginated:
+                # Keyset pages need a total order; ties on created_at go by id
+                query = query.order_by(Comment.created_at.asc(), Comment.id.asc())
+            else:
+                query = query.order_by(Comment.created_at.asc())
+            if cursor:
+                created_at, comment_id = self.decode_cursor(cursor)
+                query = query.where(
+                    or_(
+                        Comment.created_at > created_at,
+                        and_(Comment.created_at == created_at, Comment.id > comment_id)
+                    )
+                )
+            if limit is not None:
+                query = query.limit(limit + 1)
+            result = await self.db.execute(query)
+            top_level = list(result.scalars().all())
+
+        has_more = limit is not None and len(top_level) > limit
+        if has_more:
+            top_level = top_level[:limit]
+
+        parent_ids = [comment.id for comment in top_level]
+        if parent_ids and include_replies and paginated:
+            query = select(Comment).where(
+                Comment.post_id == post_id,
+                Comment.parent_comment_id.in_(parent_ids)
+            ).options(
+                selectinload(Comment.user)
+            ).order_by(Comment.created_at.asc())
+            result = await self.db.execute(query)
+            for reply in result.scalars().all():
+                replies.setdefault(reply.parent_comment_id, []).append(reply)
+        elif parent_ids and not include_replies:
+            query = select(
+                Comment.parent_comment_id, func.count(Comment.id)
+            ).where(
+                Comment.post_id == post_id,
+                Comment.parent_comment_id.in_(parent_ids)
+            ).group_by(Comment.parent_comment_id)
+            result = await self.db.execute(query)
+            reply_counts = {parent_id: count for parent_id, count in result.all()}
+
+        reaction_summaries: Dict[str, Dict[str, Any]] = {}
+        if current_user_id is not None and parent_ids:
+            reaction_summaries = await EmojiReactionRepository(self.db).get_comment_reaction_summaries(
+                post_id, current_user_id
+            )
+
+        def with_reactions(comment_dict: Dict[str, Any]) -> Dict[str, Any]:
+            if current_user_id is not None:
+                comment_dict["reactions"] = reaction_summaries.get(
+                    comment_dict["id"],
+                    {"totalCount": 0, "emojiCounts": {}, "userReaction": None}
+                )
+            return comment_dict
+
         comment_list = []
-        for comment in comments:
-            comment_dict = {
-                "id": comment.id,
-                "post_id": comment.post_id,
-                "user_id": comment.user_id,
-                "parent_comment_id": comment.parent_comment_id,
-                "content": comment.content,
-                "created_at": comment.created_at.isoformat(),
-                "updated_at": comment.updated_at.isoformat() if comment.updated_at else None,
-                "edited_at": comment.edited_at.isoformat() if comment.edited_at else None,
-                "user": serialize_public_user_reference(comment.user)
-            }
-            
-            # Fetch replies if requested (lazy loading for performance)
+        for comment in top_level:
+            comment_dict = with_reactions(self._serialize_comment(comment))
             if include_replies:
-                replies = await self.get_comment_replies(comment.id)
-                comment_dict["replies"] = replies
+                comment_replies = replies.get(comment.id, [])
+                comment_dict["replies"] = [
+                    with_reactions(reply) for reply in self._serialize_replies(comment_replies)
+                ]
+                comment_dict["reply_count"] = len(comment_replies)
             else:
                 comment_dict["replies"] = []
-            
+                comment_dict["reply_count"] = reply_counts.get(comment.id, 0)
             comment_list.append(comment_dict)
-        
-        return comment_list
+
+        next_cursor = self.encode_cursor(comment_list[-1]) if has_more else None
+        return comment_list, next_cursor
 
     async def get_comment_replies(self, comment_id: str) -> List[Dict[str, Any]]:
         """
@@ -226,30 +364,7 @@ class CommentService(BaseService):
         ).order_by(Comment.created_at.asc())
 
         result = await self.db.execute(query)
-        replies = list(result.scalars().all())
-
-        # Build reply list - only the last reply can be deleted
-        reply_list = []
-        total_replies = len(replies)
-
-        for index, reply in enumerate(replies):
-            # Only the last reply (chronologically) can be deleted
-            is_last_reply = (index == total_replies - 1)
-
-            reply_list.append({
-                "id": reply.id,
-                "post_id": reply.post_id,
-                "user_id": reply.user_id,
-                "parent_comment_id": reply.parent_comment_id,
-                "content": reply.content,
-                "created_at": reply.created_at.isoformat(),
-                "updated_at": reply.updated_at.isoformat() if reply.updated_at else None,
-                "edited_at": reply.edited_at.isoformat() if reply.edited_at else None,
-                "user": serialize_public_user_reference(reply.user),
-                "can_delete": is_last_reply  # Only the last reply can be deleted
-            })
-
-        return reply_list
+        return self._serialize_replies(list(result.scalars().all()))
 
     async def edit_comment(
         self,
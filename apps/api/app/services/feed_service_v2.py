@@ -11,6 +11,7 @@ import base64
 import binascii
 import json
 import logging
+import math
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
@@ -23,7 +24,9 @@ from app.config.feed_config import (
     DEFAULT_PAGE_SIZE,
     MAX_PAGE_SIZE,
     CANDIDATE_MULTIPLIER,
+    CANDIDATE_SLICE_LIMIT,
     CURSOR_VERSION,
+    FEED_CACHE_DEPTH_PAGES,
     RECENCY_WINDOW_SECONDS,
     RECENCY_MAX,
     ENGAGEMENT_MAX,
@@ -52,10 +55,12 @@ from app.config.feed_config import (
     FILTER_BOOST_WEIGHT,
     FILTER_BOOST_MAX,
 )
+from app.core.feed_cache import FeedRankingSnapshot, FeedResultCache, feed_result_cache
 from app.core.service_base import BaseService
 from app.models.post import Post
 from app.models.user import User
 from app.repositories.post_repository import PostRepository
+from app.services.post_privacy_service import PostPrivacyService
 
 logger = logging.getLogger(__name__)
 
@@ -86,9 +91,18 @@ def build_grouped_predicate_clause(groups: List[PredicateGroup]) -> str:
 class FeedServiceV2(BaseService):
     """Simplified feed service with SQL-computed scores and cursor pagination."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        candidate_window: bool = True,
+        result_cache: Optional[FeedResultCache] = feed_result_cache,
+    ):
         super().__init__(db)
         self._is_pg = self._detect_postgresql()
+        # Score a bounded candidate set first; see _candidate_window_sql.
+        self._candidate_window = candidate_window
+        # Ranked orderings reused by cursor pages; None disables caching.
+        self._result_cache = result_cache
 
     def _detect_postgresql(self) -> bool:
         try:
@@ -154,12 +168,33 @@ class FeedServiceV2(BaseService):
 
         # Fetch a wider candidate pool so author spacing has room to diversify
         fetch_size = page_size * CANDIDATE_MULTIPLIER
+
+        use_cache = self._result_cache is not None and not debug
+        cache_key = (
+            self._result_cache.make_key(user_id, query_time, filter_spec) if use_cache else None
+        )
+        if use_cache and cursor_data:
+            cached_response = await self._get_cached_page(
+                cache_key=cache_key,
+                user_id=user_id,
+                query_time=query_time,
+                cursor_data=cursor_data,
+                page_size=page_size,
+                fetch_size=fetch_size,
+            )
+            if cached_response is not None:
+                return cached_response
+
+        # When caching, rank several pages deep so the following cursors hit.
+        query_limit = fetch_size * FEED_CACHE_DEPTH_PAGES if use_cache else fetch_size
+        bounded = self._candidate_window and not self._has_active_filters(filter_spec)
         query, params = self._build_feed_query(
             user_id=user_id,
             query_time=query_time,
             cursor_data=cursor_data,
-            page_size=fetch_size,
+            page_size=query_limit,
             filter_spec=filter_spec,
+            bounded=bounded,
         )
         logger.info(
             "[FEED_FILTERS][query-exec] user_id=%s params_keys=%s",
@@ -169,6 +204,25 @@ class FeedServiceV2(BaseService):
         result = await self.db.execute(query, params)
         rows = result.fetchall()
 
+        # The bounded window is only used when it provably yields the same page
+        # as scoring every post; otherwise re-run against the full table.
+        if bounded and not self._candidate_window_is_exact(rows, fetch_size):
+            bounded = False
+            query, params = self._build_feed_query(
+                user_id=user_id,
+                query_time=query_time,
+                cursor_data=cursor_data,
+                page_size=query_limit,
+                filter_spec=filter_spec,
+                bounded=False,
+            )
+            result = await self.db.execute(query, params)
+            rows = result.fetchall()
+
+        if use_cache and rows:
+            await self._store_snapshot(cache_key, rows, query_limit, bounded)
+        rows = rows[:fetch_size]
+
         if not rows:
             return {"posts": [], "nextCursor": None}
 
@@ -257,32 +311,50 @@ class FeedServiceV2(BaseService):
             if debug and post_dict["id"] in debug_data:
                 post_dict["_debug"] = debug_data[post_dict["id"]]
 
-        # Build next cursor from the logical SQL boundary, not the reordered spaced last item.
-        # This prevents "skipping" high-ranked posts that were pushed down by author spacing.
-        next_cursor = None
-        if has_more and len(candidates) >= page_size:
-            # The boundary is the page_size-th item in the ORIGINAL SQL result
-            boundary_post = candidates[page_size - 1]
-            last_created_at = boundary_post.created_at
-            if isinstance(last_created_at, str):
-                last_created_at = datetime.fromisoformat(last_created_at)
-
-            next_cursor = self._encode_cursor(
-                query_time=query_time,
-                score=float(boundary_post._feed_score),
-                created_at=last_created_at,
-                post_id=boundary_post.id,
-            )
-
+        next_cursor = self._next_cursor(candidates, page_size, has_more, query_time)
         response = {"posts": serialized, "nextCursor": next_cursor}
         if debug:
             response["_debugMeta"] = {
                 "queryTime": query_time.isoformat(),
                 "postCount": len(serialized),
                 "candidateCount": len(candidates),
+                "candidateWindow": "bounded" if bounded else "full",
                 "spacingMoves": spacing_log,
             }
         
+        self._check_privacy_invariant(serialized, user_id)
+        return response
+
+    # ------------------------------------------------------------------
+    # Page assembly
+    # ------------------------------------------------------------------
+
+    def _next_cursor(
+        self,
+        candidates: List[Post],
+        page_size: int,
+        has_more: bool,
+        query_time: datetime,
+    ) -> Optional[str]:
+        # Build next cursor from the logical SQL boundary, not the reordered spaced last item.
+        # This prevents "skipping" high-ranked posts that were pushed down by author spacing.
+        if not (has_more and len(candidates) >= page_size):
+            return None
+        # The boundary is the page_size-th item in the ORIGINAL SQL result
+        boundary_post = candidates[page_size - 1]
+        last_created_at = boundary_post.created_at
+        if isinstance(last_created_at, str):
+            last_created_at = datetime.fromisoformat(last_created_at)
+
+        return self._encode_cursor(
+            query_time=query_time,
+            score=float(boundary_post._feed_score),
+            created_at=last_created_at,
+            post_id=boundary_post.id,
+        )
+
+    @staticmethod
+    def _check_privacy_invariant(serialized: List[Dict[str, Any]], user_id: int) -> None:
         # Runtime invariant check: No private post leakage
         for post_dict in serialized:
             privacy = post_dict.get("privacy_level")
@@ -295,8 +367,105 @@ class FeedServiceV2(BaseService):
                 )
                 from app.core.exceptions import InternalServerError
                 raise InternalServerError("Feed privacy invariant violated: private post leaked to unauthorized user")
-        
-        return response
+
+    # ------------------------------------------------------------------
+    # Cursor page cache
+    # ------------------------------------------------------------------
+
+    async def _store_snapshot(
+        self,
+        cache_key: str,
+        rows: List[Any],
+        query_limit: int,
+        bounded: bool,
+    ) -> None:
+        """Cache the part of a ranked result that later cursor pages can reuse.
+
+        From the bounded window only the prefix that provably matches full
+        scoring is kept, and the ordering is complete only if the query ran
+        out of posts before its limit.
+        """
+        exact = self._exact_prefix_length(rows) if bounded else len(rows)
+        complete = (
+            len(rows) < query_limit
+            and exact == len(rows)
+            and (not bounded or bool(int(rows[0].window_exhaustive)))
+        )
+        entries = []
+        for row in rows[:exact]:
+            created_at = row.created_at
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            entries.append((str(row.id), row.author_id, float(row.feed_score), created_at))
+        await self._result_cache.store_snapshot(
+            cache_key, FeedRankingSnapshot(entries=entries, complete=complete)
+        )
+
+    async def _get_cached_page(
+        self,
+        cache_key: str,
+        user_id: int,
+        query_time: datetime,
+        cursor_data: Dict[str, Any],
+        page_size: int,
+        fetch_size: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Serve a cursor page from a cached ordering, or None to fall back to SQL."""
+        cache = self._result_cache
+        snapshot = await cache.get_snapshot(cache_key)
+        if snapshot is None:
+            return None
+        following = snapshot.entries_after(cursor_data["id"], cursor_data["score"])
+        if following is None:
+            return None
+        window = following[:fetch_size]
+        if len(window) < fetch_size and not snapshot.complete:
+            return None
+        if not window:
+            return {"posts": [], "nextCursor": None}
+        if await cache.has_invalidated_posts(snapshot, [entry[0] for entry in window]):
+            await cache.discard(cache_key)
+            return None
+
+        candidates = []
+        for post_id, author_id, score, created_at in window:
+            post = Post(id=post_id, author_id=author_id, created_at=created_at)
+            post._feed_score = score
+            candidates.append(post)
+
+        spaced = self._apply_author_spacing(candidates)
+        has_more = len(spaced) > page_size
+        page = spaced[:page_size]
+
+        # The snapshot only fixes the order: deletion and visibility are
+        # re-checked here, and any drift sends the page back to SQL.
+        page_ids = [p.id for p in page]
+        result = await self.db.execute(
+            select(Post).where(
+                Post.id.in_(page_ids),
+                Post.deleted_at.is_(None),
+                PostPrivacyService.visible_to_user_clause(user_id),
+            )
+        )
+        hydrated = {p.id: p for p in result.scalars().all()}
+        if len(hydrated) != len(page_ids):
+            await cache.discard(cache_key)
+            return None
+        posts = [hydrated[post_id] for post_id in page_ids]
+
+        serialized = await PostRepository(self.db).serialize_posts_for_feed(
+            posts=posts,
+            user_id=user_id,
+        )
+        for post_dict in serialized:
+            if post_dict["id"] in hydrated:
+                post_dict["privacy_level"] = hydrated[post_dict["id"]].privacy_level
+
+        self._check_privacy_invariant(serialized, user_id)
+        return {
+            "posts": serialized,
+            "nextCursor": self._next_cursor(candidates, page_size, has_more, query_time),
+        }
 
     # ------------------------------------------------------------------
     # Query building
@@ -309,6 +478,7 @@ class FeedServiceV2(BaseService):
         cursor_data: Optional[Dict],
         page_size: int,
         filter_spec: Dict[str, Any],
+        bounded: bool = False,
     ) -> Tuple[Any, Dict]:
         """Build the CTE-based scored feed query."""
         if self._is_pg:
@@ -318,6 +488,7 @@ class FeedServiceV2(BaseService):
                 cursor_data,
                 page_size,
                 filter_spec,
+                bounded,
             )
         else:
             return self._build_sqlite_query(
@@ -326,8 +497,127 @@ class FeedServiceV2(BaseService):
                 cursor_data,
                 page_size,
                 filter_spec,
+                bounded,
             )
 
+    # ------------------------------------------------------------------
+    # Bounded candidate window
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _has_active_filters(filter_spec: Dict[str, Any]) -> bool:
+        return bool(
+            filter_spec.get("type_required")
+            or filter_spec.get("type_required_any")
+            or filter_spec.get("type_boost")
+            or filter_spec.get("date")
+            or filter_spec.get("author")
+            or filter_spec.get("keyword")
+        )
+
+    @staticmethod
+    def _candidate_window_sql(window_predicate: str) -> Dict[str, str]:
+        """Candidate slices scored instead of every non-deleted post.
+
+        Outside RECENCY_WINDOW_SECONDS the recency, relationship, own-post and
+        recent-engagement components are all zero, so an older post can only
+        score through engagement, the viewer's own reaction, discovery and
+        jitter. The slices therefore are:
+          - recent: every post inside the recency window (covers the
+            followed-author and own-post boosts, which also decay to zero);
+          - reacted: posts the viewer reacted to (USER_REACTION_BOOST);
+          - top commented / shared / reacted: the CANDIDATE_SLICE_LIMIT most
+            engaged posts per engagement input (engagement and discovery).
+        slice_bounds reports the engagement floor of each full slice so the
+        caller can bound the score of any post left out.
+        """
+        ctes = f"""
+            recent_slice AS (
+                SELECT p.id FROM posts p
+                WHERE p.deleted_at IS NULL AND {window_predicate}
+            ),
+            reacted_slice AS (
+                SELECT er.post_id AS id FROM emoji_reactions er
+                WHERE er.user_id = :uid AND er.object_type = 'post'
+            ),
+            top_commented AS (
+                SELECT p.id, COALESCE(p.comments_count, 0) AS v FROM posts p
+                WHERE p.deleted_at IS NULL
+                ORDER BY p.comments_count DESC
+                LIMIT :slice_lim
+            ),
+            top_shared AS (
+                SELECT p.id, COALESCE(p.shares_count, 0) AS v FROM posts p
+                WHERE p.deleted_at IS NULL
+                ORDER BY p.shares_count DESC
+                LIMIT :slice_lim
+            ),
+            top_reacted AS (
+                SELECT es.post_id AS id, es.reactions_distinct_users AS v
+                FROM post_engagement_stats es
+                ORDER BY es.reactions_distinct_users DESC
+                LIMIT :slice_lim
+            ),
+            candidates AS (
+                SELECT id FROM recent_slice
+                UNION SELECT id FROM reacted_slice
+                UNION SELECT id FROM top_commented
+                UNION SELECT id FROM top_shared
+                UNION SELECT id FROM top_reacted
+            ),
+            slice_bounds AS (
+                SELECT
+                    CASE WHEN (SELECT COUNT(*) FROM top_commented) < :slice_lim
+                         THEN 1 ELSE 0 END AS window_exhaustive,
+                    (SELECT MIN(v) FROM top_commented) AS bound_comments,
+                    (SELECT MIN(v) FROM top_shared) AS bound_shares,
+                    CASE WHEN (SELECT COUNT(*) FROM top_reacted) < :slice_lim
+                         THEN 0 ELSE (SELECT MIN(v) FROM top_reacted) END AS bound_reactions
+            ),
+        """
+        return {
+            "ctes": ctes,
+            "source": "candidates c JOIN posts p ON p.id = c.id",
+            "bounds_join": "CROSS JOIN slice_bounds",
+        }
+
+    @staticmethod
+    def _excluded_score_bound(row) -> float:
+        """Upper bound on feed_score for any post outside the candidate window."""
+        raw = (
+            int(row.bound_comments or 0) * WEIGHT_COMMENTS
+            + int(row.bound_shares or 0) * WEIGHT_SHARES
+            + int(row.bound_reactions or 0) * WEIGHT_REACTIONS
+        )
+        engagement = min(
+            COMBINED_ENGAGEMENT_MAX,
+            min(ENGAGEMENT_MAX, math.log(1 + raw))
+            + DIVERSITY_BONUS_MAX_TYPES * DIVERSITY_BONUS_PER_TYPE,
+        )
+        return engagement + DISCOVERY_BOOST + JITTER_MAX / 2
+
+    def _exact_prefix_length(self, rows: List[Any]) -> int:
+        """Number of leading rows that scoring every post would rank identically."""
+        if not rows:
+            return 0
+        if int(rows[0].window_exhaustive):
+            return len(rows)
+        bound = self._excluded_score_bound(rows[0])
+        exact = 0
+        for row in rows:
+            if float(row.feed_score) <= bound:
+                break
+            exact += 1
+        return exact
+
+    def _candidate_window_is_exact(self, rows: List[Any], limit: int) -> bool:
+        """True when no post outside the window could have entered the first limit rows."""
+        if not rows:
+            return False
+        if int(rows[0].window_exhaustive):
+            return True
+        return self._exact_prefix_length(rows) >= limit
+
     @staticmethod
     def _normalize_feed_filters(
         query_time: datetime,
@@ -587,8 +877,9 @@ class FeedServiceV2(BaseService):
         cursor_data: Optional[Dict],
         page_size: int,
         filter_spec: Dict[str, Any],
+        bounded: bool = False,
     ) -> Tuple[Any, Dict]:
-        """PostgreSQL query with CTE and can_view_post."""
+        """PostgreSQL query with CTE and set-based viewer visibility."""
 
         cursor_filter = ""
         if cursor_data:
@@ -605,19 +896,18 @@ class FeedServiceV2(BaseService):
             len(filter_clauses["boost_predicates"]),
         )
 
-        REACTION_AGG = (
-            "reaction_agg AS ("
-            "  SELECT post_id,"
-            "         COUNT(DISTINCT user_id) AS reactions_distinct_users,"
-            "         COUNT(DISTINCT emoji_code) AS reactions_distinct_codes"
-            "  FROM emoji_reactions"
-            "  WHERE object_type = 'post'"
-            "  GROUP BY post_id"
-            "), "
-        )
+        # Visibility resolved once per request as a relation (see can_view_post)
+        VIEWER_GRANTS = PostPrivacyService.viewer_grants_cte_sql()
+        visibility_clause = PostPrivacyService.viewer_visibility_sql()
+
+        window = {"ctes": "", "source": "posts p", "bounds_join": ""}
+        if bounded:
+            window = self._candidate_window_sql(
+                f"p.created_at >= CAST(:qt AS timestamptz) - INTERVAL '{RECENCY_WINDOW_SECONDS} seconds'"
+            )
 
         sql = text(f"""
-            WITH {REACTION_AGG} scored AS (
+            WITH {VIEWER_GRANTS} {window["ctes"]} scored AS (
                 SELECT p.*,
                     -- recency: 10 -> 0 over 7 days
                     ({RECENCY_MAX} * GREATEST(0, 1.0 - ({age_pg}) / {RECENCY_WINDOW_SECONDS}.0))
@@ -732,27 +1022,31 @@ class FeedServiceV2(BaseService):
                         & 65535) / 65535.0
                     ) - {JITTER_MAX / 2})
                     AS feed_score
-                FROM posts p
+                FROM {window["source"]}
                 LEFT JOIN follows f_out
                     ON f_out.follower_id = :uid AND f_out.followed_id = p.author_id
                     AND f_out.status = 'active' AND p.author_id != :uid
                 LEFT JOIN follows f_in
                     ON f_in.follower_id = p.author_id AND f_in.followed_id = :uid
                     AND f_in.status = 'active' AND p.author_id != :uid
-                LEFT JOIN reaction_agg ra ON ra.post_id = p.id
+                -- materialized per-post reaction aggregate (see PostEngagementStats)
+                LEFT JOIN post_engagement_stats ra ON ra.post_id = p.id
                 LEFT JOIN emoji_reactions er_user
                     ON er_user.post_id = p.id AND er_user.user_id = :uid AND er_user.object_type = 'post'
+                LEFT JOIN viewer_grants vg ON vg.post_id = p.id
                 WHERE p.deleted_at IS NULL
-                  AND can_view_post(:uid, p.id::uuid)
+                  AND {visibility_clause}
                 {filter_clauses["required_clause"]}
             )
-            SELECT * FROM scored
+            SELECT * FROM scored {window["bounds_join"]}
             WHERE 1=1 {cursor_filter}
             ORDER BY feed_score DESC, created_at DESC, id DESC
             LIMIT :lim
         """)
 
         params = {"uid": user_id, "qt": query_time, "lim": page_size}
+        if bounded:
+            params["slice_lim"] = CANDIDATE_SLICE_LIMIT
         params.update(filter_clauses.get("params", {}))
         if cursor_data:
             params["cursor_s"] = cursor_data["score"]
@@ -768,6 +1062,7 @@ class FeedServiceV2(BaseService):
         cursor_data: Optional[Dict],
         page_size: int,
         filter_spec: Dict[str, Any],
+        bounded: bool = False,
     ) -> Tuple[Any, Dict]:
         """SQLite query for tests. Uses julianday for time math, LN/GREATEST registered as custom functions."""
 
@@ -785,55 +1080,6 @@ class FeedServiceV2(BaseService):
             filter_clauses["required_clause"] or "(none)",
             len(filter_clauses["boost_predicates"]),
         )
-        # Build visibility clause for SQLite (inline instead of can_view_post function)
-        visibility_clause = """
-            p.deleted_at IS NULL
-            AND (
-                p.author_id = :uid
-                OR p.privacy_level = 'public'
-                OR (
-                    p.privacy_level = 'custom'
-                    AND (
-                        (
-                            EXISTS (
-                                SELECT 1
-                                FROM post_privacy_rules ppr
-                                WHERE ppr.post_id = p.id
-                                  AND ppr.rule_type = 'followers'
-                            )
-                            AND EXISTS (
-                                SELECT 1
-                                FROM follows vf
-                                WHERE vf.follower_id = :uid
-                                  AND vf.followed_id = p.author_id
-                                  AND vf.status = 'active'
-                            )
-                        )
-                        OR (
-                            EXISTS (
-                                SELECT 1
-                                FROM post_privacy_rules ppr
-                                WHERE ppr.post_id = p.id
-                                  AND ppr.rule_type = 'following'
-                            )
-                            AND EXISTS (
-                                SELECT 1
-                                FROM follows af
-                                WHERE af.follower_id = p.author_id
-                                  AND af.followed_id = :uid
-                                  AND af.status = 'active'
-                            )
-                        )
-                        OR EXISTS (
-                            SELECT 1
-                            FROM post_privacy_users ppu
-                            WHERE ppu.post_id = p.id
-                              AND ppu.user_id = :uid
-                        )
-                    )
-                )
-            )
-        """
         # Deterministic jitter for SQLite: lightweight hash from UUID chars + query time
         jitter_sqlite = f"""
             ({JITTER_MAX} * (
@@ -845,19 +1091,16 @@ class FeedServiceV2(BaseService):
             ) - {JITTER_MAX / 2})
         """
 
-        REACTION_AGG = (
-            "reaction_agg AS ("
-            "  SELECT post_id,"
-            "         COUNT(DISTINCT user_id) AS reactions_distinct_users,"
-            "         COUNT(DISTINCT emoji_code) AS reactions_distinct_codes"
-            "  FROM emoji_reactions"
-            "  WHERE object_type = 'post'"
-            "  GROUP BY post_id"
-            "), "
-        )
+        # Visibility resolved once per request as a relation (see can_view_post)
+        VIEWER_GRANTS = PostPrivacyService.viewer_grants_cte_sql()
+        visibility_clause = PostPrivacyService.viewer_visibility_sql()
+
+        window = {"ctes": "", "source": "posts p", "bounds_join": ""}
+        if bounded:
+            window = self._candidate_window_sql(f"({age_expr}) <= {RECENCY_WINDOW_SECONDS}")
 
         sql = text(f"""
-            WITH {REACTION_AGG} scored AS (
+            WITH {VIEWER_GRANTS} {window["ctes"]} scored AS (
                 SELECT p.*,
                     -- recency: 10 -> 0 over 7 days
                     ({RECENCY_MAX} * GREATEST(0, 1.0 - ({age_expr}) / {RECENCY_WINDOW_SECONDS}.0))
@@ -962,20 +1205,23 @@ class FeedServiceV2(BaseService):
                     + {filter_clauses["boost_expr"]}
                     + ({jitter_sqlite})
                     AS feed_score
-                FROM posts p
+                FROM {window["source"]}
                 LEFT JOIN follows f_out
                     ON f_out.follower_id = :uid AND f_out.followed_id = p.author_id
                     AND f_out.status = 'active' AND p.author_id != :uid
                 LEFT JOIN follows f_in
                     ON f_in.follower_id = p.author_id AND f_in.followed_id = :uid
                     AND f_in.status = 'active' AND p.author_id != :uid
-                LEFT JOIN reaction_agg ra ON ra.post_id = p.id
+                -- materialized per-post reaction aggregate (see PostEngagementStats)
+                LEFT JOIN post_engagement_stats ra ON ra.post_id = p.id
                 LEFT JOIN emoji_reactions er_user
                     ON er_user.post_id = p.id AND er_user.user_id = :uid AND er_user.object_type = 'post'
-                WHERE {visibility_clause}
+                LEFT JOIN viewer_grants vg ON vg.post_id = p.id
+                WHERE p.deleted_at IS NULL
+                  AND {visibility_clause}
                 {filter_clauses["required_clause"]}
             )
-            SELECT * FROM scored
+            SELECT * FROM scored {window["bounds_join"]}
             WHERE 1=1 {cursor_filter}
             ORDER BY feed_score DESC, created_at DESC, id DESC
             LIMIT :lim
@@ -986,6 +1232,8 @@ class FeedServiceV2(BaseService):
             "qt": query_time.isoformat(),
             "lim": page_size,
         }
+        if bounded:
+            params["slice_lim"] = CANDIDATE_SLICE_LIMIT
         params.update(filter_clauses.get("params", {}))
         if cursor_data:
             params["cursor_s"] = cursor_data["score"]
@@ -2,6 +2,8 @@
 Shared file upload service for handling image uploads across the application.
 """
 
+import asyncio
+import hashlib
 import logging
 import uuid
 import os
@@ -14,13 +16,21 @@ from fastapi import UploadFile, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.service_base import BaseService
-from app.core.exceptions import ValidationException, BusinessLogicError
-from app.core.storage import storage  # Import the storage adapter
+from app.core.exceptions import ValidationException, BusinessLogicError, UpstreamServiceError
+from app.core.image_pipeline import (
+    ImageDecodeError,
+    RenderedVariant,
+    apply_circular_crop,
+    image_pipeline,
+    render_boxed_variant,
+    render_post_image,
+)
+from app.core.storage import StorageObject, storage  # Import the storage adapter
 from app.services.image_hash_service import ImageHashService
 from app.models.image_hash import ImageHash
 
 try:
-    from PIL import Image, ImageOps
+    from PIL import Image
 except ImportError:
     raise ImportError("PIL (Pillow) is required for image processing. Install with: pip install Pillow")
 
@@ -40,6 +50,24 @@ class ExistingFile:
     file_size: int
 
 
+@dataclass(eq=False)
+class _PendingPostImage:
+    """One post image on its way through save_post_images_variants."""
+
+    file: UploadFile
+    content: bytes
+    position: int
+    width: int
+    height: int
+    file_hash: str
+    store_hash: bool
+    variant_paths: Optional[Dict[str, str]] = None
+    same_as: Optional["_PendingPostImage"] = None
+    base_filename: Optional[str] = None
+    perceptual_hash: Optional[str] = None
+    image_hash: Optional[ImageHash] = None
+
+
 class FileUploadService(BaseService):
     """Shared service for file upload operations."""
 
@@ -124,7 +152,7 @@ class FileUploadService(BaseService):
             
             # Upload using storage adapter
             # Returns clean relative path: 'posts/abc.jpg'
-            relative_path = storage.upload_file(
+            relative_path = await storage.upload_file_async(
                 file_data=content,
                 folder=subdirectory,
                 filename=unique_filename,
@@ -174,121 +202,168 @@ class FileUploadService(BaseService):
             ValidationException: If image file is invalid
             BusinessLogicError: If processing fails
         """
+        results = await self.save_post_images_variants(
+            [file],
+            first_position=position,
+            force_upload=force_upload,
+            uploader_id=uploader_id,
+        )
+        return results[0]
+
+    async def save_post_images_variants(
+        self,
+        files: List[UploadFile],
+        first_position: int = 0,
+        force_upload: bool = False,
+        uploader_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Save every image of a post with its variants, like save_post_image_variants.
+
+        Duplicate lookups run image by image, then all new images are rendered
+        in parallel and all of their variants uploaded concurrently, so the
+        upload takes as long as the slowest object rather than the sum of them.
+        If anything fails, the variants uploaded by this call are deleted.
+
+        Args:
+            files: Uploaded image files, in post order
+            first_position: Position index of the first file
+
+        Returns:
+            One save_post_image_variants result per file, in order
+
+        Raises:
+            ValidationException: If an image file is invalid
+            BusinessLogicError: If processing fails
+        """
         from app.config.image_config import get_variant_config
 
         config = get_variant_config()
+        uploaded_paths: List[str] = []
 
         try:
-            content = await file.read()
-            file_size = len(content)
-            await file.seek(0)
-
-            image, original_width, original_height = self._prepare_post_image(content)
-            should_store_hash = not force_upload
-            if not force_upload:
-                existing = await self.get_existing_file_by_hash(file, upload_context="post")
-                if existing:
-                    existing_variant_paths = self._build_post_variant_paths(existing.file_path)
-                    if existing_variant_paths:
-                        await self.hash_service.increment_reference_count(existing.image_hash)
-                        return self._build_post_variant_result(
-                            position=position,
-                            width=original_width,
-                            height=original_height,
-                            file_size=file_size,
-                            variant_paths=existing_variant_paths,
-                        )
-                    # Only reuse stored hashes when they already point at post variants.
-                    # This avoids mutating unrelated upload flows such as profile photos.
-                    should_store_hash = False
-
-            # Generate unique base filename for all variants
-            base_filename = str(uuid.uuid4())
-            variant_paths = {}
-
-            # Helper function to resize maintaining aspect ratio
-            def resize_to_max_width(img: Image.Image, max_width: int) -> Image.Image:
-                if img.width <= max_width:
-                    return img.copy()
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                return img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-            # Create thumbnail variant
-            thumb_image = resize_to_max_width(image, config.thumbnail_width)
-            thumb_buffer = io.BytesIO()
-            thumb_image.save(thumb_buffer, "JPEG", quality=config.jpeg_quality, optimize=True)
-            thumb_filename = f"{base_filename}_thumb.jpg"
-            thumb_path = storage.upload_file(
-                file_data=thumb_buffer.getvalue(),
-                folder="posts",
-                filename=thumb_filename,
-                content_type="image/jpeg"
-            )
-            variant_paths['thumbnail_url'] = thumb_path
-
-            # Create medium variant
-            medium_image = resize_to_max_width(image, config.medium_width)
-            medium_buffer = io.BytesIO()
-            medium_image.save(medium_buffer, "JPEG", quality=config.jpeg_quality, optimize=True)
-            medium_filename = f"{base_filename}_medium.jpg"
-            medium_path = storage.upload_file(
-                file_data=medium_buffer.getvalue(),
-                folder="posts",
-                filename=medium_filename,
-                content_type="image/jpeg"
-            )
-            variant_paths['medium_url'] = medium_path
-
-            # Create original variant (capped to max width)
-            original_image = resize_to_max_width(image, config.original_max_width)
-            original_buffer = io.BytesIO()
-            original_image.save(original_buffer, "JPEG", quality=config.jpeg_quality, optimize=True)
-            original_filename = f"{base_filename}_original.jpg"
-            original_path = storage.upload_file(
-                file_data=original_buffer.getvalue(),
-                folder="posts",
-                filename=original_filename,
-                content_type="image/jpeg"
-            )
-            variant_paths['original_url'] = original_path
-
-            logger.info(
-                f"Created post image variants: {base_filename} "
-                f"(thumb={thumb_image.width}x{thumb_image.height}, "
-                f"medium={medium_image.width}x{medium_image.height}, "
-                f"original={original_image.width}x{original_image.height})"
-            )
+            images = []
+            new_by_hash: Dict[str, _PendingPostImage] = {}
+            for offset, file in enumerate(files):
+                content = await file.read()
+                await file.seek(0)
+
+                width, height = self._probe_post_image(content)
+                # hashlib releases the GIL, so a thread keeps this off the event loop
+                file_hash = await asyncio.to_thread(lambda: hashlib.sha256(content).hexdigest())
+                image = _PendingPostImage(
+                    file=file,
+                    content=content,
+                    position=first_position + offset,
+                    width=width,
+                    height=height,
+                    file_hash=file_hash,
+                    store_hash=not force_upload,
+                )
+                images.append(image)
+
+                if not force_upload:
+                    if file_hash in new_by_hash:
+                        # Same bytes earlier in this post: share its variants
+                        image.same_as = new_by_hash[file_hash]
+                        continue
+                    existing = await self.get_existing_file_by_hash(file, upload_context="post", file_hash=file_hash)
+                    if existing:
+                        existing_variant_paths = self._build_post_variant_paths(existing.file_path)
+                        if existing_variant_paths:
+                            await self.hash_service.increment_reference_count(existing.image_hash)
+                            image.variant_paths = existing_variant_paths
+                            continue
+                        # Only reuse stored hashes when they already point at post variants.
+                        # This avoids mutating unrelated upload flows such as profile photos.
+                        image.store_hash = False
+                    new_by_hash[file_hash] = image
+
+            new_images = [image for image in images if image.variant_paths is None and image.same_as is None]
+
+            # Decode each image once and cascade original -> medium -> thumbnail,
+            # all images in parallel, off the event loop
+            rendered_images = await self._render_variants([
+                (
+                    render_post_image,
+                    image.content,
+                    (
+                        ("original", config.original_max_width),
+                        ("medium", config.medium_width),
+                        ("thumbnail", config.thumbnail_width),
+                    ),
+                    config.jpeg_quality,
+                )
+                for image in new_images
+            ])
+
+            uploads = []
+            for image, rendered_image in zip(new_images, rendered_images):
+                image.base_filename = str(uuid.uuid4())
+                image.perceptual_hash = rendered_image.perceptual_hash
+                for suffix, variant in (
+                    ('thumb', rendered_image.variants["thumbnail"]),
+                    ('medium', rendered_image.variants["medium"]),
+                    ('original', rendered_image.variants["original"]),
+                ):
+                    uploads.append(StorageObject(
+                        file_data=variant.data,
+                        folder="posts",
+                        filename=f"{image.base_filename}_{suffix}.jpg",
+                        content_type="image/jpeg",
+                    ))
+                logger.info(
+                    f"Created post image variants: {image.base_filename} "
+                    + ", ".join(
+                        f"{name}={variant.width}x{variant.height}"
+                        for name, variant in rendered_image.variants.items()
+                    )
+                )
 
-            if should_store_hash:
-                try:
-                    await self.hash_service.store_image_hash(
-                        file_content=content,
-                        original_filename=file.filename or original_filename,
-                        file_path=variant_paths['medium_url'],
-                        mime_type=file.content_type or "image/jpeg",
+            uploaded_paths = await storage.upload_files(uploads)
+            for index, image in enumerate(new_images):
+                thumb, medium, original = uploaded_paths[index * 3:index * 3 + 3]
+                image.variant_paths = {
+                    'thumbnail_url': thumb,
+                    'medium_url': medium,
+                    'original_url': original,
+                }
+
+            for image in images:
+                if image.same_as is not None:
+                    image.variant_paths = image.same_as.variant_paths
+                    if image.same_as.image_hash is not None:
+                        await self.hash_service.increment_reference_count(image.same_as.image_hash)
+                elif image in new_images and image.store_hash:
+                    image.image_hash = await self.hash_service.store_image_hash(
+                        file_content=image.content,
+                        original_filename=image.file.filename or f"{image.base_filename}_original.jpg",
+                        file_path=image.variant_paths['medium_url'],
+                        mime_type=image.file.content_type or "image/jpeg",
                         upload_context="post",
                         uploader_id=uploader_id,
+                        file_hash=image.file_hash,
+                        perceptual_hash=image.perceptual_hash,
+                        width=image.width,
+                        height=image.height,
                     )
-                except Exception:
-                    self.cleanup_post_image_variants(
-                        variant_paths.get('thumbnail_url'),
-                        variant_paths.get('medium_url'),
-                        variant_paths.get('original_url'),
-                    )
-                    raise
-
-            return self._build_post_variant_result(
-                position=position,
-                width=original_width,
-                height=original_height,
-                file_size=file_size,
-                variant_paths=variant_paths,
-            )
 
-        except ValidationException:
-            raise
+            return [
+                self._build_post_variant_result(
+                    position=image.position,
+                    width=image.width,
+                    height=image.height,
+                    file_size=len(image.content),
+                    variant_paths=image.variant_paths,
+                )
+                for image in images
+            ]
+
         except Exception as e:
+            if uploaded_paths:
+                await storage.delete_files(uploaded_paths)
+            if isinstance(e, (ValidationException, UpstreamServiceError)):
+                raise
             logger.error(f"Error creating post image variants: {e}")
             raise BusinessLogicError(f"Failed to process post image: {str(e)}")
 
@@ -296,11 +371,19 @@ class FileUploadService(BaseService):
         self,
         file: UploadFile,
         upload_context: str = None,
+        file_hash: Optional[str] = None,
     ) -> Optional[ExistingFile]:
         """
         Return existing file metadata for an exact duplicate without writing to the DB.
+
+        Only the SHA-256 is compared; pass file_hash when it is already known
+        to skip re-reading the upload.
         """
-        exact_duplicate, _ = await self.check_for_duplicate(file, upload_context)
+        if file_hash is None:
+            content = await file.read()
+            await file.seek(0)
+            file_hash = await self.hash_service.calculate_file_hash(content)
+        exact_duplicate = await self.hash_service.check_duplicate_by_hash(file_hash)
         if not exact_duplicate:
             return None
 
@@ -338,27 +421,26 @@ class FileUploadService(BaseService):
             "original_url": f"{base_path}_original.jpg",
         }
 
-    def _prepare_post_image(self, content: bytes) -> Tuple[Image.Image, int, int]:
-        """Load and normalize a post image while preserving original dimensions."""
+    def _probe_post_image(self, content: bytes) -> Tuple[int, int]:
+        """Validate a post image from its header and return its stored dimensions."""
         try:
-            image = Image.open(io.BytesIO(content))
-            original_width = image.width
-            original_height = image.height
-
-            if image.mode in ('RGBA', 'LA', 'P'):
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
-
-            image = ImageOps.exif_transpose(image)
-            return image, original_width, original_height
+            with Image.open(io.BytesIO(content)) as image:
+                return image.width, image.height
         except Exception as e:
             raise ValidationException(f"Invalid image file: {str(e)}")
 
+    async def _render_variants(self, jobs: List[Tuple]) -> List[RenderedVariant]:
+        """
+        Run render jobs of (function, *args) concurrently in the image pipeline.
+
+        Raises:
+            ValidationException: If the upload cannot be decoded
+        """
+        try:
+            return list(await asyncio.gather(*(image_pipeline.run(fn, *args) for fn, *args in jobs)))
+        except ImageDecodeError as e:
+            raise ValidationException(str(e))
+
     def _build_post_variant_result(
         self,
         *,
@@ -424,96 +506,33 @@ class FileUploadService(BaseService):
             # Read and process the uploaded file
             content = await file.read()
             
-            # Open image with PIL
+            # Render every size in parallel, off the event loop
+            rendered = await self._render_variants([
+                (render_boxed_variant, content, (width, height), 85, crop_data)
+                for width, height in sizes.values()
+            ])
+
+            # Upload every size variant concurrently; a failed upload
+            # removes the others before raising
             try:
-                image = Image.open(io.BytesIO(content))
-                
-                # Convert to RGB if necessary (handles RGBA, P mode images)
-                if image.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'P':
-                        image = image.convert('RGBA')
-                    background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                    image = background
-                elif image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Auto-orient image based on EXIF data
-                image = ImageOps.exif_transpose(image)
-                
-            except Exception as e:
-                raise ValidationException(f"Invalid image file: {str(e)}")
-            
-            # Apply circular cropping if crop_data is provided
-            if crop_data:
-                image = self._apply_circular_crop(image, crop_data)
-            
-            file_paths = {}
-            
-            # Create and save each size variant
-            for size_name, (width, height) in sizes.items():
-                try:
-                    # Create a copy of the original image
-                    resized_image = image.copy()
-                    
-                    # For circular cropped images, maintain aspect ratio and create square variants
-                    if crop_data:
-                        # Resize to fit the target size while maintaining aspect ratio
-                        resized_image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                        
-                        # Create square canvas with transparent background
-                        final_image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-                        
-                        # Calculate position to center the image
-                        x = (width - resized_image.width) // 2
-                        y = (height - resized_image.height) // 2
-                        final_image.paste(resized_image, (x, y))
-                        
-                        # Convert to RGB with white background for JPEG
-                        if final_image.mode == 'RGBA':
-                            background = Image.new('RGB', final_image.size, (255, 255, 255))
-                            background.paste(final_image, mask=final_image.split()[-1])
-                            final_image = background
-                    else:
-                        # Original rectangular cropping logic
-                        # Resize image maintaining aspect ratio, then crop to exact size
-                        resized_image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                        
-                        # Create new image with exact dimensions and paste resized image centered
-                        final_image = Image.new('RGB', (width, height), (255, 255, 255))
-                        
-                        # Calculate position to center the image
-                        x = (width - resized_image.width) // 2
-                        y = (height - resized_image.height) // 2
-                        final_image.paste(resized_image, (x, y))
-                    
-                    # Save the image to buffer
-                    buffer = io.BytesIO()
-                    final_image.save(buffer, "JPEG", quality=85, optimize=True)
-                    
-                    # Upload using storage adapter
-                    filename = f"{filename_base}_{size_name}.jpg"
-                    relative_path = storage.upload_file(
-                        file_data=buffer.getvalue(),
+                relative_paths = await storage.upload_files([
+                    StorageObject(
+                        file_data=variant.data,
                         folder="profile_photos",
-                        filename=filename,
-                        content_type="image/jpeg"
+                        filename=f"{filename_base}_{size_name}.jpg",
+                        content_type="image/jpeg",
                     )
-                    
-                    # Store clean relative path
-                    file_paths[size_name] = relative_path
-                    
-                except Exception as e:
-                    logger.error(f"Error creating {size_name} variant: {e}")
-                    # Clean up any files created so far
-                    self.cleanup_profile_photo_files(filename_base, list(file_paths.keys()))
-                    raise BusinessLogicError(f"Failed to create image variant: {str(e)}")
-            
-            return file_paths
+                    for size_name, variant in zip(sizes, rendered)
+                ])
+            except Exception as e:
+                logger.error(f"Error uploading image variants for {filename_base}: {e}")
+                raise BusinessLogicError(f"Failed to create image variant: {str(e)}")
+
+            # Clean relative paths by size name
+            return dict(zip(sizes, relative_paths))
             
         except Exception as e:
-            if isinstance(e, (ValidationException, BusinessLogicError)):
+            if isinstance(e, (ValidationException, BusinessLogicError, UpstreamServiceError)):
                 raise
             logger.error(f"Error processing profile photo variants: {e}")
             raise BusinessLogicError(f"Failed to process profile photo: {str(e)}")
@@ -546,96 +565,33 @@ class FileUploadService(BaseService):
             # Read and process the uploaded file
             content = await file.read()
             
-            # Open image with PIL
+            # Render every size in parallel, off the event loop
+            rendered = await self._render_variants([
+                (render_boxed_variant, content, (width, height), 85, crop_data)
+                for width, height in sizes.values()
+            ])
+
+            # Upload every size variant concurrently; a failed upload
+            # removes the others before raising
             try:
-                image = Image.open(io.BytesIO(content))
-                
-                # Convert to RGB if necessary (handles RGBA, P mode images)
-                if image.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    if image.mode == 'P':
-                        image = image.convert('RGBA')
-                    background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                    image = background
-                elif image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Auto-orient image based on EXIF data
-                image = ImageOps.exif_transpose(image)
-                
-            except Exception as e:
-                raise ValidationException(f"Invalid image file: {str(e)}")
-            
-            # Apply circular cropping if crop_data is provided
-            if crop_data:
-                image = self._apply_circular_crop(image, crop_data)
-            
-            file_paths = {}
-            
-            # Create and save each size variant
-            for size_name, (width, height) in sizes.items():
-                try:
-                    # Create a copy of the original image
-                    resized_image = image.copy()
-                    
-                    # For circular cropped images, maintain aspect ratio and create square variants
-                    if crop_data:
-                        # Resize to fit the target size while maintaining aspect ratio
-                        resized_image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                        
-                        # Create square canvas with transparent background
-                        final_image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-                        
-                        # Calculate position to center the image
-                        x = (width - resized_image.width) // 2
-                        y = (height - resized_image.height) // 2
-                        final_image.paste(resized_image, (x, y))
-                        
-                        # Convert to RGB with white background for JPEG
-                        if final_image.mode == 'RGBA':
-                            background = Image.new('RGB', final_image.size, (255, 255, 255))
-                            background.paste(final_image, mask=final_image.split()[-1])
-                            final_image = background
-                    else:
-                        # Original rectangular cropping logic
-                        # Resize image maintaining aspect ratio, then crop to exact size
-                        resized_image.thumbnail((width, height), Image.Resampling.LANCZOS)
-                        
-                        # Create new image with exact dimensions and paste resized image centered
-                        final_image = Image.new('RGB', (width, height), (255, 255, 255))
-                        
-                        # Calculate position to center the image
-                        x = (width - resized_image.width) // 2
-                        y = (height - resized_image.height) // 2
-                        final_image.paste(resized_image, (x, y))
-                    
-                    # Save the image to buffer
-                    buffer = io.BytesIO()
-                    final_image.save(buffer, "JPEG", quality=85, optimize=True)
-                    
-                    # Upload using storage adapter
-                    filename = f"{filename_base}_{size_name}.jpg"
-                    relative_path = storage.upload_file(
-                        file_data=buffer.getvalue(),
+                relative_paths = await storage.upload_files([
+                    StorageObject(
+                        file_data=variant.data,
                         folder=subdirectory,
-                        filename=filename,
-                        content_type="image/jpeg"
+                        filename=f"{filename_base}_{size_name}.jpg",
+                        content_type="image/jpeg",
                     )
-                    
-                    # Store clean relative path
-                    file_paths[size_name] = relative_path
-                    
-                except Exception as e:
-                    logger.error(f"Error creating {size_name} variant: {e}")
-                    # Clean up any files created so far
-                    self.cleanup_files(subdirectory, filename_base, list(file_paths.keys()))
-                    raise BusinessLogicError(f"Failed to create image variant: {str(e)}")
-            
-            return file_paths
+                    for size_name, variant in zip(sizes, rendered)
+                ])
+            except Exception as e:
+                logger.error(f"Error uploading image variants for {filename_base}: {e}")
+                raise BusinessLogicError(f"Failed to create image variant: {str(e)}")
+
+            # Clean relative paths by size name
+            return dict(zip(sizes, relative_paths))
             
         except Exception as e:
-            if isinstance(e, (ValidationException, BusinessLogicError)):
+            if isinstance(e, (ValidationException, BusinessLogicError, UpstreamServiceError)):
                 raise
             logger.error(f"Error processing image variants: {e}")
             raise BusinessLogicError(f"Failed to process image: {str(e)}")
@@ -859,7 +815,7 @@ class FileUploadService(BaseService):
             content = await file.read()
             
             # Upload using storage adapter - returns clean relative path
-            relative_path = storage.upload_file(
+            relative_path = await storage.upload_file_async(
                 file_data=content,
                 folder=subdirectory,
                 filename=unique_filename,
@@ -946,11 +902,10 @@ class FileUploadService(BaseService):
                     # If any variant deletion fails, restore ref_count so state remains consistent.
                     variant_paths = self._build_related_variant_paths(clean_path)
                     failed_paths = []
-                    for variant_path in variant_paths:
-                        try:
-                            storage.delete_file(variant_path)
-                        except Exception as delete_error:
-                            failed_paths.append((variant_path, str(delete_error)))
+                    try:
+                        await storage.delete_files(variant_paths)
+                    except Exception as delete_error:
+                        failed_paths.append((variant_paths, str(delete_error)))
 
                     if failed_paths:
                         image_hash.reference_count = 1
@@ -972,7 +927,7 @@ class FileUploadService(BaseService):
                     return False
             else:
                 # No hash record found, delete file directly (legacy behavior)
-                storage.delete_file(clean_path)
+                await storage.delete_file_async(clean_path)
                 logger.info(f"Deleted file (no hash record): {clean_path}")
                 return True
             
@@ -1019,41 +974,7 @@ class FileUploadService(BaseService):
         Returns:
             Circularly cropped PIL Image
         """
-        try:
-            x = float(crop_data.get('x', 0))
-            y = float(crop_data.get('y', 0))
-            radius = float(crop_data.get('radius', 100))
-            
-            # Calculate crop bounds
-            left = max(0, int(x - radius))
-            top = max(0, int(y - radius))
-            right = min(image.width, int(x + radius))
-            bottom = min(image.height, int(y + radius))
-            
-            # Crop to square containing the circle
-            crop_size = int(radius * 2)
-            cropped = image.crop((left, top, right, bottom))
-            
-            # Resize to exact crop size if needed
-            if cropped.size != (crop_size, crop_size):
-                cropped = cropped.resize((crop_size, crop_size), Image.Resampling.LANCZOS)
-            
-            # Create circular mask
-            mask = Image.new('L', (crop_size, crop_size), 0)
-            from PIL import ImageDraw
-            draw = ImageDraw.Draw(mask)
-            draw.ellipse((0, 0, crop_size, crop_size), fill=255)
-            
-            # Apply circular mask
-            result = Image.new('RGBA', (crop_size, crop_size), (0, 0, 0, 0))
-            result.paste(cropped, (0, 0))
-            result.putalpha(mask)
-            
-            return result
-            
-        except Exception as e:
-            logger.warning(f"Failed to apply circular crop: {e}")
-            return image  # Return original image if cropping fails
+        return apply_circular_crop(image, crop_data)
 
     def _convert_file_path_to_url(self, file_path: str) -> str:
         """
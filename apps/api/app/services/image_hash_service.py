@@ -15,6 +15,7 @@ from sqlalchemy import and_, or_, func
 
 from app.core.service_base import BaseService
 from app.core.exceptions import ValidationException, BusinessLogicError
+from app.core.phash_index import PerceptualHashIndex, parse_phash, perceptual_hash_index
 from app.core.storage import storage  # Import storage adapter
 from app.models.image_hash import ImageHash
 
@@ -30,8 +31,9 @@ logger = logging.getLogger(__name__)
 class ImageHashService(BaseService):
     """Service for managing image hashes and deduplication."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, similarity_index: PerceptualHashIndex = perceptual_hash_index):
         super().__init__(db)
+        self.similarity_index = similarity_index
 
     async def calculate_file_hash(self, file_content: bytes) -> str:
         """
@@ -127,31 +129,35 @@ class ImageHashService(BaseService):
             return []
 
         try:
-            # Get all active images with perceptual hashes
+            await self._ensure_similarity_index()
+            candidates = self.similarity_index.query(perceptual_hash, threshold)
+            if not candidates:
+                return []
+
             result = await self.db.execute(
                 select(ImageHash).where(
                     and_(
-                        ImageHash.perceptual_hash.isnot(None),
-                        ImageHash.perceptual_hash != "",
+                        ImageHash.id.in_([image_id for image_id, _ in candidates]),
                         ImageHash.is_active == True
                     )
                 )
             )
-            all_hashes = result.scalars().all()
+            rows_by_id = {row.id: row for row in result.scalars().all()}
 
+            # Re-check against the database; the index may lag other workers.
+            target = parse_phash(perceptual_hash)
             similar_images = []
-            target_hash = imagehash.hex_to_hash(perceptual_hash)
-
-            for img_hash in all_hashes:
-                try:
-                    stored_hash = imagehash.hex_to_hash(img_hash.perceptual_hash)
-                    distance = target_hash - stored_hash  # Hamming distance
-                    
-                    if distance <= threshold:
-                        similar_images.append((img_hash, distance))
-                except Exception as e:
-                    logger.warning(f"Error comparing hashes: {e}")
+            for image_id, _ in candidates:
+                img_hash = rows_by_id.get(image_id)
+                stored = parse_phash(img_hash.perceptual_hash) if img_hash else None
+                if stored is None:
+                    self.similarity_index.remove(image_id)
                     continue
+                distance = bin(target ^ stored).count("1")
+                if distance <= threshold:
+                    similar_images.append((img_hash, distance))
+                else:
+                    self.similarity_index.add(image_id, img_hash.perceptual_hash)
 
             # Sort by similarity (lower distance = more similar)
             similar_images.sort(key=lambda x: x[1])
@@ -161,6 +167,22 @@ class ImageHashService(BaseService):
             logger.error(f"Error finding similar images: {e}")
             return []
 
+    async def _ensure_similarity_index(self) -> None:
+        """Load the perceptual hash index on first use and once it is stale."""
+        if not self.similarity_index.needs_load():
+            return
+        result = await self.db.execute(
+            select(ImageHash.id, ImageHash.perceptual_hash).where(
+                and_(
+                    ImageHash.perceptual_hash.isnot(None),
+                    ImageHash.perceptual_hash != "",
+                    ImageHash.is_active == True
+                )
+            )
+        )
+        count = self.similarity_index.load(result.all())
+        logger.info(f"Loaded {count} perceptual hashes into the similarity index")
+
     async def store_image_hash(
         self,
         file_content: bytes,
@@ -168,7 +190,11 @@ class ImageHashService(BaseService):
         file_path: str,
         mime_type: str,
         upload_context: str = None,
-        uploader_id: int = None
+        uploader_id: int = None,
+        file_hash: Optional[str] = None,
+        perceptual_hash: Optional[str] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
     ) -> ImageHash:
         """
         Store image hash information in database.
@@ -180,6 +206,11 @@ class ImageHashService(BaseService):
             mime_type: MIME type of the file
             upload_context: Context of upload ('profile', 'post', etc.)
             uploader_id: ID of user who uploaded the image
+            file_hash: SHA-256 of file_content, if already computed
+            perceptual_hash: pHash, if already computed (with width and
+                height, the image is not decoded again)
+            width: Image width, if already known
+            height: Image height, if already known
             
         Returns:
             ImageHash object
@@ -192,7 +223,8 @@ class ImageHashService(BaseService):
             clean_path = storage.normalize_path(file_path)
             
             # Calculate file hash
-            file_hash = await self.calculate_file_hash(file_content)
+            if file_hash is None:
+                file_hash = await self.calculate_file_hash(file_content)
             
             # Check if any record with this hash already exists (active or inactive)
             existing_hash = await self.check_duplicate_by_hash(file_hash, include_inactive=True)
@@ -211,6 +243,7 @@ class ImageHashService(BaseService):
                     
                     await self.db.commit()
                     await self.db.refresh(existing_hash)
+                    self.similarity_index.add(existing_hash.id, existing_hash.perceptual_hash)
                     
                     logger.info(f"Reactivated existing image hash {file_hash[:8]}...")
                     return existing_hash
@@ -223,10 +256,13 @@ class ImageHashService(BaseService):
                     logger.info(f"Incremented reference count for existing hash {file_hash[:8]}...")
                     return existing_hash
             
-            # Open image for metadata and perceptual hash
-            image = Image.open(io.BytesIO(file_content))
-            metadata = await self.get_image_metadata(image)
-            perceptual_hash = await self.calculate_perceptual_hash(image)
+            if perceptual_hash is None or width is None or height is None:
+                # Open image for metadata and perceptual hash
+                image = Image.open(io.BytesIO(file_content))
+                metadata = await self.get_image_metadata(image)
+                perceptual_hash = await self.calculate_perceptual_hash(image)
+            else:
+                metadata = {"width": width, "height": height}
             
             # Create ImageHash record with clean path
             image_hash = ImageHash(
@@ -246,6 +282,7 @@ class ImageHashService(BaseService):
             self.db.add(image_hash)
             await self.db.commit()
             await self.db.refresh(image_hash)
+            self.similarity_index.add(image_hash.id, perceptual_hash)
             
             logger.info(f"Stored image hash: {file_hash[:8]}... for {original_filename}, path: {clean_path}")
             return image_hash
@@ -291,6 +328,8 @@ class ImageHashService(BaseService):
                 logger.info(f"Deleting image hash record {image_hash.file_hash[:8]}... (no references)")
                 await self.db.delete(image_hash)
             await self.db.commit()
+            if delete_when_zero:
+                self.similarity_index.remove(image_hash.id)
             if not delete_when_zero:
                 await self.db.refresh(image_hash)
             return True
@@ -350,7 +389,7 @@ class ImageHashService(BaseService):
             for image_hash in orphaned_hashes:
                 # Delete file using storage adapter (works for both local and S3)
                 try:
-                    success = storage.delete_file(image_hash.file_path)
+                    success = await storage.delete_file_async(image_hash.file_path)
                     if success:
                         logger.info(f"Deleted orphaned file: {image_hash.file_path}")
                     else:
@@ -360,6 +399,7 @@ class ImageHashService(BaseService):
                 
                 # Delete the hash record from database
                 await self.db.delete(image_hash)
+                self.similarity_index.remove(image_hash.id)
                 count += 1
             
             if count > 0:
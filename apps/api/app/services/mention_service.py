@@ -73,10 +73,14 @@ class MentionService(BaseService):
         if not usernames:
             return []
         
-        valid_users = []
+        # One query for every username instead of a lookup per mention
+        users_by_name = {
+            user.username: user for user in await self.user_repo.get_by_usernames(usernames)
+        }
         
+        valid_users = []
         for username in usernames:
-            user = await self.user_repo.get_by_username(username)
+            user = users_by_name.get(username)
             if user and (getattr(user, "account_status", None) or "active") == "active":
                 valid_users.append(user)
             else:
@@ -136,25 +140,24 @@ class MentionService(BaseService):
             mentioned_user_ids=mentioned_user_ids
         )
         
-        # Create notifications for mentioned users using the factory
+        # Notify everyone mentioned with one batch lookup and one commit
         author = await self.user_repo.get_by_id_or_404(author_id)
         notification_factory = NotificationFactory(self.db)
-        
-        for user in valid_users:
-            try:
-                await notification_factory.create_mention_notification(
-                    mentioned_user_id=user.id,
-                    author_username=author.username,
-                    author_id=author_id,
-                    post_id=post_id
-                )
-            except Exception as e:
-                logger.error(f"Failed to create mention notification for user {user.id}: {e}")
-                # Don't fail the mention creation if notification fails
+        try:
+            await notification_factory.create_mention_notifications(
+                mentioned_user_ids=[mention.mentioned_user_id for mention in mentions],
+                author_username=author.username,
+                author_id=author_id,
+                post_id=post_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to create mention notifications for post {post_id}: {e}")
+            # Don't fail the mention creation if notification fails
         
         logger.info(f"Created {len(mentions)} mentions for post {post_id}")
         
         # Return mention data
+        users_by_id = {user.id: user for user in valid_users}
         return [
             {
                 "id": mention.id,
@@ -162,9 +165,9 @@ class MentionService(BaseService):
                 "author_id": mention.author_id,
                 "mentioned_user_id": mention.mentioned_user_id,
                 "created_at": mention.created_at.isoformat(),
-                "mentioned_user": serialize_public_user_reference(user)
+                "mentioned_user": serialize_public_user_reference(users_by_id[mention.mentioned_user_id])
             }
-            for mention, user in zip(mentions, valid_users)
+            for mention in mentions
         ]
 
     @monitor_query("search_users")
@@ -7,15 +7,19 @@ from app.core.notification_factory import NotificationFactory
 This service handles notification retrieval, batching, and management operations.
 """
 
+import base64
+import binascii
 import datetime
+import json
 import logging
 from datetime import timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.service_base import BaseService
 from app.core.query_monitor import monitor_query
+from app.core.notification_rate_limiter import notification_rate_limiter
 from app.repositories.notification_repository import NotificationRepository
 from app.repositories.user_repository import UserRepository
 from app.models.notification import Notification
@@ -46,6 +50,9 @@ class NotificationService(BaseService):
         """
         Check if user has exceeded the notification rate limit for a specific type.
         
+        An allowed check counts towards the limit, so call it only right
+        before creating the notification.
+        
         Args:
             user_id: ID of the user to check
             notification_type: Type of notification to check
@@ -53,15 +60,9 @@ class NotificationService(BaseService):
         Returns:
             bool: True if under rate limit, False if exceeded
         """
-        print(f"🔍 DEBUG: Rate limit check - user: {user_id}, type: {notification_type}")
-        
-        is_under_limit = await self.notification_repo.check_rate_limit(
-            user_id, notification_type, NotificationService.MAX_NOTIFICATIONS_PER_HOUR
+        return await notification_rate_limiter.acquire(
+            self.db, user_id, notification_type, NotificationService.MAX_NOTIFICATIONS_PER_HOUR
         )
-        
-        print(f"🔍 DEBUG: Under limit: {is_under_limit}")
-        
-        return is_under_limit
 
     @monitor_query("create_notification")
     async def create_notification(
@@ -230,7 +231,8 @@ class NotificationService(BaseService):
         limit: int = 20,
         offset: int = 0,
         unread_only: bool = False,
-        include_children: bool = False
+        include_children: bool = False,
+        cursor: Optional[str] = None
     ) -> List[Notification]:
         """
         Get notifications for a user, excluding child notifications by default.
@@ -239,18 +241,58 @@ class NotificationService(BaseService):
             db: Database session
             user_id: ID of the user
             limit: Maximum number of notifications to return
-            offset: Number of notifications to skip
+            offset: Number of notifications to skip; ignored with a cursor
             unread_only: If True, only return unread notifications
             include_children: If True, include child notifications
+            cursor: Cursor from encode_cursor() for the previous page
             
         Returns:
             List[Notification]: List of notifications
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
         notification_repo = NotificationRepository(db)
+        if cursor:
+            return await notification_repo.get_user_notifications(
+                user_id, limit, offset, unread_only, include_children,
+                before=NotificationService.decode_cursor(cursor)
+            )
         return await notification_repo.get_user_notifications(
             user_id, limit, offset, unread_only, include_children
         )
 
+    @staticmethod
+    def encode_cursor(notification: Notification) -> str:
+        """Encode the keyset position after a notification as base64url JSON."""
+        payload = {"t": notification.last_updated_at.isoformat(), "id": notification.id}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime.datetime, str]:
+        """Decode and validate a notification pagination cursor."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor))
+            return datetime.datetime.fromisoformat(payload["t"]), str(payload["id"])
+        except (json.JSONDecodeError, binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+
+    @staticmethod
+    async def count_user_notifications(db: AsyncSession, user_id: int, cap: int = 1000) -> int:
+        """
+        Count a user's notifications (only parent notifications), up to cap.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user
+            cap: Maximum count to report
+            
+        Returns:
+            int: Number of notifications, at most cap
+        """
+        notification_repo = NotificationRepository(db)
+        return await notification_repo.count_user_notifications(user_id, cap)
+
     @staticmethod
     async def get_batch_children(
         db: AsyncSession,
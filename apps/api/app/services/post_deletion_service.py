@@ -2,27 +2,42 @@
 
 import logging
 from datetime import datetime, timezone
-from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.feed_cache import feed_result_cache
 from app.models.comment import Comment
+from app.models.emoji_reaction import EmojiReaction
 from app.models.mention import Mention
-from app.models.notification import Notification
 from app.models.post import Post
 from app.models.post_image import PostImage
 from app.models.post_privacy import PostPrivacyRule, PostPrivacyUser
 from app.models.share import Share
 from app.models.user_interaction import UserInteraction
+from app.repositories.emoji_reaction_repository import EmojiReactionRepository
+from app.repositories.notification_repository import NotificationRepository
 from app.repositories.post_repository import PostRepository
-from app.services.comment_service import CommentService
+from app.repositories.user_repository import UserRepository
 from app.services.file_upload_service import FileUploadService
-from app.services.mention_service import MentionService
-from app.services.reaction_service import ReactionService
 
 logger = logging.getLogger(__name__)
 
+# Column values a tombstoned post keeps (besides deleted_at/deletion_source)
+_TOMBSTONE_VALUES = {
+    "content": "",
+    "rich_content": None,
+    "post_style": None,
+    "image_url": None,
+    "location": None,
+    "location_data": None,
+    "is_public": True,
+    "privacy_level": "public",
+    "reactions_count": 0,
+    "shares_count": 0,
+    "comments_count": 0,
+}
+
 
 class PostDeletionService:
     """Owns explicit cleanup for post tombstone deletion."""
@@ -50,51 +65,91 @@ class PostDeletionService:
             return False
 
         post_id = post.id
-        image_paths = await self._collect_image_paths(post)
-
-        await CommentService(self.db).delete_comments_for_post(post_id, commit=False)
-        await MentionService(self.db).delete_post_mentions(post_id, commit=False)
-        await ReactionService(self.db).delete_all_post_reactions(post_id)
-        await self.db.execute(delete(Share).where(Share.post_id == post_id))
-        await self.db.execute(delete(PostPrivacyRule).where(PostPrivacyRule.post_id == post_id))
-        await self.db.execute(delete(PostPrivacyUser).where(PostPrivacyUser.post_id == post_id))
-        await self.db.execute(delete(PostImage).where(PostImage.post_id == post_id))
-        await self.db.execute(delete(UserInteraction).where(UserInteraction.post_id == post_id))
-        await self._delete_post_notifications(post_id)
-
-        post.content = ""
-        post.rich_content = None
-        post.post_style = None
-        post.image_url = None
-        post.location = None
-        post.location_data = None
-        post.is_public = True
-        post.privacy_level = "public"
-        post.reactions_count = 0
-        post.shares_count = 0
-        post.comments_count = 0
+        image_paths = await self._collect_image_paths([post_id], [post.image_url])
+        await self._delete_dependent_rows([post_id])
+
+        for field, value in _TOMBSTONE_VALUES.items():
+            setattr(post, field, value)
         post.deleted_at = datetime.now(timezone.utc)
         post.deletion_source = deletion_source
 
         await self.db.commit()
-
-        file_service = FileUploadService(self.db)
-        for path in image_paths:
-            try:
-                await file_service.delete_with_deduplication(path)
-            except Exception as exc:
-                logger.warning("Failed to clean media for tombstoned post %s: %s", post_id, exc)
+        await feed_result_cache.invalidate_post(post_id)
+        await self._delete_media(image_paths)
 
         logger.info("Tombstoned post %s", post_id)
         return True
 
-    async def _collect_image_paths(self, post: Post) -> list[str]:
-        paths: list[str] = []
-        if post.image_url:
-            paths.append(post.image_url)
+    async def tombstone_posts(self, post_ids: list[str], deletion_source: str = "self") -> int:
+        """
+        Tombstone many posts with the same cleanup as tombstone_post.
+
+        Set-based: a fixed number of statements and one commit however many
+        posts are given, so callers batch large deletions by passing a few
+        hundred ids at a time. Already tombstoned posts are skipped.
+
+        Returns:
+            int: Number of posts tombstoned
+        """
+        if not post_ids:
+            return 0
+
+        result = await self.db.execute(
+            select(Post.id, Post.author_id, Post.image_url).where(
+                Post.id.in_(post_ids), Post.deleted_at.is_(None)
+            )
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        live_ids = [row.id for row in rows]
+        image_paths = await self._collect_image_paths(live_ids, [row.image_url for row in rows])
+        await self._delete_dependent_rows(live_ids)
+        await self.db.execute(
+            update(Post)
+            .where(Post.id.in_(live_ids))
+            .values(
+                **_TOMBSTONE_VALUES,
+                deleted_at=datetime.now(timezone.utc),
+                deletion_source=deletion_source,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # Core UPDATE bypasses the listeners that maintain the posts counters
+        await UserRepository(self.db).refresh_user_counters(sorted({row.author_id for row in rows}))
 
-        result = await self.db.execute(select(PostImage).where(PostImage.post_id == post.id))
-        for image in result.scalars().all():
+        await self.db.commit()
+        for post_id in live_ids:
+            await feed_result_cache.invalidate_post(post_id)
+        await self._delete_media(image_paths)
+
+        logger.info("Tombstoned %d posts", len(live_ids))
+        return len(live_ids)
+
+    async def _delete_dependent_rows(self, post_ids: list[str]) -> None:
+        """Delete every row hanging off the given posts, one statement per table."""
+        # Covers post, image and comment reactions: all of them carry post_id
+        await self.db.execute(delete(EmojiReaction).where(EmojiReaction.post_id.in_(post_ids)))
+        await EmojiReactionRepository(self.db).refresh_post_engagement_stats(post_ids)
+        await self.db.execute(delete(Comment).where(Comment.post_id.in_(post_ids)))
+        await self.db.execute(delete(Mention).where(Mention.post_id.in_(post_ids)))
+        await self.db.execute(delete(Share).where(Share.post_id.in_(post_ids)))
+        await self.db.execute(delete(PostPrivacyRule).where(PostPrivacyRule.post_id.in_(post_ids)))
+        await self.db.execute(delete(PostPrivacyUser).where(PostPrivacyUser.post_id.in_(post_ids)))
+        await self.db.execute(delete(PostImage).where(PostImage.post_id.in_(post_ids)))
+        await self.db.execute(delete(UserInteraction).where(UserInteraction.post_id.in_(post_ids)))
+        await NotificationRepository(self.db).delete_posts_notifications(post_ids)
+
+    async def _collect_image_paths(self, post_ids: list[str], image_urls: list[str | None]) -> list[str]:
+        paths: list[str] = [url for url in image_urls if url]
+
+        result = await self.db.execute(
+            select(PostImage.medium_url, PostImage.original_url, PostImage.thumbnail_url).where(
+                PostImage.post_id.in_(post_ids)
+            )
+        )
+        for image in result.all():
             if image.medium_url:
                 paths.append(image.medium_url)
             elif image.original_url:
@@ -104,13 +159,10 @@ class PostDeletionService:
 
         return list(dict.fromkeys(paths))
 
-    async def _delete_post_notifications(self, post_id: str) -> int:
-        result = await self.db.execute(select(Notification).where(Notification.data.isnot(None)))
-        notifications = result.scalars().all()
-        deleted = 0
-        for notification in notifications:
-            data: Any = notification.data or {}
-            if isinstance(data, dict) and data.get("post_id") == post_id:
-                await self.db.delete(notification)
-                deleted += 1
-        return deleted
+    async def _delete_media(self, image_paths: list[str]) -> None:
+        file_service = FileUploadService(self.db)
+        for path in image_paths:
+            try:
+                await file_service.delete_with_deduplication(path)
+            except Exception as exc:
+                logger.warning("Failed to clean media %s for tombstoned post: %s", path, exc)
@@ -16,6 +16,7 @@ from sqlalchemy import and_, cast, delete, exists, func, or_, select
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.feed_cache import feed_result_cache
 from app.models.follow import Follow
 from app.models.post import Post, PostPrivacyLevel
 from app.models.post_privacy import PostPrivacyRule, PostPrivacyUser
@@ -152,6 +153,8 @@ class PostPrivacyService:
             rules=config.rules,
             specific_user_ids=config.specific_user_ids,
         )
+        # Cached feed orderings may have been built under the old audience.
+        await feed_result_cache.invalidate_post(post.id)
 
     async def replace_post_custom_rules(
         self,
@@ -241,6 +244,59 @@ class PostPrivacyService:
             custom_clause,
         )
 
+    @classmethod
+    def viewer_grants_cte_sql(cls, viewer_param: str = "uid") -> str:
+        """Raw-SQL CTE listing custom posts the viewer is granted by a rule.
+
+        Set-based twin of the custom branch of ``can_view_post``: instead of
+        probing rules/follows per candidate row, it walks the viewer's follow
+        edges (both directions) and explicit grants once, yielding a
+        ``viewer_grants(post_id)`` relation the caller LEFT JOINs against.
+        Pair with ``viewer_visibility_sql`` for the full predicate.
+        """
+        return (
+            "viewer_grants AS ("
+            "  SELECT r.post_id"
+            "  FROM follows vf"
+            "  JOIN posts vp ON vp.author_id = vf.followed_id"
+            f"   AND vp.privacy_level = '{cls.CUSTOM}'"
+            "  JOIN post_privacy_rules r ON r.post_id = vp.id"
+            f"   AND r.rule_type = '{cls.RULE_FOLLOWERS}'"
+            f"  WHERE vf.follower_id = :{viewer_param} AND vf.status = 'active'"
+            "  UNION"
+            "  SELECT r.post_id"
+            "  FROM follows af"
+            "  JOIN posts ap ON ap.author_id = af.follower_id"
+            f"   AND ap.privacy_level = '{cls.CUSTOM}'"
+            "  JOIN post_privacy_rules r ON r.post_id = ap.id"
+            f"   AND r.rule_type = '{cls.RULE_FOLLOWING}'"
+            f"  WHERE af.followed_id = :{viewer_param} AND af.status = 'active'"
+            "  UNION"
+            "  SELECT pu.post_id"
+            "  FROM post_privacy_users pu"
+            f"  WHERE pu.user_id = :{viewer_param}"
+            "), "
+        )
+
+    @classmethod
+    def viewer_visibility_sql(
+        cls,
+        post_alias: str = "p",
+        grants_alias: str = "vg",
+        viewer_param: str = "uid",
+    ) -> str:
+        """Raw-SQL visibility predicate over a LEFT JOIN of ``viewer_grants``.
+
+        Equivalent to ``can_view_post(:uid, p.id)``: own posts, public posts, or
+        custom posts with a matching grant row.
+        """
+        return (
+            f"({post_alias}.author_id = :{viewer_param}"
+            f" OR {post_alias}.privacy_level = '{cls.PUBLIC}'"
+            f" OR ({post_alias}.privacy_level = '{cls.CUSTOM}'"
+            f" AND {grants_alias}.post_id IS NOT NULL))"
+        )
+
     @staticmethod
     def _dialect_name(db: AsyncSession) -> str:
         return db.bind.dialect.name if db.bind is not None else ""
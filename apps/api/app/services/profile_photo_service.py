@@ -249,26 +249,23 @@ class ProfilePhotoService(BaseService):
             
             logger.info(f"Deleting individual profile photo variants for {base_filename}")
             
-            # Delete all size variants using storage adapter
-            for size_name in self.sizes.keys():
-                variant_filename = f"{base_filename}_{size_name}{extension}"
-                relative_path = f"profile_photos/{variant_filename}"
-                
-                try:
-                    # Use storage adapter to delete file
-                    success = storage.delete_file(relative_path)
-                    if success:
-                        logger.debug(f"Deleted profile photo variant: {relative_path}")
-                    else:
-                        logger.debug(f"Variant not found (may have been deleted): {relative_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete variant {relative_path}: {e}")
+            # Delete all size variants concurrently using storage adapter
+            relative_paths = [
+                f"profile_photos/{base_filename}_{size_name}{extension}"
+                for size_name in self.sizes.keys()
+            ]
+            results = await storage.delete_files(relative_paths)
+            for relative_path, success in zip(relative_paths, results):
+                if success:
+                    logger.debug(f"Deleted profile photo variant: {relative_path}")
+                else:
+                    logger.debug(f"Variant not found (may have been deleted): {relative_path}")
             
         except Exception as e:
             logger.warning(f"Error deleting profile photo variants for {profile_image_path}: {e}")
             # Fallback: try to delete the main file directly
             try:
-                storage.delete_file(profile_image_path)
+                await storage.delete_file_async(profile_image_path)
                 logger.info(f"Deleted main profile photo as fallback: {profile_image_path}")
             except Exception as fallback_error:
                 logger.warning(f"Fallback deletion also failed: {fallback_error}")
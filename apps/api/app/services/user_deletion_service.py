@@ -1,17 +1,46 @@
-"""Account deletion orchestration."""
+"""
+Account deletion orchestration.
 
+Deletion is a sequence of idempotent, set-based phases: owned posts are
+tombstoned a batch at a time, the user's reactions are removed with one
+grouped recount of the posts they touched, and the user is dropped from
+share recipient lists inside the database. Until the last phase commits the
+account stays "deletion_pending", so re-running the pipeline resumes where
+it stopped.
+
+When AccountDeletionJobs is running (ACCOUNT_DELETION_BACKGROUND), the
+endpoint only marks the account pending and queues it; the job reports its
+progress through /api/v1/monitoring/account-deletions, and accounts still
+pending at startup are queued again. Each worker process runs the jobs, so an
+account is claimed with a lease on users.deletion_claimed_at before its
+deletion starts.
+"""
+
+import asyncio
 import hashlib
 import logging
 import os
 import secrets
-from datetime import datetime, timezone
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.account_deletion_config import (
+    ACCOUNT_DELETION_CLAIM_LEASE_SECONDS,
+    ACCOUNT_DELETION_MAX_ATTEMPTS,
+    ACCOUNT_DELETION_MAX_RETRY_SECONDS,
+    ACCOUNT_DELETION_MAX_TRACKED_JOBS,
+    ACCOUNT_DELETION_POST_BATCH_SIZE,
+    ACCOUNT_DELETION_RESCAN_SECONDS,
+    ACCOUNT_DELETION_RETRY_BASE_SECONDS,
+)
 from app.core.exceptions import NotFoundError, ValidationException
-from app.core.security import get_password_hash
+from app.core.principal_cache import invalidate_principal
+from app.core.password_hashing import password_hasher
 from app.models.deleted_user_auth_identity import DeletedUserAuthIdentity
 from app.models.emoji_reaction import EmojiReaction
 from app.models.follow import Follow
@@ -22,19 +51,66 @@ from app.models.share import Share
 from app.models.token import PasswordResetToken
 from app.models.user import User
 from app.models.user_interaction import UserInteraction
+from app.repositories.emoji_reaction_repository import EmojiReactionRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.repositories.share_repository import ShareRepository
+from app.repositories.user_repository import UserRepository
 from app.services.post_deletion_service import PostDeletionService
 from app.services.profile_photo_service import ProfilePhotoService
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class DeletionProgress:
+    """Progress of one account deletion."""
+    user_id: int
+    phase: str = "queued"
+    posts_total: int = 0
+    posts_tombstoned: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    retry_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "phase": self.phase,
+            "posts_total": self.posts_total,
+            "posts_tombstoned": self.posts_tombstoned,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "attempts": self.attempts,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+        }
+
+
 class UserDeletionService:
     """Idempotent, resumable account deletion pipeline."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, post_batch_size: int = ACCOUNT_DELETION_POST_BATCH_SIZE):
         self.db = db
+        self.post_batch_size = post_batch_size
+
+    async def delete_user(
+        self,
+        user_id: int,
+        confirmation: str,
+        progress: Optional[DeletionProgress] = None,
+    ) -> dict[str, Any]:
+        """Validate the request and run the whole deletion inline."""
+        await self.request_deletion(user_id, confirmation)
+        return await self.run_deletion(user_id, progress)
 
-    async def delete_user(self, user_id: int, confirmation: str) -> dict[str, Any]:
+    async def request_deletion(self, user_id: int, confirmation: str) -> dict[str, Any]:
+        """
+        Validate a deletion request and mark the account deletion_pending.
+
+        Signs the user out everywhere; run_deletion does the actual cleanup.
+        """
         user = await self._get_user(user_id)
         if confirmation != user.username:
             raise ValidationException("Confirmation must match the current username")
@@ -44,10 +120,22 @@ class UserDeletionService:
         elif user.account_status not in {"deletion_pending", "deleted"}:
             raise ValidationException("Account cannot be deleted from its current state")
 
-        await self._tombstone_owned_posts(user_id)
+        return self._deletion_state(user)
+
+    async def run_deletion(self, user_id: int, progress: Optional[DeletionProgress] = None) -> dict[str, Any]:
+        """Run (or resume) every deletion phase for a deletion_pending account."""
+        progress = progress or DeletionProgress(user_id)
+        progress.started_at = progress.started_at or datetime.now(timezone.utc)
+
+        progress.phase = "posts"
+        await self._tombstone_owned_posts(user_id, progress)
+        progress.phase = "reactions"
         await self._delete_authored_reactions(user_id)
+        progress.phase = "relationships"
         await self._delete_relationships_and_private_rows(user_id)
+        progress.phase = "media"
         await self._cleanup_profile_media(user_id)
+        progress.phase = "scrub"
         await self._scrub_user(user_id)
 
         user = await self._get_user(user_id)
@@ -55,14 +143,67 @@ class UserDeletionService:
             user.account_status = "deleted"
             user.deleted_at = user.deleted_at or datetime.now(timezone.utc)
             user.deletion_source = user.deletion_source or "self"
+            user.deletion_claimed_at = None
             self.db.add(user)
             await self.db.commit()
+            invalidate_principal(user.id)
+
+        progress.phase = "done"
+        progress.finished_at = datetime.now(timezone.utc)
+        return self._deletion_state(user)
+
+    async def claim_deletion(
+        self, user_id: int, lease_seconds: float = ACCOUNT_DELETION_CLAIM_LEASE_SECONDS
+    ) -> bool:
+        """
+        Take the lease on a deletion_pending account for this worker.
+
+        One conditional UPDATE, so of several workers racing for the same
+        account exactly one wins. An expired lease (its worker died or
+        backed off) can be taken over.
+
+        Returns:
+            True if the caller now holds the lease and should run the deletion
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            update(User)
+            .where(
+                User.id == user_id,
+                User.account_status == "deletion_pending",
+                or_(
+                    User.deletion_claimed_at.is_(None),
+                    User.deletion_claimed_at < now - timedelta(seconds=lease_seconds),
+                ),
+            )
+            .values(deletion_claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def release_claim(
+        self,
+        user_id: int,
+        retry_after_seconds: float = 0,
+        lease_seconds: float = ACCOUNT_DELETION_CLAIM_LEASE_SECONDS,
+    ) -> None:
+        """Let the lease expire retry_after_seconds from now, so nobody retries sooner."""
+        expires = datetime.now(timezone.utc) + timedelta(seconds=retry_after_seconds)
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.deletion_claimed_at.is_not(None))
+            .values(deletion_claimed_at=expires - timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
 
+    def _deletion_state(self, user: User) -> dict[str, Any]:
         return {
             "id": user.id,
             "username": user.username,
             "account_status": user.account_status,
-            "is_deleted": True,
+            "is_deleted": user.account_status == "deleted",
             "deleted_at": user.deleted_at.isoformat() if user.deleted_at else None,
         }
 
@@ -80,41 +221,77 @@ class UserDeletionService:
         user.token_version = (user.token_version or 0) + 1
         self.db.add(user)
         await self.db.commit()
+        invalidate_principal(user.id)
 
-    async def _tombstone_owned_posts(self, user_id: int) -> None:
-        result = await self.db.execute(
-            select(Post).where(Post.author_id == user_id, Post.deleted_at.is_(None))
-        )
-        posts = result.scalars().all()
+    async def _tombstone_owned_posts(self, user_id: int, progress: DeletionProgress) -> None:
+        live_posts = (Post.author_id == user_id, Post.deleted_at.is_(None))
+        remaining = await self.db.execute(select(func.count(Post.id)).where(*live_posts))
+        progress.posts_total = progress.posts_tombstoned + (remaining.scalar() or 0)
+
+        # Each batch commits on its own, so an interrupted run resumes with
+        # the posts that are still live
         post_deletion = PostDeletionService(self.db)
-        for post in posts:
-            await post_deletion.tombstone_post(post, deletion_source="self")
+        while True:
+            result = await self.db.execute(
+                select(Post.id).where(*live_posts).order_by(Post.id).limit(self.post_batch_size)
+            )
+            post_ids = list(result.scalars().all())
+            if not post_ids:
+                break
+            # Renew a claimed lease; committed together with the batch
+            await self.db.execute(
+                update(User)
+                .where(User.id == user_id, User.deletion_claimed_at.is_not(None))
+                .values(deletion_claimed_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            progress.posts_tombstoned += await post_deletion.tombstone_posts(post_ids, deletion_source="self")
 
     async def _delete_authored_reactions(self, user_id: int) -> None:
-        affected_result = await self.db.execute(
-            select(EmojiReaction.post_id).where(EmojiReaction.user_id == user_id).distinct()
-        )
+        authored = select(EmojiReaction.post_id).where(EmojiReaction.user_id == user_id)
+        affected_result = await self.db.execute(authored.distinct())
         affected_post_ids = list(affected_result.scalars().all())
-        await self.db.execute(delete(EmojiReaction).where(EmojiReaction.user_id == user_id))
-        await self.db.commit()
+        if not affected_post_ids:
+            return
 
-        for post_id in affected_post_ids:
-            count_result = await self.db.execute(
-                select(func.count(EmojiReaction.id)).where(
-                    EmojiReaction.post_id == post_id,
-                    EmojiReaction.object_type == "post",
-                )
-            )
-            count = count_result.scalar() or 0
-            await self.db.execute(
-                update(Post).where(Post.id == post_id).values(reactions_count=count)
+        # One grouped recount of every post the user reacted to, counting the
+        # reactions that survive the delete below
+        surviving = (
+            select(func.count(EmojiReaction.id))
+            .where(
+                EmojiReaction.post_id == Post.id,
+                EmojiReaction.object_type == "post",
+                EmojiReaction.user_id != user_id,
             )
+            .scalar_subquery()
+        )
+        await self.db.execute(
+            update(Post)
+            .where(Post.id.in_(authored))
+            .values(reactions_count=surviving)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(delete(EmojiReaction).where(EmojiReaction.user_id == user_id))
+        await EmojiReactionRepository(self.db).refresh_post_engagement_stats(affected_post_ids)
         await self.db.commit()
 
     async def _delete_relationships_and_private_rows(self, user_id: int) -> None:
+        counterpart_result = await self.db.execute(
+            select(Follow.follower_id, Follow.followed_id).where(
+                (Follow.follower_id == user_id) | (Follow.followed_id == user_id)
+            )
+        )
+        counterpart_ids = {
+            other_id
+            for row in counterpart_result.all()
+            for other_id in row
+            if other_id != user_id
+        }
         await self.db.execute(
             delete(Follow).where((Follow.follower_id == user_id) | (Follow.followed_id == user_id))
         )
+        # Core delete bypasses the listeners that maintain follow counters.
+        await UserRepository(self.db).refresh_user_counters([user_id, *sorted(counterpart_ids)])
         await self.db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id))
         await self.db.execute(delete(PostPrivacyUser).where(PostPrivacyUser.user_id == user_id))
         await self.db.execute(
@@ -123,17 +300,13 @@ class UserDeletionService:
             )
         )
         await self.db.execute(delete(Notification).where(Notification.user_id == user_id))
+        await NotificationRepository(self.db).refresh_unread_counts([user_id])
         await self.db.execute(delete(Share).where(Share.user_id == user_id))
         await self._remove_user_from_share_recipients(user_id)
         await self.db.commit()
 
     async def _remove_user_from_share_recipients(self, user_id: int) -> None:
-        result = await self.db.execute(select(Share).where(Share.recipient_user_ids.isnot(None)))
-        for share in result.scalars().all():
-            recipients = share.recipient_ids_list
-            if user_id in recipients:
-                share.recipient_ids_list = [rid for rid in recipients if rid != user_id]
-                self.db.add(share)
+        await ShareRepository(self.db).remove_recipient_from_shares(user_id)
 
     async def _cleanup_profile_media(self, user_id: int) -> None:
         try:
@@ -152,7 +325,7 @@ class UserDeletionService:
         short_hash = hashlib.sha256(f"{os.getenv('SECRET_KEY', 'development-key')}:{user.id}".encode()).hexdigest()[:6]
         user.username = f"deleted_user_{user.id}_{short_hash}"
         user.email = f"deleted-user-{user.id}-{secrets.token_hex(8)}@deleted.grateful.internal"
-        user.hashed_password = get_password_hash(secrets.token_urlsafe(32))
+        user.hashed_password = await password_hasher.hash(secrets.token_urlsafe(32))
         user.bio = None
         user.profile_image_url = None
         user.display_name = None
@@ -205,3 +378,219 @@ class UserDeletionService:
     def _hash_identity(self, value: str) -> str:
         key = os.getenv("SECRET_KEY", "development-key")
         return hashlib.sha256(f"{key}:{value.lower()}".encode("utf-8")).hexdigest()
+
+
+class AccountDeletionJobs:
+    """
+    Background runner for account deletions, one account at a time.
+
+    Every worker process runs one. An account is only deleted by the worker
+    holding its users.deletion_claimed_at lease; the others skip it. A failed
+    attempt pushes the lease out by an exponential backoff and retries after
+    it, and a periodic rescan picks up pending accounts whose lease has
+    expired, e.g. because their worker died.
+    """
+
+    def __init__(
+        self,
+        max_tracked_jobs: int = ACCOUNT_DELETION_MAX_TRACKED_JOBS,
+        session_factory: Optional[Callable[[], Any]] = None,
+        lease_seconds: float = ACCOUNT_DELETION_CLAIM_LEASE_SECONDS,
+        retry_base_seconds: float = ACCOUNT_DELETION_RETRY_BASE_SECONDS,
+        max_retry_seconds: float = ACCOUNT_DELETION_MAX_RETRY_SECONDS,
+        max_attempts: int = ACCOUNT_DELETION_MAX_ATTEMPTS,
+        rescan_seconds: float = ACCOUNT_DELETION_RESCAN_SECONDS,
+    ):
+        self.max_tracked_jobs = max_tracked_jobs
+        self._session_factory = session_factory
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.max_attempts = max_attempts
+        self.rescan_seconds = rescan_seconds
+        self._jobs: "OrderedDict[int, DeletionProgress]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._rescan_task: Optional[asyncio.Task] = None
+        self._retry_handles: Dict[int, asyncio.TimerHandle] = {}
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+        self._skipped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, user_id: int) -> Optional[DeletionProgress]:
+        """
+        Queue a deletion_pending account for deletion.
+
+        Returns:
+            The job's progress (the existing one if it is already queued,
+            running or waiting to retry), or None if the runner is not
+            started; delete inline then
+        """
+        if not self.running:
+            return None
+        progress = self._jobs.get(user_id)
+        if progress is not None and progress.phase not in {"done", "failed", "skipped"}:
+            return progress
+
+        progress = DeletionProgress(user_id)
+        self._track(progress)
+        self._queue.put_nowait(user_id)
+        self._submitted += 1
+        return progress
+
+    def get_progress(self, user_id: int) -> Optional[DeletionProgress]:
+        return self._jobs.get(user_id)
+
+    async def start(self) -> None:
+        """Start the worker and queue the accounts an earlier process left pending."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="account-deletion-jobs")
+        pending = await self._queue_claimable()
+        logger.info(f"Account deletion jobs started: {len(pending)} pending deletions resumed")
+        if self.rescan_seconds > 0:
+            self._rescan_task = asyncio.create_task(self._rescan(), name="account-deletion-rescan")
+
+    async def stop(self) -> None:
+        """Stop the worker; unfinished accounts stay pending and resume on the next start."""
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in (self._rescan_task, self._task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._rescan_task = None
+
+    def _track(self, progress: DeletionProgress) -> None:
+        self._jobs[progress.user_id] = progress
+        self._jobs.move_to_end(progress.user_id)
+        while len(self._jobs) > self.max_tracked_jobs:
+            self._jobs.popitem(last=False)
+
+    async def _queue_claimable(self) -> List[int]:
+        """Queue the pending accounts nobody holds an unexpired lease on."""
+        expired = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        session_factory = self._session_factory or _default_session_factory()
+        try:
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(User.id).where(
+                        User.account_status == "deletion_pending",
+                        or_(User.deletion_claimed_at.is_(None), User.deletion_claimed_at < expired),
+                    )
+                )
+                pending = list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Failed to resume pending account deletions: {e}")
+            return []
+        for user_id in pending:
+            self.submit(user_id)
+        return pending
+
+    async def _rescan(self) -> None:
+        while True:
+            await asyncio.sleep(self.rescan_seconds)
+            await self._queue_claimable()
+
+    def _retry(self, user_id: int, progress: DeletionProgress) -> None:
+        self._retry_handles.pop(user_id, None)
+        if self.running and self._jobs.get(user_id) is progress and progress.phase == "retrying":
+            progress.phase = "queued"
+            self._queue.put_nowait(user_id)
+            self._retried += 1
+
+    async def _run(self) -> None:
+        while True:
+            user_id = await self._queue.get()
+            progress = self._jobs.get(user_id)
+            if progress is None:
+                progress = DeletionProgress(user_id)
+                self._track(progress)
+            session_factory = self._session_factory or _default_session_factory()
+            async with session_factory() as db:
+                service = UserDeletionService(db)
+                try:
+                    claimed = await service.claim_deletion(user_id, self.lease_seconds)
+                except Exception as e:
+                    await db.rollback()
+                    claimed = False
+                    logger.error(f"Failed to claim account deletion for user {user_id}: {e}")
+                if not claimed:
+                    # Another worker holds the lease, or the account is no longer pending
+                    progress.phase = "skipped"
+                    progress.finished_at = datetime.now(timezone.utc)
+                    self._skipped += 1
+                    continue
+
+                progress.attempts += 1
+                progress.error = progress.retry_at = None
+                try:
+                    await service.run_deletion(user_id, progress)
+                    self._completed += 1
+                    logger.info(
+                        f"Deleted account {user_id}: {progress.posts_tombstoned} posts tombstoned"
+                    )
+                except Exception as e:
+                    await db.rollback()
+                    await self._back_off(service, progress, e)
+
+    async def _back_off(self, service: "UserDeletionService", progress: DeletionProgress, error: Exception) -> None:
+        user_id = progress.user_id
+        delay = min(self.retry_base_seconds * 2 ** (progress.attempts - 1), self.max_retry_seconds)
+        progress.error = str(error)
+        progress.finished_at = datetime.now(timezone.utc)
+        progress.retry_at = progress.finished_at + timedelta(seconds=delay)
+        try:
+            # Nobody, including this worker, retries before the backoff ends
+            await service.release_claim(user_id, retry_after_seconds=delay, lease_seconds=self.lease_seconds)
+        except Exception as e:
+            await service.db.rollback()
+            logger.error(f"Failed to release account deletion claim for user {user_id}: {e}")
+
+        if progress.attempts >= self.max_attempts:
+            progress.phase = "failed"
+            self._failed += 1
+            logger.error(
+                f"Account deletion failed for user {user_id} after {progress.attempts} attempts: {error}"
+            )
+            return
+        progress.phase = "retrying"
+        # A little after the lease expires, so the retry's claim succeeds
+        self._retry_handles[user_id] = asyncio.get_running_loop().call_later(
+            delay + 0.1, self._retry, user_id, progress
+        )
+        logger.warning(
+            f"Account deletion attempt {progress.attempts} failed for user {user_id}, retrying in {delay:.0f}s: {error}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "retried": self._retried,
+            "skipped": self._skipped,
+            "jobs": [progress.to_dict() for progress in reversed(self._jobs.values())],
+        }
+
+
+def _default_session_factory():
+    from app.core.database import async_session
+    return async_session
+
+
+# Global instance; started from the app lifespan when ACCOUNT_DELETION_BACKGROUND is on
+account_deletion_jobs = AccountDeletionJobs()
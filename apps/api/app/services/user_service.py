@@ -13,7 +13,8 @@ from app.core.user_serialization import serialize_deleted_profile, serialize_pub
 from app.repositories.user_repository import UserRepository
 from app.repositories.post_repository import PostRepository
 from app.models.user import User
-from app.core.security import get_password_hash
+from app.core.principal_cache import invalidate_principal
+from app.core.password_hashing import password_hasher
 
 logger = logging.getLogger(__name__)
 
@@ -424,6 +425,7 @@ class UserService(BaseService):
         """
         self.validate_field_length(new_password, "password", 128, 8)
         
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await password_hasher.hash(new_password)
         await self.user_repo.update(user, hashed_password=hashed_password)
+        invalidate_principal(user.id)
         logger.info(f"Password updated for user {user.id}")
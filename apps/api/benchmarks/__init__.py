@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the API.
+
+Each module is runnable from apps/api, e.g.:
+  python -m benchmarks.feed_benchmark --help
+"""
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.feed_benchmark [--database-url URL] [--users N] [--output results.json]
+
+Description:
+  Benchmarks FeedServiceV2.get_feed against a synthetic social graph.
+  Generates the dataset (see benchmarks/synthetic_graph.py), then scrolls the
+  feed page by page for a sample of viewers under several filter
+  combinations and reports, per scenario and page depth:
+    - p50/p95/p99/mean latency in milliseconds
+    - SQL statements per request (via statement_count_var)
+    - rows scanned by the first-page query (PostgreSQL EXPLAIN ANALYZE) or
+      the tables it fully scans (SQLite EXPLAIN QUERY PLAN)
+  Results are emitted as JSON for comparison between runs.
+
+  SQLite (default) builds a fresh file database. For PostgreSQL, point
+  --database-url at a scratch database with migrations applied, or pass
+  --create-schema to build it from the models.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.config.feed_config import CANDIDATE_MULTIPLIER
+from app.core.database import Base, receive_before_cursor_execute, statement_count_var
+from app.services.feed_service_v2 import FeedServiceV2
+from benchmarks.stats import percentile, run_cli
+from benchmarks.synthetic_graph import KEYWORDS, GraphConfig, GraphStats, generate_graph
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./feed_benchmark.db"
+
+SCENARIOS = ("unfiltered", "images", "followed", "keyword", "authors", "combined")
+
+
+@dataclass
+class BenchmarkConfig:
+    """What to measure once the dataset exists."""
+    iterations: int = 5
+    viewers: int = 5
+    page_depth: int = 5
+    page_size: int = 10
+    scenarios: List[str] = field(default_factory=lambda: list(SCENARIOS))
+    explain: bool = True
+    seed: int = 7
+
+
+def _scenario_kwargs(name: str, stats: GraphStats) -> Dict[str, Any]:
+    popular = stats.popular_user_ids[:3]
+    return {
+        "unfiltered": {},
+        "images": {"type_required": ["images"]},
+        "followed": {"type_required": ["followed"]},
+        "keyword": {"keyword_mode": "required", "keyword": KEYWORDS[0]},
+        "authors": {"author_mode": "required", "author_ids": popular},
+        "combined": {
+            "type_required_any": ["images", "followed"],
+            "keyword_mode": "boost",
+            "keyword": KEYWORDS[1],
+            "author_mode": "boost",
+            "author_ids": popular,
+        },
+    }[name]
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count statements on this engine the same way the app engine does."""
+    event.listen(engine.sync_engine, "before_cursor_execute", receive_before_cursor_execute)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine.sync_engine, "connect")
+        def _register_sqlite_functions(dbapi_conn, connection_record):
+            dbapi_conn.create_function("LN", 1, math.log)
+            dbapi_conn.create_function("GREATEST", 2, max)
+            dbapi_conn.create_function("LEAST", 2, min)
+
+
+def summarize(latencies_ms: List[float], statements: List[int]) -> Dict[str, Any]:
+    return {
+        "samples": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 3) if latencies_ms else 0.0,
+        "statements_mean": round(sum(statements) / len(statements), 2) if statements else 0.0,
+        "statements_max": max(statements) if statements else 0,
+    }
+
+
+def _sum_scanned_rows(plan: Dict[str, Any]) -> int:
+    """Rows read by scan nodes (returned plus filtered out), across loops."""
+    loops = plan.get("Actual Loops", 1) or 1
+    scanned = 0
+    if "Scan" in plan.get("Node Type", ""):
+        scanned += (plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)) * loops
+    for child in plan.get("Plans", []):
+        scanned += _sum_scanned_rows(child)
+    return scanned
+
+
+async def explain_first_page(session: AsyncSession, user_id: int, page_size: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Scan profile of the first-page feed query for one viewer."""
+    service = FeedServiceV2(session, result_cache=None)
+    query_time = datetime.now(timezone.utc)
+    filter_spec = service._normalize_feed_filters(
+        query_time=query_time,
+        type_required=kwargs.get("type_required"),
+        type_required_any=kwargs.get("type_required_any"),
+        type_boost=kwargs.get("type_boost"),
+        date_mode=None,
+        date_start=None,
+        date_end=None,
+        author_mode=kwargs.get("author_mode"),
+        author_ids=kwargs.get("author_ids"),
+        keyword_mode=kwargs.get("keyword_mode"),
+        keyword=kwargs.get("keyword"),
+    )
+    query, params = service._build_feed_query(
+        user_id=user_id,
+        query_time=query_time,
+        cursor_data=None,
+        page_size=page_size * CANDIDATE_MULTIPLIER,
+        filter_spec=filter_spec,
+        bounded=not service._has_active_filters(filter_spec),
+    )
+    if service._is_pg:
+        result = await session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query.text}"), params)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return {"rows_scanned": _sum_scanned_rows(plan[0]["Plan"])}
+
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {query.text}"), params)
+    full_scans = sorted({row[-1] for row in result.fetchall() if str(row[-1]).startswith("SCAN")})
+    return {"rows_scanned": None, "full_scans": full_scans}
+
+
+async def _timed_page(service: FeedServiceV2, **kwargs) -> Dict[str, Any]:
+    token = statement_count_var.set(0)
+    try:
+        start = time.perf_counter()
+        result = await service.get_feed(**kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return {"result": result, "ms": elapsed_ms, "statements": statement_count_var.get()}
+    finally:
+        statement_count_var.reset(token)
+
+
+async def run_benchmark(
+    session_factory,
+    stats: GraphStats,
+    config: BenchmarkConfig,
+) -> Dict[str, Any]:
+    """Scroll the feed for sampled viewers and aggregate per scenario and page depth."""
+    rng = random.Random(config.seed)
+    user_ids = list(range(stats.first_user_id, stats.first_user_id + stats.users))
+    # Always include the most-followed user; it has the densest graph.
+    viewers = stats.popular_user_ids[:1] + rng.sample(user_ids, min(len(user_ids), max(0, config.viewers - 1)))
+
+    scenarios: Dict[str, Any] = {}
+    for name in config.scenarios:
+        kwargs = _scenario_kwargs(name, stats)
+        samples: Dict[int, Dict[str, List]] = {}
+        for _ in range(config.iterations):
+            for viewer_id in viewers:
+                async with session_factory() as session:
+                    service = FeedServiceV2(session)
+                    cursor = None
+                    for depth in range(1, config.page_depth + 1):
+                        page = await _timed_page(
+                            service, user_id=viewer_id, cursor=cursor, page_size=config.page_size, **kwargs
+                        )
+                        bucket = samples.setdefault(depth, {"ms": [], "statements": []})
+                        bucket["ms"].append(page["ms"])
+                        bucket["statements"].append(page["statements"])
+                        cursor = page["result"]["nextCursor"]
+                        if cursor is None:
+                            break
+
+        scenario = {
+            "filters": kwargs,
+            "pages": {
+                str(depth): summarize(bucket["ms"], bucket["statements"])
+                for depth, bucket in sorted(samples.items())
+            },
+        }
+        if config.explain:
+            async with session_factory() as session:
+                scenario["first_page_scan"] = await explain_first_page(
+                    session, viewers[0], config.page_size, kwargs
+                )
+        scenarios[name] = scenario
+    return scenarios
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = create_async_engine(args.database_url, echo=False)
+    instrument_engine(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    if args.create_schema or engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            if args.reset:
+                await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    graph_config = GraphConfig(
+        users=args.users,
+        avg_follows=args.avg_follows,
+        follow_exponent=args.follow_exponent,
+        posts_per_user=args.posts_per_user,
+        reactions_per_post=args.reactions_per_post,
+        comments_per_post=args.comments_per_post,
+        image_fraction=args.image_fraction,
+        custom_privacy_fraction=args.custom_privacy_fraction,
+        seed=args.seed,
+    )
+    bench_config = BenchmarkConfig(
+        iterations=args.iterations,
+        viewers=args.viewers,
+        page_depth=args.page_depth,
+        page_size=args.page_size,
+        scenarios=args.scenarios,
+        explain=not args.no_explain,
+        seed=args.seed,
+    )
+
+    generate_start = time.perf_counter()
+    async with session_factory() as session:
+        stats = await generate_graph(session, graph_config)
+    generate_seconds = time.perf_counter() - generate_start
+
+    scenarios = await run_benchmark(session_factory, stats, bench_config)
+    await engine.dispose()
+
+    return {
+        "benchmark": "feed",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "dialect": engine.dialect.name,
+        "python": platform.python_version(),
+        "graph": graph_config.to_dict(),
+        "dataset": stats.to_dict(),
+        "generate_seconds": round(generate_seconds, 3),
+        "config": {
+            "iterations": bench_config.iterations,
+            "viewers": bench_config.viewers,
+            "page_depth": bench_config.page_depth,
+            "page_size": bench_config.page_size,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    print(f"feed benchmark ({report['dialect']}): {report['dataset']['posts']} posts, "
+          f"{report['dataset']['follows']} follows", file=sys.stderr)
+    for name, scenario in report["scenarios"].items():
+        for depth, page in scenario["pages"].items():
+            print(
+                f"  {name:<11} page {depth:>2}: p50={page['p50_ms']:>8.2f}ms "
+                f"p95={page['p95_ms']:>8.2f}ms p99={page['p99_ms']:>8.2f}ms "
+                f"statements={page['statements_mean']}",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the v2 feed on a synthetic social graph.")
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--create-schema", action="store_true", help="Create tables from the models (always on for SQLite).")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables before creating them.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--avg-follows", type=float, default=20.0)
+    parser.add_argument("--follow-exponent", type=float, default=1.1)
+    parser.add_argument("--posts-per-user", type=float, default=5.0)
+    parser.add_argument("--reactions-per-post", type=float, default=4.0)
+    parser.add_argument("--comments-per-post", type=float, default=1.5)
+    parser.add_argument("--image-fraction", type=float, default=0.3)
+    parser.add_argument("--custom-privacy-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--viewers", type=int, default=5)
+    parser.add_argument("--page-depth", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--no-explain", action="store_true", help="Skip the scan profile of first-page queries.")
+    run_cli(parser, lambda args: asyncio.run(main(args)), _print_summary)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.image_upload_benchmark [--megapixels 12 24] [--runs 3] [--output results.json]
+
+Description:
+  Compares the CPU work of processing one post image upload, before and
+  after the single-decode pipeline (render_post_image):
+    - legacy: full decode, three LANCZOS resizes from the full-resolution
+      source, then two more decodes for the perceptual hash (duplicate
+      check and ImageHashService.store_image_hash)
+    - pipeline: one full decode hashed as-is, an integer box reduction,
+      then cascaded resizes original -> medium -> thumbnail
+  Each run executes in a fresh process and reports wall time, peak RSS
+  growth (covers Pillow's C allocations) and peak Python allocations
+  (tracemalloc). Storage and database work is excluded; it is the same
+  for both. Results are emitted as JSON for comparison between runs.
+"""
+import argparse
+import hashlib
+import io
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import imagehash
+from PIL import Image
+
+from app.config.image_config import ImageVariantConfig
+from app.core.image_pipeline import normalize_image, render_post_image
+from benchmarks.stats import percentile, run_cli
+
+MODES = ("legacy", "pipeline")
+
+
+def make_jpeg(megapixels: float, seed: int = 0) -> bytes:
+    """A 4:3 JPEG with noisy content, so it compresses like a photo."""
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    channels = [Image.effect_noise((width, height), 40 + 10 * index + seed) for index in range(3)]
+    gradient = Image.linear_gradient("L").resize((width, height))
+    channels[0] = Image.blend(channels[0], gradient, 0.5)
+    buffer = io.BytesIO()
+    Image.merge("RGB", channels).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def legacy_post_upload(content: bytes, config: ImageVariantConfig) -> Dict[str, bytes]:
+    """The per-upload image work FileUploadService did before the pipeline."""
+    hashlib.sha256(content).hexdigest()  # get_existing_file_by_hash
+    imagehash.phash(Image.open(io.BytesIO(content)))  # check_for_duplicate similarity pass
+
+    image = Image.open(io.BytesIO(content))
+    image = normalize_image(image)
+    variants = {}
+    for name, max_width in (
+        ("thumbnail", config.thumbnail_width),
+        ("medium", config.medium_width),
+        ("original", config.original_max_width),
+    ):
+        if image.width <= max_width:
+            resized = image.copy()
+        else:
+            resized = image.resize((max_width, int(image.height * (max_width / image.width))), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, "JPEG", quality=config.jpeg_quality, optimize=True)
+        variants[name] = buffer.getvalue()
+
+    hashlib.sha256(content).hexdigest()  # store_image_hash
+    imagehash.phash(Image.open(io.BytesIO(content)))  # store_image_hash
+    return variants
+
+
+def pipeline_post_upload(content: bytes, config: ImageVariantConfig) -> Dict[str, bytes]:
+    hashlib.sha256(content).hexdigest()
+    rendered = render_post_image(
+        content,
+        (
+            ("original", config.original_max_width),
+            ("medium", config.medium_width),
+            ("thumbnail", config.thumbnail_width),
+        ),
+        config.jpeg_quality,
+    )
+    return {name: variant.data for name, variant in rendered.variants.items()}
+
+
+def _proc_status_kb(field_name: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field_name + ":"):
+                return int(line.split()[1])
+    raise KeyError(field_name)
+
+
+def _reset_peak_rss() -> int:
+    """Reset the peak RSS mark where the OS allows it; return the baseline in KB."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return _proc_status_kb("VmRSS")
+    except OSError:
+        # No resettable high-water mark: growth is measured above the prior peak.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_rss() -> int:
+    try:
+        return _proc_status_kb("VmHWM")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(mode: str, content: bytes, queue) -> None:
+    """Runs in a fresh process so peak RSS reflects this upload alone."""
+    config = ImageVariantConfig()
+    fn = legacy_post_upload if mode == "legacy" else pipeline_post_upload
+    rss_before_kb = _reset_peak_rss()
+    tracemalloc.start()
+    start = time.perf_counter()
+    variants = fn(content, config)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after_kb = _peak_rss()
+    queue.put({
+        "ms": elapsed_ms,
+        "rss_growth_mb": (rss_after_kb - rss_before_kb) / 1024,
+        "python_peak_mb": python_peak / (1024 * 1024),
+        "output_bytes": sum(len(data) for data in variants.values()),
+    })
+
+
+def run_once(mode: str, content: bytes) -> Dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(mode, content, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def run_benchmark(megapixels: List[float], runs: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for mp in megapixels:
+        content = make_jpeg(mp)
+        with Image.open(io.BytesIO(content)) as image:
+            size = image.size
+        entry: Dict[str, Any] = {"width": size[0], "height": size[1], "input_bytes": len(content)}
+        for mode in MODES:
+            samples = [run_once(mode, content) for _ in range(runs)]
+            entry[mode] = {
+                "p50_ms": round(percentile([s["ms"] for s in samples], 50), 1),
+                "rss_growth_mb": round(max(s["rss_growth_mb"] for s in samples), 1),
+                "python_peak_mb": round(max(s["python_peak_mb"] for s in samples), 1),
+                "output_bytes": samples[0]["output_bytes"],
+            }
+        entry["speedup_p50"] = round(entry["legacy"]["p50_ms"] / max(entry["pipeline"]["p50_ms"], 1e-6), 2)
+        results[f"{mp:g}MP"] = entry
+    return results
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "benchmark": "image_upload",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pillow": Image.__version__,
+        "config": {"runs": args.runs},
+        "uploads": run_benchmark(args.megapixels, args.runs),
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    for label, entry in report["uploads"].items():
+        for mode in MODES:
+            stats = entry[mode]
+            print(
+                f"  {label:>6} {mode:<8}: p50={stats['p50_ms']:>8.1f}ms "
+                f"rss+={stats['rss_growth_mb']:>7.1f}MB python_peak={stats['python_peak_mb']:>6.1f}MB",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark post image processing per upload.")
+    parser.add_argument("--megapixels", nargs="+", type=float, default=[12, 24])
+    parser.add_argument("--runs", type=int, default=3)
+    run_cli(parser, main, _print_summary)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.login_storm_benchmark [--logins 16] [--feed-requests 300] [--output results.json]
+
+Description:
+  Measures /api/v1/posts/feed latency while a burst of logins verifies
+  bcrypt passwords on the same worker. The endpoints are stubs: the feed
+  returns a canned page and login only verifies a password, so the numbers
+  isolate the effect of password hashing on the event loop. Three phases:
+    - idle: feed requests only
+    - inline: the login burst calls pwd_context.verify on the event loop
+      (what AuthService.login did before the hashing pool)
+    - pooled: the login burst awaits PasswordHasher.verify
+  Feed requests are issued open-loop at a fixed interval and their latency
+  is measured from the scheduled start, so time spent waiting behind a
+  blocked event loop is counted. Requests are driven straight through the
+  ASGI interface. Results are emitted as JSON for comparison between runs.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.password_hashing import PasswordHasher
+from app.core.security import BCRYPT_ROUNDS, pwd_context
+from benchmarks.stats import percentile, run_cli
+
+PHASES = ("idle", "inline", "pooled")
+PASSWORD = "benchmark-password"
+FEED_PAGE_SIZE = 20
+
+
+def build_app(hasher: PasswordHasher, stored_hash: str) -> FastAPI:
+    app = FastAPI()
+    feed = {
+        "success": True,
+        "data": {
+            "posts": [
+                {"id": index, "content": "Grateful for the small things today.", "hearts_count": index}
+                for index in range(FEED_PAGE_SIZE)
+            ],
+            "next_cursor": "cursor",
+        },
+    }
+
+    @app.get("/api/v1/posts/feed")
+    async def posts_feed():
+        return feed
+
+    @app.post("/login/inline")
+    async def login_inline():
+        return {"valid": pwd_context.verify(PASSWORD, stored_hash)}
+
+    @app.post("/login/pooled")
+    async def login_pooled():
+        return {"valid": await hasher.verify(PASSWORD, stored_hash)}
+
+    return app
+
+
+async def _request(app, method: str, path: str) -> int:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench.local")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench.local", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+async def _feed_at(app, scheduled: float, latencies: List[float]) -> None:
+    delay = scheduled - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    await _request(app, "GET", "/api/v1/posts/feed")
+    latencies.append((time.perf_counter() - scheduled) * 1000)
+
+
+async def run_phase(app, phase: str, logins: int, feed_requests: int, interval_ms: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    start = time.perf_counter() + 0.05
+    feed_tasks = [
+        asyncio.create_task(_feed_at(app, start + index * interval_ms / 1000, latencies))
+        for index in range(feed_requests)
+    ]
+    login_statuses: List[int] = []
+    login_elapsed = 0.0
+    if phase != "idle":
+        await asyncio.sleep(max(0.0, start - time.perf_counter()))
+        login_started = time.perf_counter()
+        login_statuses = await asyncio.gather(
+            *(_request(app, "POST", f"/login/{phase}") for _ in range(logins))
+        )
+        login_elapsed = (time.perf_counter() - login_started) * 1000
+    await asyncio.gather(*feed_tasks)
+
+    return {
+        "feed": {
+            "samples": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(max(latencies), 3) if latencies else 0.0,
+        },
+        "logins": {
+            "count": len(login_statuses),
+            "ok": sum(1 for status in login_statuses if status == 200),
+            "rejected": sum(1 for status in login_statuses if status == 503),
+            "burst_ms": round(login_elapsed, 3),
+        },
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    hasher = PasswordHasher()
+    stored_hash = pwd_context.hash(PASSWORD)
+    app = build_app(hasher, stored_hash)
+    try:
+        # Warm up the route handlers and the pool threads
+        await _request(app, "GET", "/api/v1/posts/feed")
+        await _request(app, "POST", "/login/pooled")
+        phases = {
+            phase: await run_phase(app, phase, args.logins, args.feed_requests, args.interval_ms)
+            for phase in PHASES
+        }
+        return {"phases": phases, "hasher": hasher.get_stats()}
+    finally:
+        hasher.shutdown()
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    logging.disable(logging.INFO)
+    results = asyncio.run(run_benchmark(args))
+    return {
+        "benchmark": "login_storm",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "logins": args.logins,
+            "feed_requests": args.feed_requests,
+            "interval_ms": args.interval_ms,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+        },
+        **results,
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    for phase, stats in report["phases"].items():
+        feed, logins = stats["feed"], stats["logins"]
+        print(
+            f"  {phase:<7}: feed p50={feed['p50_ms']:>9.3f}ms p99={feed['p99_ms']:>9.3f}ms "
+            f"logins ok={logins['ok']} rejected={logins['rejected']} burst={logins['burst_ms']:.0f}ms",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark feed latency during a login burst.")
+    parser.add_argument("--logins", type=int, default=16, help="Concurrent logins per burst")
+    parser.add_argument("--feed-requests", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Gap between feed requests")
+    run_cli(parser, main, _print_summary)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.middleware_benchmark [--requests 2000] [--output results.json]
+
+Description:
+  Measures the per-request cost of the middleware stack on /health and
+  /api/v1/posts/feed. The endpoints are stubs returning canned payloads, so
+  the numbers cover routing plus middleware only. Requests are driven
+  straight through the ASGI interface (no HTTP client in the loop), under
+  three stacks:
+    - bare: no middleware
+    - base_http: one pass-through BaseHTTPMiddleware per layer the app
+      registers, plus SessionMiddleware and CORSMiddleware; the structural
+      cost the stack paid before the middlewares were plain ASGI, with none
+      of their actual logic
+    - asgi: the middleware stack registered in main.py, logic included
+  Overhead is reported as p50/mean minus the bare stack. INFO logging is
+  disabled so log handlers do not dominate the numbers.
+  Results are emitted as JSON for comparison between runs.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.stats import percentile, run_cli
+
+STACKS = ("bare", "base_http", "asgi")
+PATHS = ("/health", "/api/v1/posts/feed")
+FEED_PAGE_SIZE = 20
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def _feed_payload() -> Dict[str, Any]:
+    posts = [
+        {
+            "id": f"00000000-0000-4000-8000-{index:012d}",
+            "content": "Grateful for the small things today. " * 4,
+            "post_type": "spontaneous",
+            "author": {"id": index, "username": f"user{index}", "display_name": f"User {index}", "profile_image_url": None},
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "hearts_count": index,
+            "reactions_count": index * 2,
+            "comments_count": index % 5,
+            "images": [],
+        }
+        for index in range(FEED_PAGE_SIZE)
+    ]
+    return {"success": True, "data": {"posts": posts, "next_cursor": "cursor"}}
+
+
+def build_app(stack: str, registered: List[Middleware]) -> FastAPI:
+    """Stub app with the endpoints under test and the given middleware stack."""
+    if stack == "bare":
+        middleware: List[Middleware] = []
+    elif stack == "base_http":
+        converted = [entry for entry in registered if entry.cls not in (SessionMiddleware, CORSMiddleware)]
+        middleware = [Middleware(PassThroughMiddleware) for _ in converted]
+        middleware += [entry for entry in registered if entry.cls in (SessionMiddleware, CORSMiddleware)]
+    else:
+        middleware = list(registered)
+
+    app = FastAPI(middleware=middleware)
+    feed = _feed_payload()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/api/v1/posts/feed")
+    async def posts_feed():
+        return feed
+
+    return app
+
+
+def _scope(path: str, index: int) -> Dict[str, Any]:
+    # A distinct client address per request keeps the rate limiter from
+    # answering 429 without disabling it.
+    client_ip = f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"limit=20" if path != "/health" else b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench.local"),
+            (b"user-agent", b"middleware-benchmark"),
+            (b"accept", b"application/json"),
+            (b"origin", b"http://localhost:3000"),
+            (b"x-forwarded-for", client_ip.encode()),
+        ],
+        "client": (client_ip, 50000),
+        "server": ("bench.local", 80),
+    }
+
+
+async def _request(app, path: str, index: int) -> int:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(_scope(path, index), receive, send)
+    return status
+
+
+async def time_stack(app, path: str, requests: int, warmup: int) -> Dict[str, Any]:
+    for index in range(warmup):
+        await _request(app, path, index)
+    samples = []
+    statuses: Dict[int, int] = {}
+    for index in range(warmup, warmup + requests):
+        start = time.perf_counter()
+        status = await _request(app, path, index)
+        samples.append((time.perf_counter() - start) * 1000)
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "mean_ms": round(sum(samples) / len(samples), 4) if samples else 0.0,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run_benchmark(registered: List[Middleware], requests: int, warmup: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for path in PATHS:
+        entry: Dict[str, Any] = {}
+        for stack in STACKS:
+            entry[stack] = await time_stack(build_app(stack, registered), path, requests, warmup)
+        for stack in STACKS[1:]:
+            entry[stack]["overhead_p50_ms"] = round(entry[stack]["p50_ms"] - entry["bare"]["p50_ms"], 4)
+            entry[stack]["overhead_mean_ms"] = round(entry[stack]["mean_ms"] - entry["bare"]["mean_ms"], 4)
+        results[path] = entry
+    return results
+
+
+def registered_middleware() -> List[Middleware]:
+    """The middleware stack main.py installs, in registration order."""
+    from main import app
+    return list(app.user_middleware)
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    logging.disable(logging.INFO)
+    registered = registered_middleware()
+    return {
+        "benchmark": "middleware",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {"requests": args.requests, "warmup": args.warmup},
+        "middleware": [entry.cls.__name__ for entry in registered],
+        "paths": asyncio.run(run_benchmark(registered, args.requests, args.warmup)),
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    for path, entry in report["paths"].items():
+        for stack in STACKS:
+            stats = entry[stack]
+            overhead = stats.get("overhead_p50_ms")
+            overhead_text = f" overhead={overhead:>7.3f}ms" if overhead is not None else ""
+            print(
+                f"  {path:<20} {stack:<9}: p50={stats['p50_ms']:>7.3f}ms p95={stats['p95_ms']:>7.3f}ms"
+                f"{overhead_text}",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-request middleware overhead.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    run_cli(parser, main, _print_summary)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.phash_index_benchmark [--sizes 10000 100000 1000000] [--output results.json]
+
+Description:
+  Benchmarks near-duplicate lookup over stored perceptual hashes. For each
+  index size it measures:
+    - the time to load the PerceptualHashIndex from (id, hex) rows
+    - p50/p95/mean query latency of PerceptualHashIndex.query
+    - the same for the previous approach (imagehash.hex_to_hash and
+      subtraction per stored row), up to --legacy-max rows
+  Stored hashes are random 64-bit values with a fraction of planted near
+  duplicates of the query hashes, so every query has matches.
+  Results are emitted as JSON for comparison between runs.
+"""
+import argparse
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+import imagehash
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.phash_index import PerceptualHashIndex
+from benchmarks.stats import percentile, run_cli
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def generate_rows(size: int, queries: List[int], rng: random.Random, near_fraction: float = 0.001) -> List[Tuple[int, str]]:
+    """Random hashes plus near duplicates (1-4 flipped bits) of the query hashes."""
+    rows = []
+    for image_id in range(1, size + 1):
+        if queries and rng.random() < near_fraction:
+            value = rng.choice(queries)
+            for _ in range(rng.randint(1, 4)):
+                value ^= 1 << rng.randrange(64)
+        else:
+            value = rng.getrandbits(64)
+        rows.append((image_id, f"{value:016x}"))
+    return rows
+
+
+def legacy_query(rows: List[Tuple[int, str]], phash: str, threshold: int) -> List[Tuple[int, int]]:
+    """The per-row Python comparison the index replaces."""
+    target = imagehash.hex_to_hash(phash)
+    matches = []
+    for image_id, stored in rows:
+        distance = target - imagehash.hex_to_hash(stored)
+        if distance <= threshold:
+            matches.append((image_id, distance))
+    matches.sort(key=lambda item: item[1])
+    return matches
+
+
+def _timed(fn, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _latency(samples: List[float]) -> Dict[str, float]:
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "mean_ms": round(sum(samples) / len(samples), 4) if samples else 0.0,
+    }
+
+
+def run_benchmark(sizes: List[int], queries: int, threshold: int, legacy_max: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    query_values = [rng.getrandbits(64) for _ in range(queries)]
+    query_hashes = [f"{value:016x}" for value in query_values]
+
+    results = {}
+    for size in sizes:
+        rows = generate_rows(size, query_values, rng)
+        index = PerceptualHashIndex()
+        _, load_ms = _timed(index.load, rows)
+
+        index_samples, matches = [], 0
+        for phash in query_hashes:
+            found, elapsed = _timed(index.query, phash, threshold)
+            index_samples.append(elapsed)
+            matches += len(found)
+
+        entry: Dict[str, Any] = {
+            "load_ms": round(load_ms, 3),
+            "matches_per_query": round(matches / len(query_hashes), 2) if query_hashes else 0.0,
+            "index": _latency(index_samples),
+        }
+        if size <= legacy_max:
+            legacy_samples = []
+            # The legacy scan is slow; a few queries are enough.
+            for phash in query_hashes[:max(1, min(len(query_hashes), 5))]:
+                found, elapsed = _timed(legacy_query, rows, phash, threshold)
+                legacy_samples.append(elapsed)
+                assert sorted(found) == sorted(index.query(phash, threshold))
+            entry["legacy"] = _latency(legacy_samples)
+            entry["speedup_p50"] = round(entry["legacy"]["p50_ms"] / max(entry["index"]["p50_ms"], 1e-6), 1)
+        results[str(size)] = entry
+    return results
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "benchmark": "phash_index",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "queries": args.queries,
+            "threshold": args.threshold,
+            "legacy_max": args.legacy_max,
+            "seed": args.seed,
+        },
+        "sizes": run_benchmark(args.sizes, args.queries, args.threshold, args.legacy_max, args.seed),
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    for size, entry in report["sizes"].items():
+        legacy = entry.get("legacy")
+        legacy_text = f" legacy p50={legacy['p50_ms']:>10.2f}ms" if legacy else ""
+        print(
+            f"  {int(size):>9,} hashes: load={entry['load_ms']:>9.1f}ms "
+            f"index p50={entry['index']['p50_ms']:>8.3f}ms p95={entry['index']['p95_ms']:>8.3f}ms"
+            f"{legacy_text}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the perceptual hash similarity index.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--threshold", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="Largest size at which to also time the per-row Python scan.")
+    parser.add_argument("--seed", type=int, default=42)
+    run_cli(parser, main, _print_summary)
@@ -0,0 +1,47 @@
+"""
+Summary statistics and the command-line runner shared by the benchmark scripts.
+"""
+
+import argparse
+import json
+import math
+import sys
+from typing import Any, Callable, Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_cli(
+    parser: argparse.ArgumentParser,
+    main: Callable[[argparse.Namespace], Dict[str, Any]],
+    print_summary: Callable[[Dict[str, Any]], None],
+) -> None:
+    """
+    Run a benchmark script: parse its flags, run main(args) and emit the report.
+
+    Adds --output to the script's own flags. The summary goes to stderr via
+    print_summary and the JSON report to --output, or stdout if it is not set.
+    """
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args()
+
+    try:
+        report = main(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print_summary(report)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
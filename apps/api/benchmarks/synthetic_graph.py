@@ -0,0 +1,233 @@
+"""
+Synthetic social-graph generator for benchmarks.
+
+Builds users, a power-law follow graph, posts (with images and custom
+privacy), reactions and comments directly through Core bulk inserts, then
+rebuilds the denormalized aggregates and counters the feed reads. Output is deterministic
+for a given GraphConfig.seed.
+"""
+
+import random
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Dict, List
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_password_hash
+from app.models.comment import Comment
+from app.models.emoji_reaction import EmojiReaction
+from app.models.follow import Follow
+from app.models.post import Post
+from app.models.post_image import PostImage
+from app.models.post_privacy import PostPrivacyRule, PostPrivacyUser
+from app.models.user import User
+from app.repositories.emoji_reaction_repository import EmojiReactionRepository
+from app.repositories.user_repository import UserRepository
+
+INSERT_CHUNK_SIZE = 1000
+
+# Words used for post content; keyword benchmarks search for KEYWORDS.
+VOCABULARY = (
+    "grateful thankful family friends morning coffee sunshine walk garden music "
+    "dinner book rain ocean mountain kindness support health teacher neighbor "
+    "project weekend smile laughter home journey patience progress community"
+).split()
+KEYWORDS = ("sunshine", "kindness", "journey")
+
+REACTION_CODES = ("heart", "heart_eyes", "hug", "grateful", "praise", "clap", "star", "fire")
+CUSTOM_RULES = ("followers", "following", "specific_users")
+
+
+@dataclass
+class GraphConfig:
+    """Shape of the synthetic dataset."""
+    users: int = 1000
+    avg_follows: float = 20.0
+    follow_exponent: float = 1.1  # Zipf exponent of followed-user popularity
+    posts_per_user: float = 5.0
+    reactions_per_post: float = 4.0
+    comments_per_post: float = 1.5
+    image_fraction: float = 0.3
+    custom_privacy_fraction: float = 0.1
+    private_fraction: float = 0.05
+    history_days: int = 30
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class GraphStats:
+    """Row counts produced by a generation run."""
+    users: int = 0
+    follows: int = 0
+    posts: int = 0
+    images: int = 0
+    custom_posts: int = 0
+    reactions: int = 0
+    comments: int = 0
+    first_user_id: int = 0
+    popular_user_ids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def _bulk_insert(session: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        if chunk:
+            await session.execute(insert(model.__table__), chunk)
+
+
+def _sample_count(rng: random.Random, mean: float, cap: int) -> int:
+    """Exponentially distributed count with the given mean, capped."""
+    if mean <= 0 or cap <= 0:
+        return 0
+    return min(cap, int(rng.expovariate(1.0 / mean) + 0.5))
+
+
+async def generate_graph(session: AsyncSession, config: GraphConfig) -> GraphStats:
+    """Insert a synthetic dataset and commit it. Existing rows are left untouched."""
+    rng = random.Random(config.seed)
+    now = datetime.now(timezone.utc)
+    stats = GraphStats()
+
+    max_id = (await session.execute(select(func.max(User.id)))).scalar() or 0
+    first_id = max_id + 1
+    user_ids = list(range(first_id, first_id + config.users))
+    run_tag = uuid.uuid4().hex[:8]
+    password = get_password_hash("benchmark")
+
+    await _bulk_insert(session, User, [
+        {
+            "id": user_id,
+            "email": f"bench_{run_tag}_{user_id}@example.com",
+            "username": f"bench_{run_tag}_{user_id}",
+            "hashed_password": password,
+            "created_at": now - timedelta(days=config.history_days + 1),
+        }
+        for user_id in user_ids
+    ])
+    stats.users = len(user_ids)
+    if session.bind.dialect.name == "postgresql":
+        # Ids were assigned explicitly; keep the serial ahead of them.
+        await session.execute(text("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))"))
+    stats.first_user_id = first_id
+
+    # Popularity follows a Zipf law over a shuffled order, so a few users
+    # collect most followers; out-degrees are Pareto distributed.
+    by_popularity = list(user_ids)
+    rng.shuffle(by_popularity)
+    cum_weights = list(accumulate(1.0 / (rank + 1) ** config.follow_exponent for rank in range(len(by_popularity))))
+    stats.popular_user_ids = by_popularity[:10]
+
+    follows = []
+    for follower_id in user_ids:
+        degree = min(len(user_ids) - 1, int(rng.paretovariate(2.0) * config.avg_follows / 2))
+        targets = set(rng.choices(by_popularity, cum_weights=cum_weights, k=degree)) if degree else set()
+        targets.discard(follower_id)
+        for followed_id in targets:
+            follows.append({
+                "id": str(uuid.uuid4()),
+                "follower_id": follower_id,
+                "followed_id": followed_id,
+                "status": "active",
+                "created_at": now - timedelta(days=rng.uniform(0, config.history_days)),
+            })
+    await _bulk_insert(session, Follow, follows)
+    stats.follows = len(follows)
+
+    posts, images, rules, specific_users, reactions, comments = [], [], [], [], [], []
+    for author_id in user_ids:
+        for _ in range(_sample_count(rng, config.posts_per_user, 10 * max(1, int(config.posts_per_user)))):
+            post_id = str(uuid.uuid4())
+            created_at = now - timedelta(seconds=rng.uniform(0, config.history_days * 86400))
+
+            roll = rng.random()
+            if roll < config.private_fraction:
+                privacy_level = "private"
+            elif roll < config.private_fraction + config.custom_privacy_fraction:
+                privacy_level = "custom"
+                for rule in rng.sample(CUSTOM_RULES, rng.randint(1, len(CUSTOM_RULES))):
+                    rules.append({"id": str(uuid.uuid4()), "post_id": post_id, "rule_type": rule})
+                    if rule == "specific_users":
+                        for user_id in rng.sample(user_ids, min(3, len(user_ids))):
+                            specific_users.append({"id": str(uuid.uuid4()), "post_id": post_id, "user_id": user_id})
+                stats.custom_posts += 1
+            else:
+                privacy_level = "public"
+
+            image_url = None
+            if rng.random() < config.image_fraction:
+                for position in range(rng.randint(1, 3)):
+                    base = f"/uploads/posts/{post_id}_{position}"
+                    images.append({
+                        "id": str(uuid.uuid4()),
+                        "post_id": post_id,
+                        "position": position,
+                        "thumbnail_url": f"{base}_thumb.jpg",
+                        "medium_url": f"{base}_medium.jpg",
+                        "original_url": f"{base}.jpg",
+                        "width": 1200,
+                        "height": 900,
+                        "file_size": 250_000,
+                    })
+                image_url = f"/uploads/posts/{post_id}_0_medium.jpg"
+
+            reactors = rng.sample(user_ids, _sample_count(rng, config.reactions_per_post, len(user_ids)))
+            for user_id in reactors:
+                reactions.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "post_id": post_id,
+                    "object_type": "post",
+                    "object_id": post_id,
+                    "emoji_code": rng.choice(REACTION_CODES),
+                    "created_at": created_at + timedelta(minutes=rng.uniform(1, 600)),
+                })
+
+            comment_count = _sample_count(rng, config.comments_per_post, 50)
+            for _ in range(comment_count):
+                comments.append({
+                    "id": str(uuid.uuid4()),
+                    "post_id": post_id,
+                    "user_id": rng.choice(user_ids),
+                    "content": " ".join(rng.choices(VOCABULARY, k=6)),
+                    "created_at": created_at + timedelta(minutes=rng.uniform(1, 600)),
+                })
+
+            posts.append({
+                "id": post_id,
+                "author_id": author_id,
+                "content": " ".join(rng.choices(VOCABULARY, k=rng.randint(5, 25))),
+                "image_url": image_url,
+                "is_public": privacy_level == "public",
+                "privacy_level": privacy_level,
+                "created_at": created_at,
+                "reactions_count": len(reactors),
+                "comments_count": comment_count,
+                "shares_count": _sample_count(rng, 0.3, 20),
+            })
+
+    await _bulk_insert(session, Post, posts)
+    await _bulk_insert(session, PostImage, images)
+    await _bulk_insert(session, PostPrivacyRule, rules)
+    await _bulk_insert(session, PostPrivacyUser, specific_users)
+    await _bulk_insert(session, EmojiReaction, reactions)
+    await _bulk_insert(session, Comment, comments)
+    stats.posts = len(posts)
+    stats.images = len(images)
+    stats.reactions = len(reactions)
+    stats.comments = len(comments)
+
+    # Core inserts bypass the ORM listeners that maintain the aggregates.
+    await EmojiReactionRepository(session).reconcile_post_engagement_stats()
+    await UserRepository(session).reconcile_user_counters()
+    await session.commit()
+    return stats
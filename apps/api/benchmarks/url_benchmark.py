@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Usage:
+  cd apps/api
+  python -m benchmarks.url_benchmark [--pages 2000] [--output results.json]
+
+Description:
+  Measures the cost of turning stored paths into URLs while serializing a
+  feed page: 50 posts, each with an author avatar and 4 images of 3 variants
+  (650 URLs per page). Paths mix clean, legacy /uploads/ and full-URL
+  formats, and authors repeat across posts as they do in real feeds.
+  Each page is serialized with:
+    - legacy: the get_url implementation before memoization (normalize on
+      every call, per-call prefix building, eager f-string debug logging)
+    - uncached: StorageAdapter.get_url with the memo disabled
+    - cached: StorageAdapter.get_url per URL, memo warm
+    - batch: StorageAdapter.get_urls once per page, memo warm
+  for both the local and the S3 backend, with DEBUG logging disabled as in
+  production. Results are emitted as JSON for comparison between runs.
+"""
+import argparse
+import logging
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.stats import percentile, run_cli
+
+POSTS_PER_PAGE = 50
+IMAGES_PER_POST = 4
+VARIANTS = ("thumbnail_url", "medium_url", "original_url")
+AUTHORS = 20
+BACKENDS = ("local", "s3")
+MODES = ("legacy", "uncached", "cached", "batch")
+
+S3_ENV = {
+    "ENVIRONMENT": "production",
+    "S3_ENDPOINT_URL": "https://objects.bench.local",
+    "S3_ACCESS_KEY_ID": "bench",
+    "S3_SECRET_ACCESS_KEY": "bench",
+    "S3_BUCKET": "grateful-uploads",
+    "S3_PUBLIC_URL": "https://cdn.bench.local/storage/v1/object/public/grateful-uploads/",
+}
+
+logger = logging.getLogger("app.core.storage")
+
+
+@contextmanager
+def _environ(values: Dict[str, str]) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def build_page(page: int) -> List[Dict[str, Any]]:
+    """One page of posts holding stored paths as they come out of the DB."""
+    posts = []
+    for index in range(POSTS_PER_PAGE):
+        post_id = f"{page:06d}-{index:03d}"
+        author = (page * POSTS_PER_PAGE + index) % AUTHORS
+        avatar = (
+            f"/uploads/profile_photos/profile_{author}_medium.jpg" if author % 3 == 0
+            else f"profile_photos/profile_{author}_medium.jpg"
+        )
+        images = []
+        for position in range(IMAGES_PER_POST):
+            image = {}
+            for variant in VARIANTS:
+                path = f"posts/{post_id}_{position}_{variant.split('_')[0]}.jpg"
+                if position == 3:
+                    path = f"https://cdn.bench.local/storage/v1/object/public/grateful-uploads/{path}"
+                image[variant] = path
+            images.append(image)
+        posts.append({"id": post_id, "author_image": avatar, "images": images})
+    return posts
+
+
+def legacy_get_url(adapter, relative_path: str) -> str:
+    """StorageAdapter.get_url as it was before the memo and URL prefix."""
+    if not relative_path:
+        return relative_path
+    clean_path = adapter.normalize_path(relative_path)
+    if not clean_path:
+        logger.warning(f"Empty path after normalization: {relative_path}")
+        return relative_path
+    if adapter.is_production:
+        if adapter.public_url_base:
+            base_url = adapter.public_url_base.rstrip('/')
+            url = f"{base_url}/{clean_path}"
+            logger.debug(f"🔗 Generated S3 URL: {clean_path} -> {url}")
+            return url
+        s3_endpoint = os.getenv("S3_ENDPOINT_URL", "").rstrip('/')
+        url = f"{s3_endpoint}/{adapter.bucket_name}/{clean_path}"
+        logger.debug(f"🔗 Generated S3 URL (endpoint): {clean_path} -> {url}")
+        return url
+    url = f"/uploads/{clean_path}"
+    logger.debug(f"🔗 Generated local URL: {clean_path} -> {url}")
+    return url
+
+
+def serialize_per_url(posts: List[Dict[str, Any]], get_url: Callable[[str], str]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": post["id"],
+            "author_image": get_url(post["author_image"]),
+            "images": [{variant: get_url(image[variant]) for variant in VARIANTS} for image in post["images"]],
+        }
+        for post in posts
+    ]
+
+
+def serialize_batch(posts: List[Dict[str, Any]], get_urls: Callable) -> List[Dict[str, Any]]:
+    paths: List[Optional[str]] = []
+    for post in posts:
+        paths.append(post["author_image"])
+        paths.extend(image[variant] for image in post["images"] for variant in VARIANTS)
+    urls = iter(get_urls(paths))
+    return [
+        {
+            "id": post["id"],
+            "author_image": next(urls),
+            "images": [{variant: next(urls) for variant in VARIANTS} for image in post["images"]],
+        }
+        for post in posts
+    ]
+
+
+def make_adapter(backend: str, url_cache_size: int):
+    from app.core.storage import StorageAdapter
+
+    env = S3_ENV if backend == "s3" else {"ENVIRONMENT": "development", "UPLOAD_PATH": "/tmp/url-benchmark-uploads"}
+    with _environ(env):
+        return StorageAdapter(url_cache_size=url_cache_size)
+
+
+def time_mode(backend: str, mode: str, pages: List[List[Dict[str, Any]]], warmup: int) -> Dict[str, Any]:
+    adapter = make_adapter(backend, url_cache_size=0 if mode in ("legacy", "uncached") else 10000)
+    if mode == "legacy":
+        run = lambda posts: serialize_per_url(posts, lambda path: legacy_get_url(adapter, path))
+    elif mode == "batch":
+        run = lambda posts: serialize_batch(posts, adapter.get_urls)
+    else:
+        run = lambda posts: serialize_per_url(posts, adapter.get_url)
+
+    # The legacy S3 fallback reads S3_ENDPOINT_URL on every call
+    with _environ(S3_ENV if backend == "s3" else {}):
+        for posts in pages[:warmup]:
+            run(posts)
+        samples = []
+        for posts in pages:
+            start = time.perf_counter()
+            run(posts)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "mean_ms": round(sum(samples) / len(samples), 4) if samples else 0.0,
+        "url_cache": adapter.get_url_cache_stats(),
+    }
+
+
+def check_equivalent(backend: str, posts: List[Dict[str, Any]]) -> None:
+    """All modes must serialize the page to the same URLs."""
+    adapter = make_adapter(backend, url_cache_size=10000)
+    with _environ(S3_ENV if backend == "s3" else {}):
+        expected = serialize_per_url(posts, lambda path: legacy_get_url(adapter, path))
+    if serialize_per_url(posts, adapter.get_url) != expected or serialize_batch(posts, adapter.get_urls) != expected:
+        raise RuntimeError(f"get_url output differs from the legacy implementation ({backend})")
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    logging.disable(logging.INFO)
+    # Feeds re-serialize the same posts across requests; keep a rolling set
+    # of distinct pages so the memo sees realistic reuse
+    distinct = [build_page(page) for page in range(args.distinct_pages)]
+    pages = [distinct[index % len(distinct)] for index in range(args.pages)]
+
+    results: Dict[str, Any] = {}
+    for backend in BACKENDS:
+        check_equivalent(backend, distinct[0])
+        entry = {mode: time_mode(backend, mode, pages, args.warmup) for mode in MODES}
+        legacy_p50 = entry["legacy"]["p50_ms"]
+        for mode in MODES[1:]:
+            p50 = entry[mode]["p50_ms"]
+            entry[mode]["speedup_p50"] = round(legacy_p50 / p50, 2) if p50 else None
+        results[backend] = entry
+
+    return {
+        "benchmark": "storage_urls",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "pages": args.pages,
+            "distinct_pages": args.distinct_pages,
+            "warmup": args.warmup,
+            "posts_per_page": POSTS_PER_PAGE,
+            "images_per_post": IMAGES_PER_POST,
+            "urls_per_page": POSTS_PER_PAGE * (1 + IMAGES_PER_POST * len(VARIANTS)),
+        },
+        "backends": results,
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    for backend, entry in report["backends"].items():
+        for mode in MODES:
+            stats = entry[mode]
+            speedup = stats.get("speedup_p50")
+            speedup_text = f" speedup={speedup:>5.2f}x" if speedup is not None else ""
+            print(
+                f"  {backend:<5} {mode:<8}: p50={stats['p50_ms']:>7.3f}ms p95={stats['p95_ms']:>7.3f}ms"
+                f"{speedup_text}",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark URL generation for a serialized feed page.")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--distinct-pages", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=100)
+    run_cli(parser, main, _print_summary)
@@ -58,12 +58,20 @@ from app.core.input_sanitization import InputSanitizationMiddleware
 from app.core.request_size_middleware import RequestSizeLimitMiddleware
 from app.core.request_id_middleware import RequestIDMiddleware
 from app.core.ssl_middleware import HTTPSRedirectMiddleware
+from app.core.sql_profiler import SQLProfilerMiddleware
 from app.core.security_config import security_config
 from app.core.openapi_validator import create_openapi_validator
 from app.core.exceptions import BaseAPIException
 from app.core.responses import error_response
-from app.core.structured_logging import setup_structured_logging
+from app.core.structured_logging import setup_structured_logging, stop_structured_logging
+from app.config.observability_config import LOG_QUEUE_ENABLED, LOG_QUEUE_MAX_SIZE
 from app.core.uptime_monitoring import uptime_monitor
+from app.core.image_pipeline import image_pipeline
+from app.core.password_hashing import password_hasher
+from app.core.notification_pipeline import notification_pipeline
+from app.config.notification_config import NOTIFICATION_WRITE_BEHIND
+from app.config.account_deletion_config import ACCOUNT_DELETION_BACKGROUND
+from app.services.user_deletion_service import account_deletion_jobs
 from app.core.oauth_config import initialize_oauth_providers, get_oauth_config
 from app.core.storage import storage  # Import unified storage adapter
 from fastapi.responses import JSONResponse
@@ -76,7 +84,9 @@ import os
 setup_structured_logging(
     service_name="grateful-api",
     log_level=os.getenv("LOG_LEVEL", "INFO"),
-    enable_json_format=os.getenv("ENVIRONMENT", "development") == "production"
+    enable_json_format=os.getenv("ENVIRONMENT", "development") == "production",
+    use_queue=LOG_QUEUE_ENABLED,
+    queue_max_size=LOG_QUEUE_MAX_SIZE
 )
 logger = logging.getLogger(__name__)
 
@@ -141,12 +151,27 @@ async def lifespan(app: FastAPI):
     await uptime_monitor.start_monitoring()
     logger.info("Uptime monitoring started")
     
+    # Start write-behind notification delivery
+    if NOTIFICATION_WRITE_BEHIND:
+        notification_pipeline.start()
+    
+    # Start background account deletion (resumes accounts left pending)
+    if ACCOUNT_DELETION_BACKGROUND:
+        await account_deletion_jobs.start()
+    
     yield
     
     # on shutdown
     logger.info("Shutting down Grateful API...")
     await uptime_monitor.stop_monitoring()
     logger.info("Uptime monitoring stopped")
+    await notification_pipeline.stop()
+    await account_deletion_jobs.stop()
+    await storage.close()
+    image_pipeline.shutdown()
+    password_hasher.shutdown()
+    get_rate_limiter().close()
+    stop_structured_logging()
 
 # Create FastAPI app with security configurations
 app = FastAPI(
@@ -231,7 +256,9 @@ async def validation_exception_handler(request, exc: RequestValidationError):
         }
     )
 
-# Add middleware (order matters - first added is outermost)
+# Add middleware (order matters - each add_middleware call wraps the ones before it,
+# so the last added is outermost). All of these are plain ASGI middlewares.
+app.add_middleware(SQLProfilerMiddleware)  # Innermost: sees the matched route after routing
 app.add_middleware(ErrorHandlingMiddleware)
 app.add_middleware(HTTPSRedirectMiddleware)  # HTTPS redirect should be first for security
 app.add_middleware(SecurityHeadersMiddleware)
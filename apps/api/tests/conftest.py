@@ -35,6 +35,9 @@ from app.core.database import Base, get_db
 from app.models.user import User
 from app.models.post import Post
 from app.core.security import create_access_token, get_password_hash
+from app.core.principal_cache import principal_cache
+from app.core.notification_rate_limiter import notification_rate_limiter
+from app.core.sql_profiler import sql_profiler
 from main import app
 import uuid
 from unittest.mock import patch
@@ -97,6 +100,11 @@ async def setup_test_database(test_engine):
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     
+    # User ids are reused across tests, so per-user process state must not
+    # carry over from the previous test
+    principal_cache.clear()
+    notification_rate_limiter.clear()
+    
     # Override the database dependency
     async def get_test_db():
         async with TestSessionLocal() as session:
@@ -128,6 +136,15 @@ async def setup_test_database(test_engine):
                     del os.environ['TESTING']
 
 
+@pytest.fixture(autouse=True)
+def enforce_statement_budgets():
+    """Fail tests whose requests exceed SQL_STATEMENT_BUDGETS (catches N+1 queries)."""
+    sql_profiler.take_violations()
+    yield
+    violations = sql_profiler.take_violations()
+    assert not violations, f"SQL statement budget exceeded: {violations}"
+
+
 @pytest_asyncio.fixture
 async def db_session(setup_test_database):
     """Provide a database session for tests."""
@@ -0,0 +1,179 @@
+"""
+Tests for the set-based account deletion pipeline and its background runner.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.emoji_reaction import EmojiReaction
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.share import Share
+from app.models.user import User
+from app.services.user_deletion_service import (
+    AccountDeletionJobs,
+    DeletionProgress,
+    UserDeletionService,
+)
+
+
+@pytest.mark.asyncio
+async def test_deletion_is_set_based_and_reports_progress(db_session, test_user, test_user_2, test_user_3):
+    owned = [Post(id=str(uuid.uuid4()), author_id=test_user.id, content=f"post {i}", is_public=True) for i in range(5)]
+    other_post = Post(id=str(uuid.uuid4()), author_id=test_user_2.id, content="theirs", is_public=True, reactions_count=2)
+    db_session.add_all([*owned, other_post])
+    await db_session.commit()
+    # Core statements and commits below expire these instances; keep plain ids
+    user_id, username = test_user.id, test_user.username
+    owned_ids, other_post_id = [p.id for p in owned], other_post.id
+    other_user_id, recipient_id = test_user_2.id, test_user_3.id
+
+    share = Share(
+        user_id=test_user_2.id,
+        post_id=other_post.id,
+        share_method="message",
+        recipient_user_ids=[test_user_3.id, test_user.id],
+    )
+    db_session.add_all([
+        EmojiReaction(user_id=test_user_2.id, post_id=owned[0].id, object_id=owned[0].id, emoji_code="heart"),
+        EmojiReaction(user_id=test_user.id, post_id=other_post.id, object_id=other_post.id, emoji_code="heart"),
+        EmojiReaction(user_id=test_user_3.id, post_id=other_post.id, object_id=other_post.id, emoji_code="pray"),
+        Notification(
+            user_id=test_user_2.id, type="mention", title="t", message="m",
+            data={"post_id": owned[1].id},
+        ),
+        share,
+    ])
+    await db_session.commit()
+    share_id = share.id
+
+    progress = DeletionProgress(user_id)
+    service = UserDeletionService(db_session, post_batch_size=2)
+    result = await service.delete_user(user_id, username, progress)
+
+    assert result["account_status"] == "deleted"
+    assert (progress.phase, progress.posts_total, progress.posts_tombstoned) == ("done", 5, 5)
+
+    live = await db_session.scalar(
+        select(func.count(Post.id)).where(Post.author_id == user_id, Post.deleted_at.is_(None))
+    )
+    assert live == 0
+    assert await db_session.scalar(select(User.posts_count).where(User.id == user_id)) == 0
+    assert await db_session.scalar(
+        select(func.count(EmojiReaction.id)).where(EmojiReaction.post_id.in_(owned_ids))
+    ) == 0
+    assert await db_session.scalar(
+        select(func.count(Notification.id)).where(Notification.user_id == other_user_id)
+    ) == 0
+
+    # Grouped recount leaves only the surviving reaction
+    assert await db_session.scalar(select(Post.reactions_count).where(Post.id == other_post_id)) == 1
+
+    # Recipient removed in SQL, order kept
+    recipients = await db_session.scalar(select(Share.recipient_user_ids).where(Share.id == share_id))
+    assert recipients == [recipient_id]
+
+
+@pytest.mark.asyncio
+async def test_background_job_resumes_pending_account(db_session, test_user, setup_test_database):
+    user_id, username = test_user.id, test_user.username
+    db_session.add_all([
+        Post(id=str(uuid.uuid4()), author_id=user_id, content=f"post {i}", is_public=True)
+        for i in range(3)
+    ])
+    await db_session.commit()
+
+    # Marked pending by an earlier process that stopped before deleting anything
+    state = await UserDeletionService(db_session).request_deletion(user_id, username)
+    assert state["account_status"] == "deletion_pending"
+
+    jobs = AccountDeletionJobs(session_factory=setup_test_database)
+    await jobs.start()
+    try:
+        progress = jobs.get_progress(user_id)
+        assert progress is not None
+        for _ in range(200):
+            if progress.phase in {"done", "failed"}:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await jobs.stop()
+
+    assert progress.phase == "done", progress.error
+    assert progress.posts_tombstoned == 3
+    assert jobs.get_stats()["completed"] == 1
+
+    db_session.expire_all()
+    user = await db_session.get(User, user_id)
+    assert user.account_status == "deleted"
+
+
+async def _wait_for(progress, phases, attempts=300):
+    for _ in range(attempts):
+        if progress.phase in phases:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_account_claimed_by_another_worker_is_skipped(db_session, test_user, setup_test_database):
+    user_id, username = test_user.id, test_user.username
+    await UserDeletionService(db_session).request_deletion(user_id, username)
+
+    # Another worker holds the lease
+    async with setup_test_database() as db:
+        assert await UserDeletionService(db).claim_deletion(user_id) is True
+
+    jobs = AccountDeletionJobs(session_factory=setup_test_database, rescan_seconds=0)
+    await jobs.start()
+    try:
+        assert jobs.get_progress(user_id) is None  # not resumed while the lease is live
+        # Queued before the other worker claimed it: skipped at run time
+        progress = jobs.submit(user_id)
+        await _wait_for(progress, {"done", "skipped", "failed"})
+    finally:
+        await jobs.stop()
+    assert progress.phase == "skipped"
+    assert jobs.get_stats()["skipped"] == 1
+
+    async with setup_test_database() as db:
+        assert await db.scalar(select(User.account_status).where(User.id == user_id)) == "deletion_pending"
+        # Once the lease has expired the account can be taken over
+        assert await UserDeletionService(db).claim_deletion(user_id, lease_seconds=0) is True
+
+
+@pytest.mark.asyncio
+async def test_failed_deletion_is_retried_after_backoff(db_session, test_user, setup_test_database, monkeypatch):
+    user_id, username = test_user.id, test_user.username
+    await UserDeletionService(db_session).request_deletion(user_id, username)
+
+    run_deletion = UserDeletionService.run_deletion
+    calls = []
+
+    async def flaky_run_deletion(self, user_id, progress=None):
+        calls.append(user_id)
+        if len(calls) == 1:
+            raise RuntimeError("database went away")
+        return await run_deletion(self, user_id, progress)
+
+    monkeypatch.setattr(UserDeletionService, "run_deletion", flaky_run_deletion)
+
+    jobs = AccountDeletionJobs(session_factory=setup_test_database, retry_base_seconds=0.05, rescan_seconds=0)
+    await jobs.start()
+    try:
+        progress = jobs.get_progress(user_id)
+        await _wait_for(progress, {"retrying"})
+        assert progress.error == "database went away"
+        async with setup_test_database() as db:
+            # Lease pushed out by the backoff: no other worker can claim it yet
+            assert await UserDeletionService(db).claim_deletion(user_id) is False
+        await _wait_for(progress, {"done", "failed"})
+    finally:
+        await jobs.stop()
+
+    assert progress.phase == "done", progress.error
+    assert progress.attempts == 2
+    assert jobs.get_stats()["retried"] == 1
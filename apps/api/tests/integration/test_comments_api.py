@@ -3,6 +3,7 @@ Integration tests for comments API endpoints.
 """
 
 import pytest
+from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
@@ -402,6 +403,106 @@ class TestGetPostComments:
         assert len(data) == 1
         assert data[0]["replies"] == []
 
+    async def test_get_comments_thread_with_reactions(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_post: Post,
+        test_user: User,
+        another_user: User,
+        auth_headers: dict
+    ):
+        """Test the whole thread with replies and reaction summaries folded in."""
+        parents = [
+            Comment(post_id=test_post.id, user_id=test_user.id, content=f"Parent {index}")
+            for index in range(2)
+        ]
+        db_session.add_all(parents)
+        await db_session.flush()
+        replies = [
+            Comment(
+                post_id=test_post.id,
+                user_id=another_user.id,
+                content=f"Reply {index}",
+                parent_comment_id=parents[0].id,
+                created_at=datetime(2026, 1, 1, 12, index, tzinfo=timezone.utc)
+            )
+            for index in range(2)
+        ]
+        db_session.add_all(replies)
+        await db_session.flush()
+        db_session.add(EmojiReaction(
+            user_id=test_user.id,
+            post_id=test_post.id,
+            object_type="comment",
+            object_id=replies[1].id,
+            emoji_code="heart"
+        ))
+        await db_session.commit()
+
+        response = await async_client.get(
+            f"/api/v1/posts/{test_post.id}/comments",
+            params={"include_replies": "true", "include_reactions": "true"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        by_content = {comment["content"]: comment for comment in data}
+        assert set(by_content) == {"Parent 0", "Parent 1"}
+        thread = by_content["Parent 0"]
+        assert thread["reply_count"] == 2
+        assert [reply["content"] for reply in thread["replies"]] == ["Reply 0", "Reply 1"]
+        assert [reply["can_delete"] for reply in thread["replies"]] == [False, True]
+        assert thread["replies"][1]["user"]["username"] == another_user.username
+        assert thread["replies"][1]["reactions"] == {
+            "totalCount": 1,
+            "emojiCounts": {"heart": 1},
+            "userReaction": "heart"
+        }
+        assert thread["reactions"]["totalCount"] == 0
+        assert by_content["Parent 1"]["replies"] == []
+
+    async def test_get_comments_keyset_pagination(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_post: Post,
+        test_user: User,
+        auth_headers: dict
+    ):
+        """Test paging through top-level comments with limit and cursor."""
+        # Shared timestamps exercise the id tie-breaker
+        base = datetime(2026, 1, 1, 12, 0, 0)
+        db_session.add_all([
+            Comment(
+                post_id=test_post.id,
+                user_id=test_user.id,
+                content=f"Comment {index}",
+                created_at=base + timedelta(minutes=index // 2)
+            )
+            for index in range(5)
+        ])
+        await db_session.commit()
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = await async_client.get(
+                f"/api/v1/posts/{test_post.id}/comments",
+                params=params,
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            seen.extend(comment["id"] for comment in response.json()["data"])
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
 
 class TestGetCommentReplies:
     """Tests for GET /api/v1/comments/{comment_id}/replies endpoint."""
@@ -0,0 +1,48 @@
+"""
+Smoke test for the feed benchmark harness on a tiny synthetic graph.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.models.post import Post
+from app.models.post_engagement_stats import PostEngagementStats
+from benchmarks.feed_benchmark import SCENARIOS, BenchmarkConfig, instrument_engine, percentile, run_benchmark
+from benchmarks.synthetic_graph import GraphConfig, generate_graph
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_benchmark_runs_every_scenario(test_engine):
+    instrument_engine(test_engine)
+    session_factory = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        stats = await generate_graph(session, GraphConfig(users=30, posts_per_user=3, seed=1))
+        assert stats.posts == (await session.execute(select(func.count(Post.id)))).scalar()
+        assert (await session.execute(select(func.count(PostEngagementStats.post_id)))).scalar() > 0
+
+    report = await run_benchmark(
+        session_factory,
+        stats,
+        BenchmarkConfig(iterations=1, viewers=2, page_depth=2, page_size=5),
+    )
+
+    assert set(report) == set(SCENARIOS)
+    first_page = report["unfiltered"]["pages"]["1"]
+    assert first_page["samples"] == 2
+    assert first_page["statements_mean"] > 0
+    assert first_page["p50_ms"] <= first_page["p99_ms"]
+    assert "full_scans" in report["unfiltered"]["first_page_scan"]
+    json.dumps(report)
@@ -0,0 +1,188 @@
+"""
+Tests for the cursor page cache in FeedServiceV2.
+
+Cursor pages served from a cached ranked ordering must be identical to the
+pages the scored query returns, and must never surface posts that were
+deleted or re-scoped after the ordering was cached.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from app.core.feed_cache import FeedResultCache, feed_result_cache
+from app.models.follow import Follow
+from app.models.post import Post
+from app.models.user import User
+from app.core.security import get_password_hash
+from app.services.feed_service_v2 import FeedServiceV2
+from app.services.post_deletion_service import PostDeletionService
+from app.services.post_privacy_service import PostPrivacyService
+
+PAGE_SIZE = 4
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin datetime.now() in the feed service so both runs share one query_time."""
+    from app.services import feed_service_v2
+
+    frozen = datetime.now(timezone.utc)
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen
+
+    monkeypatch.setattr(feed_service_v2, "datetime", _FrozenDatetime)
+    return frozen
+
+
+@pytest_asyncio.fixture
+async def feed_graph(db_session):
+    users = []
+    for name in ("viewer", "author_a", "author_b", "author_c"):
+        user = User(email=f"{name}@t.com", username=name, hashed_password=get_password_hash("p"))
+        db_session.add(user)
+        users.append(user)
+    await db_session.flush()
+    viewer, *authors = users
+    db_session.add(Follow(id=str(uuid.uuid4()), follower_id=viewer.id, followed_id=authors[0].id, status="active"))
+
+    now = datetime.now(timezone.utc)
+    posts = []
+    for i in range(30):
+        post = Post(
+            id=str(uuid.uuid4()),
+            author_id=authors[i % 3].id,
+            content=f"post-{i}",
+            is_public=True,
+            privacy_level="public",
+            created_at=now - timedelta(hours=i * 5),
+            comments_count=(i * 7) % 11,
+            shares_count=i % 3,
+        )
+        db_session.add(post)
+        posts.append(post)
+    await db_session.commit()
+    return {"viewer": viewer, "authors": authors, "posts": posts}
+
+
+async def _scroll(service, user_id, max_pages=20):
+    pages, cursors, cursor = [], [], None
+    for _ in range(max_pages):
+        result = await service.get_feed(user_id=user_id, cursor=cursor, page_size=PAGE_SIZE)
+        pages.append([p["id"] for p in result["posts"]])
+        cursor = result["nextCursor"]
+        cursors.append(cursor)
+        if cursor is None:
+            break
+    return pages, cursors
+
+
+@pytest.mark.asyncio
+async def test_cached_pages_match_uncached_pages(db_session, feed_graph, frozen_now):
+    viewer_id = feed_graph["viewer"].id
+    cache = FeedResultCache()
+
+    expected = await _scroll(FeedServiceV2(db_session, result_cache=None), viewer_id)
+    actual = await _scroll(FeedServiceV2(db_session, result_cache=cache), viewer_id)
+
+    assert actual == expected
+    assert len(expected[0]) > 2
+    # Every cursor page after the first was served from the cached ordering.
+    assert cache.hits == len(expected[0]) - 1
+    assert cache.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_is_scoped_to_filter_spec(db_session, feed_graph, frozen_now):
+    viewer_id = feed_graph["viewer"].id
+    author_id = feed_graph["authors"][1].id
+    cache = FeedResultCache()
+    service = FeedServiceV2(db_session, result_cache=cache)
+
+    unfiltered = await service.get_feed(user_id=viewer_id, page_size=PAGE_SIZE)
+    filtered = await service.get_feed(
+        user_id=viewer_id, page_size=PAGE_SIZE, author_mode="required", author_ids=[author_id],
+    )
+    second = await service.get_feed(
+        user_id=viewer_id, cursor=filtered["nextCursor"], page_size=PAGE_SIZE,
+        author_mode="required", author_ids=[author_id],
+    )
+
+    assert unfiltered["nextCursor"] and filtered["nextCursor"]
+    assert {p["author_id"] for p in second["posts"]} == {author_id}
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_deleted_post_is_not_served_from_cache(db_session, feed_graph, frozen_now):
+    viewer_id = feed_graph["viewer"].id
+    # Deletion and privacy hooks mark posts in the shared cache.
+    await feed_result_cache.clear()
+    service = FeedServiceV2(db_session)
+
+    first = await service.get_feed(user_id=viewer_id, page_size=PAGE_SIZE)
+    baseline = await FeedServiceV2(db_session, result_cache=None).get_feed(
+        user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE,
+    )
+    victim_id = baseline["posts"][0]["id"]
+    victim = await db_session.get(Post, victim_id)
+    await PostDeletionService(db_session).tombstone_post(victim)
+
+    second = await service.get_feed(user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE)
+    expected = await FeedServiceV2(db_session, result_cache=None).get_feed(
+        user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE,
+    )
+
+    assert victim_id not in [p["id"] for p in second["posts"]]
+    assert [p["id"] for p in second["posts"]] == [p["id"] for p in expected["posts"]]
+
+
+@pytest.mark.asyncio
+async def test_privacy_change_is_not_served_from_cache(db_session, feed_graph, frozen_now):
+    viewer_id = feed_graph["viewer"].id
+    # Deletion and privacy hooks mark posts in the shared cache.
+    await feed_result_cache.clear()
+    service = FeedServiceV2(db_session)
+
+    first = await service.get_feed(user_id=viewer_id, page_size=PAGE_SIZE)
+    baseline = await FeedServiceV2(db_session, result_cache=None).get_feed(
+        user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE,
+    )
+    target_id = next(p["id"] for p in baseline["posts"] if p["author_id"] != viewer_id)
+    target = await db_session.get(Post, target_id)
+    privacy_service = PostPrivacyService(db_session)
+    await privacy_service.apply_post_config(target, privacy_service.resolve_config(privacy_level="private"))
+    await db_session.commit()
+
+    second = await service.get_feed(user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE)
+
+    assert target_id not in [p["id"] for p in second["posts"]]
+    assert all(p["privacy_level"] != "private" for p in second["posts"])
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_rechecked_without_marker(db_session, feed_graph, frozen_now):
+    """Visibility is re-checked at hydration even when no invalidation marker exists."""
+    viewer_id = feed_graph["viewer"].id
+    cache = FeedResultCache()
+    service = FeedServiceV2(db_session, result_cache=cache)
+
+    first = await service.get_feed(user_id=viewer_id, page_size=PAGE_SIZE)
+    baseline = await FeedServiceV2(db_session, result_cache=None).get_feed(
+        user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE,
+    )
+    target_id = next(p["id"] for p in baseline["posts"] if p["author_id"] != viewer_id)
+    target = await db_session.get(Post, target_id)
+    # Bypass the service so no marker is written.
+    target.privacy_level = "private"
+    target.is_public = False
+    await db_session.commit()
+
+    second = await service.get_feed(user_id=viewer_id, cursor=first["nextCursor"], page_size=PAGE_SIZE)
+
+    assert target_id not in [p["id"] for p in second["posts"]]
@@ -512,3 +512,93 @@ class TestKeywordNormalization:
         ids = {p["id"] for p in result["posts"]}
         assert len(ids) > 0
         # The normalized keyword "grateful for" should match the first post
+
+
+# ===================================================================
+# Candidate window — bounded scoring must match the full-table ranking
+# ===================================================================
+
+class TestCandidateWindowParity:
+
+    PAGES = 4
+    PAGE_SIZE = 5
+
+    @staticmethod
+    def _freeze_query_time(monkeypatch):
+        """Pin datetime.now() in the feed service so jitter is identical across runs."""
+        from app.services import feed_service_v2
+
+        frozen = datetime.now(timezone.utc)
+
+        class _FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen
+
+        monkeypatch.setattr(feed_service_v2, "datetime", _FrozenDatetime)
+
+    async def _pages(self, db_session, user_id, candidate_window):
+        service = FeedServiceV2(db_session, candidate_window=candidate_window)
+        pages, windows, cursor = [], [], None
+        for _ in range(self.PAGES):
+            result = await service.get_feed(
+                user_id=user_id, cursor=cursor, page_size=self.PAGE_SIZE, debug=True,
+            )
+            pages.append([p["id"] for p in result["posts"]])
+            windows.append(result.get("_debugMeta", {}).get("candidateWindow"))
+            cursor = result["nextCursor"]
+            if cursor is None:
+                break
+        return pages, windows
+
+    async def _seed(self, db_session, u_a, u_b, u_c):
+        await _follow(db_session, u_a, u_b)
+        await _follow(db_session, u_c, u_a)
+        authors = [u_a, u_b, u_c]
+        # Fresh posts inside the recency window
+        for i in range(24):
+            await _post(db_session, authors[i % 3], f"fresh-{i}", age_hours=i * 2)
+        # Older posts: only engagement, discovery and the viewer's reaction can score
+        for i in range(16):
+            post = await _post(
+                db_session, authors[i % 3], f"old-{i}", age_hours=200 + i * 30,
+                comments_count=(i * 7) % 23, shares_count=i % 4,
+                image_url="https://example.com/i.jpg" if i % 2 else None,
+                heart_reactions=i % 5,
+            )
+            if i % 6 == 0:
+                db_session.add(EmojiReaction(
+                    id=str(uuid.uuid4()), user_id=u_a.id, post_id=post.id,
+                    object_id=post.id, emoji_code="star",
+                ))
+        await db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_first_pages_match_full_ranking(self, db_session, u_a, u_b, u_c, monkeypatch):
+        from app.services import feed_service_v2
+
+        self._freeze_query_time(monkeypatch)
+        monkeypatch.setattr(feed_service_v2, "CANDIDATE_SLICE_LIMIT", 4)
+        await self._seed(db_session, u_a, u_b, u_c)
+
+        for viewer in (u_a, u_b, u_c):
+            bounded_pages, windows = await self._pages(db_session, viewer.id, True)
+            full_pages, _ = await self._pages(db_session, viewer.id, False)
+            assert bounded_pages == full_pages
+            # The harness only proves something if the window actually served pages.
+            assert windows[0] == "bounded"
+
+    @pytest.mark.asyncio
+    async def test_window_falls_back_when_old_posts_could_rank(self, db_session, u_a, u_b, monkeypatch):
+        from app.services import feed_service_v2
+
+        self._freeze_query_time(monkeypatch)
+        monkeypatch.setattr(feed_service_v2, "CANDIDATE_SLICE_LIMIT", 1)
+        # Only stale posts: every page must come from the full-table path.
+        for i in range(8):
+            await _post(db_session, u_b, f"stale-{i}", age_hours=400 + i, comments_count=i)
+
+        bounded_pages, windows = await self._pages(db_session, u_a.id, True)
+        full_pages, _ = await self._pages(db_session, u_a.id, False)
+        assert bounded_pages == full_pages
+        assert set(windows) == {"full"}
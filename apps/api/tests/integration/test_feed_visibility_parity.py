@@ -0,0 +1,154 @@
+"""
+Parity tests for the set-based feed visibility relation.
+
+The feed joins against ``viewer_grants`` instead of calling ``can_view_post``
+per candidate row. These tests assert that the relation admits exactly the
+posts ``PostPrivacyService.visible_to_user_clause`` (the SQL twin of
+``can_view_post``) admits, for every viewer over a matrix of privacy setups.
+"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+
+from app.config.feed_config import MAX_PAGE_SIZE
+from app.models.follow import Follow
+from app.models.post import Post
+from app.models.post_privacy import PostPrivacyRule, PostPrivacyUser
+from app.models.user import User
+from app.core.security import get_password_hash
+from app.services.feed_service_v2 import FeedServiceV2
+from app.services.post_privacy_service import PostPrivacyService
+
+
+@pytest_asyncio.fixture
+async def outsider(db_session):
+    user = User(email="outsider@t.com", username="outsider", hashed_password=get_password_hash("p"))
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    return user
+
+
+def _add_post(db_session, author, label, privacy_level, rules=(), specific_users=()):
+    post = Post(
+        id=str(uuid.uuid4()),
+        author_id=author.id,
+        content=label,
+        is_public=privacy_level == "public",
+        privacy_level=privacy_level,
+    )
+    db_session.add(post)
+    for rule in rules:
+        db_session.add(PostPrivacyRule(post_id=post.id, rule_type=rule))
+    for user in specific_users:
+        db_session.add(PostPrivacyUser(post_id=post.id, user_id=user.id))
+    return post
+
+
+def _add_follow(db_session, follower, followed, status="active"):
+    db_session.add(
+        Follow(id=str(uuid.uuid4()), follower_id=follower.id, followed_id=followed.id, status=status)
+    )
+
+
+@pytest_asyncio.fixture
+async def privacy_matrix(db_session, test_user, test_user_2, test_user_3, outsider):
+    """
+    Follow graph:
+      user_2 -> user (active), user -> user_2 (active),
+      user -> user_3 (active), outsider -> user (pending).
+    Every author gets one post per privacy configuration.
+    """
+    _add_follow(db_session, test_user_2, test_user)
+    _add_follow(db_session, test_user, test_user_2)
+    _add_follow(db_session, test_user, test_user_3)
+    _add_follow(db_session, outsider, test_user, status="pending")
+
+    users = [test_user, test_user_2, test_user_3, outsider]
+    posts = []
+    for author in users:
+        others = [u for u in users if u.id != author.id]
+        posts.append(_add_post(db_session, author, "public", "public"))
+        posts.append(_add_post(db_session, author, "private", "private"))
+        posts.append(_add_post(db_session, author, "followers", "custom", rules=["followers"]))
+        posts.append(_add_post(db_session, author, "following", "custom", rules=["following"]))
+        posts.append(_add_post(
+            db_session, author, "specific", "custom",
+            rules=["specific_users"], specific_users=others[:1],
+        ))
+        posts.append(_add_post(
+            db_session, author, "followers+specific", "custom",
+            rules=["followers", "specific_users"], specific_users=others[-1:],
+        ))
+        posts.append(_add_post(
+            db_session, author, "all-rules", "custom",
+            rules=["followers", "following", "specific_users"], specific_users=others[1:2],
+        ))
+        # Stale rows left behind by a privacy downgrade must not grant access.
+        posts.append(_add_post(
+            db_session, author, "stale-private", "private",
+            rules=["followers", "following"], specific_users=others,
+        ))
+    await db_session.commit()
+    return {"users": users, "posts": posts}
+
+
+async def _visible_ids_via_grants(db_session, viewer_id):
+    sql = text(
+        f"WITH {PostPrivacyService.viewer_grants_cte_sql().rstrip(', ')} "
+        "SELECT p.id FROM posts p "
+        "LEFT JOIN viewer_grants vg ON vg.post_id = p.id "
+        f"WHERE {PostPrivacyService.viewer_visibility_sql()}"
+    )
+    result = await db_session.execute(sql, {"uid": viewer_id})
+    return [row[0] for row in result.fetchall()]
+
+
+async def _visible_ids_via_reference(db_session, viewer_id):
+    result = await db_session.execute(
+        select(Post.id).where(PostPrivacyService.visible_to_user_clause(viewer_id))
+    )
+    return [row[0] for row in result.fetchall()]
+
+
+@pytest.mark.asyncio
+async def test_viewer_grants_matches_reference_for_every_viewer(db_session, privacy_matrix):
+    for viewer in privacy_matrix["users"]:
+        via_grants = await _visible_ids_via_grants(db_session, viewer.id)
+        reference = await _visible_ids_via_reference(db_session, viewer.id)
+
+        # The relation is a UNION, so a post matching several rules appears once.
+        assert len(via_grants) == len(set(via_grants))
+        assert set(via_grants) == set(reference), f"viewer={viewer.username}"
+
+
+@pytest.mark.asyncio
+async def test_viewer_grants_expected_custom_audiences(db_session, privacy_matrix, test_user, test_user_2, test_user_3):
+    posts_by_key = {(p.author_id, p.content): p.id for p in privacy_matrix["posts"]}
+
+    # user_3 is followed by user, so "following" posts from user are visible.
+    visible_3 = set(await _visible_ids_via_grants(db_session, test_user_3.id))
+    assert posts_by_key[(test_user.id, "following")] in visible_3
+    assert posts_by_key[(test_user.id, "followers")] not in visible_3
+    assert posts_by_key[(test_user.id, "private")] not in visible_3
+    assert posts_by_key[(test_user.id, "stale-private")] not in visible_3
+
+    # user_2 follows user, so "followers" posts from user are visible.
+    visible_2 = set(await _visible_ids_via_grants(db_session, test_user_2.id))
+    assert posts_by_key[(test_user.id, "followers")] in visible_2
+
+
+@pytest.mark.asyncio
+async def test_feed_returns_exactly_reference_visible_posts(db_session, privacy_matrix):
+    service = FeedServiceV2(db_session)
+    assert len(privacy_matrix["posts"]) <= MAX_PAGE_SIZE
+    for viewer in privacy_matrix["users"]:
+        page = await service.get_feed(user_id=viewer.id, page_size=MAX_PAGE_SIZE)
+        returned = [post["id"] for post in page["posts"]]
+        assert page["nextCursor"] is None
+
+        reference = await _visible_ids_via_reference(db_session, viewer.id)
+        assert sorted(returned) == sorted(reference), f"viewer={viewer.username}"
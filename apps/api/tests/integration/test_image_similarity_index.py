@@ -0,0 +1,85 @@
+"""
+Tests for near-duplicate lookup through the perceptual hash index.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+from sqlalchemy import update
+
+from app.core.phash_index import PerceptualHashIndex
+from app.models.image_hash import ImageHash
+from app.services.image_hash_service import ImageHashService
+
+
+def _image_hash(file_hash: str, phash: str, **overrides) -> ImageHash:
+    fields = dict(
+        file_hash=file_hash,
+        perceptual_hash=phash,
+        original_filename=f"{file_hash}.jpg",
+        file_path=f"posts/{file_hash}.jpg",
+        file_size=1024,
+        mime_type="image/jpeg",
+    )
+    fields.update(overrides)
+    return ImageHash(**fields)
+
+
+def _png_bytes(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_find_similar_images_uses_index(db_session):
+    db_session.add_all([
+        _image_hash("a" * 64, "0000000000000000"),
+        _image_hash("b" * 64, "0000000000000007"),
+        _image_hash("c" * 64, "ffffffffffffffff"),
+        _image_hash("d" * 64, "0000000000000001", is_active=False),
+    ])
+    await db_session.commit()
+    service = ImageHashService(db_session, similarity_index=PerceptualHashIndex())
+
+    result = await service.find_similar_images("0000000000000000", threshold=5)
+
+    assert [(row.file_hash[0], distance) for row, distance in result] == [("a", 0), ("b", 3)]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_store_and_delete(db_session):
+    index = PerceptualHashIndex()
+    service = ImageHashService(db_session, similarity_index=index)
+    await service.find_similar_images("0000000000000000")  # loads the (empty) index
+
+    stored = await service.store_image_hash(
+        _png_bytes((200, 30, 30)), "red.png", "posts/red.png", "image/png"
+    )
+    assert len(index) == 1
+    result = await service.find_similar_images(stored.perceptual_hash, threshold=0)
+    assert [row.id for row, _ in result] == [stored.id]
+
+    assert await service.decrement_reference_count(stored) is True
+    assert len(index) == 0
+    assert await service.find_similar_images(stored.perceptual_hash, threshold=0) == []
+
+
+@pytest.mark.asyncio
+async def test_stale_index_entries_are_rechecked(db_session):
+    row = _image_hash("e" * 64, "0000000000000000")
+    db_session.add(row)
+    await db_session.commit()
+    index = PerceptualHashIndex()
+    service = ImageHashService(db_session, similarity_index=index)
+    assert len(await service.find_similar_images("0000000000000000")) == 1
+
+    # Changed by another worker behind this process's back.
+    await db_session.execute(
+        update(ImageHash).where(ImageHash.id == row.id).values(perceptual_hash="ffffffffffffffff")
+    )
+    await db_session.commit()
+
+    assert await service.find_similar_images("0000000000000000") == []
+    assert index.query("ffffffffffffffff", threshold=0) == [(row.id, 0)]
@@ -476,4 +476,51 @@ class TestMentionNotifications:
         assert summary_response.status_code == 200
         summary_data = summary_response.json()
         assert summary_data["unread_count"] == 0
-        assert summary_data["total_count"] == 1
\ No newline at end of file
+        assert summary_data["total_count"] == 1
+    async def test_mention_processing_statements_independent_of_mention_count(
+        self,
+        db_session: AsyncSession,
+        test_engine
+    ):
+        """Mentions resolve, insert and notify with a fixed number of statements."""
+        from sqlalchemy import event, select
+
+        from app.services.mention_service import MentionService
+
+        author = User(username="busy_author", email="busy@example.com", hashed_password="hashed_password")
+        mentioned = [
+            User(username=f"friend_{index}", email=f"friend{index}@example.com", hashed_password="hashed_password")
+            for index in range(8)
+        ]
+        db_session.add_all([author, *mentioned])
+        await db_session.commit()
+        posts = [Post(author_id=author.id, content="Thanks!"), Post(author_id=author.id, content="Thanks!")]
+        db_session.add_all(posts)
+        await db_session.commit()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async def statements_for(post, users):
+            content = " ".join(f"@{user.username}" for user in users) + " @nobody_here"
+            statements.clear()
+            event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            try:
+                created = await MentionService(db_session).create_mentions(post.id, author.id, content)
+            finally:
+                event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+            assert len(created) == len(users)
+            return len(statements)
+
+        assert await statements_for(posts[0], mentioned[:2]) == await statements_for(posts[1], mentioned)
+
+        notifications = await db_session.execute(
+            select(Notification).where(Notification.type == "mention")
+        )
+        assert len(notifications.scalars().all()) == 10
+        unread = await db_session.execute(
+            select(User.unread_notifications_count).where(User.id == mentioned[0].id)
+        )
+        assert unread.scalar_one() == 2
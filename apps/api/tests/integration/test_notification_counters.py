@@ -0,0 +1,144 @@
+"""
+Tests for the unread notification counter on users, keyset pagination of
+/notifications and deletion of a post's notifications.
+"""
+
+import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.notification_factory import NotificationFactory
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.notification_repository import NotificationRepository
+from app.services.notification_service import NotificationService
+from app.services.post_deletion_service import PostDeletionService
+
+
+async def _unread(db_session, user_id):
+    result = await db_session.execute(
+        select(User.unread_notifications_count).where(User.id == user_id)
+    )
+    return result.scalar_one()
+
+
+def _notification(user_id, **kwargs):
+    return Notification(user_id=user_id, type="mention", title="t", message="m", data={}, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_writes_maintain_unread_counter(db_session, test_user, test_user_2, test_user_3):
+    user_id = test_user.id
+    first, second, already_read = _notification(user_id), _notification(user_id), _notification(user_id, read=True)
+    db_session.add_all([first, second, already_read])
+    await db_session.commit()
+    assert await _unread(db_session, user_id) == 2
+
+    assert await NotificationService.mark_as_read(db_session, first.id, user_id) is True
+    assert await _unread(db_session, user_id) == 1
+
+    await db_session.delete(second)
+    await db_session.commit()
+    assert await _unread(db_session, user_id) == 0
+
+    # Batching converts an unread single into a batch child: still one unread item
+    factory = NotificationFactory(db_session)
+    for actor in (test_user_2, test_user_3):
+        await factory.create_follow_notification(
+            followed_user_id=user_id,
+            follower_username=actor.username,
+            follower_id=actor.id
+        )
+    assert await _unread(db_session, user_id) == 1
+    assert await NotificationService.get_unread_count(db_session, user_id) == 1
+
+    assert await NotificationService.mark_all_as_read(db_session, user_id) == 1
+    assert await _unread(db_session, user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_unread_counter(db_session, test_user):
+    db_session.add_all([_notification(test_user.id), _notification(test_user.id)])
+    await db_session.commit()
+    await db_session.execute(
+        update(User).where(User.id == test_user.id).values(unread_notifications_count=7)
+    )
+    await db_session.commit()
+
+    repaired = await NotificationRepository(db_session).reconcile_unread_counts()
+    await db_session.commit()
+
+    assert repaired == 1
+    assert await _unread(db_session, test_user.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_walks_every_notification_once(async_client, db_session, test_user, auth_headers):
+    # Shared timestamps exercise the id tie-breaker
+    base = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    db_session.add_all([
+        _notification(test_user.id, last_updated_at=base + datetime.timedelta(minutes=index // 2))
+        for index in range(7)
+    ])
+    await db_session.commit()
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        # Clients migrating from offset paging may still send it with the cursor
+        params = {"limit": 3, "offset": len(seen), **({"cursor": cursor} if cursor else {})}
+        response = await async_client.get("/api/v1/notifications", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(async_client, test_user, auth_headers):
+    response = await async_client.get(
+        "/api/v1/notifications", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_post_tombstone_deletes_its_notifications_only(db_session, test_user, test_user_2, test_user_3, test_post):
+    other_post = Post(author_id=test_user.id, content="Another post", is_public=True)
+    db_session.add(other_post)
+    await db_session.commit()
+
+    factory = NotificationFactory(db_session)
+    for actor in (test_user_2, test_user_3):
+        await factory.create_share_notification(
+            recipient_id=test_user.id,
+            sharer_username=actor.username,
+            sharer_id=actor.id,
+            post_id=test_post.id,
+            share_method="url"
+        )
+    await factory.create_share_notification(
+        recipient_id=test_user.id,
+        sharer_username=test_user_2.username,
+        sharer_id=test_user_2.id,
+        post_id=other_post.id,
+        share_method="url"
+    )
+    result = await db_session.execute(select(Notification).where(Notification.user_id == test_user.id))
+    notifications = result.scalars().all()
+    # Batch + two children for test_post, one single for other_post; post_id filled from data
+    assert sorted(n.post_id for n in notifications) == sorted([test_post.id] * 3 + [other_post.id])
+    assert await _unread(db_session, test_user.id) == 2
+
+    await PostDeletionService(db_session).tombstone_post(test_post)
+
+    result = await db_session.execute(select(Notification).where(Notification.user_id == test_user.id))
+    remaining = result.scalars().all()
+    assert [n.post_id for n in remaining] == [other_post.id]
+    assert await _unread(db_session, test_user.id) == 1
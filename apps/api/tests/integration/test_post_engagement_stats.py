@@ -0,0 +1,96 @@
+"""
+Tests for the materialized post engagement aggregate used by feed scoring.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models.emoji_reaction import EmojiReaction
+from app.models.post_engagement_stats import PostEngagementStats
+from app.repositories.emoji_reaction_repository import EmojiReactionRepository
+from app.services.reaction_service import ReactionService
+
+
+async def _stats(db_session, post_id):
+    result = await db_session.execute(
+        select(
+            PostEngagementStats.reactions_distinct_users,
+            PostEngagementStats.reactions_distinct_codes,
+        ).where(PostEngagementStats.post_id == post_id)
+    )
+    row = result.first()
+    return tuple(row) if row else (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reaction_service_maintains_stats(db_session, test_user, test_user_2, test_user_3, test_post):
+    await db_session.commit()
+    post_id, user_2_id, user_3_id = test_post.id, test_user_2.id, test_user_3.id
+    service = ReactionService(db_session)
+
+    await service.add_reaction(user_2_id, post_id, "heart")
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (1, 1)
+
+    await service.add_reaction(user_3_id, post_id, "heart")
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (2, 1)
+
+    # Changing an emoji updates the distinct code count without a new user.
+    await service.add_reaction(user_3_id, post_id, "fire")
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (2, 2)
+
+    await service.remove_reaction(user_2_id, post_id)
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (1, 1)
+
+    await service.delete_all_post_reactions(post_id)
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_non_post_reactions_are_excluded(db_session, test_user_2, test_post):
+    db_session.add(EmojiReaction(
+        id=str(uuid.uuid4()),
+        user_id=test_user_2.id,
+        post_id=test_post.id,
+        object_type="comment",
+        object_id=str(uuid.uuid4()),
+        emoji_code="heart",
+    ))
+    await db_session.commit()
+    assert await _stats(db_session, test_post.id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(db_session, test_user_2, test_user_3, test_post):
+    post_id = test_post.id
+    for user_id, code in ((test_user_2.id, "heart"), (test_user_3.id, "pray")):
+        db_session.add(EmojiReaction(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            post_id=post_id,
+            object_id=post_id,
+            emoji_code=code,
+        ))
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (2, 2)
+
+    await db_session.execute(
+        update(PostEngagementStats)
+        .where(PostEngagementStats.post_id == post_id)
+        .values(reactions_distinct_users=9, reactions_distinct_codes=0)
+    )
+    await db_session.commit()
+
+    repo = EmojiReactionRepository(db_session)
+    assert await repo.reconcile_post_engagement_stats() == 1
+    await db_session.commit()
+    assert await _stats(db_session, post_id) == (2, 2)
+
+    # A second pass finds nothing to repair.
+    assert await repo.reconcile_post_engagement_stats() == 0
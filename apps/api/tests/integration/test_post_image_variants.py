@@ -0,0 +1,77 @@
+"""
+Tests for single-decode post image variant rendering and deduplication.
+"""
+
+import io
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from sqlalchemy import select
+from starlette.datastructures import Headers
+
+from app.core.object_storage import LocalS3Server
+from app.core.storage import storage
+from app.models.image_hash import ImageHash
+from app.services.file_upload_service import FileUploadService
+
+
+def _upload(size=(3000, 2000)) -> UploadFile:
+    buffer = io.BytesIO()
+    image = Image.new("RGB", size, (240, 200, 40))
+    image.paste((30, 60, 90), (0, 0, size[0] // 3, size[1]))
+    image.save(buffer, format="JPEG")
+    buffer.seek(0)
+    return UploadFile(
+        file=buffer,
+        filename="photo.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_post_variants_are_rendered_and_deduplicated(db_session, test_user):
+    service = FileUploadService(db_session)
+
+    first = await service.save_post_image_variants(_upload(), position=0, uploader_id=test_user.id)
+    try:
+        assert (first["width"], first["height"]) == (3000, 2000)
+        for key, width in (("thumbnail_url", 400), ("medium_url", 1200), ("original_url", 2560)):
+            with Image.open(storage.upload_path / first[key]) as variant:
+                assert variant.width == width
+
+        image_hash = (await db_session.execute(select(ImageHash))).scalar_one()
+        assert image_hash.file_path == first["medium_url"]
+        assert len(image_hash.perceptual_hash) == 16
+        assert (image_hash.width, image_hash.height) == (3000, 2000)
+
+        # The same bytes reuse the stored variants.
+        second = await service.save_post_image_variants(_upload(), position=1, uploader_id=test_user.id)
+        assert second["medium_url"] == first["medium_url"]
+        assert second["position"] == 1
+        await db_session.refresh(image_hash)
+        assert image_hash.reference_count == 2
+    finally:
+        service.cleanup_post_image_variants(first["thumbnail_url"], first["medium_url"], first["original_url"])
+
+
+@pytest.mark.asyncio
+async def test_post_images_uploaded_concurrently_to_s3_stand_in(db_session, test_user, monkeypatch):
+    server = LocalS3Server(latency_seconds=0.05)
+    backend = server.client()
+    monkeypatch.setattr(storage, "backend", backend)
+    service = FileUploadService(db_session)
+    try:
+        results = await service.save_post_images_variants(
+            [_upload((800, 600)), _upload((600, 800))], uploader_id=test_user.id
+        )
+
+        assert [result["position"] for result in results] == [0, 1]
+        stored = {key.split("/", 1)[1] for key in server.objects}
+        assert stored == {
+            result[key] for result in results for key in ("thumbnail_url", "medium_url", "original_url")
+        }
+        # Both images' variants were in flight together
+        assert server.max_in_flight == 6
+    finally:
+        await backend.close()
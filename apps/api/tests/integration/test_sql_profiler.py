@@ -0,0 +1,26 @@
+"""
+Integration tests for request SQL profiling and statement budgets.
+"""
+
+from app.config.sql_profiler_config import SQL_STATEMENT_BUDGETS
+from app.core.sql_profiler import sql_profiler
+from app.models.post import Post
+
+FEED_ROUTE = "GET /api/v1/posts/feed"
+
+
+async def test_feed_profiled_within_budget(async_client, db_session, test_user, auth_headers):
+    """A full feed page stays within its statement budget and is reported per route."""
+    sql_profiler.clear()
+    db_session.add_all([Post(author_id=test_user.id, content=f"Grateful {index}", is_public=True) for index in range(12)])
+    await db_session.commit()
+
+    response = await async_client.get("/api/v1/posts/feed", params={"page_size": 10}, headers=auth_headers)
+    assert response.status_code == 200
+
+    report = await async_client.get("/api/v1/database/performance")
+    assert report.status_code == 200
+    route = report.json()["data"]["sql_profile"]["routes"][FEED_ROUTE]
+    assert route["requests"] == 1
+    assert 0 < route["max_statements"] <= SQL_STATEMENT_BUDGETS[FEED_ROUTE]
+    assert route["budget"] == SQL_STATEMENT_BUDGETS[FEED_ROUTE]
@@ -0,0 +1,118 @@
+"""
+Tests for the denormalized follower/following/post counters on users.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+
+from app.models.follow import Follow
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.services.follow_service import FollowService
+from app.services.post_deletion_service import PostDeletionService
+from app.services.user_deletion_service import UserDeletionService
+
+
+async def _counters(db_session, user_id):
+    result = await db_session.execute(
+        select(
+            User.posts_count,
+            User.public_posts_count,
+            User.followers_count,
+            User.following_count,
+        ).where(User.id == user_id)
+    )
+    return tuple(result.first())
+
+
+@pytest.mark.asyncio
+async def test_follow_service_maintains_counters(db_session, test_user, test_user_2, test_user_3):
+    user_1, user_2, user_3 = test_user.id, test_user_2.id, test_user_3.id
+    service = FollowService(db_session)
+
+    await service.follow_user(user_1, user_2)
+    await service.follow_user(user_3, user_2)
+    await db_session.commit()
+    assert (await _counters(db_session, user_2))[2:] == (2, 0)
+    assert (await _counters(db_session, user_1))[2:] == (0, 1)
+
+    await service.unfollow_user(user_1, user_2)
+    await db_session.commit()
+    assert (await _counters(db_session, user_2))[2:] == (1, 0)
+    assert (await _counters(db_session, user_1))[2:] == (0, 0)
+
+    # Only active follows count.
+    follow = (await db_session.execute(
+        select(Follow).where(Follow.follower_id == user_3, Follow.followed_id == user_2)
+    )).scalar_one()
+    follow.status = "blocked"
+    await db_session.commit()
+    assert (await _counters(db_session, user_2))[2:] == (0, 0)
+    assert (await _counters(db_session, user_3))[2:] == (0, 0)
+
+    stats = await UserRepository(db_session).get_user_stats_batch([user_2, user_3])
+    assert stats[user_2]["followers_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_post_writes_maintain_counters(db_session, test_user):
+    user_id = test_user.id
+    public_post = Post(id=str(uuid.uuid4()), author_id=user_id, content="public")
+    private_post = Post(
+        id=str(uuid.uuid4()), author_id=user_id, content="private",
+        privacy_level="private", is_public=False,
+    )
+    db_session.add_all([public_post, private_post])
+    await db_session.commit()
+    assert (await _counters(db_session, user_id))[:2] == (2, 1)
+
+    private_post.privacy_level = "public"
+    await db_session.commit()
+    assert (await _counters(db_session, user_id))[:2] == (2, 2)
+
+    await PostDeletionService(db_session).tombstone_post(public_post)
+    assert (await _counters(db_session, user_id))[:2] == (1, 1)
+
+    await db_session.delete(private_post)
+    await db_session.commit()
+    assert (await _counters(db_session, user_id))[:2] == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_user_deletion_refreshes_counterparts(db_session, test_user, test_user_2, test_user_3):
+    user_1, user_2, user_3 = test_user.id, test_user_2.id, test_user_3.id
+    service = FollowService(db_session)
+    await service.follow_user(user_1, user_2)
+    await service.follow_user(user_2, user_3)
+    await db_session.commit()
+
+    await UserDeletionService(db_session).delete_user(user_2, test_user_2.username)
+
+    assert (await _counters(db_session, user_1))[2:] == (0, 0)
+    assert (await _counters(db_session, user_3))[2:] == (0, 0)
+    assert (await _counters(db_session, user_2))[2:] == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(db_session, test_user, test_user_2):
+    user_1, user_2 = test_user.id, test_user_2.id
+    await FollowService(db_session).follow_user(user_1, user_2)
+    db_session.add(Post(id=str(uuid.uuid4()), author_id=user_2, content="hello"))
+    await db_session.commit()
+    assert await _counters(db_session, user_2) == (1, 1, 1, 0)
+
+    await db_session.execute(
+        update(User).where(User.id == user_2).values(posts_count=7, followers_count=0)
+    )
+    await db_session.commit()
+
+    repo = UserRepository(db_session)
+    assert await repo.reconcile_user_counters() == 1
+    await db_session.commit()
+    assert await _counters(db_session, user_2) == (1, 1, 1, 0)
+
+    # A second pass finds nothing to repair.
+    assert await repo.reconcile_user_counters() == 0
@@ -0,0 +1,151 @@
+"""
+Unit tests for the raw ASGI middleware stack.
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.exceptions import NotFoundError
+from app.core.input_sanitization import InputSanitizationMiddleware
+from app.core.middleware import ErrorHandlingMiddleware, RequestValidationMiddleware
+from app.core.rate_limiting import InMemoryRateLimiter, RateLimitingMiddleware, SecurityHeadersMiddleware
+from app.core.request_id_middleware import RequestIDMiddleware
+from app.core.request_size_middleware import RequestSizeLimitMiddleware
+from app.core.ssl_middleware import HTTPSRedirectMiddleware
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"ok": True}
+
+    @app.post("/api/v1/posts")
+    async def create_post():
+        return {"created": True}
+
+    @app.get("/missing")
+    async def missing():
+        raise NotFoundError("Post", "42")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/cookie")
+    async def cookie():
+        response = JSONResponse({})
+        response.set_cookie("session_id", "abc")
+        return response
+
+    return app
+
+
+def _client(app) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app, raise_app_exceptions=False), base_url="http://api.example.com")
+
+
+async def test_security_and_request_id_headers():
+    app = _app()
+    app.add_middleware(SecurityHeadersMiddleware, security_headers={"X-Frame-Options": "DENY"})
+    app.add_middleware(RequestValidationMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+
+    async with _client(app) as client:
+        response = await client.get("/items", headers={"X-Request-ID": "req-123"})
+        generated = await client.get("/items")
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert generated.headers["X-Request-ID"]
+    assert generated.headers["X-Request-ID"] != "req-123"
+
+
+async def test_error_handling_returns_standard_error_body():
+    app = _app()
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware, security_headers={"X-Frame-Options": "DENY"})
+
+    async with _client(app) as client:
+        missing = await client.get("/missing")
+        boom = await client.get("/boom")
+
+    # API exceptions are HTTPExceptions, answered by the app's own handler.
+    assert missing.status_code == 404
+    assert boom.status_code == 500
+    assert boom.json()["error"]["code"] == "internal_error"
+    # Error responses still pass through the outer layers.
+    assert boom.headers["X-Frame-Options"] == "DENY"
+
+
+async def test_rate_limiting_headers_and_429(monkeypatch):
+    monkeypatch.setenv("SECURITY_TESTING", "true")
+    app = _app()
+    app.add_middleware(
+        RateLimitingMiddleware,
+        limiter=InMemoryRateLimiter(),
+        rate_limits={"default": 2, "public": 2, "auth": 2, "upload": 2},
+    )
+
+    async with _client(app) as client:
+        first = await client.get("/items")
+        second = await client.get("/items")
+        blocked = await client.get("/items")
+
+    assert first.headers["X-RateLimit-Limit"] == "2"
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert second.headers["X-RateLimit-Remaining"] == "0"
+    assert blocked.status_code == 429
+    assert blocked.json()["error"]["code"] == "rate_limit_exceeded"
+    assert blocked.headers["Retry-After"] == "60"
+
+
+async def test_request_size_limit(monkeypatch):
+    monkeypatch.delenv("TESTING", raising=False)
+    app = _app()
+    app.add_middleware(RequestSizeLimitMiddleware)
+
+    async with _client(app) as client:
+        too_large = await client.post("/api/v1/posts", content=b"x" * (5 * 1024 * 1024 + 1))
+        accepted = await client.post("/api/v1/posts", content=b"x" * 10)
+
+    assert too_large.status_code == 413
+    assert too_large.json()["error"]["code"] == "request_too_large"
+    assert accepted.status_code == 200
+
+
+async def test_https_redirect_and_cookie_hardening():
+    app = _app()
+    app.add_middleware(HTTPSRedirectMiddleware, force_https=True)
+
+    async with _client(app) as client:
+        redirected = await client.get("/items")
+        proxied = await client.get("/cookie", headers={"X-Forwarded-Proto": "https"})
+
+    assert redirected.status_code == 301
+    assert redirected.headers["location"] == "https://api.example.com/items"
+    assert proxied.status_code == 200
+    assert proxied.headers["Strict-Transport-Security"].startswith("max-age=")
+    cookie = proxied.headers["set-cookie"]
+    assert "HttpOnly" in cookie
+    assert "samesite=lax" in cookie.lower()
+
+
+async def test_input_sanitization_sets_request_state(monkeypatch):
+    monkeypatch.setenv("SECURITY_TESTING", "true")
+    app = FastAPI()
+
+    @app.post("/api/v1/posts")
+    async def create_post(request: Request):
+        return {"mappings": getattr(request.state, "input_sanitization_mappings", None)}
+
+    app.add_middleware(InputSanitizationMiddleware)
+
+    async with _client(app) as client:
+        response = await client.post("/api/v1/posts", json={"content": "hi"})
+
+    assert response.json()["mappings"] == {"content": "post_content", "location": "city"}
@@ -58,6 +58,31 @@ class TestAuthServiceLogin:
         assert "refresh_token" in result
         assert result["user"]["email"] == "normal@example.com"
 
+    async def test_login_rehashes_password_with_stale_work_factor(
+        self, db_session: AsyncSession
+    ):
+        """A hash made with another bcrypt cost is replaced on successful login."""
+        from passlib.context import CryptContext
+        from app.core.security import BCRYPT_ROUNDS, pwd_context
+
+        stale_rounds = 4 if BCRYPT_ROUNDS != 4 else 5
+        stale_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=stale_rounds).hash("correct_password")
+        user = User(
+            email="stale@example.com",
+            username="stalehash",
+            hashed_password=stale_hash,
+            display_name="Stale Hash",
+        )
+        db_session.add(user)
+        await db_session.commit()
+
+        await AuthService(db_session).login("stale@example.com", "correct_password")
+
+        await db_session.refresh(user)
+        assert user.hashed_password != stale_hash
+        assert not pwd_context.needs_update(user.hashed_password)
+        assert pwd_context.verify("correct_password", user.hashed_password)
+
     async def test_login_oauth_user_no_provider_fallback(
         self, db_session: AsyncSession
     ):
@@ -344,26 +344,29 @@ class TestGetPostComments:
             created_at=datetime.now(timezone.utc)
         )
         comment1.user = sample_user
+        reply1 = Comment(
+            id="reply-1",
+            post_id="post-123",
+            user_id=1,
+            parent_comment_id="comment-1",
+            content="Reply to first",
+            created_at=datetime.now(timezone.utc)
+        )
+        reply1.user = sample_user
         
-        # Mock database query
+        # The whole thread comes back from one query
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [comment1]
+        mock_result.scalars.return_value.all.return_value = [comment1, reply1]
         comment_service.db.execute = AsyncMock(return_value=mock_result)
         
-        # Mock get_comment_replies
-        comment_service.get_comment_replies = AsyncMock(return_value=[
-            {
-                "id": "reply-1",
-                "content": "Reply to first",
-                "user": {"username": "replyuser"}
-            }
-        ])
-        
         result = await comment_service.get_post_comments("post-123", include_replies=True)
         
         assert len(result) == 1
         assert result[0]["id"] == "comment-1"
         assert len(result[0]["replies"]) == 1
+        assert result[0]["replies"][0]["can_delete"] is True
+        assert result[0]["reply_count"] == 1
+        comment_service.db.execute.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_post_comments_without_replies(self, comment_service, sample_user):
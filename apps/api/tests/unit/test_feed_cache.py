@@ -0,0 +1,74 @@
+"""
+Unit tests for the feed cursor page cache.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.feed_cache import FeedRankingSnapshot, FeedResultCache, InMemoryFeedCacheBackend
+
+
+QT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _spec(**overrides):
+    spec = {
+        "type_required": [], "type_required_any": [], "type_boost": [],
+        "date": None, "author": None, "keyword": None,
+        "params": {}, "debug": {},
+    }
+    spec.update(overrides)
+    return spec
+
+
+def test_key_depends_on_user_query_time_and_filters():
+    base = FeedResultCache.make_key(1, QT, _spec())
+    assert base == FeedResultCache.make_key(1, QT, _spec(params={"ignored": 1}))
+    assert base != FeedResultCache.make_key(2, QT, _spec())
+    assert base != FeedResultCache.make_key(1, QT.replace(second=1), _spec())
+    assert base != FeedResultCache.make_key(1, QT, _spec(type_required=["photo"]))
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryFeedCacheBackend(max_entries=2)
+    await backend.set("a", 1, 60)
+    await backend.set("b", 2, 60)
+    assert await backend.get("a") == 1  # refresh "a"
+    await backend.set("c", 3, 60)
+
+    assert await backend.get("b") is None
+    assert await backend.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_expires_entries():
+    backend = InMemoryFeedCacheBackend()
+    await backend.set("a", 1, 0)
+    assert await backend.get("a") is None
+    assert len(backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_marker_only_affects_older_snapshots():
+    cache = FeedResultCache()
+    entries = [("p1", 1, 3.0, QT), ("p2", 2, 2.0, QT), ("p3", 1, 1.0, QT)]
+    older = FeedRankingSnapshot(entries=entries, complete=True, created_at=0.0)
+
+    await cache.invalidate_post("p2")
+    newer = FeedRankingSnapshot(entries=entries, complete=True)
+
+    assert await cache.has_invalidated_posts(older, ["p2", "p3"])
+    assert not await cache.has_invalidated_posts(older, ["p3"])
+    assert not await cache.has_invalidated_posts(newer, ["p2"])
+
+
+def test_entries_after_requires_matching_cursor():
+    entries = [("p1", 1, 3.0, QT), ("p2", 2, 2.0, QT), ("p3", 1, 1.0, QT)]
+    snapshot = FeedRankingSnapshot(entries=entries, complete=True)
+
+    assert snapshot.entries_after("p1", 3.0) == entries[1:]
+    assert snapshot.entries_after("p3", 1.0) == []
+    assert snapshot.entries_after("p2", 2.5) is None
+    assert snapshot.entries_after("missing", 1.0) is None
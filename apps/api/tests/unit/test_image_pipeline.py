@@ -0,0 +1,159 @@
+"""
+Unit tests for the off-event-loop image pipeline.
+"""
+
+import asyncio
+import io
+import time
+
+import pytest
+from PIL import Image
+
+from app.core.exceptions import UpstreamServiceError
+from app.services.image_hash_service import ImageHashService
+from app.core.image_pipeline import (
+    ImageDecodeError,
+    ImagePipeline,
+    RenderedVariant,
+    render_boxed_variant,
+    render_post_image,
+)
+
+
+POST_WIDTHS = (("original", 1200), ("medium", 800), ("thumbnail", 400))
+
+
+def _jpeg(size=(1600, 900), color=(20, 120, 200), exif=None) -> bytes:
+    buffer = io.BytesIO()
+    image = Image.new("RGB", size, color)
+    # A gradient gives the perceptual hash something to work with.
+    for x in range(0, size[0], max(1, size[0] // 16)):
+        image.paste((x * 255 // size[0], 80, 160), (x, 0, x + max(1, size[0] // 32), size[1]))
+    image.save(buffer, format="JPEG", exif=exif or Image.Exif())
+    return buffer.getvalue()
+
+
+def _slow_render(seconds: float) -> RenderedVariant:
+    time.sleep(seconds)
+    return RenderedVariant(data=b"", width=0, height=0, timings={"encode": seconds * 1000})
+
+
+def test_render_post_image_cascades_variants():
+    content = _jpeg((4000, 2250))
+    rendered = render_post_image(content, POST_WIDTHS, 85)
+
+    sizes = {name: (variant.width, variant.height) for name, variant in rendered.variants.items()}
+    assert sizes == {"original": (1200, 675), "medium": (800, 450), "thumbnail": (400, 225)}
+    assert Image.open(io.BytesIO(rendered.variants["thumbnail"].data)).size == (400, 225)
+    assert set(rendered.timings) == {"decode", "hash", "resize", "encode"}
+
+    # Smaller images are re-encoded at their own size.
+    small = render_post_image(_jpeg((300, 200)), POST_WIDTHS, 85)
+    assert {variant.width for variant in small.variants.values()} == {300}
+
+
+def test_render_post_image_respects_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees on display
+    rendered = render_post_image(_jpeg((4000, 3000), exif=exif), POST_WIDTHS, 85)
+
+    # Stored 4000x3000 displays as 3000x4000; the reduction must not undershoot.
+    assert (rendered.variants["original"].width, rendered.variants["original"].height) == (1200, 1600)
+
+
+@pytest.mark.parametrize("size", [(3000, 4000), (6000, 4000)])
+async def test_render_post_image_hash_matches_image_hash_service(size):
+    # Photo-like noise: a flat gradient hashes the same at any decode scale
+    noise = Image.effect_noise(size, 64).convert("RGB")
+    buffer = io.BytesIO()
+    Image.blend(noise, Image.open(io.BytesIO(_jpeg(size))), 0.5).save(buffer, format="JPEG", quality=90)
+    content = buffer.getvalue()
+
+    rendered = render_post_image(content, (("original", 2560), ("medium", 1200), ("thumbnail", 400)), 85)
+
+    expected = await ImageHashService(db=None).calculate_perceptual_hash(Image.open(io.BytesIO(content)))
+    assert rendered.perceptual_hash == expected
+
+
+def test_render_boxed_variant_pads_to_exact_size():
+    rendered = render_boxed_variant(_jpeg(), (150, 150), 85)
+    assert Image.open(io.BytesIO(rendered.data)).size == (150, 150)
+
+    cropped = render_boxed_variant(_jpeg(), (64, 64), 85, {"x": 800, "y": 450, "radius": 300})
+    assert (cropped.width, cropped.height) == (64, 64)
+
+
+def test_render_rejects_non_images():
+    with pytest.raises(ImageDecodeError):
+        render_post_image(b"not an image", POST_WIDTHS, 85)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_stage_timings():
+    pipeline = ImagePipeline(max_workers=0, max_pending=2, queue_timeout=1)
+    try:
+        results = await asyncio.gather(*(pipeline.run(render_post_image, _jpeg(), POST_WIDTHS, 85) for _ in range(3)))
+    finally:
+        pipeline.shutdown()
+
+    assert all(result.variants["thumbnail"].width == 400 for result in results)
+    stats = pipeline.get_stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+    assert stats["stages_ms"]["total"]["mean"] > 0
+    assert stats["stages_ms"]["decode"]["max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_applies_backpressure():
+    pipeline = ImagePipeline(max_workers=0, max_pending=1, queue_timeout=0.05)
+    try:
+        busy = asyncio.create_task(pipeline.run(_slow_render, 0.3))
+        await asyncio.sleep(0.01)
+        assert pipeline.get_stats()["running"] == 1
+
+        with pytest.raises(UpstreamServiceError) as exc_info:
+            await pipeline.run(_slow_render, 0)
+        assert exc_info.value.status_code == 503
+        await busy
+    finally:
+        pipeline.shutdown()
+
+    assert pipeline.get_stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_pool_keeps_event_loop_responsive():
+    pipeline = ImagePipeline(max_workers=1, max_pending=4, queue_timeout=30)
+    content = _jpeg((4000, 3000))
+    try:
+        # Warm the worker so process start-up is not measured.
+        await pipeline.run(render_post_image, _jpeg((10, 10)), POST_WIDTHS, 85)
+
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        rendered = await pipeline.run(render_post_image, content, POST_WIDTHS, 85)
+        task.cancel()
+    finally:
+        pipeline.shutdown()
+
+    assert rendered.variants["original"].width == 1200
+    gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+    assert len(ticks) > 2
+    assert max(gaps) < 0.1
+
+
+def test_upload_benchmark_smoke():
+    from benchmarks.image_upload_benchmark import run_benchmark
+
+    report = run_benchmark(megapixels=[0.5], runs=1)
+
+    entry = report["0.5MP"]
+    assert entry["legacy"]["p50_ms"] > 0 and entry["pipeline"]["p50_ms"] > 0
+    assert entry["pipeline"]["output_bytes"] > 0
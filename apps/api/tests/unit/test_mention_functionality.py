@@ -120,10 +120,11 @@ class TestMentionService:
         john_user = User(id=1, username="john", email="john@test.com", hashed_password="hash")
         jane_user = User(id=2, username="jane", email="jane@test.com", hashed_password="hash")
         
-        mention_service.user_repo.get_by_username.side_effect = [john_user, jane_user]
+        mention_service.user_repo.get_by_usernames.return_value = [jane_user, john_user]
         
         valid_users = await mention_service.validate_mentions(usernames)
         
+        mention_service.user_repo.get_by_usernames.assert_called_once_with(usernames)
         assert len(valid_users) == 2
         assert valid_users[0].username == "john"
         assert valid_users[1].username == "jane"
@@ -136,7 +137,7 @@ class TestMentionService:
         # Mock user repository responses
         john_user = User(id=1, username="john", email="john@test.com", hashed_password="hash")
         
-        mention_service.user_repo.get_by_username.side_effect = [john_user, None]
+        mention_service.user_repo.get_by_usernames.return_value = [john_user]
         
         valid_users = await mention_service.validate_mentions(usernames)
         
@@ -335,50 +336,33 @@ class TestMentionRepository:
         assert exists is False
     
     @pytest.mark.asyncio
-    async def test_bulk_create_mentions_success(self, mention_repo):
-        """Test bulk creation of mentions."""
+    async def test_bulk_create_mentions_success(self, mention_repo, mock_db):
+        """Test bulk creation of mentions in one commit."""
         post_id = "test-post"
         author_id = 1
         mentioned_user_ids = [2, 3, 4]
         
-        # Mock check_mention_exists to return False (no existing mentions)
-        mention_repo.check_mention_exists = AsyncMock(return_value=False)
-        
-        # Mock create method
-        created_mentions = []
-        for user_id in mentioned_user_ids:
-            mention = Mention(post_id=post_id, author_id=author_id, mentioned_user_id=user_id)
-            created_mentions.append(mention)
-        
-        mention_repo.create = AsyncMock(side_effect=created_mentions)
+        # No existing mentions
+        mention_repo.get_existing_mentioned_user_ids = AsyncMock(return_value=set())
         
         result = await mention_repo.bulk_create_mentions(post_id, author_id, mentioned_user_ids)
         
-        assert len(result) == 3
-        assert mention_repo.create.call_count == 3
+        assert [mention.mentioned_user_id for mention in result] == [2, 3, 4]
+        assert all(mention.created_at is not None for mention in result)
+        mock_db.add_all.assert_called_once()
+        mock_db.commit.assert_awaited_once()
     
     @pytest.mark.asyncio
-    async def test_bulk_create_mentions_with_duplicates(self, mention_repo):
+    async def test_bulk_create_mentions_with_duplicates(self, mention_repo, mock_db):
         """Test bulk creation skips existing mentions."""
         post_id = "test-post"
         author_id = 1
         mentioned_user_ids = [2, 3, 4]
         
-        # Mock check_mention_exists - user 2 already has mention
-        def mock_check_exists(pid, uid):
-            return uid == 2  # User 2 already mentioned
-        
-        mention_repo.check_mention_exists = AsyncMock(side_effect=mock_check_exists)
-        
-        # Mock create method for new mentions only
-        created_mentions = []
-        for user_id in [3, 4]:  # Only users 3 and 4 should be created
-            mention = Mention(post_id=post_id, author_id=author_id, mentioned_user_id=user_id)
-            created_mentions.append(mention)
-        
-        mention_repo.create = AsyncMock(side_effect=created_mentions)
+        # User 2 already mentioned
+        mention_repo.get_existing_mentioned_user_ids = AsyncMock(return_value={2})
         
         result = await mention_repo.bulk_create_mentions(post_id, author_id, mentioned_user_ids)
         
-        assert len(result) == 2  # Only 2 new mentions created
-        assert mention_repo.create.call_count == 2
\ No newline at end of file
+        assert [mention.mentioned_user_id for mention in result] == [3, 4]  # Only 2 new mentions created
+        mention_repo.get_existing_mentioned_user_ids.assert_awaited_once_with(post_id, mentioned_user_ids)
@@ -0,0 +1,183 @@
+"""
+Tests for the write-behind notification pipeline.
+"""
+
+import pytest
+from sqlalchemy import inspect, select
+
+from app.core.notification_factory import NotificationFactory
+from app.core.notification_pipeline import NotificationPipeline
+from app.models.notification import Notification
+from app.models.user import User
+
+
+@pytest.fixture
+async def actors(db_session):
+    """Create users that act on the test user's content."""
+    users = [
+        User(email=f"actor{index}@example.com", username=f"actor{index}", hashed_password="x")
+        for index in range(3)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    return users
+
+
+async def _notifications_for(db_session, user_id):
+    result = await db_session.execute(
+        select(Notification).where(Notification.user_id == user_id).order_by(Notification.created_at)
+    )
+    return result.scalars().all()
+
+
+class TestNotificationPipeline:
+    """Test coalesced write-behind notification delivery."""
+
+    async def test_submit_refused_when_not_running(self, setup_test_database, test_user):
+        """Without a running pipeline the factory writes inline."""
+        pipeline = NotificationPipeline(session_factory=setup_test_database)
+        notification = Notification(user_id=test_user.id, type="mention", title="t", message="m", data={})
+
+        assert pipeline.submit(notification, "single") is False
+
+    async def test_factory_writes_inline_when_pipeline_stopped(self, db_session, test_user, actors, setup_test_database):
+        """The factory falls back to the inline batcher."""
+        pipeline = NotificationPipeline(session_factory=setup_test_database)
+        factory = NotificationFactory(db_session, pipeline=pipeline)
+
+        result = await factory.create_follow_notification(
+            followed_user_id=test_user.id,
+            follower_username=actors[0].username,
+            follower_id=actors[0].id
+        )
+
+        assert result is not None
+        assert pipeline.get_stats()["submitted"] == 0
+
+    async def test_reaction_burst_coalesced_into_one_batch(self, db_session, test_user, actors, setup_test_database):
+        """A burst of reactions on one post flushes to one batch with children."""
+        pipeline = NotificationPipeline(flush_interval=60, session_factory=setup_test_database)
+        pipeline.start()
+        try:
+            factory = NotificationFactory(db_session, pipeline=pipeline)
+            for actor in actors:
+                result = await factory.create_reaction_notification(
+                    post_author_id=test_user.id,
+                    reactor_username=actor.username,
+                    reactor_id=actor.id,
+                    post_id="post-1",
+                    emoji_code="heart"
+                )
+                assert result is None
+
+            assert pipeline.get_stats()["queue_depth"] == 3
+            assert pipeline.get_stats()["pending_groups"] == 1
+        finally:
+            await pipeline.stop()
+
+        notifications = await _notifications_for(db_session, test_user.id)
+        batches = [n for n in notifications if n.is_batch]
+        children = [n for n in notifications if not n.is_batch]
+        assert len(batches) == 1
+        assert batches[0].batch_count == 3
+        assert batches[0].batch_key == "post_interaction:post:post-1"
+        assert len(children) == 3
+        assert all(child.parent_id == batches[0].id for child in children)
+        assert pipeline.get_stats()["written"] == 3
+
+    async def test_flush_matches_sequential_batching(self, db_session, test_user, actors, setup_test_database):
+        """Coalesced mentions leave the same rows as inline batching."""
+        inline_factory = NotificationFactory(db_session, pipeline=NotificationPipeline())
+        for actor in actors:
+            await inline_factory.create_mention_notification(
+                mentioned_user_id=test_user.id,
+                author_username=actor.username,
+                author_id=actor.id,
+                post_id="inline-post"
+            )
+
+        pipeline = NotificationPipeline(flush_interval=60, session_factory=setup_test_database)
+        pipeline.start()
+        try:
+            factory = NotificationFactory(db_session, pipeline=pipeline)
+            for actor in actors:
+                await factory.create_mention_notification(
+                    mentioned_user_id=test_user.id,
+                    author_username=actor.username,
+                    author_id=actor.id,
+                    post_id="queued-post"
+                )
+        finally:
+            await pipeline.stop()
+
+        notifications = await _notifications_for(db_session, test_user.id)
+
+        def shape(post_id):
+            rows = [n for n in notifications if (n.data or {}).get("post_id") == post_id]
+            return sorted((n.is_batch, n.batch_count, n.title, n.parent_id is None) for n in rows)
+
+        assert shape("queued-post") == shape("inline-post")
+        assert len(shape("queued-post")) == 4
+
+    async def test_full_queue_falls_back_inline(self, db_session, test_user, actors, setup_test_database):
+        """Events beyond max_pending are written inline by the caller."""
+        pipeline = NotificationPipeline(flush_interval=60, max_pending=1, session_factory=setup_test_database)
+        pipeline.start()
+        try:
+            factory = NotificationFactory(db_session, pipeline=pipeline)
+            queued = await factory.create_follow_notification(
+                followed_user_id=test_user.id,
+                follower_username=actors[0].username,
+                follower_id=actors[0].id
+            )
+            inline = await factory.create_follow_notification(
+                followed_user_id=test_user.id,
+                follower_username=actors[1].username,
+                follower_id=actors[1].id
+            )
+        finally:
+            await pipeline.stop()
+
+        assert queued is None
+        assert inline is not None
+        assert pipeline.get_stats()["written"] == 1
+
+    async def test_queued_only_after_caller_commits(self, db_session, test_user, setup_test_database):
+        """Notifications wait on the caller's transaction and are dropped on rollback."""
+        user_id = test_user.id
+        pipeline = NotificationPipeline(flush_interval=60, session_factory=setup_test_database)
+        pipeline.start()
+        try:
+            rolled_back = Notification(user_id=user_id, type="mention", title="t", message="m", data={})
+            assert pipeline.submit_after_commit(db_session, rolled_back, "single") is True
+            assert pipeline.get_stats()["queue_depth"] == 0
+            await db_session.rollback()
+
+            committed = Notification(user_id=user_id, type="mention", title="t", message="m", data={})
+            pipeline.submit_after_commit(db_session, committed, "single")
+            await db_session.commit()
+            assert pipeline.get_stats()["queue_depth"] == 1
+        finally:
+            await pipeline.stop()
+
+        notifications = await _notifications_for(db_session, user_id)
+        assert len(notifications) == 1
+        assert pipeline.get_stats()["written"] == 1
+
+    async def test_retry_writes_new_rows_for_surviving_groups(self, db_session, test_user, setup_test_database):
+        """A failed bulk flush is retried per group without re-adding rolled back instances."""
+        pipeline = NotificationPipeline(flush_interval=60, session_factory=setup_test_database)
+        pipeline.start()
+        good = Notification(user_id=test_user.id, type="mention", title="t", message="m", data={})
+        bad = Notification(user_id=test_user.id, type="mention", title=None, message="m", data={})
+        try:
+            pipeline.submit(good, "single")
+            pipeline.submit(bad, "single")
+        finally:
+            await pipeline.stop()
+
+        notifications = await _notifications_for(db_session, test_user.id)
+        assert [n.title for n in notifications] == ["t"]
+        assert inspect(good).transient and inspect(bad).transient
+        stats = pipeline.get_stats()
+        assert (stats["written"], stats["dropped"]) == (1, 1)
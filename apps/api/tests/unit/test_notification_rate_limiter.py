@@ -0,0 +1,97 @@
+"""
+Tests for the sliding-window notification rate limiter.
+"""
+
+import datetime
+from datetime import timezone
+
+from app.core.notification_rate_limiter import InMemoryRateLimitBackend, NotificationRateLimiter
+from app.models.notification import Notification
+from app.services.notification_service import NotificationService
+
+
+def _seed(timestamps):
+    calls = []
+
+    async def seed():
+        calls.append(1)
+        return list(timestamps)
+
+    return seed, calls
+
+
+class TestInMemoryRateLimitBackend:
+    """Test the per-process sliding windows."""
+
+    async def test_allows_up_to_limit_then_rejects(self):
+        backend = InMemoryRateLimitBackend()
+        seed, calls = _seed([])
+
+        results = [await backend.acquire("1:mention", 3, 3600, 1000.0 + i, seed) for i in range(4)]
+
+        assert results == [True, True, True, False]
+        assert len(calls) == 1
+
+    async def test_window_slides(self):
+        backend = InMemoryRateLimitBackend()
+        seed, _ = _seed([])
+        for i in range(2):
+            await backend.acquire("1:mention", 2, 60, 1000.0 + i, seed)
+
+        assert await backend.acquire("1:mention", 2, 60, 1059.0, seed) is False
+        assert await backend.acquire("1:mention", 2, 60, 1060.5, seed) is True
+
+    async def test_seed_counts_towards_limit(self):
+        backend = InMemoryRateLimitBackend()
+        seed, _ = _seed([900.0, 950.0])
+
+        assert await backend.acquire("1:mention", 2, 3600, 1000.0, seed) is False
+
+    async def test_evicts_least_recently_used_key(self):
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        seed, calls = _seed([])
+        for key in ("a", "b", "c"):
+            await backend.acquire(key, 5, 3600, 1000.0, seed)
+
+        assert backend.get_stats()["keys"] == 2
+        assert backend.get_stats()["evictions"] == 1
+        await backend.acquire("a", 5, 3600, 1001.0, seed)
+        assert len(calls) == 4
+
+
+class TestNotificationRateLimiter:
+    """Test rate limiting through NotificationService."""
+
+    async def test_seeds_from_recent_notifications(self, db_session, test_user):
+        """Notifications already in the last hour count after a restart."""
+        now = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+        db_session.add_all([
+            Notification(user_id=test_user.id, type="mention", title="t", message="m", data={}, created_at=now),
+            Notification(user_id=test_user.id, type="mention", title="t", message="m", data={}, created_at=now),
+            Notification(
+                user_id=test_user.id, type="mention", title="t", message="m", data={},
+                created_at=now - datetime.timedelta(hours=2)
+            ),
+        ])
+        await db_session.commit()
+        limiter = NotificationRateLimiter()
+
+        assert await limiter.acquire(db_session, test_user.id, "mention", 3) is True
+        assert await limiter.acquire(db_session, test_user.id, "mention", 3) is False
+        assert await limiter.acquire(db_session, test_user.id, "follow", 3) is True
+
+    async def test_service_enforces_hourly_limit(self, db_session, test_user):
+        """create_notification stops at MAX_NOTIFICATIONS_PER_HOUR per type."""
+        service = NotificationService(db_session)
+        created = []
+        for i in range(NotificationService.MAX_NOTIFICATIONS_PER_HOUR + 2):
+            created.append(await service.create_notification(
+                user_id=test_user.id,
+                notification_type="emoji_reaction",
+                title=f"Reaction {i}",
+                message="reacted",
+                data={"post_id": f"post-{i}"}
+            ))
+
+        assert sum(1 for n in created if n is not None) == NotificationService.MAX_NOTIFICATIONS_PER_HOUR
+        assert created[-1] is None
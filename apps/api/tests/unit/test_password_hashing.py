@@ -0,0 +1,64 @@
+"""
+Unit tests for the off-event-loop password hashing pool.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import UpstreamServiceError
+from app.core.password_hashing import PasswordHasher
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(max_workers=1)
+    try:
+        hashed = await hasher.hash("correct horse")
+        assert await hasher.verify("correct horse", hashed)
+        assert not await hasher.verify("wrong horse", hashed)
+        assert await hasher.verify_and_update("correct horse", hashed) == (True, None)
+        assert hasher.get_stats()["completed"] == 4
+    finally:
+        hasher.shutdown()
+
+
+async def test_event_loop_keeps_running_while_hashing():
+    hasher = PasswordHasher(max_workers=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await hasher.hash("correct horse")
+    finally:
+        task.cancel()
+        hasher.shutdown()
+    assert ticks > 0
+
+
+async def test_saturated_pool_fails_fast():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        blocked = asyncio.create_task(hasher._run(release.wait, 5))
+        await asyncio.sleep(0)
+        assert hasher.get_stats()["queue_depth"] + hasher.get_stats()["running"] == 1
+
+        with pytest.raises(UpstreamServiceError) as exc_info:
+            await hasher.hash("correct horse")
+        assert exc_info.value.status_code == 503
+        assert hasher.get_stats()["rejected"] == 1
+
+        release.set()
+        await blocked
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -61,7 +61,7 @@ def oauth_user():
 async def test_update_password_hashes_correctly(mock_user_service, password_user):
     """Verify that the UserService.update_password function correctly hashes and updates a user's password."""
     mock_user_service.user_repo.update = AsyncMock()
-    with patch('app.services.user_service.get_password_hash') as mock_get_hash:
+    with patch('app.services.user_service.password_hasher.hash', new_callable=AsyncMock) as mock_get_hash:
         mock_get_hash.return_value = "new_hashed_password"
         
         await mock_user_service.update_password(password_user, "new_password_123")
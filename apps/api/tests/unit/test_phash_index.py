@@ -0,0 +1,88 @@
+"""
+Unit tests for the in-memory perceptual hash similarity index.
+"""
+
+import random
+
+import imagehash
+import numpy as np
+
+from app.core.phash_index import PerceptualHashIndex, parse_phash
+
+
+def _hex(value: int) -> str:
+    return f"{value:016x}"
+
+
+def test_query_matches_imagehash_distance():
+    rng = random.Random(3)
+    target = rng.getrandbits(64)
+    rows = [(i, _hex(target ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)))) for i in range(50)]
+    rows += [(100 + i, _hex(rng.getrandbits(64))) for i in range(200)]
+    index = PerceptualHashIndex()
+    index.load(rows)
+
+    result = index.query(_hex(target), threshold=5)
+
+    expected = sorted(
+        (
+            (image_id, imagehash.hex_to_hash(_hex(target)) - imagehash.hex_to_hash(phash))
+            for image_id, phash in rows
+        ),
+        key=lambda item: item[1],
+    )
+    expected = [(image_id, distance) for image_id, distance in expected if distance <= 5]
+    assert sorted(result) == sorted(expected)
+    assert [distance for _, distance in result] == sorted(distance for _, distance in result)
+
+
+def test_incremental_add_and_remove():
+    index = PerceptualHashIndex()
+    index.add(1, "ffffffffffffffff")
+    # Updates before the first load are dropped; the load is authoritative.
+    assert len(index) == 0
+
+    index.load([(1, "0000000000000000"), (2, "not-a-hash"), (3, None)])
+    assert len(index) == 1
+
+    for image_id in range(2, 2000):
+        index.add(image_id, _hex(image_id))
+    assert len(index) == 1999
+    assert index.query("0000000000000003", threshold=0)[0] == (3, 0)
+
+    index.remove(1)
+    index.remove(1)
+    assert (1, 0) not in index.query("0000000000000000", threshold=0)
+    # Swap-remove keeps the moved entry addressable.
+    index.remove(1999)
+    index.add(1998, "0000000000000000")
+    assert index.query("0000000000000000", threshold=0) == [(1998, 0)]
+
+
+def test_invalid_query_and_reload_state():
+    index = PerceptualHashIndex(max_age_seconds=0)
+    assert index.needs_load()
+    index.load([])
+    assert index.query("xyz", threshold=64) == []
+    assert parse_phash("abc") is None
+    index.clear()
+    assert not index.is_loaded
+
+
+def test_popcount_fallback_matches(monkeypatch):
+    index = PerceptualHashIndex()
+    index.load([(1, "ffffffffffffffff"), (2, "0f0f0f0f0f0f0f0f")])
+    expected = index.query("0000000000000000", threshold=64)
+
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert index.query("0000000000000000", threshold=64) == expected == [(2, 32), (1, 64)]
+
+
+def test_benchmark_smoke():
+    from benchmarks.phash_index_benchmark import run_benchmark
+
+    report = run_benchmark(sizes=[500, 2000], queries=3, threshold=5, legacy_max=500, seed=1)
+
+    assert set(report) == {"500", "2000"}
+    assert "legacy" in report["500"] and "legacy" not in report["2000"]
+    assert report["2000"]["index"]["samples"] == 3
@@ -0,0 +1,83 @@
+"""
+Tests for connection pool metrics and the queued logging pipeline.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.pool_metrics import PoolMetrics
+from app.core.structured_logging import NonBlockingQueueHandler, StructuredFormatter, request_id_context
+
+
+class TestPoolMetrics:
+    """Test checkout counting and sampling."""
+
+    def test_counts_and_samples_checkouts(self):
+        pool = QueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=2)
+        metrics = PoolMetrics(sample_every=2)
+        metrics.instrument(pool)
+
+        connections = [pool.connect() for _ in range(3)]
+        for connection in connections:
+            connection.close()
+
+        stats = metrics.get_stats()
+        assert stats["checkouts"] == 3
+        assert stats["checkins"] == 3
+        assert stats["connects"] == 3
+        assert stats["in_use"] == 0
+        assert stats["sampled"]["samples"] == 1
+        # The second checkout saw two connections in use, one of them overflow
+        assert stats["sampled"]["in_use_max"] == 2
+        assert stats["sampled"]["overflow_max"] == 1
+        assert stats["checkout_wait_ms"]["max"] >= stats["checkout_wait_ms"]["p50"] >= 0
+
+    def test_keeps_timing_checkouts_after_engine_dispose(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.sqlite3'}", poolclass=QueuePool)
+        metrics = PoolMetrics(sample_every=1)
+        metrics.instrument_engine(engine)
+        try:
+            engine.connect().close()
+            engine.dispose()
+            engine.connect().close()
+        finally:
+            engine.dispose()
+
+        stats = metrics.get_stats()
+        assert metrics.pool is engine.pool
+        assert stats["checkouts"] == 2
+        assert stats["checkins"] == 2
+        assert stats["sampled"]["samples"] == 2
+
+
+class TestNonBlockingQueueHandler:
+    """Test the handler feeding the background log listener."""
+
+    def _record(self, message, *args):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, message, args, None)
+
+    def test_renders_message_and_keeps_request_id(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+        token = request_id_context.set("req-1")
+        try:
+            handler.emit(self._record("hello %s", "world"))
+        finally:
+            request_id_context.reset(token)
+
+        record = handler.queue.get_nowait()
+        entry = json.loads(StructuredFormatter().format(record))
+        assert entry["message"] == "hello world"
+        assert entry["request_id"] == "req-1"
+
+    def test_drops_records_when_full(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.emit(self._record("first"))
+        handler.emit(self._record("second"))
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
@@ -0,0 +1,114 @@
+"""
+Unit tests for single-statement post hydration on PostgreSQL.
+"""
+
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.repositories.post_repository import PostRepository
+
+
+def _pg_row(**overrides):
+    row = dict(
+        id="post-1",
+        author_id=7,
+        content="hello",
+        rich_content=None,
+        post_style=None,
+        image_url=None,
+        location=None,
+        location_data=None,
+        is_public=False,
+        privacy_level="custom",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        updated_at=None,
+        deleted_at=None,
+        author_user_id=7,
+        author_username="author",
+        author_display_name="Author",
+        author_email="author@example.com",
+        author_profile_image_url=None,
+        author_account_status="active",
+        reactions_count=2,
+        reaction_emoji_codes=["heart", "pray"],
+        comments_count=1,
+        current_user_reaction=None,
+        author_posts_count=4,
+        author_followers_count=3,
+        author_following_count=5,
+        author_is_following=True,
+        # asyncpg returns untyped JSON columns as text
+        images_json=json.dumps([
+            {"id": "img-1", "position": 0, "thumbnail_url": "/uploads/posts/a_thumb.jpg",
+             "medium_url": "/uploads/posts/a_medium.jpg", "original_url": "/uploads/posts/a.jpg",
+             "width": 800, "height": 600},
+        ]),
+        privacy_rules_json=json.dumps(["followers", "specific_users", "followers"]),
+        specific_users_json=json.dumps([9, 9, 11]),
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def _pg_repository(rows):
+    db = MagicMock()
+    db.bind.dialect.name = "postgresql"
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    db.execute = AsyncMock(return_value=result)
+    return PostRepository(db), db
+
+
+@pytest.mark.asyncio
+async def test_postgresql_hydrates_page_in_one_statement():
+    repo, db = _pg_repository([_pg_row()])
+
+    posts = await repo._fetch_engagement_data(["post-1"], viewer_id=7, include_privacy_details=True)
+
+    assert db.execute.await_count == 1
+    sql = str(db.execute.await_args.args[0])
+    assert "LEFT JOIN LATERAL" in sql
+    assert "p.author_id = :viewer_id" in sql
+
+    post = posts[0]
+    assert post["author"]["follower_count"] == 3
+    assert post["author"]["following_count"] == 5
+    assert post["author"]["posts_count"] == 4
+    # Own posts never report a follow status.
+    assert post["author"]["is_following"] is None
+    assert [img["id"] for img in post["images"]] == ["img-1"]
+    assert post["images"][0]["width"] == 800
+    assert post["privacy_rules"] == ["followers", "specific_users"]
+    assert post["specific_users"] == [9, 11]
+
+
+@pytest.mark.asyncio
+async def test_postgresql_hydration_for_other_viewers():
+    repo, db = _pg_repository([
+        _pg_row(images_json=None, privacy_rules_json=None, specific_users_json=None),
+    ])
+
+    posts = await repo._fetch_engagement_data(["post-1"], viewer_id=8, include_privacy_details=True)
+
+    post = posts[0]
+    assert post["author"]["is_following"] is True
+    assert post["images"] == []
+    # Privacy metadata is only attached for the owner.
+    assert "privacy_rules" not in post
+    assert "specific_users" not in post
+
+
+@pytest.mark.asyncio
+async def test_postgresql_hydration_without_privacy_details():
+    repo, db = _pg_repository([_pg_row(author_is_following=False)])
+
+    posts = await repo._fetch_engagement_data(["post-1"], viewer_id=None)
+
+    sql = str(db.execute.await_args.args[0])
+    assert ") privacy ON FALSE" in sql
+    assert posts[0]["author"]["is_following"] is None
+    assert "privacy_rules" not in posts[0]
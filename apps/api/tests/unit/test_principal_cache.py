@@ -0,0 +1,114 @@
+"""
+Unit tests for the authenticated-principal cache.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.dependencies import get_active_user_id_from_credentials
+from app.core.exceptions import AuthenticationError
+from app.core.principal_cache import PrincipalCache, principal_cache
+from app.core.security import create_access_token
+
+
+class _CountingSession:
+    """Stands in for AsyncSession; answers the users lookup with one row."""
+
+    def __init__(self, user):
+        self.user = user
+        self.executes = 0
+
+    async def execute(self, statement):
+        self.executes += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.user)
+
+
+def _credentials(user_id: int, token_version: int = 0) -> HTTPAuthorizationCredentials:
+    token = create_access_token({"sub": str(user_id), "token_version": token_version})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture(autouse=True)
+def _clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def test_lookup_requires_matching_token_version():
+    cache = PrincipalCache(ttl_seconds=60)
+    cache.store(1, 3, cache.now())
+
+    assert cache.lookup(1, 3)
+    assert not cache.lookup(1, 2)
+    assert not cache.lookup(2, 3)
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_entries_expire_and_evict_least_recently_used():
+    expired = PrincipalCache(ttl_seconds=0.001, max_entries=10)
+    expired.store(1, 0, expired.now())
+    time.sleep(0.002)
+    assert not expired.lookup(1, 0)
+
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    cache.store(1, 0, cache.now())
+    cache.store(2, 0, cache.now())
+    assert cache.lookup(1, 0)  # refresh 1
+    cache.store(3, 0, cache.now())
+    assert not cache.lookup(2, 0)
+    assert cache.lookup(1, 0) and cache.lookup(3, 0)
+
+
+def test_invalidation_blocks_stores_of_lookups_that_started_earlier():
+    cache = PrincipalCache(ttl_seconds=60)
+    load_started_at = cache.now()
+    cache.invalidate_user(1)
+    cache.store(1, 0, load_started_at)
+    assert not cache.lookup(1, 0)
+
+    cache.store(1, 1, cache.now())
+    assert cache.lookup(1, 1)
+    cache.invalidate_user(1)
+    assert not cache.lookup(1, 1)
+    assert cache.get_stats()["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_user_id_dependency_skips_database_on_cache_hit():
+    db = _CountingSession(SimpleNamespace(id=7, account_status="active", token_version=0))
+    auth = _credentials(7)
+
+    assert await get_active_user_id_from_credentials(auth, db) == 7
+    assert await get_active_user_id_from_credentials(auth, db) == 7
+    assert db.executes == 1
+
+
+@pytest.mark.asyncio
+async def test_user_id_dependency_rejects_revoked_tokens():
+    db = _CountingSession(SimpleNamespace(id=7, account_status="active", token_version=0))
+    old_token = _credentials(7, token_version=0)
+    assert await get_active_user_id_from_credentials(old_token, db) == 7
+
+    # logout-all: token_version bumped in the database, cache invalidated
+    db.user = SimpleNamespace(id=7, account_status="active", token_version=1)
+    principal_cache.invalidate_user(7)
+
+    with pytest.raises(AuthenticationError):
+        await get_active_user_id_from_credentials(old_token, db)
+    assert await get_active_user_id_from_credentials(_credentials(7, token_version=1), db) == 7
+
+
+@pytest.mark.asyncio
+async def test_inactive_users_are_not_cached():
+    db = _CountingSession(SimpleNamespace(id=7, account_status="deletion_pending", token_version=0))
+    auth = _credentials(7)
+
+    for _ in range(2):
+        with pytest.raises(AuthenticationError):
+            await get_active_user_id_from_credentials(auth, db)
+    assert db.executes == 2
@@ -0,0 +1,206 @@
+"""
+Unit tests for the sliding-window rate limiter backends.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.rate_limiting import (
+    InMemoryRateLimiter,
+    RateLimitingMiddleware,
+    SlidingWindowCounter,
+    SQLiteRateLimiter,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def limiter(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryRateLimiter()
+    else:
+        limiter = SQLiteRateLimiter(path=str(tmp_path / "limits.sqlite3"))
+        yield limiter
+        limiter.close()
+
+
+def test_window_slides_per_subwindow(limiter):
+    with patch("time.time") as mock_time:
+        mock_time.return_value = 1000.0
+        for _ in range(3):
+            assert limiter.check_and_record("user1", "GET:/a", limit=5)["allowed"] is True
+        mock_time.return_value = 1030.5
+        for _ in range(2):
+            limiter.check_and_record("user1", "GET:/a", limit=5)
+
+        blocked = limiter.check_and_record("user1", "GET:/a", limit=5)
+        assert (blocked["allowed"], blocked["current_count"], blocked["remaining"]) == (False, 5, 0)
+        # The first three leave the window once their sub-window is a full window old
+        assert blocked["reset_time"].timestamp() == 1061.0
+
+        mock_time.return_value = 1061.0
+        status = limiter.check_and_record("user1", "GET:/a", limit=5)
+        assert (status["allowed"], status["current_count"]) == (True, 2)
+
+        mock_time.return_value = 1200.0
+        assert limiter.is_allowed("user1", "GET:/a", limit=5)["current_count"] == 0
+
+
+def test_two_step_api_with_custom_window(limiter):
+    with patch("time.time") as mock_time:
+        mock_time.return_value = 1000.0
+        results = []
+        for _ in range(3):
+            status = limiter.is_allowed("user1", "GET:/a", limit=2, window_seconds=10)
+            results.append((status["allowed"], status["current_count"]))
+            if status["allowed"]:
+                limiter.record_request("user1", "GET:/a")
+        assert results == [(True, 0), (True, 1), (False, 2)]
+
+        # A shorter window lets the requests expire sooner, never earlier than it
+        mock_time.return_value = 1011.0
+        assert limiter.is_allowed("user1", "GET:/a", limit=2, window_seconds=10)["current_count"] == 0
+
+
+def test_window_change_keeps_counted_requests(limiter):
+    with patch("time.time") as mock_time:
+        mock_time.return_value = 1000.0
+        for _ in range(3):
+            limiter.check_and_record("user1", "GET:/a", limit=5, window_seconds=60)
+
+        status = limiter.check_and_record("user1", "GET:/a", limit=5, window_seconds=30)
+        assert status["current_count"] == 3
+        assert status["window_seconds"] == 30
+
+
+def test_fractional_window_survives_reload(limiter):
+    with patch("time.time") as mock_time:
+        mock_time.return_value = 1000.0
+        limiter.check_and_record("user1", "GET:/a", limit=5, window_seconds=7.5)
+
+        status = limiter.check_and_record("user1", "GET:/a", limit=5, window_seconds=7.5)
+        assert (status["current_count"], status["window_seconds"]) == (1, 7.5)
+        # 60 sub-windows of 0.125s; the first request leaves a full window after its own
+        assert status["reset_time"].timestamp() == 1007.625
+
+        mock_time.return_value = 1007.625
+        assert limiter.is_allowed("user1", "GET:/a", limit=5, window_seconds=7.5)["current_count"] == 0
+
+
+def test_clear_user_limits(limiter):
+    for _ in range(3):
+        limiter.record_request("user1", "GET:/a")
+    limiter.record_request("user2", "GET:/a")
+
+    limiter.clear_user_limits("user1")
+
+    assert limiter.is_allowed("user1", "GET:/a", limit=5)["current_count"] == 0
+    assert limiter.is_allowed("user2", "GET:/a", limit=5)["current_count"] == 1
+
+
+def test_memory_is_bounded_without_sweeps():
+    limiter = InMemoryRateLimiter(max_keys=100)
+    with patch("time.time") as mock_time:
+        mock_time.return_value = 0.0
+        for index in range(150):
+            limiter.record_request(f"ip:{index}", "GET:/a")
+        assert limiter.get_stats()["keys"] == 100
+        assert limiter.evictions == 50
+
+        # Idle windows are dropped as later requests come in
+        mock_time.return_value = 120.0
+        limiter.record_request("ip:new", "GET:/a")
+        assert limiter.get_stats()["keys"] == 1
+        assert limiter.expirations == 100
+
+
+def test_counter_memory_does_not_grow_with_requests():
+    window = SlidingWindowCounter(60, subwindows=60, now=0.0)
+    for second in range(10_000):
+        window.advance(second / 10)
+        window.add()
+    assert len(window.counts) == 61
+    # Requests from the last 60 seconds plus the sub-window in progress
+    assert window.total == 610
+
+
+def test_sqlite_windows_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    worker_a, worker_b = SQLiteRateLimiter(path=path), SQLiteRateLimiter(path=path)
+    try:
+        results = [
+            (worker_a if index % 2 else worker_b).check_and_record("ip:10.0.0.1", "POST:/api/v1/auth/login", limit=10)
+            for index in range(12)
+        ]
+        assert [result["allowed"] for result in results] == [True] * 10 + [False] * 2
+        assert worker_b.get_stats()["keys"] == 1
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_sqlite_store_unavailable_lets_requests_through(tmp_path):
+    limiter = SQLiteRateLimiter(path=str(tmp_path / "missing" / "limits.sqlite3"))
+
+    status = limiter.check_and_record("user1", "GET:/a", limit=1)
+
+    assert status["allowed"] is True
+    assert limiter.get_stats()["errors"] == 1
+
+
+async def test_sqlite_check_runs_off_the_event_loop(tmp_path):
+    limiter = SQLiteRateLimiter(path=str(tmp_path / "limits.sqlite3"))
+    loop_thread = threading.get_ident()
+    transact_threads = []
+    transact = limiter._transact
+
+    def recording_transact(*args):
+        transact_threads.append(threading.get_ident())
+        return transact(*args)
+
+    limiter._transact = recording_transact
+    try:
+        results = await asyncio.gather(
+            *(limiter.check_and_record_async("user1", "GET:/a", limit=3) for _ in range(4))
+        )
+    finally:
+        limiter.close()
+
+    assert sorted(result["allowed"] for result in results) == [False, True, True, True]
+    assert transact_threads and loop_thread not in transact_threads
+
+
+async def test_middleware_headers_with_shared_backend(monkeypatch, tmp_path):
+    monkeypatch.setenv("SECURITY_TESTING", "true")
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"ok": True}
+
+    limiter = SQLiteRateLimiter(path=str(tmp_path / "limits.sqlite3"))
+    app.add_middleware(
+        RateLimitingMiddleware,
+        limiter=limiter,
+        rate_limits={"default": 2, "public": 2, "auth": 2, "upload": 2},
+    )
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://api.local") as client:
+            first = await client.get("/items")
+            second = await client.get("/items")
+            blocked = await client.get("/items")
+    finally:
+        limiter.close()
+
+    assert first.headers["X-RateLimit-Limit"] == "2"
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert second.headers["X-RateLimit-Remaining"] == "0"
+    assert first.headers["X-RateLimit-Reset"] == blocked.headers["X-RateLimit-Reset"]
+    assert blocked.status_code == 429
+    assert blocked.headers["Retry-After"] == "60"
+    assert blocked.headers["X-RateLimit-Remaining"] == "0"
@@ -0,0 +1,80 @@
+"""
+Tests for the request-scoped SQL profiler.
+"""
+
+from app.core.sql_profiler import RequestProfile, SQLProfiler, StatementRecord, normalize_statement
+from app.repositories.user_repository import UserRepository
+
+
+def _profile(*statements):
+    profile = RequestProfile()
+    profile.statements = [StatementRecord(statement, 1.5, "app/x.py:1 in f") for statement in statements]
+    return profile
+
+
+class TestNormalizeStatement:
+    """Test statement normalization."""
+
+    def test_collapses_literals_and_parameters(self):
+        assert normalize_statement("SELECT * FROM users WHERE id = $1 AND name = 'bob' LIMIT 10") == (
+            "SELECT * FROM users WHERE id = ? AND name = ? LIMIT ?"
+        )
+
+    def test_collapses_in_lists_of_any_length(self):
+        short = normalize_statement("SELECT * FROM users WHERE id IN (?, ?)")
+        long = normalize_statement("SELECT *\n  FROM users WHERE id IN (?, ?, ?, ?, ?)")
+        assert short == long == "SELECT * FROM users WHERE id IN (?)"
+
+    def test_keeps_identifiers_and_casts(self):
+        assert normalize_statement("SELECT anon_1.id, x::int FROM t1 AS anon_1") == (
+            "SELECT anon_1.id, x::int FROM t1 AS anon_1"
+        )
+
+
+class TestSQLProfiler:
+    """Test per-route aggregation and budgets."""
+
+    def test_aggregates_routes(self):
+        profiler = SQLProfiler(budgets={})
+        profiler.finish_request("GET /a", _profile("SELECT ?", "SELECT ?", "UPDATE t SET x = ?"))
+        profiler.finish_request("GET /a", _profile("SELECT ?"))
+
+        route = profiler.get_stats()["routes"]["GET /a"]
+        assert route["requests"] == 2
+        assert route["max_statements"] == 3
+        assert route["avg_statements"] == 2
+        select = next(s for s in route["top_statements"] if s["statement"] == "SELECT ?")
+        assert select["count"] == 3
+        assert select["call_sites"] == ["app/x.py:1 in f"]
+
+    def test_budget_violation_recorded_once(self):
+        profiler = SQLProfiler(budgets={"GET /feed": 2})
+        profiler.finish_request("GET /feed", _profile("SELECT ?", "SELECT ?"))
+        profiler.finish_request("GET /feed", _profile("SELECT ?", "SELECT ?", "SELECT ?"), request_id="r1")
+
+        violations = profiler.take_violations()
+        assert len(violations) == 1
+        assert violations[0]["statements"] == 3
+        assert violations[0]["request_id"] == "r1"
+        assert violations[0]["top_statements"][0]["count"] == 3
+        assert profiler.take_violations() == []
+        assert profiler.get_stats()["routes"]["GET /feed"]["budget_violations"] == 1
+
+    def test_evicts_least_recently_used_route(self):
+        profiler = SQLProfiler(budgets={}, max_routes=2)
+        for route in ("GET /a", "GET /b", "GET /a", "GET /c"):
+            profiler.finish_request(route, _profile("SELECT ?"))
+
+        assert set(profiler.get_stats()["routes"]) == {"GET /a", "GET /c"}
+        assert profiler.get_stats()["evictions"] == 1
+
+    async def test_profile_records_statements_with_call_site(self, db_session, test_user):
+        profiler = SQLProfiler()
+        with profiler.profile() as profile:
+            await UserRepository(db_session).get_by_usernames([test_user.username, "someone_else"])
+
+        assert profile.statement_count == 1
+        record = profile.statements[0]
+        assert "IN (?)" in record.statement
+        assert record.call_site.startswith("app/repositories/user_repository.py:")
+        assert record.call_site.endswith("in get_by_usernames")
@@ -0,0 +1,68 @@
+"""
+Unit tests for StorageAdapter URL generation and its memo.
+"""
+
+import pytest
+
+from app.core.storage import StorageAdapter
+
+
+@pytest.fixture
+def s3_env(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    monkeypatch.setenv("S3_ENDPOINT_URL", "https://objects.example.com/")
+    monkeypatch.setenv("S3_ACCESS_KEY_ID", "key")
+    monkeypatch.setenv("S3_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setenv("S3_BUCKET", "grateful-uploads")
+
+
+def test_local_urls_for_every_stored_format(monkeypatch, tmp_path):
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    monkeypatch.setenv("UPLOAD_PATH", str(tmp_path))
+    adapter = StorageAdapter()
+
+    assert adapter.get_urls([
+        "posts/a.jpg",
+        "/uploads/posts/a.jpg",
+        "uploads/posts/a.jpg",
+        None,
+        "",
+    ]) == ["/uploads/posts/a.jpg"] * 3 + [None, ""]
+
+
+def test_s3_prefix_computed_once(monkeypatch, s3_env):
+    monkeypatch.setenv("S3_PUBLIC_URL", "https://cdn.example.com/storage/v1/object/public/grateful-uploads/")
+    adapter = StorageAdapter()
+    monkeypatch.setenv("S3_PUBLIC_URL", "https://elsewhere.example.com")
+
+    assert adapter.get_url("posts/a.jpg") == "https://cdn.example.com/storage/v1/object/public/grateful-uploads/posts/a.jpg"
+    assert adapter.get_url(
+        "https://cdn.example.com/storage/v1/object/public/grateful-uploads/posts/b.jpg"
+    ) == "https://cdn.example.com/storage/v1/object/public/grateful-uploads/posts/b.jpg"
+
+
+def test_s3_endpoint_fallback(monkeypatch, s3_env):
+    monkeypatch.delenv("S3_PUBLIC_URL", raising=False)
+    adapter = StorageAdapter()
+
+    assert adapter.get_url("/uploads/posts/a.jpg") == "https://objects.example.com/grateful-uploads/posts/a.jpg"
+
+
+def test_memo_is_bounded_lru(monkeypatch, tmp_path):
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    monkeypatch.setenv("UPLOAD_PATH", str(tmp_path))
+    adapter = StorageAdapter(url_cache_size=2)
+    calls = []
+    normalize = adapter.normalize_path
+    monkeypatch.setattr(adapter, "normalize_path", lambda path: calls.append(path) or normalize(path))
+
+    adapter.get_url("posts/a.jpg")
+    adapter.get_url("posts/b.jpg")
+    adapter.get_url("posts/a.jpg")  # hit; b becomes least recently used
+    adapter.get_url("posts/c.jpg")  # evicts b
+    adapter.get_url("posts/a.jpg")
+    adapter.get_url("posts/b.jpg")
+
+    assert calls == ["posts/a.jpg", "posts/b.jpg", "posts/c.jpg", "posts/b.jpg"]
+    stats = adapter.get_url_cache_stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 2, 4)